@@ -79,6 +79,40 @@ class Settings(BaseSettings):
     api_enabled: bool = False  # PS_API_ENABLED — enable LAN API access
     api_host: str = "0.0.0.0"  # PS_API_HOST — bind address when api_enabled
 
+    # Deployment history
+    deployment_history_retention: int = 1000  # Records kept in the log, 0 = all
+
+    # Concurrent multi-device deployments
+    ssh_sessions_per_host: int = 2  # Devices deploying to one SSH host at a time
+    fleet_concurrency: int = 4  # Targets a fleet deploys at once by default
+
+    # Pooled SSH connections shared by deployers and device managers
+    ssh_pool_max_per_host: int = 4  # Connections lent out per host at once
+    ssh_pool_idle_timeout: int = 60  # Seconds an idle connection stays open
+
+    # Remote Docker management runs on its own bounded thread pool
+    docker_ssh_workers: int = 8  # Threads for remote Docker management calls
+    docker_ssh_connect_timeout: int = 30  # Seconds to open a remote Docker session
+
+    # Live preview streams (one FFmpeg per camera, shared by all viewers)
+    preview_stream_idle_timeout: int = (
+        300  # Seconds unwatched before stopping, 0 = never
+    )
+
+    # Downloaded solution assets (content-addressed, least recently used evicted)
+    download_cache_max_bytes: int = 10 * 1024**3  # Byte budget, 0 = unlimited
+    offline_mode: bool = False  # Never download; serve imported asset bundles only
+
+    # MQTT preview messages buffered per WebSocket (see services/mqtt_bridge.py)
+    preview_mqtt_buffer_size: int = 100  # Messages (or topics) held per socket
+    preview_mqtt_drop_policy: str = "drop_oldest"  # drop_oldest | latest_per_topic
+    preview_mqtt_max_rate: float = 0  # Messages/s sent per socket, 0 = unlimited
+
+    # Hot reload of edited solution files (for content authors)
+    watch_solutions: bool = False  # PS_WATCH_SOLUTIONS — reload on file changes
+    watch_debounce_ms: int = 500  # Quiet period before applying a change batch
+    watch_force_polling: bool = False  # Poll mtimes instead of OS notifications
+
     # Language
     default_language: str = "zh"  # zh | en
 
@@ -25,6 +25,9 @@ class BaseDeployer(ABC):
         "connection_scope": "device",
     }
     steps: list = []
+    # False if deploy() keeps per-run state on the instance; the engine then
+    # deploys with a fresh instance instead of the shared registry one
+    concurrent_deploys: bool = True
 
     @abstractmethod
     async def deploy(
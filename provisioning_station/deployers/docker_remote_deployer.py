@@ -4,9 +4,7 @@ Remote Docker Compose deployment via SSH
 
 import asyncio
 import logging
-import os
 import shlex
-import tempfile
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
@@ -17,7 +15,7 @@ from ..services.remote_pre_check import remote_pre_check
 from ..utils.compose_labels import create_labels, inject_labels_to_compose
 from .action_executor import SSHActionExecutor
 from .base import BaseDeployer
-from .ssh_mixin import SSHMixin
+from .ssh_mixin import SSHMixin, TransferItem
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +35,7 @@ class DockerRemoteDeployer(SSHMixin, BaseDeployer):
     """Deploy Docker Compose applications to remote devices via SSH"""
 
     device_type = "docker_remote"
+    concurrent_deploys = False  # Substitution context lives on the instance
     ui_traits = {
         "connection": "ssh",
         "auto_deploy": True,
@@ -614,127 +613,73 @@ class DockerRemoteDeployer(SSHMixin, BaseDeployer):
             return False
 
     def _transfer_directory(self, client, local_dir: str, remote_dir: str) -> bool:
-        """Transfer entire directory via SCP (blocking, run in thread)"""
-        try:
-            from scp import SCPClient
-
-            with SCPClient(client.get_transport()) as scp:
-                scp.put(local_dir, remote_dir, recursive=True)
-            return True
-        except Exception as e:
-            logger.error(f"Directory transfer failed: {e}")
-            return False
+        """Transfer entire directory, skipping unchanged files (blocking, run in thread)"""
+        target = f"{remote_dir}/{Path(local_dir).name}"
+        return self._sync_files(client, self._directory_items(local_dir, target))
 
     def _transfer_directory_contents(
         self, client, local_dir: str, remote_dir: str
     ) -> bool:
         """Transfer contents of a directory (files and subdirs) directly into remote_dir"""
-        try:
-
-            from scp import SCPClient
-
-            local_path = Path(local_dir)
-            with SCPClient(client.get_transport()) as scp:
-                for item in local_path.iterdir():
-                    remote_path = f"{remote_dir}/{item.name}"
-                    if item.is_file():
-                        scp.put(str(item), remote_path)
-                    elif item.is_dir():
-                        scp.put(str(item), remote_dir, recursive=True)
-            return True
-        except Exception as e:
-            logger.error(f"Directory contents transfer failed: {e}")
-            return False
+        return self._sync_files(client, self._directory_items(local_dir, remote_dir))
 
     def _transfer_compose_with_labels(
         self, client, local_path: str, remote_path: str, labels: Dict[str, str]
     ) -> bool:
         """Transfer compose file with labels injected"""
         try:
-
-            from scp import SCPClient
-
-            # Read and inject labels
             with open(local_path, "r") as f:
                 original_content = f.read()
-
             modified_content = inject_labels_to_compose(original_content, labels)
-
-            # Create a file-like object for SCP
-            with SCPClient(client.get_transport()) as scp:
-                # Write to temp file and upload
-                with tempfile.NamedTemporaryFile(
-                    mode="w", suffix=".yml", delete=False
-                ) as tmp:
-                    tmp.write(modified_content)
-                    tmp_path = tmp.name
-
-                try:
-                    scp.put(tmp_path, remote_path)
-                finally:
-                    os.unlink(tmp_path)
-
-            logger.info(f"Uploaded compose file with labels to {remote_path}")
-            return True
-
         except Exception as e:
             logger.error(f"Compose file transfer with labels failed: {e}")
             return False
 
+        if not self._sync_files(client, [(modified_content.encode(), remote_path)]):
+            return False
+        logger.info(f"Uploaded compose file with labels to {remote_path}")
+        return True
+
     def _transfer_directory_contents_with_labels(
         self, client, local_dir: str, remote_dir: str, labels: Optional[Dict[str, str]]
     ) -> bool:
         """Transfer directory contents, injecting labels into compose files"""
         try:
-            from scp import SCPClient
-
-            local_path = Path(local_dir)
-            compose_names = {
-                "docker-compose.yml",
-                "docker-compose.yaml",
-                "compose.yml",
-                "compose.yaml",
-            }
-
-            with SCPClient(client.get_transport()) as scp:
-                for item in local_path.iterdir():
-                    remote_path = f"{remote_dir}/{item.name}"
-
-                    if item.is_file():
-                        # Check if it's a compose file that needs label injection
-                        if labels and item.name.lower() in compose_names:
-                            # Inject labels
-                            with open(item, "r") as f:
-                                original_content = f.read()
-                            modified_content = inject_labels_to_compose(
-                                original_content, labels
-                            )
-
-                            # Write to temp file and upload
-                            with tempfile.NamedTemporaryFile(
-                                mode="w", suffix=".yml", delete=False
-                            ) as tmp:
-                                tmp.write(modified_content)
-                                tmp_path = tmp.name
-
-                            try:
-                                scp.put(tmp_path, remote_path)
-                            finally:
-                                os.unlink(tmp_path)
-
-                            logger.info(
-                                f"Uploaded compose file with labels: {item.name}"
-                            )
-                        else:
-                            scp.put(str(item), remote_path)
-                    elif item.is_dir():
-                        scp.put(str(item), remote_dir, recursive=True)
-
-            return True
-
+            items = self._directory_items(local_dir, remote_dir, labels)
         except Exception as e:
             logger.error(f"Directory contents transfer with labels failed: {e}")
             return False
+        return self._sync_files(client, items)
+
+    @staticmethod
+    def _directory_items(
+        local_dir: str, remote_dir: str, labels: Optional[Dict[str, str]] = None
+    ) -> List[TransferItem]:
+        """Files under local_dir mapped into remote_dir, with labels injected
+        into top-level compose files"""
+        compose_names = {
+            "docker-compose.yml",
+            "docker-compose.yaml",
+            "compose.yml",
+            "compose.yaml",
+        }
+        local_path = Path(local_dir)
+        items: List[TransferItem] = []
+        for item in sorted(local_path.rglob("*")):
+            if not item.is_file():
+                continue
+            relative = item.relative_to(local_path)
+            remote_path = f"{remote_dir}/{relative.as_posix()}"
+            if (
+                labels
+                and item.parent == local_path
+                and item.name.lower() in compose_names
+            ):
+                content = inject_labels_to_compose(item.read_text(), labels)
+                items.append((content.encode(), remote_path))
+            else:
+                items.append((str(item), remote_path))
+        return items
 
     def _get_compose_container_names(self, compose_file: str) -> List[str]:
         """Extract container_name values from a local compose file"""
@@ -32,6 +32,7 @@ from typing import Any, Callable, Dict, List, Optional
 from uuid import uuid4
 
 from ..models.device import DeviceConfig
+from ..services.ssh_pool import get_ssh_pool
 from .base import BaseDeployer
 
 logger = logging.getLogger(__name__)
@@ -540,15 +541,12 @@ class HAIntegrationDeployer(BaseDeployer):
         use_sudo: bool,
     ):
         """Copy custom_components files to HA via SSH using tar+base64."""
-        import paramiko
-
         domain = self._get_domain(config)
         include_patterns = self._get_include_patterns(config)
         b64_data, _ = self._build_tar(components_dir, include_patterns)
 
         # SSH connect and copy
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client = get_ssh_pool().client()
 
         try:
             await asyncio.to_thread(
@@ -756,14 +754,11 @@ class HAIntegrationDeployer(BaseDeployer):
         config: DeviceConfig,
     ):
         """Copy custom_components into HA Docker container via docker exec."""
-        import paramiko
-
         domain = self._get_domain(config)
         include_patterns = self._get_include_patterns(config)
         b64_data, _ = self._build_tar(components_dir, include_patterns)
 
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client = get_ssh_pool().client()
 
         try:
             await asyncio.to_thread(
@@ -12,6 +12,8 @@ import asyncio
 import fnmatch
 import logging
 import re
+import tempfile
+import threading
 import time
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
@@ -22,6 +24,7 @@ import serial.tools.list_ports
 from ..models.device import DeviceConfig, HimaxModelConfig
 from .action_executor import LocalActionExecutor
 from .base import BaseDeployer
+from .xmodem_worker import SerialWorker, XmodemProgress, packet_count
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +32,9 @@ logger = logging.getLogger(__name__)
 PREAMBLE_HEADER = bytes([0xC0, 0x5A])
 PREAMBLE_FOOTER = bytes([0x5A, 0xC0])
 
+# Transfer progress is reported in steps of this many percent
+PROGRESS_REPORT_STEP = 5
+
 
 class HimaxDeployer(BaseDeployer):
     """Himax WE2 firmware flashing via xmodem protocol"""
@@ -680,149 +686,21 @@ class HimaxDeployer(BaseDeployer):
         progress_callback: Optional[Callable],
         esp32_port: Optional[str] = None,
     ) -> bool:
-        """Flash using xmodem protocol with proper Himax bootloader handshake
-
-        Protocol (matching official xmodem_send.py):
-        1. Hold ESP32 in reset (if SenseCAP Watcher)
-        2. Open serial port with proper settings
-        3. Send "1" repeatedly until "Send data using the xmodem protocol"
-        4. sleep(1), flushInput(), send "1" again
-        5. Let xmodem library handle the 'C' handshake
-        6. Transfer firmware using xmodem
-        7. Wait for reboot prompt and send "y"
-        8. Release ESP32 from reset
-        """
-        esp32_serial = None
-
-        try:
-            # Step 0: Hold ESP32 in reset if this is SenseCAP Watcher
-            if esp32_port:
-                esp32_serial = self._hold_esp32_reset(esp32_port)
-                if esp32_serial:
-                    await self._report_progress(
-                        progress_callback, "flash", 5, "ESP32 held in reset"
-                    )
-                    # Give it a moment to stabilize
-                    await asyncio.sleep(0.5)
-
-            # Step 1: Open Himax serial port with proper settings
-            await self._report_progress(
-                progress_callback, "flash", 10, "Connecting to Himax..."
-            )
-
-            ser = self._open_serial_port(port, baudrate, timeout=60)
-            logger.info(f"Opened Himax port: {port}")
-
-            # Step 2: Wait for bootloader and send "1" to select xmodem download
-            await self._report_progress(
-                progress_callback, "flash", 15, "Waiting for bootloader..."
-            )
-
-            # Use short timeout for rapid polling during bootloader detection
-            ser.timeout = 0.5  # 500ms for each readline
-
-            bootloader_ready = False
-            start_time = time.time()
-            timeout_sec = 30
-
-            while (time.time() - start_time) < timeout_sec:
-                response = ser.readline().strip()
-                if response:
-                    logger.debug(f"Device: {response}")
-                self._send_at_command(ser, "1")
-
-                # Match official script: look for "Send data using the xmodem protocol"
-                if b"Send data using the xmodem protocol" in response:
-                    bootloader_ready = True
-                    break
-
-            # Restore timeout for xmodem transfer
-            ser.timeout = 60
-
-            if not bootloader_ready:
-                logger.error("Timeout waiting for bootloader")
-                ser.close()
-                return False
-
-            await self._report_progress(
-                progress_callback, "flash", 30, "Bootloader ready"
-            )
-
-            # Step 3: Match official script sequence exactly
-            # sleep(1), flushInput(), send '1' again, then start xmodem
-            await asyncio.sleep(1)
-            ser.flushInput()
-            self._send_at_command(ser, "1")
-
-            await self._report_progress(
-                progress_callback, "flash", 40, "Starting transfer..."
-            )
-
-            # Step 4: Transfer firmware using xmodem
-            # Let xmodem library handle the 'C' handshake internally
-            from xmodem import XMODEM
-
-            # Match official xmodem_send.py - don't convert empty reads to None
-            def getc(size, timeout=1):
-                return ser.read(size)
-
-            def putc(data, timeout=1):
-                return ser.write(data)
-
-            modem = XMODEM(getc, putc, mode="xmodem")
-
-            with open(firmware_path, "rb") as f:
-                success = modem.send(f, retry=16, quiet=True)
-
-            if not success:
-                logger.error("Xmodem transfer failed")
-                ser.close()
-                return False
-
-            logger.info("Xmodem transfer complete")
-            await self._report_progress(
-                progress_callback, "flash", 90, "Transfer complete"
-            )
-
-            # Step 5: Wait for reboot prompt and confirm
-            start_time = time.time()
-            timeout_sec = 60
-
-            while (time.time() - start_time) < timeout_sec:
-                response = ser.readline().strip()
-                if response:
-                    logger.debug(f"Device: {response}")
-                # Use shorter pattern to handle split reads
-                if (
-                    b"reboot system? (y)" in response
-                    or b"end file transmission" in response
-                ):
-                    self._send_at_command(ser, "y")
-                    logger.info("Sent reboot confirmation")
-                    break
-
-            ser.close()
+        """Flash a single firmware image using xmodem protocol
 
-            await self._report_progress(
-                progress_callback, "flash", 100, "Flash complete!"
-            )
-
-            return True
-
-        except ImportError:
-            logger.error("xmodem library not installed")
-            await self._report_progress(
-                progress_callback, "flash", 0, "xmodem library not installed"
-            )
-            return False
-        except Exception as e:
-            logger.error(f"xmodem flash failed: {e}")
-            return False
-        finally:
-            # Always release ESP32 from reset
-            if esp32_serial:
-                self._release_esp32_reset(esp32_serial)
-                logger.info("ESP32 released from reset")
+        Same bootloader handshake as the multi-model flow (matching official
+        xmodem_send.py), with no models after the base firmware.
+        """
+        return await self._flash_with_xmodem_multimodel(
+            port=port,
+            firmware_path=firmware_path,
+            baudrate=baudrate,
+            protocol="xmodem",
+            models=[],
+            base_path="",
+            progress_callback=progress_callback,
+            esp32_port=esp32_port,
+        )
 
     @classmethod
     def list_available_ports(cls) -> List[Dict[str, Any]]:
@@ -884,10 +762,13 @@ class HimaxDeployer(BaseDeployer):
 
         return preamble
 
-    async def _wait_for_reboot_prompt(
-        self, ser: serial.Serial, timeout: int = 60
+    def _wait_for_reboot_prompt(
+        self,
+        ser: serial.Serial,
+        timeout: int = 60,
+        cancelled: Optional[threading.Event] = None,
     ) -> bool:
-        """Wait for the reboot confirmation prompt from bootloader
+        """Wait for the reboot confirmation prompt from bootloader (blocking)
 
         Use shorter readline timeout to allow multiple retries within overall timeout.
         """
@@ -898,6 +779,8 @@ class HimaxDeployer(BaseDeployer):
 
         try:
             while (time.time() - start) < timeout:
+                if cancelled and cancelled.is_set():
+                    return False
                 retry_count += 1
                 try:
                     response = ser.readline()
@@ -935,8 +818,13 @@ class HimaxDeployer(BaseDeployer):
 
         return False
 
-    async def _wait_for_bootloader(self, ser: serial.Serial, timeout: int = 30) -> bool:
-        """Wait for bootloader and enter xmodem download mode
+    def _wait_for_bootloader(
+        self,
+        ser: serial.Serial,
+        timeout: int = 30,
+        cancelled: Optional[threading.Event] = None,
+    ) -> bool:
+        """Wait for bootloader and enter xmodem download mode (blocking)
 
         Matches official xmodem_send.py behavior:
         - Use readline() with timeout
@@ -954,6 +842,8 @@ class HimaxDeployer(BaseDeployer):
 
         try:
             while (time.time() - start_time) < timeout:
+                if cancelled and cancelled.is_set():
+                    return False
                 response = ser.readline().strip()
                 if response:
                     logger.debug(f"Device: {response}")
@@ -969,48 +859,79 @@ class HimaxDeployer(BaseDeployer):
         logger.error("Timeout waiting for bootloader")
         return False
 
-    def _prepare_for_xmodem(self, ser: serial.Serial):
+    def _prepare_for_xmodem(self, ser: serial.Serial, command: str = "1"):
         """Prepare serial port for xmodem transfer (matching official script)
 
-        After detecting bootloader ready:
+        After detecting bootloader ready (or a reboot prompt):
         1. sleep(1)
         2. flushInput()
-        3. send '1' command
+        3. send '1' command ('n' to continue with the next file)
         Then let xmodem library handle the 'C' handshake
         """
         time.sleep(1)
         ser.flushInput()
-        self._send_at_command(ser, "1")
+        self._send_at_command(ser, command)
 
     def _resolve_model_path(self, model: HimaxModelConfig, base_path: str) -> str:
-        """Resolve model file path (local or download)"""
+        """Resolve model file path.
+
+        Model URLs are downloaded into the shared download cache before the
+        deployment starts (``resolve_remote_assets``), so ``model.path`` is
+        a local file here.
+        """
         local_path = Path(base_path) / model.path
         if local_path.exists():
             return str(local_path)
 
-        # If URL is provided, download the model
-        if model.url:
-            return self._download_model(model)
-
         raise FileNotFoundError(f"Model file not found: {model.path}")
 
-    def _download_model(self, model: HimaxModelConfig) -> str:
-        """Download model file to temporary directory with caching"""
-        import tempfile
-        import urllib.request
-
-        cache_dir = Path(tempfile.gettempdir()) / "himax_models"
-        cache_dir.mkdir(exist_ok=True)
+    async def _send_xmodem(
+        self,
+        worker: SerialWorker,
+        modem,
+        path: str,
+        packet_size: int,
+        progress_callback: Optional[Callable],
+        start: int,
+        end: int,
+        label: str,
+    ) -> bool:
+        """Send one file via xmodem on the worker thread
 
-        filename = Path(model.path).name
-        cache_path = cache_dir / filename
+        Packet progress is mapped onto the flash step between ``start`` and
+        ``end`` and reported every few percent.
+        """
+        total = packet_count(Path(path).stat().st_size, packet_size)
+        channel = XmodemProgress(asyncio.get_running_loop())
+        last_reported = -PROGRESS_REPORT_STEP
+
+        async def on_update(sent: int, errors: int):
+            nonlocal last_reported
+            percent = min(100, sent * 100 // total)
+            if percent < last_reported + PROGRESS_REPORT_STEP and percent < 100:
+                return
+            last_reported = percent
+            message = f"{label}: {percent}% ({sent}/{total} packets"
+            message += f", {errors} retries)" if errors else ")"
+            await self._report_progress(
+                progress_callback,
+                "flash",
+                start + (end - start) * percent // 100,
+                message,
+            )
 
-        if not cache_path.exists():
-            logger.info(f"Downloading model: {model.url}")
-            urllib.request.urlretrieve(model.url, cache_path)
-            # TODO: Validate checksum if provided
+        def send() -> bool:
+            with open(path, "rb") as stream:
+                return modem.send(
+                    stream, retry=16, quiet=True, callback=channel.callback
+                )
 
-        return str(cache_path)
+        transfer = asyncio.ensure_future(worker.run(send))
+        try:
+            return await channel.follow(transfer, on_update)
+        except asyncio.CancelledError:
+            transfer.cancel()
+            raise
 
     async def _flash_with_xmodem_multimodel(
         self,
@@ -1035,14 +956,20 @@ class HimaxDeployer(BaseDeployer):
            c. Wait for reboot prompt, send 'n\r'
            d. Send model file via xmodem
         5. After all models, send 'y\r' to reboot
+
+        All serial I/O runs on a dedicated worker thread for this port, so
+        the event loop stays free and other ports can flash concurrently.
         """
         packet_size = 128 if protocol == "xmodem" else 1024
+        firmware_end = 35 if models else 90
+        worker = SerialWorker(port)
         esp32_serial = None
+        ser = None
 
         try:
             # Step 0: Hold ESP32 in reset if this is SenseCAP Watcher
             if esp32_port:
-                esp32_serial = self._hold_esp32_reset(esp32_port)
+                esp32_serial = await worker.run(self._hold_esp32_reset, esp32_port)
                 if esp32_serial:
                     await self._report_progress(
                         progress_callback, "flash", 5, "ESP32 held in reset"
@@ -1054,7 +981,7 @@ class HimaxDeployer(BaseDeployer):
                 progress_callback, "flash", 10, "Connecting to Himax..."
             )
 
-            ser = self._open_serial_port(port, baudrate, timeout=60)
+            ser = await worker.run(self._open_serial_port, port, baudrate, 60)
             logger.info(f"Opened Himax port: {port}")
 
             # Step 2: Wait for bootloader
@@ -1062,8 +989,9 @@ class HimaxDeployer(BaseDeployer):
                 progress_callback, "flash", 15, "Waiting for bootloader..."
             )
 
-            if not await self._wait_for_bootloader(ser, timeout=30):
-                ser.close()
+            if not await worker.run(
+                self._wait_for_bootloader, ser, 30, worker.cancelled
+            ):
                 return False
 
             await self._report_progress(
@@ -1071,7 +999,7 @@ class HimaxDeployer(BaseDeployer):
             )
 
             # Step 3: Prepare for xmodem (matching official script sequence)
-            self._prepare_for_xmodem(ser)
+            await worker.run(self._prepare_for_xmodem, ser)
 
             await self._report_progress(
                 progress_callback, "flash", 25, "Starting base firmware transfer..."
@@ -1083,194 +1011,199 @@ class HimaxDeployer(BaseDeployer):
 
             # Match official xmodem_send.py - don't convert empty reads to None
             def getc(size, timeout=1):
+                worker.check_cancelled()
                 return ser.read(size)
 
             def putc(data, timeout=1):
+                worker.check_cancelled()
                 return ser.write(data)
 
             modem = XMODEM(getc, putc, mode=protocol)
 
-            # Run blocking xmodem in thread to allow WebSocket updates
-            def send_firmware():
-                with open(firmware_path, "rb") as f:
-                    return modem.send(f, retry=16, quiet=True)
-
-            if not await asyncio.to_thread(send_firmware):
+            if not await self._send_xmodem(
+                worker,
+                modem,
+                firmware_path,
+                packet_size,
+                progress_callback,
+                25,
+                firmware_end,
+                "Base firmware",
+            ):
                 logger.error("Base firmware xmodem transfer failed")
-                ser.close()
                 return False
 
             logger.info("Base firmware transfer complete")
             await self._report_progress(
-                progress_callback, "flash", 35, "Base firmware complete"
+                progress_callback, "flash", firmware_end, "Base firmware complete"
             )
 
             # Step 5: Flash each model
-            if models:
-                total_models = len(models)
-                for idx, model in enumerate(models):
-                    progress_base = 35 + int((idx / total_models) * 55)
-                    model_name = model.name_zh if model.name_zh else model.name
-
-                    await self._report_progress(
-                        progress_callback,
-                        "flash",
-                        progress_base,
-                        f"Flashing model {idx + 1}/{total_models}: {model_name}",
-                    )
+            total_models = len(models)
+            for idx, model in enumerate(models):
+                progress_base = 35 + int((idx / total_models) * 55)
+                progress_next = 35 + int(((idx + 1) / total_models) * 55)
+                model_name = model.name_zh if model.name_zh else model.name
 
-                    # Resolve model path first to fail fast
-                    try:
-                        model_path = self._resolve_model_path(model, base_path)
-                        logger.info(f"Model file resolved: {model_path}")
-                    except FileNotFoundError as e:
-                        logger.error(f"Model file not found: {e}")
-                        await self._report_progress(
-                            progress_callback,
-                            "flash",
-                            progress_base,
-                            f"Model file not found: {model.path}",
-                        )
-                        ser.close()
-                        return False
+                await self._report_progress(
+                    progress_callback,
+                    "flash",
+                    progress_base,
+                    f"Flashing model {idx + 1}/{total_models}: {model_name}",
+                )
 
-                    # Wait for reboot prompt
+                # Resolve model path first to fail fast
+                try:
+                    model_path = await worker.run(
+                        self._resolve_model_path, model, base_path
+                    )
+                    logger.info(f"Model file resolved: {model_path}")
+                except FileNotFoundError as e:
+                    logger.error(f"Model file not found: {e}")
                     await self._report_progress(
                         progress_callback,
                         "flash",
                         progress_base,
-                        f"[{idx + 1}/{total_models}] Waiting for reboot prompt...",
+                        f"Model file not found: {model.path}",
                     )
-                    if not await self._wait_for_reboot_prompt(ser, timeout=60):
-                        logger.error(
-                            f"Timeout waiting for reboot prompt before model {model.id}"
-                        )
-                        await self._report_progress(
-                            progress_callback,
-                            "flash",
-                            progress_base,
-                            "Timeout waiting for reboot prompt",
-                        )
-                        ser.close()
-                        return False
-
-                    # Send 'n' to continue (not reboot) - matching official script
-                    await asyncio.sleep(1)
-                    ser.flushInput()
-                    self._send_at_command(ser, "n")
-                    logger.info(f"Continuing to flash model: {model.id}")
+                    return False
 
-                    # Send preamble - xmodem library handles handshake
+                # Wait for reboot prompt
+                await self._report_progress(
+                    progress_callback,
+                    "flash",
+                    progress_base,
+                    f"[{idx + 1}/{total_models}] Waiting for reboot prompt...",
+                )
+                if not await worker.run(
+                    self._wait_for_reboot_prompt, ser, 60, worker.cancelled
+                ):
+                    logger.error(
+                        f"Timeout waiting for reboot prompt before model {model.id}"
+                    )
                     await self._report_progress(
                         progress_callback,
                         "flash",
                         progress_base,
-                        f"[{idx + 1}/{total_models}] Sending preamble @ {model.flash_address}...",
-                    )
-
-                    # Generate preamble packet with flash address
-                    preamble = self._generate_preamble(
-                        model.flash_address, model.offset, packet_size
-                    )
-                    logger.info(
-                        f"Sending preamble for {model.id} at {model.flash_address}"
+                        "Timeout waiting for reboot prompt",
                     )
-                    logger.info(f"Preamble bytes: {preamble[:20].hex()}...")
-
-                    import os
-                    import tempfile
+                    return False
 
-                    preamble_file = os.path.join(
-                        tempfile.gettempdir(), f"_temp_model_{idx}_preamble.bin"
-                    )
-                    with open(preamble_file, "wb") as f:
-                        f.write(preamble)
+                # Send 'n' to continue (not reboot) - matching official script
+                await worker.run(self._prepare_for_xmodem, ser, "n")
+                logger.info(f"Continuing to flash model: {model.id}")
 
-                    # Run blocking xmodem in thread to allow WebSocket updates
-                    def send_preamble():
-                        with open(preamble_file, "rb") as stream:
-                            return modem.send(stream, retry=16)
+                # Send preamble - xmodem library handles handshake
+                await self._report_progress(
+                    progress_callback,
+                    "flash",
+                    progress_base,
+                    f"[{idx + 1}/{total_models}] Sending preamble @ {model.flash_address}...",
+                )
 
-                    if not await asyncio.to_thread(send_preamble):
-                        logger.error(f"Failed to send preamble for model {model.id}")
-                        await self._report_progress(
-                            progress_callback,
-                            "flash",
-                            progress_base,
-                            "Failed to send preamble",
-                        )
-                        ser.close()
-                        return False
+                # Generate preamble packet with flash address
+                preamble = self._generate_preamble(
+                    model.flash_address, model.offset, packet_size
+                )
+                logger.info(f"Sending preamble for {model.id} at {model.flash_address}")
+                logger.info(f"Preamble bytes: {preamble[:20].hex()}...")
 
-                    # Small delay for device to process preamble
-                    logger.debug("Preamble sent, waiting for device response...")
-                    await asyncio.sleep(0.5)
+                # Unique per flash: ports flash concurrently on their own workers
+                with tempfile.NamedTemporaryFile(
+                    prefix=f"_temp_model_{idx}_", suffix="_preamble.bin", delete=False
+                ) as f:
+                    f.write(preamble)
+                    preamble_file = f.name
 
-                    # Debug: check if there's any data waiting
-                    if ser.in_waiting:
-                        logger.debug(
-                            f"Data waiting after preamble: {ser.in_waiting} bytes"
-                        )
+                try:
+                    preamble_sent = await self._send_xmodem(
+                        worker,
+                        modem,
+                        preamble_file,
+                        packet_size,
+                        None,
+                        progress_base,
+                        progress_base,
+                        "Preamble",
+                    )
+                finally:
+                    Path(preamble_file).unlink(missing_ok=True)
 
-                    # Wait for reboot prompt again
+                if not preamble_sent:
+                    logger.error(f"Failed to send preamble for model {model.id}")
                     await self._report_progress(
                         progress_callback,
                         "flash",
                         progress_base,
-                        f"[{idx + 1}/{total_models}] Preamble sent, waiting...",
+                        "Failed to send preamble",
                     )
-                    if not await self._wait_for_reboot_prompt(ser, timeout=60):
-                        logger.error(
-                            f"Timeout waiting for reboot prompt after preamble for model {model.id}"
-                        )
-                        await self._report_progress(
-                            progress_callback,
-                            "flash",
-                            progress_base,
-                            "Timeout after preamble",
-                        )
-                        ser.close()
-                        return False
+                    return False
 
-                    # Send 'n' to continue - matching official script
-                    await asyncio.sleep(1)
-                    ser.flushInput()
-                    self._send_at_command(ser, "n")
+                # Small delay for device to process preamble
+                logger.debug("Preamble sent, waiting for device response...")
+                await asyncio.sleep(0.5)
 
-                    # Send model file - xmodem library handles handshake
+                # Wait for reboot prompt again
+                await self._report_progress(
+                    progress_callback,
+                    "flash",
+                    progress_base,
+                    f"[{idx + 1}/{total_models}] Preamble sent, waiting...",
+                )
+                if not await worker.run(
+                    self._wait_for_reboot_prompt, ser, 60, worker.cancelled
+                ):
+                    logger.error(
+                        f"Timeout waiting for reboot prompt after preamble for model {model.id}"
+                    )
                     await self._report_progress(
                         progress_callback,
                         "flash",
                         progress_base,
-                        f"[{idx + 1}/{total_models}] Sending model file...",
+                        "Timeout after preamble",
                     )
+                    return False
 
-                    logger.info(f"Sending model file: {model_path}")
+                # Send 'n' to continue - matching official script
+                await worker.run(self._prepare_for_xmodem, ser, "n")
 
-                    # Run blocking xmodem in thread to allow WebSocket updates
-                    def send_model():
-                        with open(model_path, "rb") as f:
-                            return modem.send(f, retry=16, quiet=True)
+                # Send model file - xmodem library handles handshake
+                await self._report_progress(
+                    progress_callback,
+                    "flash",
+                    progress_base,
+                    f"[{idx + 1}/{total_models}] Sending model file...",
+                )
 
-                    if not await asyncio.to_thread(send_model):
-                        logger.error(f"Failed to send model {model.id}")
-                        await self._report_progress(
-                            progress_callback,
-                            "flash",
-                            progress_base,
-                            "Failed to send model file",
-                        )
-                        ser.close()
-                        return False
+                logger.info(f"Sending model file: {model_path}")
 
-                    logger.info(f"Model {model.id} transfer complete")
+                if not await self._send_xmodem(
+                    worker,
+                    modem,
+                    model_path,
+                    packet_size,
+                    progress_callback,
+                    progress_base,
+                    progress_next,
+                    f"[{idx + 1}/{total_models}] {model_name}",
+                ):
+                    logger.error(f"Failed to send model {model.id}")
+                    await self._report_progress(
+                        progress_callback,
+                        "flash",
+                        progress_base,
+                        "Failed to send model file",
+                    )
+                    return False
 
-            # Step 6: Send 'y' to reboot after all models - matching official script
-            if await self._wait_for_reboot_prompt(ser, timeout=60):
-                self._send_at_command(ser, "y")
-                logger.info("Sent reboot confirmation")
+                logger.info(f"Model {model.id} transfer complete")
 
-            ser.close()
+            # Step 6: Send 'y' to reboot - matching official script
+            if await worker.run(
+                self._wait_for_reboot_prompt, ser, 60, worker.cancelled
+            ):
+                await worker.run(self._send_at_command, ser, "y")
+                logger.info("Sent reboot confirmation")
 
             await self._report_progress(
                 progress_callback, "flash", 100, "Flash complete!"
@@ -1290,11 +1223,18 @@ class HimaxDeployer(BaseDeployer):
                 progress_callback, "flash", 0, f"Model file not found: {e}"
             )
             return False
+        except asyncio.CancelledError:
+            # Unblock the worker so the port and ESP32 are released promptly
+            worker.abort(ser)
+            raise
         except Exception as e:
             logger.error(f"Multi-model flash failed: {e}")
             return False
         finally:
+            if ser is not None:
+                await worker.run(ser.close)
             # Always release ESP32 from reset
             if esp32_serial:
-                self._release_esp32_reset(esp32_serial)
+                await worker.run(self._release_esp32_reset, esp32_serial)
                 logger.info("ESP32 released from reset")
+            worker.close()
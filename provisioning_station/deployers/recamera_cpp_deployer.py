@@ -23,9 +23,11 @@ from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
 from ..models.device import DeviceConfig
+from ..services.ssh_pool import get_ssh_pool
 from ..utils.recamera_ssh import _is_system_service, _parse_svc_name
 from .action_executor import SSHActionExecutor
 from .base import BaseDeployer
+from .ssh_mixin import SSHMixin
 
 logger = logging.getLogger(__name__)
 
@@ -96,7 +98,7 @@ DEFAULT_CONFLICT_SERVICES = [
 ]
 
 
-class ReCameraCppDeployer(BaseDeployer):
+class ReCameraCppDeployer(SSHMixin, BaseDeployer):
     """Deploy C++ applications to reCamera devices.
 
     This deployer handles:
@@ -177,15 +179,13 @@ class ReCameraCppDeployer(BaseDeployer):
 
         try:
             import paramiko
-            from scp import SCPClient
 
             # Step 1: Connect
             await self._report_progress(
                 progress_callback, "connect", 0, f"Connecting to {host}..."
             )
 
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            client = get_ssh_pool().client()
 
             try:
                 await asyncio.to_thread(
@@ -273,17 +273,30 @@ class ReCameraCppDeployer(BaseDeployer):
                     config, binary_config, connection
                 )
 
-                with SCPClient(client.get_transport()) as scp:
-                    total_files = len(files_to_transfer)
-                    for i, (local_path, remote_path) in enumerate(files_to_transfer):
-                        progress = int((i / total_files) * 100)
-                        await self._report_progress(
+                loop = asyncio.get_running_loop()
+
+                def on_file(index: int, total: int, remote_path: str):
+                    asyncio.run_coroutine_threadsafe(
+                        self._report_progress(
                             progress_callback,
                             "transfer",
-                            progress,
-                            f"Uploading {Path(local_path).name}...",
-                        )
-                        await asyncio.to_thread(scp.put, local_path, remote_path)
+                            index * 100 // total,
+                            f"Uploading {Path(remote_path).name}...",
+                        ),
+                        loop,
+                    )
+
+                # Unchanged files left in /tmp by the last deploy are skipped
+                if not await asyncio.to_thread(
+                    self._sync_files,
+                    client,
+                    files_to_transfer,
+                    on_file=on_file,
+                ):
+                    await self._report_progress(
+                        progress_callback, "transfer", 0, "File transfer failed"
+                    )
+                    return False
 
                 await self._report_progress(
                     progress_callback, "transfer", 100, "Files transferred"
@@ -26,6 +26,7 @@ from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
 from ..models.device import DeviceConfig, NodeRedModuleConfig
+from ..services.ssh_pool import get_ssh_pool
 from ..utils.recamera_ssh import (
     build_sudo_cmd,
     exec_ssh_cmd,
@@ -102,6 +103,7 @@ class ReCameraNodeRedDeployer(NodeRedDeployer):
     """
 
     device_type = "recamera_nodered"
+    concurrent_deploys = False  # Discovered SSCMA client ID lives on the instance
     ui_traits = {
         "connection": "ssh",
         "auto_deploy": True,
@@ -192,10 +194,7 @@ class ReCameraNodeRedDeployer(NodeRedDeployer):
             return True
 
         try:
-            import paramiko
-
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            client = get_ssh_pool().client()
 
             try:
                 await asyncio.to_thread(
@@ -612,11 +611,8 @@ class ReCameraNodeRedDeployer(NodeRedDeployer):
     @asynccontextmanager
     async def _ssh_connect(self, connection: Dict[str, Any]):
         """Create a temporary SSH connection from connection parameters."""
-        import paramiko
-
         connection = self._normalize_connection(connection)
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client = get_ssh_pool().client()
         recamera_ip = connection.get("recamera_ip")
         await asyncio.to_thread(
             client.connect,
@@ -876,10 +872,7 @@ class ReCameraNodeRedDeployer(NodeRedDeployer):
             return
 
         try:
-            import paramiko
-
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            client = get_ssh_pool().client()
 
             try:
                 await asyncio.to_thread(
@@ -8,14 +8,83 @@ Provides shared SSH utilities used by multiple deployers:
 
 Extracted to eliminate code duplication of SSH connection creation,
 command execution, file transfer, and checksum verification.
+
+File transfers are deltas: the remote copies are hashed with one batched
+``sha256sum`` and only missing or changed files are uploaded, in a single
+(optionally gzipped) tar stream, with SCP as the fallback.
 """
 
+import gzip
 import hashlib
+import io
 import logging
-from typing import Dict, Optional
+import os
+import posixpath
+import re
+import shlex
+import tarfile
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# A file to upload: local path or generated content, and its remote path
+TransferItem = Tuple[Union[str, bytes], str]
+
+# Called as on_file(index, total, remote_path) before each changed file is sent
+FileCallback = Callable[[int, int, str], None]
+
+# Longest quoted path list passed to one remote sha256sum
+HASH_BATCH_CHARS = 32 * 1024
+
+# gzip level for tar uploads: models and binaries barely compress, so
+# favour speed on the weak CPUs at both ends
+COMPRESS_LEVEL = 1
+
+# path -> (size, mtime_ns, sha256) of local files already hashed
+_local_hashes: Dict[str, Tuple[int, int, str]] = {}
+_local_hashes_lock = threading.Lock()
+
+
+def local_sha256(path: str) -> str:
+    """sha256 of a local file, remembered until its size or mtime changes"""
+    st = os.stat(path)
+    with _local_hashes_lock:
+        cached = _local_hashes.get(path)
+    if cached and cached[:2] == (st.st_size, st.st_mtime_ns):
+        return cached[2]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    digest = h.hexdigest()
+    with _local_hashes_lock:
+        _local_hashes[path] = (st.st_size, st.st_mtime_ns, digest)
+    return digest
+
+
+def parse_sha256sum(output: str) -> Dict[str, str]:
+    """Parse ``sha256sum`` output into ``{path: digest}``.
+
+    Handles GNU coreutils escaping (a leading backslash, with ``\\n`` and
+    ``\\\\`` in the name) of paths containing newlines or backslashes.
+    """
+    hashes = {}
+    for line in output.splitlines():
+        escaped = line.startswith("\\")
+        if escaped:
+            line = line[1:]
+        digest, sep, name = line[:64], line[64:66], line[66:]
+        if not re.fullmatch(r"[0-9a-fA-F]{64}", digest) or sep not in ("  ", " *"):
+            continue
+        if escaped:
+            name = re.sub(
+                r"\\(.)", lambda m: "\n" if m.group(1) == "n" else m.group(1), name
+            )
+        hashes[name] = digest.lower()
+    return hashes
+
 
 class SSHMixin:
     """Mixin providing common SSH operations for deployers."""
@@ -29,30 +98,30 @@ class SSHMixin:
         key_file: Optional[str],
         timeout: int,
     ):
-        """Create SSH connection (blocking, run in thread)"""
+        """Borrow a pooled SSH connection (blocking, run in thread).
+
+        ``client.close()`` returns the connection to the shared pool.
+        """
         import paramiko
 
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        from ..services.ssh_pool import get_ssh_pool
 
         try:
             if key_file:
-                client.connect(
+                return get_ssh_pool().connect(
                     hostname=host,
                     port=port,
                     username=username,
                     key_filename=key_file,
                     timeout=timeout,
                 )
-            else:
-                client.connect(
-                    hostname=host,
-                    port=port,
-                    username=username,
-                    password=password,
-                    timeout=timeout,
-                )
-            return client
+            return get_ssh_pool().connect(
+                hostname=host,
+                port=port,
+                username=username,
+                password=password,
+                timeout=timeout,
+            )
         except paramiko.AuthenticationException:
             logger.error(f"SSH authentication failed for {username}@{host}")
             return None
@@ -67,17 +136,187 @@ class SSHMixin:
             return None
 
     def _transfer_file(self, client, local_path: str, remote_path: str) -> bool:
-        """Transfer file via SCP (blocking, run in thread)"""
+        """Transfer file unless the remote copy is identical (blocking, run in thread)"""
+        return self._sync_files(client, [(local_path, remote_path)])
+
+    def _sync_files(
+        self,
+        client,
+        items: List[TransferItem],
+        compress: bool = True,
+        on_file: Optional[FileCallback] = None,
+    ) -> bool:
+        """Upload the files whose remote copy is missing or differs.
+
+        Blocking, run in thread. A remote path ending in ``/`` is a
+        directory and keeps the local file name. Uploaded files are checked
+        against their local hash when the remote host has ``sha256sum``.
+        ``on_file`` is called from this thread as each changed file starts.
+        """
         try:
-            from scp import SCPClient
+            local: Dict[str, Tuple[Union[str, bytes], str]] = {}
+            for source, remote in items:
+                if remote.endswith("/") and isinstance(source, str):
+                    remote += os.path.basename(source)
+                digest = (
+                    hashlib.sha256(source).hexdigest()
+                    if isinstance(source, bytes)
+                    else local_sha256(source)
+                )
+                local[remote] = (source, digest)
+
+            remote_hashes = self._remote_sha256(client, local) or {}
+            changed = [
+                (source, remote)
+                for remote, (source, digest) in local.items()
+                if remote_hashes.get(remote) != digest
+            ]
+            logger.info(
+                f"Uploading {len(changed)} of {len(local)} files "
+                f"({len(local) - len(changed)} unchanged on remote)"
+            )
+            if not changed:
+                return True
 
-            with SCPClient(client.get_transport()) as scp:
-                scp.put(local_path, remote_path)
+            if not self._upload_tar(client, changed, compress, on_file):
+                logger.info("tar upload unavailable, falling back to SCP")
+                self._upload_scp(client, changed, on_file)
+
+            uploaded = self._remote_sha256(client, [r for _, r in changed])
+            if uploaded is not None:
+                bad = [r for _, r in changed if uploaded.get(r) != local[r][1]]
+                if bad:
+                    logger.error(f"Remote checksum mismatch after upload: {bad}")
+                    return False
             return True
         except Exception as e:
             logger.error(f"File transfer failed: {e}")
             return False
 
+    def _remote_sha256(
+        self, client, remote_paths: Iterable[str]
+    ) -> Optional[Dict[str, str]]:
+        """sha256 of remote files, with one ``sha256sum`` per batch of paths.
+
+        Missing files are left out. Returns None when the remote host
+        cannot hash files (no ``sha256sum``).
+        """
+        batches: List[List[str]] = [[]]
+        length = 0
+        for path in remote_paths:
+            quoted = shlex.quote(path)
+            if batches[-1] and length + len(quoted) > HASH_BATCH_CHARS:
+                batches.append([])
+                length = 0
+            batches[-1].append(quoted)
+            length += len(quoted) + 1
+
+        hashes: Dict[str, str] = {}
+        for batch in batches:
+            if not batch:
+                continue
+            # Exits non-zero when some files are missing; the rest are listed
+            exit_code, stdout, _ = self._exec_with_timeout(
+                client, f"sha256sum -- {' '.join(batch)} 2>/dev/null", 300
+            )
+            if exit_code in (-1, 126, 127):
+                logger.info("Remote host cannot hash files; uploading all of them")
+                return None
+            hashes.update(parse_sha256sum(stdout))
+        return hashes
+
+    def _upload_tar(
+        self,
+        client,
+        items: List[TransferItem],
+        compress: bool,
+        on_file: Optional[FileCallback] = None,
+    ) -> bool:
+        """Stream files to the remote host as one tar archive per extraction
+        root (``/`` for absolute paths, the login directory otherwise)."""
+        sent = 0
+        groups: Dict[str, List[TransferItem]] = {}
+        for source, remote in items:
+            groups.setdefault("/" if remote.startswith("/") else ".", []).append(
+                (source, remote)
+            )
+
+        for root, group in groups.items():
+            unpack = "gzip -dc | tar -xf -" if compress else "tar -xf -"
+            channel = client.get_transport().open_session()
+            try:
+                channel.exec_command(f"{unpack} -C {shlex.quote(root)}")
+                with channel.makefile("wb") as raw:
+                    stream = (
+                        gzip.GzipFile(
+                            fileobj=raw, mode="wb", compresslevel=COMPRESS_LEVEL
+                        )
+                        if compress
+                        else raw
+                    )
+                    with tarfile.open(fileobj=stream, mode="w|") as tar:
+                        for source, remote in group:
+                            if on_file:
+                                on_file(sent, len(items), remote)
+                            sent += 1
+                            self._add_to_tar(tar, source, remote.lstrip("/"))
+                    if compress:
+                        stream.close()
+                channel.shutdown_write()
+                exit_code = channel.recv_exit_status()
+                if exit_code != 0:
+                    stderr = (
+                        channel.makefile_stderr("rb").read().decode(errors="replace")
+                    )
+                    logger.warning(f"Remote tar exited {exit_code}: {stderr[:200]}")
+                    return False
+            except Exception as e:
+                logger.warning(f"tar upload failed: {e}")
+                return False
+            finally:
+                channel.close()
+        return True
+
+    @staticmethod
+    def _add_to_tar(tar: tarfile.TarFile, source: Union[str, bytes], arcname: str):
+        if isinstance(source, bytes):
+            info = tarfile.TarInfo(arcname)
+            info.size = len(source)
+            info.mode = 0o644
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(source))
+            return
+        with open(source, "rb") as f:
+            # From the open file, so symlinks are sent as content, as with SCP
+            info = tar.gettarinfo(arcname=arcname, fileobj=f)
+            # Files belong to whoever extracts them, also as with SCP
+            info.uid = info.gid = 0
+            info.uname = info.gname = ""
+            tar.addfile(info, f)
+
+    def _upload_scp(
+        self,
+        client,
+        items: List[TransferItem],
+        on_file: Optional[FileCallback] = None,
+    ):
+        """Upload files one by one via SCP, creating parent directories"""
+        from scp import SCPClient
+
+        parents = sorted({posixpath.dirname(r) for _, r in items} - {""})
+        if parents:
+            self._exec_with_timeout(
+                client, "mkdir -p " + " ".join(shlex.quote(p) for p in parents), 30
+            )
+        with SCPClient(client.get_transport()) as scp:
+            for i, (source, remote) in enumerate(items):
+                if on_file:
+                    on_file(i, len(items), remote)
+                if isinstance(source, bytes):
+                    scp.putfo(io.BytesIO(source), remote)
+                else:
+                    scp.put(source, remote)
+
     def _exec_with_timeout(
         self,
         client,
@@ -111,8 +350,7 @@ class SSHMixin:
         """Verify checksum of remote file matches local file"""
         try:
             if "sha256" in expected:
-                with open(local_path, "rb") as f:
-                    local_hash = hashlib.sha256(f.read()).hexdigest()
+                local_hash = local_sha256(local_path)
 
                 expected_hash = expected["sha256"]
 
@@ -141,8 +379,11 @@ class SSHMixin:
                 return True
 
             elif "md5" in expected:
+                md5 = hashlib.md5()
                 with open(local_path, "rb") as f:
-                    local_hash = hashlib.md5(f.read()).hexdigest()
+                    for block in iter(lambda: f.read(1024 * 1024), b""):
+                        md5.update(block)
+                local_hash = md5.hexdigest()
 
                 expected_hash = expected["md5"]
 
@@ -0,0 +1,110 @@
+"""
+Off-loop serial worker for XMODEM flashing.
+
+XMODEM transfers and bootloader handshakes are long runs of blocking serial
+I/O. A SerialWorker gives one flash its own thread, so every pyserial call
+for that port runs there in order while the event loop keeps serving
+progress updates, WebSocket logs and other requests. Flashes on different
+ports each get their own worker and run side by side.
+
+Per-packet progress crosses back to the loop through an XmodemProgress
+channel, which keeps only the latest counters so a fast transfer cannot
+flood the loop with callbacks.
+"""
+
+import asyncio
+import functools
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+
+class SerialWorker:
+    """Dedicated thread running the blocking serial I/O of one flash"""
+
+    def __init__(self, port: str):
+        self.port = port
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"xmodem-{port.rsplit('/', 1)[-1]}"
+        )
+        self.cancelled = threading.Event()
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call on the worker thread and await its result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def check_cancelled(self):
+        """Raise on the worker thread once the flash was aborted"""
+        if self.cancelled.is_set():
+            raise RuntimeError(f"Flash on {self.port} cancelled")
+
+    def abort(self, ser=None):
+        """Abort the flash: a blocked read or write returns early and the
+        next ``check_cancelled`` raises"""
+        self.cancelled.set()
+        if ser is not None:
+            for cancel in ("cancel_read", "cancel_write"):
+                try:
+                    getattr(ser, cancel)()
+                except Exception:
+                    pass
+
+    def close(self):
+        """Let the thread exit once its current call returns"""
+        self._executor.shutdown(wait=False)
+
+
+class XmodemProgress:
+    """Thread-safe channel for XMODEM packet counters.
+
+    ``callback`` is handed to ``XMODEM.send`` and runs on the worker thread;
+    ``updates()`` yields ``(sent, errors)`` on the event loop whenever the
+    counters changed, skipping intermediate values it had no time to see.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._lock = threading.Lock()
+        self._latest: Optional[Tuple[int, int]] = None
+        self._wakeup = asyncio.Event()
+
+    def callback(self, total_packets: int, success_count: int, error_count: int):
+        with self._lock:
+            first = self._latest is None
+            self._latest = (success_count, error_count)
+        if first:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _take(self) -> Optional[Tuple[int, int]]:
+        with self._lock:
+            latest, self._latest = self._latest, None
+        return latest
+
+    async def follow(
+        self,
+        transfer: "asyncio.Future[Any]",
+        on_update: Callable[[int, int], Awaitable[None]],
+    ) -> Any:
+        """Deliver counter updates until the transfer finishes, then return
+        its result"""
+        while not transfer.done():
+            waiter = asyncio.ensure_future(self._wakeup.wait())
+            await asyncio.wait({transfer, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            waiter.cancel()
+            self._wakeup.clear()
+            latest = self._take()
+            if latest:
+                await on_update(*latest)
+        latest = self._take()
+        if latest:
+            await on_update(*latest)
+        return transfer.result()
+
+
+def packet_count(size: int, packet_size: int) -> int:
+    """Number of XMODEM packets needed for ``size`` bytes"""
+    return max(1, math.ceil(size / packet_size))
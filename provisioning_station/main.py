@@ -29,6 +29,7 @@ from .config import settings
 from .middleware.auth import ApiKeyAuthMiddleware
 from .routers import (
     api_keys,
+    asset_bundles,
     deployments,
     device_management,
     devices,
@@ -41,9 +42,12 @@ from .routers import (
     websocket,
 )
 from .services.api_key_manager import get_api_key_manager
+from .services.docker_device_manager import docker_device_manager
 from .services.mqtt_bridge import get_mqtt_bridge, is_mqtt_available
 from .services.serial_camera_service import get_serial_camera_manager
 from .services.solution_manager import solution_manager
+from .services.solution_watcher import get_solution_watcher
+from .services.ssh_pool import get_ssh_pool
 from .services.stream_proxy import get_stream_proxy
 
 # Global flag to track if cleanup has been performed
@@ -72,6 +76,11 @@ def _sync_cleanup():
     except Exception as e:
         logger.debug(f"Sync cleanup error: {e}")
 
+    try:
+        get_api_key_manager().flush()
+    except Exception as e:
+        logger.debug(f"API key flush error: {e}")
+
     _cleanup_done = True
 
 
@@ -96,12 +105,40 @@ async def _async_cleanup():
     except Exception as e:
         logger.debug(f"MQTT bridge cleanup error: {e}")
 
+    try:
+        await get_solution_watcher().stop()
+    except Exception as e:
+        logger.debug(f"Solution watcher cleanup error: {e}")
+
     try:
         get_serial_camera_manager().close_all()
         logger.debug("Serial camera sessions closed")
     except Exception as e:
         logger.debug(f"Serial camera cleanup error: {e}")
 
+    try:
+        get_ssh_pool().close_all()
+        logger.debug("SSH connection pool closed")
+    except Exception as e:
+        logger.debug(f"SSH pool cleanup error: {e}")
+
+    try:
+        docker_device_manager.shutdown()
+    except Exception as e:
+        logger.debug(f"Docker device manager cleanup error: {e}")
+
+    try:
+        from .services.resource_resolver import resource_resolver
+
+        await resource_resolver.aclose()
+    except Exception as e:
+        logger.debug(f"Resource resolver cleanup error: {e}")
+
+    try:
+        await get_api_key_manager().stop_flusher()
+    except Exception as e:
+        logger.debug(f"API key flush error: {e}")
+
     _cleanup_done = True
     logger.debug("Async cleanup completed")
 
@@ -128,7 +165,29 @@ async def lifespan(app: FastAPI):
 
     # Load solutions
     await solution_manager.load_solutions()
-    print(f"Loaded {len(solution_manager.solutions)} solutions")
+    stats = solution_manager.load_stats
+    print(
+        f"Loaded {len(solution_manager.solutions)} solutions in "
+        f"{stats.get('total_seconds', 0.0):.2f}s "
+        f"({stats.get('from_snapshot', 0)} from snapshot)"
+    )
+    parse_seconds = stats.get("parse_seconds") or {}
+    if parse_seconds:
+        slowest = max(parse_seconds, key=parse_seconds.get)
+        logger.info(
+            "Solution parse time: avg %.1f ms, slowest %s (%.1f ms)",
+            sum(parse_seconds.values()) / len(parse_seconds) * 1000,
+            slowest,
+            parse_seconds[slowest] * 1000,
+        )
+
+    # Hot-reload solution files while authors edit them
+    if settings.watch_solutions:
+        await get_solution_watcher().start()
+
+    # Persist API key usage periodically; idle until a key is used, and
+    # API access can be enabled at runtime via /api/keys/toggle
+    get_api_key_manager().start_flusher()
 
     # Auto-create default API key if api_enabled and no keys exist
     if settings.api_enabled:
@@ -196,6 +255,7 @@ app.include_router(docker_devices.router)
 app.include_router(restore.router)
 app.include_router(serial_camera.router)
 app.include_router(api_keys.router)
+app.include_router(asset_bundles.router)
 
 # Serve static frontend files
 _default_frontend_dir = Path(__file__).resolve().parent.parent / "frontend" / "dist"
@@ -257,6 +317,20 @@ async def health_check():
     }
 
 
+async def _run_asset_bundle_command(args) -> dict:
+    """Export or import an offline asset bundle (CLI)"""
+    from .services.asset_bundle import export_bundle, import_bundle
+    from .services.resource_resolver import resource_resolver
+
+    try:
+        if args.command == "import-assets":
+            return await import_bundle(Path(args.bundle))
+        await solution_manager.load_solutions()
+        return await export_bundle(Path(args.output), args.solutions or None)
+    finally:
+        await resource_resolver.aclose()
+
+
 def main():
     """CLI entry point"""
     import argparse
@@ -286,6 +360,23 @@ def main():
     delete_key_parser = subparsers.add_parser("delete-key", help="Delete an API key")
     delete_key_parser.add_argument("name", help="Name of the key to delete")
 
+    # Subcommand: export-assets
+    export_parser = subparsers.add_parser(
+        "export-assets", help="Bundle remote solution assets for offline sites"
+    )
+    export_parser.add_argument(
+        "solutions", nargs="*", help="Solution IDs (default: all solutions)"
+    )
+    export_parser.add_argument(
+        "-o", "--output", default="asset-bundle.tar", help="Bundle file to write"
+    )
+
+    # Subcommand: import-assets
+    import_parser = subparsers.add_parser(
+        "import-assets", help="Seed the download cache from an asset bundle"
+    )
+    import_parser.add_argument("bundle", help="Bundle file to import")
+
     # Server arguments
     parser.add_argument(
         "--port",
@@ -351,6 +442,20 @@ def main():
             print(f"Key '{args.name}' not found")
         return
 
+    elif args.command in ("export-assets", "import-assets"):
+        if args.solutions_dir:
+            solution_manager.solutions_dir = Path(args.solutions_dir)
+        try:
+            summary = asyncio.run(_run_asset_bundle_command(args))
+        except (ValueError, RuntimeError, OSError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(
+            f"{summary['assets']} assets ({summary['blobs']} files) for "
+            f"{len(summary['solutions'])} solutions"
+        )
+        return
+
     # Sync --api-enabled flag to settings so middleware sees it
     if args.api_enabled and not settings.api_enabled:
         os.environ["PS_API_ENABLED"] = "true"
@@ -36,6 +36,7 @@ LOCALHOST_ONLY_PREFIXES = (
     "/api/device-management",
     "/api/preview",
     "/api/keys",
+    "/api/asset-bundle",
 )
 
 _LOCALHOST_ADDRS = frozenset({"127.0.0.1", "::1", "testclient"})
@@ -5,9 +5,9 @@ API request/response models
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from .deployment import DeploymentStatus, StepStatus
+from .deployment import DeploymentStatus, FleetFailurePolicy, StepStatus
 
 
 class SolutionSummary(BaseModel):
@@ -154,6 +154,52 @@ class DeploymentStatusResponse(BaseModel):
     overall_progress: int = 0
 
 
+class FleetTargetRequest(BaseModel):
+    """One target of a fleet deployment"""
+
+    label: Optional[str] = None  # Defaults to the first host in the connections
+    device_connections: Dict[str, Dict[str, Any]] = {}
+
+
+class StartFleetDeploymentRequest(BaseModel):
+    """Request to roll one solution/preset out to many targets"""
+
+    solution_id: str
+    preset_id: Optional[str] = None
+    targets: List[FleetTargetRequest] = Field(..., min_length=1)
+    options: Dict[str, Any] = {}
+    selected_devices: List[str] = []
+    concurrency: Optional[int] = Field(None, ge=1, le=64)  # Default from settings
+    failure_policy: FleetFailurePolicy = FleetFailurePolicy.CONTINUE
+
+
+class FleetTargetStatus(BaseModel):
+    """Fleet target status"""
+
+    index: int
+    label: str
+    status: DeploymentStatus
+    deployment_id: Optional[str] = None
+    progress: int = 0
+    error: Optional[str] = None
+
+
+class FleetStatusResponse(BaseModel):
+    """Fleet deployment status response"""
+
+    id: str
+    solution_id: str
+    preset_id: Optional[str] = None
+    status: DeploymentStatus
+    failure_policy: FleetFailurePolicy
+    concurrency: int
+    started_at: datetime
+    completed_at: Optional[datetime] = None
+    counts: Dict[str, int] = {}
+    overall_progress: int = 0
+    targets: List[FleetTargetStatus] = []
+
+
 class LogEntryResponse(BaseModel):
     """Log entry for WebSocket"""
 
@@ -53,6 +53,8 @@ class DeviceDeployment(BaseModel):
     completed_at: Optional[datetime] = None
     current_step: Optional[str] = None
     connection: Optional[Dict[str, Any]] = None
+    depends_on: List[str] = []  # Device IDs that must complete first
+    parallel: bool = False  # Start alongside the previous device
     steps: List[StepStatus] = []
     error: Optional[str] = None
     logs: List[LogEntry] = []
@@ -68,6 +70,7 @@ class Deployment(BaseModel):
     completed_at: Optional[datetime] = None
     devices: List[DeviceDeployment] = []
     logs: List[LogEntry] = []
+    fleet_id: Optional[str] = None  # Set when started as part of a fleet
 
     def add_log(
         self,
@@ -122,3 +125,43 @@ class Deployment(BaseModel):
                         step.completed_at = datetime.utcnow()
                     break
             device.current_step = step_id if status == "running" else None
+
+
+class FleetFailurePolicy(str, Enum):
+    """What a fleet does when one target fails"""
+
+    CONTINUE = "continue"  # Keep deploying the remaining targets
+    STOP = "stop"  # Start no further targets after the first failure
+
+
+class FleetTarget(BaseModel):
+    """One connection set within a fleet deployment"""
+
+    index: int
+    label: str
+    status: DeploymentStatus = DeploymentStatus.PENDING
+    deployment_id: Optional[str] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
+class FleetDeployment(BaseModel):
+    """The same solution/preset rolled out to many targets"""
+
+    id: str
+    solution_id: str
+    preset_id: Optional[str] = None
+    status: DeploymentStatus = DeploymentStatus.PENDING
+    failure_policy: FleetFailurePolicy = FleetFailurePolicy.CONTINUE
+    concurrency: int = 1
+    started_at: datetime = Field(default_factory=datetime.utcnow)
+    completed_at: Optional[datetime] = None
+    targets: List[FleetTarget] = []
+
+    def counts(self) -> Dict[str, int]:
+        """Number of targets in each status"""
+        counts = {status.value: 0 for status in DeploymentStatus}
+        for target in self.targets:
+            counts[target.status.value] += 1
+        return counts
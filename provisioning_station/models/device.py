@@ -2,7 +2,7 @@
 Device configuration models
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -534,6 +534,10 @@ class DeviceConfig(BaseModel):
     # User inputs for interactive deployments
     user_inputs: List[UserInputConfig] = []
 
+    # Scheduling within multi-device deployments (overrides the guide step)
+    depends_on: List[str] = []  # Device IDs that must complete first
+    parallel: Optional[bool] = None  # Start alongside the previous device
+
     pre_checks: List[PreCheck] = []
     steps: List[DeploymentStep] = []
     post_deployment: PostDeploymentConfig = Field(default_factory=PostDeploymentConfig)
@@ -613,6 +617,12 @@ class DeviceConfig(BaseModel):
         ctx = self._build_when_context(connection)
         base = self.base_path
 
+        # Download every remote asset concurrently first; the resolves
+        # below then hit the cache (or join a download still running)
+        await resolver.prefetch(
+            self.remote_assets(resolver, connection), progress_callback
+        )
+
         # --- firmware ---
         if self.firmware:
             src = self.firmware.source
@@ -673,6 +683,47 @@ class DeviceConfig(BaseModel):
             for action in self.actions.before + self.actions.after:
                 await self._resolve_action(action, resolver, base)
 
+    def remote_assets(
+        self, resolver, connection=None, every_variant: bool = False
+    ) -> List[Tuple[str, Optional[Dict[str, str]]]]:
+        """All ``(url, checksum)`` pairs resolve_remote_assets would download.
+
+        Mirrors the fields resolve_remote_assets visits, including skipping
+        models whose ``when`` condition is not met. With *every_variant*,
+        models are included whatever the user picks (for asset bundles).
+        """
+        ctx = self._build_when_context(connection)
+        refs: List[Tuple[Optional[str], Optional[Dict[str, str]]]] = []
+
+        if self.firmware:
+            refs.append((self.firmware.source.path, self.firmware.source.checksum))
+            refs += [(p.file, None) for p in self.firmware.flash_config.partitions]
+            refs += [(m.path, m.checksum) for m in self.firmware.flash_config.models]
+        if self.package:
+            refs.append((self.package.source.path, self.package.source.checksum))
+        if self.binary:
+            if self.binary.deb_package:
+                dp = self.binary.deb_package
+                refs.append((dp.path, dp.checksum))
+            refs += [
+                (m.path, m.checksum)
+                for m in self.binary.models
+                if every_variant or self._check_when(m.when, ctx)
+            ]
+        if self.docker:
+            refs.append((self.docker.compose_file, None))
+        if self.docker_remote:
+            refs.append((self.docker_remote.compose_file, None))
+        if self.nodered:
+            refs.append((self.nodered.flow_file, None))
+        if self.actions:
+            for action in self.actions.before + self.actions.after:
+                refs.append((action.script, None))
+                if action.copy_files:
+                    refs.append((action.copy_files.src, None))
+
+        return [(url, checksum) for url, checksum in refs if resolver.is_url(url)]
+
     @staticmethod
     async def _resolve_action(action: "ActionConfig", resolver, base: str) -> None:
         """Resolve remote references inside a single action."""
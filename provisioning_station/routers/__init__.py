@@ -3,6 +3,7 @@ API routers
 """
 
 from . import (
+    asset_bundles,
     deployments,
     device_management,
     devices,
@@ -22,4 +23,5 @@ __all__ = [
     "device_management",
     "preview",
     "docker_devices",
+    "asset_bundles",
 ]
@@ -0,0 +1,66 @@
+"""
+Offline asset bundle endpoints.
+
+Export the remote assets of solutions into one archive, and import such an
+archive into the download cache of an offline station. Localhost-only
+(enforced by auth middleware).
+"""
+
+import asyncio
+import shutil
+import uuid
+from pathlib import Path
+from typing import List, Optional
+
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+
+from ..config import settings
+from ..services.asset_bundle import export_bundle, import_bundle
+
+router = APIRouter(prefix="/api/asset-bundle", tags=["Asset Bundles"])
+
+
+def _staging_path() -> Path:
+    # Bundles can be gigabytes: stage them next to the cache, not in /tmp
+    path = settings.cache_dir / "bundles"
+    path.mkdir(parents=True, exist_ok=True)
+    return path / f"{uuid.uuid4().hex}.tar"
+
+
+@router.get("")
+async def download_bundle(
+    solution: Optional[List[str]] = Query(
+        None, description="Solution IDs to include (default: all)"
+    ),
+):
+    """Build and download an asset bundle"""
+    path = _staging_path()
+    try:
+        await export_bundle(path, solution)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    return FileResponse(
+        path,
+        media_type="application/x-tar",
+        filename="asset-bundle.tar",
+        background=BackgroundTask(path.unlink, missing_ok=True),
+    )
+
+
+@router.post("")
+async def upload_bundle(file: UploadFile = File(...)):
+    """Import an asset bundle into the download cache"""
+    path = _staging_path()
+    try:
+        with open(path, "wb") as f:
+            await asyncio.to_thread(shutil.copyfileobj, file.file, f, 1024 * 1024)
+        return await import_bundle(path)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        path.unlink(missing_ok=True)
@@ -12,13 +12,17 @@ from ..models.api import (
     DeploymentSummaryResponse,
     DeviceDeploymentStatus,
     DeviceSummaryInfo,
+    FleetStatusResponse,
+    FleetTargetStatus,
     StartDeploymentRequest,
+    StartFleetDeploymentRequest,
     StepSummary,
     StepSummaryInfo,
 )
 from ..models.deployment import DeploymentStatus
 from ..services.deployment_engine import deployment_engine
 from ..services.deployment_history import deployment_history
+from ..services.fleet_deployment import fleet_manager
 from ..services.solution_manager import solution_manager
 
 router = APIRouter(prefix="/api/deployments", tags=["deployments"])
@@ -46,6 +50,77 @@ async def start_deployment(request: StartDeploymentRequest):
     }
 
 
+@router.post("/fleet")
+async def start_fleet_deployment(request: StartFleetDeploymentRequest):
+    """Roll one solution/preset out to many targets"""
+    solution = solution_manager.get_solution(request.solution_id)
+    if not solution:
+        raise HTTPException(status_code=404, detail="Solution not found")
+
+    fleet_id = await fleet_manager.start_fleet(
+        solution=solution,
+        targets=[t.model_dump() for t in request.targets],
+        selected_devices=request.selected_devices,
+        options=request.options,
+        preset_id=request.preset_id,
+        concurrency=request.concurrency,
+        failure_policy=request.failure_policy,
+    )
+
+    return {
+        "fleet_id": fleet_id,
+        "targets": len(request.targets),
+        "message": "Fleet deployment started",
+    }
+
+
+@router.get("/fleet/{fleet_id}", response_model=FleetStatusResponse)
+async def get_fleet_status(fleet_id: str):
+    """Get aggregated fleet deployment status"""
+    fleet = fleet_manager.get_fleet(fleet_id)
+    if not fleet:
+        raise HTTPException(status_code=404, detail="Fleet not found")
+
+    return FleetStatusResponse(
+        id=fleet.id,
+        solution_id=fleet.solution_id,
+        preset_id=fleet.preset_id,
+        status=fleet.status,
+        failure_policy=fleet.failure_policy,
+        concurrency=fleet.concurrency,
+        started_at=fleet.started_at,
+        completed_at=fleet.completed_at,
+        counts=fleet.counts(),
+        overall_progress=fleet_manager.overall_progress(fleet),
+        targets=[
+            FleetTargetStatus(
+                index=t.index,
+                label=t.label,
+                status=t.status,
+                deployment_id=t.deployment_id,
+                progress=fleet_manager.target_progress(t),
+                error=t.error,
+            )
+            for t in fleet.targets
+        ],
+    )
+
+
+@router.post("/fleet/{fleet_id}/cancel")
+async def cancel_fleet_deployment(fleet_id: str):
+    """Cancel a running fleet deployment"""
+    fleet = fleet_manager.get_fleet(fleet_id)
+    if not fleet:
+        raise HTTPException(status_code=404, detail="Fleet not found")
+
+    if fleet.status != DeploymentStatus.RUNNING:
+        raise HTTPException(status_code=400, detail="Fleet is not running")
+
+    await fleet_manager.cancel_fleet(fleet_id)
+
+    return {"message": "Fleet deployment cancelled"}
+
+
 @router.get("/{deployment_id}", response_model=DeploymentStatusResponse)
 async def get_deployment_status(deployment_id: str):
     """Get current deployment status"""
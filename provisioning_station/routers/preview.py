@@ -9,13 +9,16 @@ Handles:
 
 import asyncio
 import logging
+import re
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
-from ..services.mqtt_bridge import get_mqtt_bridge, is_mqtt_available
+from ..config import settings
+from ..services.hls_window import HlsWindow
+from ..services.mqtt_bridge import MessageBuffer, get_mqtt_bridge, is_mqtt_available
 from ..services.stream_proxy import get_stream_proxy
 
 logger = logging.getLogger(__name__)
@@ -32,6 +35,7 @@ class StartStreamRequest(BaseModel):
 
     rtsp_url: str
     stream_id: Optional[str] = None
+    low_latency: bool = True  # LL-HLS from memory instead of .ts files on disk
 
 
 class StartStreamResponse(BaseModel):
@@ -49,6 +53,7 @@ class StartMjpegRequest(BaseModel):
     stream_id: Optional[str] = None
     fps: int = 10
     quality: int = 5
+    profile: str = "full"  # full | thumbnail | passthrough | auto
 
 
 class StartMjpegResponse(BaseModel):
@@ -95,6 +100,7 @@ async def start_stream(request: StartStreamRequest):
         stream_id = await proxy.start_stream(
             rtsp_url=request.rtsp_url,
             stream_id=request.stream_id,
+            low_latency=request.low_latency,
         )
 
         return StartStreamResponse(
@@ -128,6 +134,7 @@ async def start_mjpeg_stream(request: StartMjpegRequest):
             stream_id=request.stream_id,
             fps=request.fps,
             quality=request.quality,
+            profile=request.profile,
         )
 
         return StartMjpegResponse(
@@ -135,6 +142,8 @@ async def start_mjpeg_stream(request: StartMjpegRequest):
             mjpeg_url=f"/api/preview/mjpeg/{stream_id}",
             status="starting",
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except RuntimeError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
@@ -143,12 +152,22 @@ async def start_mjpeg_stream(request: StartMjpegRequest):
 
 
 @router.get("/mjpeg/{stream_id}")
-async def get_mjpeg_stream(stream_id: str):
+async def get_mjpeg_stream(
+    stream_id: str,
+    max_fps: Optional[float] = Query(
+        None, gt=0, le=60, description="Highest frame rate sent to this viewer"
+    ),
+    adaptive: bool = Query(
+        False, description="Lower resolution and quality while the link is congested"
+    ),
+):
     """
     MJPEG streaming endpoint.
 
     Returns a multipart/x-mixed-replace stream of JPEG frames.
     Set this URL as the src of an <img> element for live video.
+    Slow viewers (or ones passing ``max_fps``) skip to the newest frame;
+    with ``adaptive`` they are also moved to a smaller encode of the camera.
     """
     proxy = get_stream_proxy()
     info = proxy.get_stream_info(stream_id)
@@ -160,7 +179,7 @@ async def get_mjpeg_stream(stream_id: str):
         raise HTTPException(status_code=400, detail="Stream is not in MJPEG mode")
 
     return StreamingResponse(
-        proxy.get_mjpeg_frames(stream_id),
+        proxy.get_mjpeg_frames(stream_id, max_fps=max_fps, adaptive=adaptive),
         media_type="multipart/x-mixed-replace; boundary=frame",
         headers={
             "Cache-Control": "no-cache, no-store, must-revalidate",
@@ -190,21 +209,78 @@ async def get_stream_status(stream_id: str):
         raise HTTPException(status_code=404, detail=f"Stream {stream_id} not found")
 
     return StreamStatusResponse(
-        stream_id=info.stream_id,
+        stream_id=stream_id,
         status=info.status,
         error=info.error,
     )
 
 
+HLS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Cache-Control": "no-cache",
+}
+_HLS_PART = re.compile(r"part(\d+)\.(\d+)\.m4s")
+_HLS_SEGMENT = re.compile(r"seg(\d+)\.m4s")
+
+
+async def _serve_hls_from_memory(
+    window: HlsWindow,
+    filename: str,
+    msn: Optional[int],
+    part: Optional[int],
+) -> Response:
+    """Serve an LL-HLS playlist, init segment, segment or part from RAM"""
+    if filename == "index.m3u8":
+        if part is not None and msn is None:
+            raise HTTPException(status_code=400, detail="_HLS_part needs _HLS_msn")
+        # Blocking playlist reload: answer once the requested part exists
+        if msn is not None and not await window.wait_for(
+            msn, part, window.blocking_timeout
+        ):
+            raise HTTPException(status_code=503, detail="Part not available yet")
+        return Response(
+            window.playlist(),
+            media_type="application/vnd.apple.mpegurl",
+            headers=HLS_HEADERS,
+        )
+
+    data = None
+    if filename == "init.mp4":
+        data = window.init
+    elif match := _HLS_PART.fullmatch(filename):
+        msn, index = int(match.group(1)), int(match.group(2))
+        # Preload hints name the next part; hold the request until it exists
+        await window.wait_for(msn, index, window.blocking_timeout)
+        data = window.get_part(msn, index)
+    elif match := _HLS_SEGMENT.fullmatch(filename):
+        data = window.get_segment(int(match.group(1)))
+
+    if data is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    return Response(data, media_type="video/mp4", headers=HLS_HEADERS)
+
+
 @router.get("/stream/{stream_id}/{filename}")
-async def get_stream_file(stream_id: str, filename: str):
+async def get_stream_file(
+    stream_id: str,
+    filename: str,
+    hls_msn: Optional[int] = Query(None, alias="_HLS_msn", ge=0),
+    hls_part: Optional[int] = Query(None, alias="_HLS_part", ge=0),
+):
     """
     Serve HLS stream files (playlist and segments).
 
-    This endpoint serves the m3u8 playlist and .ts segment files.
+    Low-latency streams are served from memory: the playlist (with blocking
+    reload via ``_HLS_msn``/``_HLS_part``), ``init.mp4``, ``seg<N>.m4s`` and
+    ``part<N>.<i>.m4s``. Disk-based streams serve the m3u8 playlist and .ts
+    segment files.
     """
     proxy = get_stream_proxy()
 
+    window = proxy.get_hls_window(stream_id)
+    if window is not None:
+        return await _serve_hls_from_memory(window, filename, hls_msn, hls_part)
+
     # Update last access time
     info = proxy.get_stream_info(stream_id)
     if info:
@@ -247,6 +323,20 @@ async def list_streams():
 # ============================================
 
 
+def _mqtt_buffer(options: dict) -> MessageBuffer:
+    """Bounded message buffer for one WebSocket.
+
+    ``options`` may override the configured ``policy`` and ``max_rate``.
+    Raises ValueError for an unknown policy.
+    """
+    return MessageBuffer(
+        asyncio.get_running_loop(),
+        maxsize=settings.preview_mqtt_buffer_size,
+        policy=options.get("policy") or settings.preview_mqtt_drop_policy,
+        max_rate=float(options.get("max_rate", settings.preview_mqtt_max_rate)),
+    )
+
+
 @router.websocket("/ws/mqtt")
 async def mqtt_websocket(websocket: WebSocket):
     """
@@ -259,9 +349,14 @@ async def mqtt_websocket(websocket: WebSocket):
         "port": 1883,
         "topic": "inference/results",
         "username": "optional",
-        "password": "optional"
+        "password": "optional",
+        "policy": "drop_oldest | latest_per_topic (optional)",
+        "max_rate": 10  (optional, messages/s, 0 = unlimited)
     }
 
+    Messages wait in a bounded per-socket buffer; when the browser falls
+    behind, the policy drops the oldest or keeps the newest value per topic.
+
     Server sends messages:
     {
         "type": "mqtt_message",
@@ -291,16 +386,7 @@ async def mqtt_websocket(websocket: WebSocket):
 
     bridge = get_mqtt_bridge()
     subscription_id = None
-    message_queue: asyncio.Queue = asyncio.Queue()
-
-    async def mqtt_callback(message):
-        """Called when MQTT message is received"""
-        await message_queue.put(
-            {
-                "type": "mqtt_message",
-                **message,
-            }
-        )
+    buffer: Optional[MessageBuffer] = None
 
     try:
         # Wait for connection request
@@ -317,11 +403,12 @@ async def mqtt_websocket(websocket: WebSocket):
 
         # Subscribe to MQTT topic
         try:
+            buffer = _mqtt_buffer(data)
             subscription_id = await bridge.subscribe(
                 broker=data["broker"],
                 port=data.get("port", 1883),
                 topic=data["topic"],
-                callback=mqtt_callback,
+                callback=buffer,
                 username=data.get("username"),
                 password=data.get("password"),
             )
@@ -345,16 +432,12 @@ async def mqtt_websocket(websocket: WebSocket):
 
         # Forward messages to WebSocket
         while True:
-            try:
-                # Check for MQTT messages with timeout
-                message = await asyncio.wait_for(
-                    message_queue.get(), timeout=30.0  # Send ping every 30 seconds
-                )
-                await websocket.send_json(message)
-
-            except asyncio.TimeoutError:
+            message = await buffer.get(timeout=30.0)  # Send ping every 30 seconds
+            if message is not None:
+                await websocket.send_json({"type": "mqtt_message", **message})
+            else:
                 # Send ping to keep connection alive
-                await websocket.send_json({"type": "ping"})
+                await websocket.send_json({"type": "ping", **buffer.stats()})
 
                 # Check subscription status
                 info = bridge.get_subscription_info(subscription_id)
@@ -374,7 +457,7 @@ async def mqtt_websocket(websocket: WebSocket):
     finally:
         # Clean up subscription
         if subscription_id:
-            await bridge.unsubscribe(subscription_id, mqtt_callback)
+            await bridge.unsubscribe(subscription_id, buffer)
 
 
 # ============================================
@@ -398,7 +481,9 @@ async def preview_websocket(websocket: WebSocket, preview_id: str):
         "mqtt": {
             "broker": "...",
             "port": 1883,
-            "topic": "..."
+            "topic": "...",
+            "policy": "drop_oldest | latest_per_topic (optional)",
+            "max_rate": 10  (optional, messages/s)
         }
     }
 
@@ -414,15 +499,7 @@ async def preview_websocket(websocket: WebSocket, preview_id: str):
 
     stream_id = None
     subscription_id = None
-    message_queue: asyncio.Queue = asyncio.Queue()
-
-    async def mqtt_callback(message):
-        await message_queue.put(
-            {
-                "type": "mqtt_message",
-                **message,
-            }
-        )
+    buffer: Optional[MessageBuffer] = None
 
     try:
         # Wait for start command
@@ -461,16 +538,24 @@ async def preview_websocket(websocket: WebSocket, preview_id: str):
                     }
                 )
 
+        # MQTT messages and stream status share one bounded buffer
+        mqtt_config = data.get("mqtt") or {}
+        try:
+            buffer = _mqtt_buffer(mqtt_config)
+        except ValueError as e:
+            await websocket.send_json({"type": "mqtt_error", "message": str(e)})
+            mqtt_config = {}
+            buffer = _mqtt_buffer(mqtt_config)
+
         # Subscribe to MQTT if configured
-        mqtt_config = data.get("mqtt")
-        if mqtt_config and mqtt_config.get("broker") and mqtt_config.get("topic"):
+        if mqtt_config.get("broker") and mqtt_config.get("topic"):
             if is_mqtt_available():
                 try:
                     subscription_id = await bridge.subscribe(
                         broker=mqtt_config["broker"],
                         port=mqtt_config.get("port", 1883),
                         topic=mqtt_config["topic"],
-                        callback=mqtt_callback,
+                        callback=buffer,
                         username=mqtt_config.get("username"),
                         password=mqtt_config.get("password"),
                     )
@@ -503,7 +588,7 @@ async def preview_websocket(websocket: WebSocket, preview_id: str):
                 if stream_id:
                     info = proxy.get_stream_info(stream_id)
                     if info:
-                        await message_queue.put(
+                        buffer.offer(
                             {
                                 "type": "stream_status",
                                 "status": info.status,
@@ -516,11 +601,11 @@ async def preview_websocket(websocket: WebSocket, preview_id: str):
         # Main message loop
         try:
             while True:
-                try:
-                    message = await asyncio.wait_for(message_queue.get(), timeout=30.0)
-                    await websocket.send_json(message)
-                except asyncio.TimeoutError:
-                    await websocket.send_json({"type": "ping"})
+                message = await buffer.get(timeout=30.0)
+                if message is not None:
+                    await websocket.send_json({"type": "mqtt_message", **message})
+                else:
+                    await websocket.send_json({"type": "ping", **buffer.stats()})
         finally:
             status_task.cancel()
 
@@ -533,7 +618,7 @@ async def preview_websocket(websocket: WebSocket, preview_id: str):
         if stream_id:
             await proxy.stop_stream(stream_id)
         if subscription_id:
-            await bridge.unsubscribe(subscription_id, mqtt_callback)
+            await bridge.unsubscribe(subscription_id, buffer)
 
 
 # ============================================
@@ -554,6 +639,9 @@ async def get_preview_status():
             "active_subscriptions": (
                 len(get_mqtt_bridge().subscriptions) if is_mqtt_available() else 0
             ),
+            "subscriptions": (
+                get_mqtt_bridge().list_subscriptions() if is_mqtt_available() else []
+            ),
         },
     }
 
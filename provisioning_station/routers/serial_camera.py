@@ -58,6 +58,11 @@ class AddFaceRequest(BaseModel):
     embedding: List[float] = []
 
 
+class BulkImportRequest(BaseModel):
+    faces: List[AddFaceRequest]
+    replace: bool = False
+
+
 class RenameFaceRequest(BaseModel):
     new_name: str
 
@@ -67,6 +72,7 @@ class StartEnrollmentRequest(BaseModel):
     duration: float = 5.0
     min_samples: int = 3
     min_confidence: float = 0.5
+    allow_duplicate: bool = False
 
 
 # ============================================
@@ -223,10 +229,9 @@ async def delete_session(session_id: str):
 async def websocket_frames(ws: WebSocket, session_id: str):
     """Stream camera frames via WebSocket.
 
-    Uses threading.Queue from serial reader thread, polled with asyncio.sleep.
+    The serial reader thread pushes frames onto this client's ClientQueue on
+    the event loop; the socket sleeps until one arrives (pinging after 10s).
     """
-    import queue as queue_mod
-
     manager = get_serial_camera_manager()
     session = manager.get_session(session_id)
 
@@ -249,18 +254,12 @@ async def websocket_frames(ws: WebSocket, session_id: str):
         )
 
     try:
-        idle_count = 0
         while True:
-            try:
-                msg = q.get_nowait()
+            msg = await q.get(timeout=10)
+            if msg is None:
+                await ws.send_json({"type": "ping"})
+            else:
                 await ws.send_text(msg)
-                idle_count = 0
-            except queue_mod.Empty:
-                idle_count += 1
-                if idle_count > 200:  # ~10s at 50ms poll → send ping
-                    await ws.send_json({"type": "ping"})
-                    idle_count = 0
-                await asyncio.sleep(0.05)  # 50ms poll interval
     except WebSocketDisconnect:
         pass
     except Exception as e:
@@ -301,7 +300,8 @@ async def debug_session(session_id: str):
         }
 
     with session._clients_lock:
-        client_info = [{"id": id(q), "qsize": q.qsize()} for q in session._clients]
+        client_info = [q.stats() for q in session._clients]
+    client = _get_crud_client(session_id)
 
     return {
         "session_id": session_id,
@@ -310,8 +310,11 @@ async def debug_session(session_id: str):
         "fps": session._fps,
         "frame_count": session._frame_count,
         "clients": client_info,
+        "dropped_frames": sum(c["dropped"] for c in client_info),
+        "parser": session._parser.stats(),
         "enrollment_active": session.enrollment_state is not None,
         "callbacks": len(session._frame_callbacks),
+        "crud_pacing": client.pacer.stats() if client else None,
     }
 
 
@@ -378,6 +381,62 @@ async def add_face(session_id: str, req: AddFaceRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/sessions/{session_id}/faces/bulk")
+async def export_faces(session_id: str):
+    """Export all faces, with embeddings where the host knows them."""
+    client = _get_crud_client(session_id)
+    if not client:
+        raise HTTPException(
+            status_code=404, detail="No database connection for this session"
+        )
+
+    try:
+        return await client.export_faces()
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="Device did not respond")
+    except Exception as e:
+        logger.exception("export_faces failed session=%s", session_id)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/sessions/{session_id}/faces/bulk")
+async def import_faces(session_id: str, req: BulkImportRequest):
+    """Import many faces in one serial transaction.
+
+    Progress is pushed to the session's WebSocket clients as
+    ``{"type": "bulk_progress", done, total, name, ok}`` events.
+    """
+    client = _get_crud_client(session_id)
+    if not client:
+        raise HTTPException(
+            status_code=404, detail="No database connection for this session"
+        )
+
+    session = get_serial_camera_manager().get_session(session_id)
+
+    def on_progress(done: int, total: int, name: str, entry: dict):
+        if session:
+            session.publish(
+                {
+                    "type": "bulk_progress",
+                    "done": done,
+                    "total": total,
+                    "name": name,
+                    "ok": entry["ok"],
+                }
+            )
+
+    try:
+        return await client.import_faces(
+            [f.model_dump() for f in req.faces],
+            replace=req.replace,
+            on_progress=on_progress,
+        )
+    except Exception as e:
+        logger.exception("import_faces failed session=%s", session_id)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/sessions/{session_id}/faces/{name}")
 async def delete_face(session_id: str, name: str):
     """Delete a face from the database."""
@@ -440,6 +499,13 @@ async def start_enrollment(session_id: str, req: StartEnrollmentRequest):
     if existing and existing.active:
         existing.cancel()
 
+    # Pull the enrolled faces once so duplicates can be detected on the host
+    if not client.gallery.synced:
+        try:
+            await client.list_faces()
+        except Exception as e:
+            logger.warning("Could not load face gallery for %s: %s", session_id, e)
+
     enrollment = FaceEnrollmentSession(
         camera_session=session,
         crud_client=client,
@@ -447,6 +513,8 @@ async def start_enrollment(session_id: str, req: StartEnrollmentRequest):
         duration=req.duration,
         min_samples=req.min_samples,
         min_confidence=req.min_confidence,
+        gallery=client.gallery,
+        allow_duplicate=req.allow_duplicate,
     )
     enrollment.start()
     _enrollments[session_id] = enrollment
@@ -477,6 +545,7 @@ async def enrollment_status(session_id: str):
             "name": enrollment.name,
             "samples": len(enrollment._samples),
             "min_samples": enrollment.min_samples,
+            "quality": enrollment.quality(),
         }
 
     # Enrollment finished - check result
@@ -499,6 +568,7 @@ async def enrollment_status(session_id: str):
                 "completed": True,
                 "name": enrollment.name,
                 "samples_collected": result.get("samples_collected", 0),
+                "quality": result.get("quality"),
                 "stored": store_result.get("ok", False),
             }
         except Exception as e:
@@ -514,4 +584,5 @@ async def enrollment_status(session_id: str):
             "active": False,
             "completed": True,
             "error": result.get("error", "Unknown error") if result else "No result",
+            "duplicate": result.get("duplicate") if result else None,
         }
@@ -173,67 +173,39 @@ async def list_solutions(
     ),
 ):
     """List all available solutions"""
-    solutions = solution_manager.get_all_solutions()
+    # Filters and file flags come from the in-memory index (no disk I/O)
+    entries = solution_manager.list_index(
+        category=category,
+        solution_type=solution_type,
+        include_disabled=include_disabled,
+    )
 
     result = []
-    for solution in solutions:
-        # Filter disabled solutions unless include_disabled is True
-        if not include_disabled and not solution.enabled:
-            continue
-
-        if category and solution.intro.category != category:
-            continue
-
-        if solution_type and solution.intro.solution_type != solution_type:
+    for entry in entries:
+        solution = solution_manager.get_solution(entry.id)
+        if not solution:
             continue
 
-        # Check file existence for management UI
-        base_path = Path(solution.base_path) if solution.base_path else None
-        has_description = (
-            base_path and (base_path / solution.intro.description_file).exists()
-            if solution.intro.description_file
-            else False
-        )
-        has_description_zh = (
-            base_path and (base_path / solution.intro.description_file_zh).exists()
-            if solution.intro.description_file_zh
-            else False
-        )
-        has_guide = (
-            base_path and (base_path / solution.deployment.guide_file).exists()
-            if solution.deployment.guide_file
-            else False
-        )
-        has_guide_zh = (
-            base_path and (base_path / solution.deployment.guide_file_zh).exists()
-            if solution.deployment.guide_file_zh
-            else False
-        )
-
         summary = SolutionSummary(
             id=solution.id,
             name=solution.name,  # Always return original values for management
             name_zh=solution.name_zh,
             summary=solution.intro.summary,  # Always return original values
             summary_zh=solution.intro.summary_zh,
-            category=solution.intro.category,
-            solution_type=solution.intro.solution_type,
+            category=entry.category,
+            solution_type=entry.solution_type,
             tags=solution.intro.tags,
-            cover_image=(
-                f"/api/solutions/{solution.id}/assets/{solution.intro.cover_image}"
-                if solution.intro.cover_image
-                else None
-            ),
+            cover_image=entry.cover_image,
             difficulty=solution.intro.stats.difficulty,
             estimated_time=solution.intro.stats.estimated_time,
             deployed_count=solution.intro.stats.deployed_count,
             likes_count=solution.intro.stats.likes_count,
-            device_count=await solution_manager.count_steps_from_guide(solution.id),
-            enabled=solution.enabled,
-            has_description=has_description,
-            has_description_zh=has_description_zh,
-            has_guide=has_guide,
-            has_guide_zh=has_guide_zh,
+            device_count=entry.device_count,
+            enabled=entry.enabled,
+            has_description=entry.has_description,
+            has_description_zh=entry.has_description_zh,
+            has_guide=entry.has_guide,
+            has_guide_zh=entry.has_guide_zh,
         )
         result.append(summary)
 
@@ -1477,6 +1449,7 @@ async def update_solution(solution_id: str, data: SolutionUpdate):
             raise HTTPException(status_code=400, detail="No fields to update")
 
         solution = await solution_manager.update_solution(solution_id, update_data)
+        entry = solution_manager.get_index_entry(solution.id)
 
         return SolutionSummary(
             id=solution.id,
@@ -1495,7 +1468,7 @@ async def update_solution(solution_id: str, data: SolutionUpdate):
             estimated_time=solution.intro.stats.estimated_time,
             deployed_count=solution.intro.stats.deployed_count,
             likes_count=solution.intro.stats.likes_count,
-            device_count=await solution_manager.count_steps_from_guide(solution.id),
+            device_count=entry.device_count if entry else 0,
         )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
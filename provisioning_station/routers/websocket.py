@@ -11,6 +11,7 @@ from ..config import settings
 from ..middleware.auth import ws_auth_check
 from ..services.api_key_manager import get_api_key_manager
 from ..services.deployment_engine import deployment_engine
+from ..services.fleet_deployment import fleet_manager
 
 router = APIRouter()
 
@@ -59,13 +60,14 @@ class ConnectionManager:
 
 manager = ConnectionManager()
 
-# Register manager with deployment engine
+# Register manager with deployment engine and fleet manager
 deployment_engine.set_websocket_manager(manager)
+fleet_manager.set_websocket_manager(manager)
 
 
 @router.websocket("/ws/logs/{deployment_id}")
 async def websocket_logs(websocket: WebSocket, deployment_id: str):
-    """WebSocket endpoint for real-time deployment logs"""
+    """WebSocket endpoint for real-time deployment logs (or a fleet's channel)"""
     if not await ws_auth_check(websocket, get_api_key_manager(), settings.api_enabled):
         return
     await manager.connect(websocket, deployment_id)
@@ -94,6 +96,18 @@ async def websocket_logs(websocket: WebSocket, deployment_id: str):
                         "message": log.message,
                     }
                 )
+        else:
+            fleet = fleet_manager.get_fleet(deployment_id)
+            if fleet:
+                await websocket.send_json(
+                    {
+                        "type": "status",
+                        "fleet_id": fleet.id,
+                        "status": fleet.status.value,
+                        "counts": fleet.counts(),
+                        "overall_progress": fleet_manager.overall_progress(fleet),
+                    }
+                )
 
         # Keep connection alive and handle client messages
         while True:
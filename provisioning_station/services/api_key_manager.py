@@ -3,13 +3,21 @@ API Key management for external API access.
 
 Keys are stored as SHA-256 hashes in data/api_keys.json.
 The plaintext key is only returned once at creation time.
+
+Validation is a dict lookup on the key's hash and never touches the disk:
+last_used_at is updated in memory and written by a periodic flush (and on
+shutdown), so authenticated requests don't each rewrite the file.
 """
 
+import asyncio
 import hashlib
+import hmac
 import json
 import logging
+import os
 import re
 import secrets
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
@@ -23,12 +31,22 @@ KEY_PREFIX = "ps_"
 KEY_BYTES = 32  # 256 bits of entropy
 NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_\-]{1,64}\Z")
 
+# Seconds between writes of updated last_used_at timestamps
+LAST_USED_FLUSH_INTERVAL = 60
+
 
 class ApiKeyManager:
     def __init__(self, data_dir: Optional[Path] = None):
         self._data_dir = data_dir or settings.data_dir
         self._keys_file = self._data_dir / "api_keys.json"
         self._keys: list[dict] = []
+        self._by_hash: dict[str, dict] = {}
+        self._dirty = False  # last_used_at changed since the last write
+        # Snapshots are numbered on the loop; a write never replaces a newer one
+        self._snapshots = 0
+        self._written = 0
+        self._write_lock = threading.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
         self._load()
 
     def _load(self):
@@ -49,10 +67,78 @@ class ApiKeyManager:
                 migrated = True
         if migrated:
             self._save()
+        self._reindex()
+
+    def _reindex(self):
+        self._by_hash = {r["key_hash"]: r for r in self._keys}
+
+    def _snapshot(self) -> tuple[int, str]:
+        self._snapshots += 1
+        return self._snapshots, json.dumps(self._keys, indent=2)
 
     def _save(self):
-        self._data_dir.mkdir(parents=True, exist_ok=True)
-        self._keys_file.write_text(json.dumps(self._keys, indent=2))
+        self._write(*self._snapshot())
+        self._dirty = False
+
+    def _write(self, snapshot: int, text: str):
+        # Leaves _dirty alone: flush_async runs this in a thread while
+        # validate_key may mark newer usage on the loop. The lock and the
+        # snapshot number keep a slow flush from overwriting a later
+        # create/delete; the temp file keeps readers from seeing half a file.
+        with self._write_lock:
+            if snapshot < self._written:
+                return
+            self._data_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = self._keys_file.with_name(self._keys_file.name + ".tmp")
+            tmp_file.write_text(text)
+            os.replace(tmp_file, self._keys_file)
+            self._written = snapshot
+
+    def flush(self) -> bool:
+        """Write pending last_used_at updates. Returns True if it wrote."""
+        if not self._dirty:
+            return False
+        self._save()
+        return True
+
+    async def flush_async(self) -> bool:
+        """Like flush(), with the file write off the event loop."""
+        if not self._dirty:
+            return False
+        # Serialize on the loop (records are only mutated there), write in a thread
+        self._dirty = False
+        snapshot, text = self._snapshot()
+        try:
+            await asyncio.to_thread(self._write, snapshot, text)
+        except OSError:
+            self._dirty = True
+            raise
+        return True
+
+    def start_flusher(self, interval: float = LAST_USED_FLUSH_INTERVAL):
+        """Start flushing last_used_at every ``interval`` seconds."""
+        if self._flush_task and not self._flush_task.done():
+            return
+        self._flush_task = asyncio.create_task(self._run_flusher(interval))
+
+    async def stop_flusher(self):
+        """Stop the periodic flush and write any pending updates."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush_async()
+
+    async def _run_flusher(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush_async()
+            except OSError as e:
+                logger.warning("Failed to save API key usage: %s", e)
 
     @staticmethod
     def _hash_key(key: str) -> str:
@@ -90,22 +176,27 @@ class ApiKeyManager:
             }
         )
         self._save()
+        self._reindex()
         logger.info("Created API key '%s'", name)
         return plaintext
 
     def validate_key(self, key: str) -> Optional[dict]:
-        """Validate an API key. Returns the key record (without hash) or None."""
+        """Validate an API key. Returns the key record (without hash) or None.
+
+        The lookup is by SHA-256 of the key, so timing reveals nothing about
+        stored keys; the final comparison is constant-time regardless.
+        """
         key_hash = self._hash_key(key)
-        for record in self._keys:
-            if record["key_hash"] == key_hash:
-                record["last_used_at"] = datetime.now(timezone.utc).isoformat()
-                self._save()
-                return {
-                    "name": record["name"],
-                    "created_at": record["created_at"],
-                    "last_used_at": record["last_used_at"],
-                }
-        return None
+        record = self._by_hash.get(key_hash)
+        if record is None or not hmac.compare_digest(record["key_hash"], key_hash):
+            return None
+        record["last_used_at"] = datetime.now(timezone.utc).isoformat()
+        self._dirty = True
+        return {
+            "name": record["name"],
+            "created_at": record["created_at"],
+            "last_used_at": record["last_used_at"],
+        }
 
     def list_keys(self) -> list[dict]:
         """List all keys (without hashes)."""
@@ -125,6 +216,7 @@ class ApiKeyManager:
             if r["name"] == name:
                 self._keys.pop(i)
                 self._save()
+                self._reindex()
                 logger.info("Deleted API key '%s'", name)
                 return True
         return False
@@ -136,6 +228,7 @@ class ApiKeyManager:
                 name = r["name"]
                 self._keys.pop(i)
                 self._save()
+                self._reindex()
                 logger.info("Deleted API key '%s' (id=%s)", name, key_id)
                 return True
         return False
@@ -0,0 +1,253 @@
+"""
+Offline asset bundles - pre-stage remote solution assets for air-gapped sites
+
+A bundle is an uncompressed tar (the assets are firmware, models and
+packages, which do not compress) holding each distinct file once as
+``blobs/<sha256>`` plus a ``bundle.json`` index of the URLs it serves,
+their sizes and checksums. Export walks solutions through the same URL
+discovery as deployments (``DeviceConfig.remote_assets``) and reads the
+files from the download cache. Import verifies every blob and seeds the
+download cache with it, so deployments resolve those URLs without network
+access (see ``PS_OFFLINE_MODE``).
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import re
+import shutil
+import tarfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .download_cache import SUPPORTED_DIGESTS
+from .resource_resolver import ResourceResolver, resource_resolver
+from .solution_manager import solution_manager
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_VERSION = 1
+INDEX_NAME = "bundle.json"
+BLOB_DIR = "blobs"
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}\Z")
+
+
+@dataclass
+class BundleAsset:
+    """A remote asset and the solutions that use it"""
+
+    url: str
+    checksum: Optional[Dict[str, str]] = None
+    solutions: Set[str] = field(default_factory=set)
+
+
+async def solution_config_files(solution_id: str) -> List[str]:
+    """Device config files of every step and target in a solution's guide"""
+    devices = await solution_manager.get_all_devices_async(solution_id)
+    files = []
+    for device in devices:
+        files.append(device.get("config_file"))
+        for target in (device.get("targets") or {}).values():
+            files.append(target.get("config_file"))
+    return list(dict.fromkeys(f for f in files if f))
+
+
+async def collect_assets(
+    solution_ids: List[str], resolver: ResourceResolver = resource_resolver
+) -> Dict[str, BundleAsset]:
+    """Remote assets of the given solutions, keyed by URL.
+
+    Includes models of every ``when`` variant, since the choice is made on
+    site.
+    """
+    assets: Dict[str, BundleAsset] = {}
+    for solution_id in solution_ids:
+        for config_file in await solution_config_files(solution_id):
+            config = await solution_manager.load_device_config(solution_id, config_file)
+            if not config:
+                continue
+            for url, checksum in config.remote_assets(resolver, every_variant=True):
+                asset = assets.setdefault(url, BundleAsset(url, checksum))
+                asset.checksum = asset.checksum or checksum
+                asset.solutions.add(solution_id)
+    return assets
+
+
+async def export_bundle(
+    dest: Path,
+    solution_ids: Optional[List[str]] = None,
+    resolver: ResourceResolver = resource_resolver,
+    progress_callback: Optional[Callable] = None,
+) -> Dict[str, Any]:
+    """Write the remote assets of *solution_ids* (default: all) to *dest*.
+
+    Assets missing from the download cache are downloaded first. Raises
+    ``ValueError`` for an unknown solution and ``RuntimeError`` when an
+    asset cannot be downloaded, since a partial bundle would only fail
+    later, on site.
+    """
+    if solution_ids is None:
+        solution_ids = [s.id for s in solution_manager.get_all_solutions()]
+    unknown = [s for s in solution_ids if not solution_manager.get_solution(s)]
+    if unknown:
+        raise ValueError(f"Unknown solutions: {', '.join(unknown)}")
+
+    assets = await collect_assets(solution_ids, resolver)
+    await resolver.prefetch(
+        [(a.url, a.checksum) for a in assets.values()], progress_callback
+    )
+
+    cache = resolver.cache
+    entries: List[Dict[str, Any]] = []
+    written: Set[str] = set()
+    size = 0
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(dest.name + ".tmp")
+    with tarfile.open(tmp, "w") as tar:
+        try:
+            for asset in assets.values():
+                # Resolve one at a time and archive it at once: with a
+                # bundle larger than the cache budget, later downloads may
+                # evict earlier assets
+                await resolver.resolve(asset.url, checksum=asset.checksum)
+                sha256 = cache.urls[asset.url].sha256
+                blob = cache.blobs[sha256]
+                if sha256 not in written:
+                    await asyncio.to_thread(
+                        tar.add, cache.blob_path(sha256), f"{BLOB_DIR}/{sha256}"
+                    )
+                    written.add(sha256)
+                    size += blob.size
+                entries.append(
+                    {
+                        "url": asset.url,
+                        "filename": resolver._filename_from_url(asset.url),
+                        "size": blob.size,
+                        "sha256": sha256,
+                        "md5": blob.digests.get("md5"),
+                        "solutions": sorted(asset.solutions),
+                    }
+                )
+            index = {
+                "version": BUNDLE_VERSION,
+                "created_at": datetime.now().isoformat(),
+                "solutions": solution_ids,
+                "assets": entries,
+            }
+            _add_bytes(tar, INDEX_NAME, json.dumps(index, indent=2).encode())
+        except BaseException:
+            tar.close()
+            tmp.unlink(missing_ok=True)
+            raise
+    tmp.replace(dest)
+
+    summary = {
+        "path": str(dest),
+        "solutions": solution_ids,
+        "assets": len(entries),
+        "blobs": len(written),
+        "bytes": size,
+    }
+    logger.info(f"Exported asset bundle: {summary}")
+    return summary
+
+
+async def import_bundle(
+    path: Path, resolver: ResourceResolver = resource_resolver
+) -> Dict[str, Any]:
+    """Seed the download cache from the bundle at *path*.
+
+    Every blob is hashed while it is extracted and rejected (``ValueError``)
+    if it does not match the index; so is an index whose digests are not
+    lowercase hex SHA-256. Content already in the cache is not
+    extracted again. Imported assets are exempt from the eviction that
+    follows, even when they exceed the cache budget.
+    """
+    index = await asyncio.to_thread(_read_index, path)
+    if index.get("version") != BUNDLE_VERSION:
+        raise ValueError(f"Unsupported asset bundle version: {index.get('version')}")
+
+    by_blob: Dict[str, List[Dict[str, Any]]] = {}
+    for entry in index["assets"]:
+        # Digests name files on disk, so the untrusted index must not
+        # smuggle path separators into them
+        if not SHA256_PATTERN.match(str(entry.get("sha256", ""))):
+            raise ValueError(f"Invalid blob digest in asset bundle: {path}")
+        by_blob.setdefault(entry["sha256"], []).append(entry)
+
+    cache = resolver.cache
+    missing = {sha for sha in by_blob if not cache.has_blob(sha)}
+    staging = cache.root / "import"
+    try:
+        digests = await asyncio.to_thread(_extract_blobs, path, missing, staging)
+        for sha256 in missing:
+            if sha256 not in digests:
+                raise ValueError(f"Asset bundle is missing blob {sha256}")
+            if digests[sha256]["sha256"] != sha256:
+                raise ValueError(f"Corrupt asset bundle: {by_blob[sha256][0]['url']}")
+        for sha256, entries in by_blob.items():
+            if sha256 in missing:
+                url = entries[0]["url"]
+                cache.adopt(
+                    url, staging / sha256, resolver._cache_path(url), digests[sha256]
+                )
+            for entry in entries:
+                cache.link(entry["url"], sha256, resolver._cache_path(entry["url"]))
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    cache.evict(keep=set(by_blob) | resolver.held_blobs())
+    cache.save()
+
+    summary = {
+        "solutions": index.get("solutions", []),
+        "assets": len(index["assets"]),
+        "blobs": len(by_blob),
+        "extracted": len(missing),
+    }
+    logger.info(f"Imported asset bundle {path}: {summary}")
+    return summary
+
+
+def _add_bytes(tar: tarfile.TarFile, name: str, data: bytes):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(datetime.now().timestamp())
+    tar.addfile(info, io.BytesIO(data))
+
+
+def _read_index(path: Path) -> Dict[str, Any]:
+    try:
+        with tarfile.open(path, "r") as tar:
+            return json.loads(tar.extractfile(INDEX_NAME).read())
+    except (OSError, tarfile.TarError, KeyError, ValueError) as e:
+        raise ValueError(f"Not an asset bundle: {path} ({e})") from e
+
+
+def _extract_blobs(
+    path: Path, wanted: Set[str], dest: Path
+) -> Dict[str, Dict[str, str]]:
+    """Copy the *wanted* blobs out of the bundle into *dest* in one pass,
+    hashing them on the way. Returns their digests by name."""
+    digests: Dict[str, Dict[str, str]] = {}
+    if not wanted:
+        return digests
+    dest.mkdir(parents=True, exist_ok=True)
+    with tarfile.open(path, "r") as tar:
+        for member in tar:
+            name = member.name.rpartition("/")[2]
+            if not member.isfile() or name not in wanted:
+                continue
+            hashes = {algo: hashlib.new(algo) for algo in SUPPORTED_DIGESTS}
+            source = tar.extractfile(member)
+            with open(dest / name, "wb") as f:
+                for block in iter(lambda: source.read(1024 * 1024), b""):
+                    f.write(block)
+                    for h in hashes.values():
+                        h.update(block)
+            digests[name] = {algo: h.hexdigest() for algo, h in hashes.items()}
+    return digests
@@ -5,7 +5,7 @@ Deployment orchestration engine
 import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 from uuid import uuid4
 
 from ..deployers import DEPLOYER_REGISTRY
@@ -18,6 +18,12 @@ from ..models.deployment import (
 from ..models.solution import Solution
 from ..models.version import DeploymentRecord, StepRecord
 from .deployment_history import deployment_history
+from .deployment_scheduler import (
+    ResourceLimiter,
+    device_resources,
+    parse_depends_on,
+    plan_dependencies,
+)
 from .mdns_scanner import is_mdns_hostname, resolve_mdns_hostname
 from .pre_check_validator import pre_check_validator
 from .solution_manager import solution_manager
@@ -33,6 +39,10 @@ class DeploymentEngine:
         self.completed_deployments: List[Deployment] = []
         self._websocket_manager = None
         self._running_tasks: Dict[str, asyncio.Task] = {}
+        # Serial ports and SSH hosts are shared across deployments
+        self._resource_limiter = ResourceLimiter()
+        # deployment_id -> fleet_id, for forwarding updates to fleet channels
+        self._fleet_channels: Dict[str, str] = {}
 
         # Deployers are auto-discovered from the deployers package
         self.deployers = DEPLOYER_REGISTRY
@@ -48,8 +58,14 @@ class DeploymentEngine:
         selected_devices: List[str] = None,
         options: Dict[str, Any] = None,
         preset_id: str = None,
+        fleet_id: str = None,
     ) -> str:
-        """Start a new deployment"""
+        """Start a new deployment
+
+        Args:
+            fleet_id: Fleet this deployment belongs to; its updates are also
+                broadcast on the fleet's channel
+        """
         logger.info(f"Starting deployment: solution={solution.id}, preset={preset_id}")
         deployment_id = str(uuid4())
 
@@ -60,6 +76,7 @@ class DeploymentEngine:
             started_at=datetime.utcnow(),
             status=DeploymentStatus.RUNNING,
             devices=[],
+            fleet_id=fleet_id,
         )
 
         # Get devices list from guide.md
@@ -198,6 +215,16 @@ class DeploymentEngine:
                     )
                 continue
 
+            # Scheduling hints: device YAML takes precedence over the guide step
+            depends_on = parse_depends_on(config.depends_on) or parse_depends_on(
+                device_ref.get("depends_on")
+            )
+            parallel = (
+                config.parallel
+                if config.parallel is not None
+                else bool(device_ref.get("parallel", False))
+            )
+
             device_name = device_ref.get("name", device_id)
             device_deployment = DeviceDeployment(
                 device_id=device_id,
@@ -206,6 +233,8 @@ class DeploymentEngine:
                 config_file=config_file,  # Store config_file for _run_deployment
                 status=DeploymentStatus.PENDING,
                 connection=device_connections.get(device_id),
+                depends_on=depends_on,
+                parallel=parallel,
                 steps=[StepStatus(id=step.id, name=step.name) for step in config.steps],
             )
             deployment.devices.append(device_deployment)
@@ -213,10 +242,15 @@ class DeploymentEngine:
         if not deployment.devices:
             raise ValueError("No devices to deploy")
 
+        # Reject dependency cycles before anything starts
+        plan_dependencies(deployment.devices)
+
         self.active_deployments[deployment_id] = deployment
+        if fleet_id:
+            self._fleet_channels[deployment_id] = fleet_id
 
         # Start deployment in background
-        task = asyncio.create_task(self._run_deployment(deployment_id))
+        task = asyncio.create_task(self._run_holding_assets(deployment_id))
         self._running_tasks[deployment_id] = task
 
         # Broadcast initial log (don't await in sync context, use create_task)
@@ -230,11 +264,16 @@ class DeploymentEngine:
 
         return deployment_id
 
-    async def _run_deployment(self, deployment_id: str):
-        """Execute deployment steps sequentially"""
-        # Lazy import to avoid circular dependency (deployers -> services -> deployers)
-        from ..deployers.docker_remote_deployer import RemoteDockerNotInstalled
+    async def _run_holding_assets(self, deployment_id: str):
+        """Run a deployment; cached assets it resolves are not evicted by
+        other deployments' downloads until it ends"""
+        from .resource_resolver import resource_resolver
+
+        with resource_resolver.hold_assets():
+            await self._run_deployment(deployment_id)
 
+    async def _run_deployment(self, deployment_id: str):
+        """Execute device deployments, running independent devices concurrently"""
         deployment = self.active_deployments.get(deployment_id)
         if not deployment:
             return
@@ -247,392 +286,492 @@ class DeploymentEngine:
             )
             return
 
+        running: Dict[asyncio.Task, DeviceDeployment] = {}
+        # Fetch every device's remote assets in the background so later
+        # devices' downloads overlap with earlier devices' deployments
+        prefetch = asyncio.create_task(self._prefetch_assets(deployment, solution))
         try:
-            for device_deployment in deployment.devices:
-                if deployment.status == DeploymentStatus.CANCELLED:
-                    break
+            dependencies = plan_dependencies(deployment.devices)
+            pending = list(deployment.devices)
+            finished: Set[str] = set()
+            failed: Set[str] = set()
+            halted = False
+
+            while pending or running:
+                if not halted and deployment.status != DeploymentStatus.CANCELLED:
+                    for device_deployment in list(pending):
+                        device_id = device_deployment.device_id
+                        if not dependencies[device_id] <= finished:
+                            continue
+                        pending.remove(device_deployment)
+                        blocker = next(
+                            (d for d in device_deployment.depends_on if d in failed),
+                            None,
+                        )
+                        if blocker:
+                            # Leave it pending, as after a sequential failure
+                            finished.add(device_id)
+                            failed.add(device_id)
+                            await self._broadcast_log(
+                                deployment_id,
+                                f"Skipping {device_id}: dependency {blocker} failed",
+                                level="warning",
+                                device_id=device_id,
+                            )
+                            continue
+                        task = asyncio.create_task(
+                            self._deploy_device(deployment, solution, device_deployment)
+                        )
+                        running[task] = device_deployment
 
-                device_deployment.status = DeploymentStatus.RUNNING
-                device_deployment.started_at = datetime.utcnow()
+                if not running:
+                    break
 
-                await self._broadcast_log(
-                    deployment_id,
-                    f"Starting deployment for device: {device_deployment.device_id}",
-                    level="info",
-                    device_id=device_deployment.device_id,
-                )
-                await self._broadcast_update(
-                    deployment_id,
-                    {
-                        "type": "device_started",
-                        "device_id": device_deployment.device_id,
-                    },
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
                 )
+                for task in done:
+                    device_deployment = running.pop(task)
+                    if task.result():
+                        halted = True
+                    finished.add(device_deployment.device_id)
+                    if device_deployment.status != DeploymentStatus.COMPLETED:
+                        failed.add(device_deployment.device_id)
+
+            # All devices completed
+            if deployment.status != DeploymentStatus.FAILED:
+                if all(
+                    d.status == DeploymentStatus.COMPLETED for d in deployment.devices
+                ):
+                    deployment.status = DeploymentStatus.COMPLETED
+
+            deployment.completed_at = datetime.utcnow()
+
+            # Update stats
+            if deployment.status == DeploymentStatus.COMPLETED:
+                solution.intro.stats.deployed_count += 1
+
+        except Exception as e:
+            logger.error(f"Deployment failed: {e}")
+            deployment.status = DeploymentStatus.FAILED
+            await self._broadcast_log(
+                deployment_id, f"Deployment error: {str(e)}", level="error"
+            )
+
+        finally:
+            prefetch.cancel()
+            # Stop devices still running (cancellation or scheduler error)
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+            # Move to completed
+            self.completed_deployments.insert(0, deployment)
+            if len(self.completed_deployments) > 100:
+                self.completed_deployments.pop()
+
+            if deployment_id in self._running_tasks:
+                del self._running_tasks[deployment_id]
+
+            # Remove from active now that it's in completed_deployments
+            self.active_deployments.pop(deployment_id, None)
+
+            await self._broadcast_update(
+                deployment_id,
+                {
+                    "type": "deployment_completed",
+                    "status": deployment.status.value,
+                },
+            )
+            self._fleet_channels.pop(deployment_id, None)
 
-                # Skip devices without config_file
-                if not device_deployment.config_file:
-                    device_deployment.status = DeploymentStatus.COMPLETED
-                    device_deployment.completed_at = datetime.utcnow()
-                    continue
+    async def _prefetch_assets(
+        self, deployment: Deployment, solution: Solution
+    ) -> None:
+        """Download the remote assets of all devices in a deployment.
 
-                # Load device config using stored config_file path
+        Best-effort: each device still resolves its own assets before it
+        deploys and reports any failure there.
+        """
+        from .resource_resolver import resource_resolver
+
+        assets = []
+        for device_deployment in deployment.devices:
+            if not device_deployment.config_file:
+                continue
+            try:
                 config = await solution_manager.load_device_config(
                     solution.id, device_deployment.config_file
                 )
-                if not config:
-                    device_deployment.status = DeploymentStatus.FAILED
-                    device_deployment.error = "Device config not found"
-                    continue
+                if config:
+                    assets += config.remote_assets(
+                        resource_resolver, device_deployment.connection
+                    )
+            except Exception as e:
+                logger.debug(f"Prefetch skipped {device_deployment.device_id}: {e}")
+        if assets:
+            logger.info(f"Prefetching {len(assets)} remote assets for {deployment.id}")
+            await resource_resolver.prefetch(assets)
 
-                # Resolve remote assets (download URLs to local cache)
-                from .resource_resolver import resource_resolver
+    async def _deploy_device(
+        self,
+        deployment: Deployment,
+        solution: Solution,
+        device_deployment: DeviceDeployment,
+    ) -> bool:
+        """Deploy a single device of a deployment.
 
-                async def _asset_progress(step_id, progress, message):
-                    await self._broadcast_log(
-                        deployment_id,
-                        message,
-                        device_id=device_deployment.device_id,
-                    )
+        Returns:
+            True if the failure should stop further devices from starting
+        """
+        # Lazy import to avoid circular dependency (deployers -> services -> deployers)
+        from ..deployers.docker_remote_deployer import RemoteDockerNotInstalled
 
-                try:
-                    await config.resolve_remote_assets(
-                        resource_resolver,
-                        progress_callback=_asset_progress,
-                        connection=device_deployment.connection,
-                    )
-                except Exception as e:
-                    device_deployment.status = DeploymentStatus.FAILED
-                    device_deployment.error = f"Failed to resolve remote assets: {e}"
-                    await self._broadcast_log(
-                        deployment_id,
-                        f"Failed to resolve remote assets: {e}",
-                        level="error",
-                        device_id=device_deployment.device_id,
-                    )
-                    deployment.status = DeploymentStatus.FAILED
-                    continue
-
-                # Resolve mDNS .local hostnames to IP addresses
-                # This is needed because Docker containers on Windows cannot resolve .local
-                connection = device_deployment.connection or {}
-                host_fields = ["host", "recamera_ip", "nodered_host"]
-                for field in host_fields:
-                    host_value = connection.get(field)
-                    if host_value and is_mdns_hostname(host_value):
-                        await self._broadcast_log(
-                            deployment_id,
-                            f"Resolving mDNS hostname: {host_value}",
-                            level="info",
-                            device_id=device_deployment.device_id,
-                        )
-                        resolved_ip = await resolve_mdns_hostname(host_value)
-                        if resolved_ip:
-                            connection[field] = resolved_ip
-                            device_deployment.connection = connection
-                            await self._broadcast_log(
-                                deployment_id,
-                                f"Resolved {host_value} → {resolved_ip}",
-                                level="info",
-                                device_id=device_deployment.device_id,
-                            )
-                        else:
-                            await self._broadcast_log(
-                                deployment_id,
-                                f"Warning: Could not resolve {host_value}, using as-is",
-                                level="warning",
-                                device_id=device_deployment.device_id,
-                            )
+        deployment_id = deployment.id
 
-                # Get the appropriate deployer
-                deployer = self.deployers.get(config.type)
-                if not deployer:
-                    device_deployment.status = DeploymentStatus.FAILED
-                    device_deployment.error = f"No deployer for type: {config.type}"
-                    continue
-
-                # Run pre-checks if defined
-                # Skip local pre-checks for docker_remote type - remote checks are handled by the deployer
-                # Use device_deployment.type (runtime effective type) instead of config.type (file-defined type)
-                if config.pre_checks and device_deployment.type != "docker_remote":
-                    await self._broadcast_log(
-                        deployment_id,
-                        "Running pre-deployment checks...",
-                        level="info",
-                        device_id=device_deployment.device_id,
-                    )
-                    await self._broadcast_update(
-                        deployment_id,
-                        {
-                            "type": "pre_check_started",
-                            "device_id": device_deployment.device_id,
-                        },
-                    )
+        device_deployment.status = DeploymentStatus.RUNNING
+        device_deployment.started_at = datetime.utcnow()
 
-                    check_results = await pre_check_validator.validate_all(
-                        config.pre_checks
-                    )
-                    failed_checks = [r for r in check_results if not r.passed]
+        await self._broadcast_log(
+            deployment_id,
+            f"Starting deployment for device: {device_deployment.device_id}",
+            level="info",
+            device_id=device_deployment.device_id,
+        )
+        await self._broadcast_update(
+            deployment_id,
+            {
+                "type": "device_started",
+                "device_id": device_deployment.device_id,
+            },
+        )
 
-                    if failed_checks:
-                        device_deployment.status = DeploymentStatus.FAILED
-                        device_deployment.error = (
-                            f"Pre-checks failed: {[c.message for c in failed_checks]}"
-                        )
-                        await self._broadcast_log(
-                            deployment_id,
-                            f"Pre-checks failed for {device_deployment.device_id}: {[c.message for c in failed_checks]}",
-                            level="error",
-                            device_id=device_deployment.device_id,
-                        )
-                        await self._broadcast_update(
-                            deployment_id,
-                            {
-                                "type": "pre_check_failed",
-                                "device_id": device_deployment.device_id,
-                                "failures": [c.model_dump() for c in failed_checks],
-                            },
-                        )
-                        deployment.status = DeploymentStatus.FAILED
-                        continue
+        # Skip devices without config_file
+        if not device_deployment.config_file:
+            device_deployment.status = DeploymentStatus.COMPLETED
+            device_deployment.completed_at = datetime.utcnow()
+            return False
+
+        # Load device config using stored config_file path
+        config = await solution_manager.load_device_config(
+            solution.id, device_deployment.config_file
+        )
+        if not config:
+            device_deployment.status = DeploymentStatus.FAILED
+            device_deployment.error = "Device config not found"
+            return False
 
+        # Resolve remote assets (download URLs to local cache)
+        from .resource_resolver import resource_resolver
+
+        async def _asset_progress(step_id, progress, message):
+            await self._broadcast_log(
+                deployment_id,
+                message,
+                device_id=device_deployment.device_id,
+            )
+
+        try:
+            await config.resolve_remote_assets(
+                resource_resolver,
+                progress_callback=_asset_progress,
+                connection=device_deployment.connection,
+            )
+        except Exception as e:
+            device_deployment.status = DeploymentStatus.FAILED
+            device_deployment.error = f"Failed to resolve remote assets: {e}"
+            await self._broadcast_log(
+                deployment_id,
+                f"Failed to resolve remote assets: {e}",
+                level="error",
+                device_id=device_deployment.device_id,
+            )
+            deployment.status = DeploymentStatus.FAILED
+            return False
+
+        # Resolve mDNS .local hostnames to IP addresses
+        # This is needed because Docker containers on Windows cannot resolve .local
+        connection = device_deployment.connection or {}
+        host_fields = ["host", "recamera_ip", "nodered_host"]
+        for field in host_fields:
+            host_value = connection.get(field)
+            if host_value and is_mdns_hostname(host_value):
+                await self._broadcast_log(
+                    deployment_id,
+                    f"Resolving mDNS hostname: {host_value}",
+                    level="info",
+                    device_id=device_deployment.device_id,
+                )
+                resolved_ip = await resolve_mdns_hostname(host_value)
+                if resolved_ip:
+                    connection[field] = resolved_ip
+                    device_deployment.connection = connection
                     await self._broadcast_log(
                         deployment_id,
-                        f"Pre-checks passed for {device_deployment.device_id}",
+                        f"Resolved {host_value} → {resolved_ip}",
                         level="info",
                         device_id=device_deployment.device_id,
                     )
-                    await self._broadcast_update(
-                        deployment_id,
-                        {
-                            "type": "pre_check_passed",
-                            "device_id": device_deployment.device_id,
-                            "results": [c.model_dump() for c in check_results],
-                        },
-                    )
-
-                # Create progress callback
-                async def progress_callback(step_id: str, progress: int, message: str):
-                    deployment.update_step(
-                        device_deployment.device_id,
-                        step_id,
-                        "running" if progress < 100 else "completed",
-                        progress,
-                        message,
-                    )
+                else:
                     await self._broadcast_log(
                         deployment_id,
-                        message,
-                        level="info",
+                        f"Warning: Could not resolve {host_value}, using as-is",
+                        level="warning",
                         device_id=device_deployment.device_id,
-                        step_id=step_id,
-                    )
-                    await self._broadcast_update(
-                        deployment_id,
-                        {
-                            "type": "progress",
-                            "device_id": device_deployment.device_id,
-                            "step_id": step_id,
-                            "progress": progress,
-                            "message": message,
-                        },
                     )
 
-                # Execute deployment
-                try:
-                    # Add solution metadata to connection for label injection
-                    enriched_connection = {
-                        **device_deployment.connection,
-                        "_solution_id": solution.id,
-                        "_solution_name": solution.name,
-                        "_device_id": device_deployment.device_id,
-                        "_config_file": device_deployment.config_file,
-                    }
-
-                    success = await deployer.deploy(
-                        config=config,
-                        connection=enriched_connection,
-                        progress_callback=progress_callback,
-                    )
+        # Get the appropriate deployer
+        deployer = self.deployers.get(config.type)
+        if not deployer:
+            device_deployment.status = DeploymentStatus.FAILED
+            device_deployment.error = f"No deployer for type: {config.type}"
+            return False
+        if not deployer.concurrent_deploys:
+            # Keeps per-run state on the instance, so concurrent runs of this
+            # type (e.g. a fleet rollout) each get their own
+            deployer = type(deployer)()
+
+        # Run pre-checks if defined
+        # Skip local pre-checks for docker_remote type - remote checks are handled by the deployer
+        # Use device_deployment.type (runtime effective type) instead of config.type (file-defined type)
+        if config.pre_checks and device_deployment.type != "docker_remote":
+            await self._broadcast_log(
+                deployment_id,
+                "Running pre-deployment checks...",
+                level="info",
+                device_id=device_deployment.device_id,
+            )
+            await self._broadcast_update(
+                deployment_id,
+                {
+                    "type": "pre_check_started",
+                    "device_id": device_deployment.device_id,
+                },
+            )
 
-                    if success:
-                        device_deployment.status = DeploymentStatus.COMPLETED
-                        device_deployment.completed_at = datetime.utcnow()
-                        # Mark all steps as completed
-                        for step in device_deployment.steps:
-                            if step.status != "completed":
-                                step.status = "completed"
-                                step.progress = 100
-
-                        # Save config manifest for reconfigurable user_inputs
-                        try:
-                            await self._save_config_manifest(
-                                solution_id=solution.id,
-                                device_id=device_deployment.device_id,
-                                device_type=device_deployment.type,
-                                config_file=device_deployment.config_file,
-                                config=config,
-                                connection=device_deployment.connection or {},
-                            )
-                        except Exception as manifest_error:
-                            logger.warning(
-                                f"Failed to save config manifest: {manifest_error}"
-                            )
+            check_results = await pre_check_validator.validate_all(config.pre_checks)
+            failed_checks = [r for r in check_results if not r.passed]
 
-                        await self._broadcast_log(
-                            deployment_id,
-                            f"Device {device_deployment.device_id} deployment completed successfully",
-                            level="success",
-                            device_id=device_deployment.device_id,
-                        )
-                    else:
-                        device_deployment.status = DeploymentStatus.FAILED
-                        deployment.status = DeploymentStatus.FAILED
-                        await self._broadcast_log(
-                            deployment_id,
-                            f"Device {device_deployment.device_id} deployment failed",
-                            level="error",
-                            device_id=device_deployment.device_id,
-                        )
+            if failed_checks:
+                device_deployment.status = DeploymentStatus.FAILED
+                device_deployment.error = (
+                    f"Pre-checks failed: {[c.message for c in failed_checks]}"
+                )
+                await self._broadcast_log(
+                    deployment_id,
+                    f"Pre-checks failed for {device_deployment.device_id}: {[c.message for c in failed_checks]}",
+                    level="error",
+                    device_id=device_deployment.device_id,
+                )
+                await self._broadcast_update(
+                    deployment_id,
+                    {
+                        "type": "pre_check_failed",
+                        "device_id": device_deployment.device_id,
+                        "failures": [c.model_dump() for c in failed_checks],
+                    },
+                )
+                deployment.status = DeploymentStatus.FAILED
+                return False
 
-                except RemoteDockerNotInstalled as e:
-                    # Docker not installed - ask user for confirmation to install
-                    logger.info(
-                        f"Docker not installed on {device_deployment.device_id}: {e}"
-                    )
-                    device_deployment.status = DeploymentStatus.FAILED
-                    device_deployment.error = str(e)
-                    deployment.status = DeploymentStatus.FAILED
+            await self._broadcast_log(
+                deployment_id,
+                f"Pre-checks passed for {device_deployment.device_id}",
+                level="info",
+                device_id=device_deployment.device_id,
+            )
+            await self._broadcast_update(
+                deployment_id,
+                {
+                    "type": "pre_check_passed",
+                    "device_id": device_deployment.device_id,
+                    "results": [c.model_dump() for c in check_results],
+                },
+            )
 
-                    await self._broadcast_log(
-                        deployment_id,
-                        str(e),
-                        level="warning",
-                        device_id=device_deployment.device_id,
-                    )
+        # Create progress callback
+        async def progress_callback(step_id: str, progress: int, message: str):
+            deployment.update_step(
+                device_deployment.device_id,
+                step_id,
+                "running" if progress < 100 else "completed",
+                progress,
+                message,
+            )
+            await self._broadcast_log(
+                deployment_id,
+                message,
+                level="info",
+                device_id=device_deployment.device_id,
+                step_id=step_id,
+            )
+            await self._broadcast_update(
+                deployment_id,
+                {
+                    "type": "progress",
+                    "device_id": device_deployment.device_id,
+                    "step_id": step_id,
+                    "progress": progress,
+                    "message": message,
+                },
+            )
 
-                    # Send special message to frontend for confirmation
-                    await self._broadcast_update(
-                        deployment_id,
-                        {
-                            "type": "docker_not_installed",
-                            "device_id": device_deployment.device_id,
-                            "message": str(e),
-                            "can_auto_fix": e.can_auto_fix,
-                            "fix_action": e.fix_action,
-                        },
-                    )
+        # Execute deployment
+        try:
+            # Add solution metadata to connection for label injection
+            enriched_connection = {
+                **device_deployment.connection,
+                "_solution_id": solution.id,
+                "_solution_name": solution.name,
+                "_device_id": device_deployment.device_id,
+                "_config_file": device_deployment.config_file,
+            }
+
+            async def _wait_for_resource(resource: str):
+                await self._broadcast_log(
+                    deployment_id,
+                    f"Waiting for {resource} (in use by another deployment)",
+                    level="info",
+                    device_id=device_deployment.device_id,
+                )
 
-                except Exception as e:
-                    logger.error(
-                        f"Deployment error for {device_deployment.device_id}: {e}"
-                    )
-                    device_deployment.status = DeploymentStatus.FAILED
-                    device_deployment.error = str(e)
-                    deployment.status = DeploymentStatus.FAILED
-                    await self._broadcast_log(
-                        deployment_id,
-                        f"Deployment error: {str(e)}",
-                        level="error",
-                        device_id=device_deployment.device_id,
-                    )
+            resources = device_resources(deployer, device_deployment.connection or {})
+            async with self._resource_limiter.hold(resources, _wait_for_resource):
+                success = await deployer.deploy(
+                    config=config,
+                    connection=enriched_connection,
+                    progress_callback=progress_callback,
+                )
 
-                # Record deployment to history
+            if success:
+                device_deployment.status = DeploymentStatus.COMPLETED
+                device_deployment.completed_at = datetime.utcnow()
+                # Mark all steps as completed
+                for step in device_deployment.steps:
+                    if step.status != "completed":
+                        step.status = "completed"
+                        step.progress = 100
+
+                # Save config manifest for reconfigurable user_inputs
                 try:
-                    step_records = [
-                        StepRecord(
-                            id=step.id,
-                            name=step.name,
-                            status=step.status,
-                            started_at=step.started_at,
-                            completed_at=step.completed_at,
-                            error=step.message if step.status == "failed" else None,
-                        )
-                        for step in device_deployment.steps
-                    ]
-                    record = DeploymentRecord(
-                        deployment_id=deployment_id,
-                        solution_id=deployment.solution_id,
+                    await self._save_config_manifest(
+                        solution_id=solution.id,
                         device_id=device_deployment.device_id,
                         device_type=device_deployment.type,
-                        deployed_version=(
-                            config.version if hasattr(config, "version") else "1.0"
-                        ),
-                        config_version=(
-                            config.version if hasattr(config, "version") else "1.0"
-                        ),
-                        status=(
-                            "completed"
-                            if device_deployment.status == DeploymentStatus.COMPLETED
-                            else "failed"
-                        ),
-                        deployed_at=datetime.utcnow(),
-                        metadata={
-                            "device_name": device_deployment.name,
-                            "error": (
-                                device_deployment.error
-                                if device_deployment.error
-                                else None
-                            ),
-                        },
-                        steps=step_records,
-                    )
-                    await deployment_history.record_deployment(record)
-                except Exception as history_error:
-                    logger.error(
-                        f"Failed to record deployment history: {history_error}"
+                        config_file=device_deployment.config_file,
+                        config=config,
+                        connection=device_deployment.connection or {},
                     )
+                except Exception as manifest_error:
+                    logger.warning(f"Failed to save config manifest: {manifest_error}")
 
-                await self._broadcast_update(
+                await self._broadcast_log(
                     deployment_id,
-                    {
-                        "type": "device_completed",
-                        "device_id": device_deployment.device_id,
-                        "status": device_deployment.status.value,
-                    },
+                    f"Device {device_deployment.device_id} deployment completed successfully",
+                    level="success",
+                    device_id=device_deployment.device_id,
+                )
+            else:
+                device_deployment.status = DeploymentStatus.FAILED
+                deployment.status = DeploymentStatus.FAILED
+                await self._broadcast_log(
+                    deployment_id,
+                    f"Device {device_deployment.device_id} deployment failed",
+                    level="error",
+                    device_id=device_deployment.device_id,
                 )
 
-                if device_deployment.status == DeploymentStatus.FAILED:
-                    break
-
-            # All devices completed
-            if deployment.status != DeploymentStatus.FAILED:
-                if all(
-                    d.status == DeploymentStatus.COMPLETED for d in deployment.devices
-                ):
-                    deployment.status = DeploymentStatus.COMPLETED
+        except RemoteDockerNotInstalled as e:
+            # Docker not installed - ask user for confirmation to install
+            logger.info(f"Docker not installed on {device_deployment.device_id}: {e}")
+            device_deployment.status = DeploymentStatus.FAILED
+            device_deployment.error = str(e)
+            deployment.status = DeploymentStatus.FAILED
 
-            deployment.completed_at = datetime.utcnow()
+            await self._broadcast_log(
+                deployment_id,
+                str(e),
+                level="warning",
+                device_id=device_deployment.device_id,
+            )
 
-            # Update stats
-            if deployment.status == DeploymentStatus.COMPLETED:
-                solution.intro.stats.deployed_count += 1
+            # Send special message to frontend for confirmation
+            await self._broadcast_update(
+                deployment_id,
+                {
+                    "type": "docker_not_installed",
+                    "device_id": device_deployment.device_id,
+                    "message": str(e),
+                    "can_auto_fix": e.can_auto_fix,
+                    "fix_action": e.fix_action,
+                },
+            )
 
         except Exception as e:
-            logger.error(f"Deployment failed: {e}")
+            logger.error(f"Deployment error for {device_deployment.device_id}: {e}")
+            device_deployment.status = DeploymentStatus.FAILED
+            device_deployment.error = str(e)
             deployment.status = DeploymentStatus.FAILED
             await self._broadcast_log(
-                deployment_id, f"Deployment error: {str(e)}", level="error"
+                deployment_id,
+                f"Deployment error: {str(e)}",
+                level="error",
+                device_id=device_deployment.device_id,
             )
 
-        finally:
-            # Move to completed
-            self.completed_deployments.insert(0, deployment)
-            if len(self.completed_deployments) > 100:
-                self.completed_deployments.pop()
-
-            if deployment_id in self._running_tasks:
-                del self._running_tasks[deployment_id]
-
-            # Remove from active now that it's in completed_deployments
-            self.active_deployments.pop(deployment_id, None)
-
-            await self._broadcast_update(
-                deployment_id,
-                {
-                    "type": "deployment_completed",
-                    "status": deployment.status.value,
+        # Record deployment to history
+        try:
+            step_records = [
+                StepRecord(
+                    id=step.id,
+                    name=step.name,
+                    status=step.status,
+                    started_at=step.started_at,
+                    completed_at=step.completed_at,
+                    error=step.message if step.status == "failed" else None,
+                )
+                for step in device_deployment.steps
+            ]
+            record = DeploymentRecord(
+                deployment_id=deployment_id,
+                solution_id=deployment.solution_id,
+                device_id=device_deployment.device_id,
+                device_type=device_deployment.type,
+                deployed_version=(
+                    config.version if hasattr(config, "version") else "1.0"
+                ),
+                config_version=(
+                    config.version if hasattr(config, "version") else "1.0"
+                ),
+                status=(
+                    "completed"
+                    if device_deployment.status == DeploymentStatus.COMPLETED
+                    else "failed"
+                ),
+                deployed_at=datetime.utcnow(),
+                metadata={
+                    "device_name": device_deployment.name,
+                    "error": (
+                        device_deployment.error if device_deployment.error else None
+                    ),
                 },
+                steps=step_records,
             )
+            await deployment_history.record_deployment(record)
+        except Exception as history_error:
+            logger.error(f"Failed to record deployment history: {history_error}")
+
+        await self._broadcast_update(
+            deployment_id,
+            {
+                "type": "device_completed",
+                "device_id": device_deployment.device_id,
+                "status": device_deployment.status.value,
+            },
+        )
+
+        return device_deployment.status == DeploymentStatus.FAILED
 
     async def cancel_deployment(self, deployment_id: str):
         """Cancel a running deployment"""
@@ -647,6 +786,18 @@ class DeploymentEngine:
             if deployment_id in self._running_tasks:
                 self._running_tasks[deployment_id].cancel()
 
+    async def wait_for_deployment(self, deployment_id: str):
+        """Wait until a deployment's background task has finished"""
+        task = self._running_tasks.get(deployment_id)
+        if not task:
+            return
+        try:
+            # Shield so a cancelled waiter does not cancel the deployment
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise  # The waiter itself was cancelled
+
     def get_deployment(self, deployment_id: str) -> Optional[Deployment]:
         """Get deployment by ID"""
         if deployment_id in self.active_deployments:
@@ -731,6 +882,12 @@ class DeploymentEngine:
             message["timestamp"] = datetime.utcnow().isoformat()
             await self._websocket_manager.broadcast(deployment_id, message)
 
+            fleet_id = self._fleet_channels.get(deployment_id)
+            if fleet_id:
+                await self._websocket_manager.broadcast(
+                    fleet_id, {**message, "fleet_id": fleet_id}
+                )
+
     async def _broadcast_log(
         self,
         deployment_id: str,
@@ -1,12 +1,20 @@
 """
 Deployment history persistence service
+
+Records are kept in an append-only JSON Lines log. Each line is either an
+``add`` entry holding one record or a ``remove`` tombstone for a deployment
+ID. The log is replayed once into memory and indexed by solution, device and
+deployment ID, so writes append a single line and queries never re-read the
+file. The log is compacted when tombstones and expired records outweigh the
+live ones.
 """
 
+import heapq
 import json
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from ..config import settings
 from ..models.version import DeploymentRecord
@@ -15,50 +23,215 @@ logger = logging.getLogger(__name__)
 
 
 class DeploymentHistory:
-    """Persists deployment records to JSON file"""
+    """Persists deployment records to an append-only JSONL log"""
 
-    def __init__(self, storage_path: Optional[str] = None):
+    def __init__(
+        self,
+        storage_path: Optional[str] = None,
+        retention: Optional[int] = None,
+    ):
+        """
+        Args:
+            storage_path: Path of the JSONL log (legacy JSON file is migrated
+                from the same path with a ``.json`` suffix)
+            retention: Maximum records to keep, 0 for unlimited
+                (defaults to ``settings.deployment_history_retention``)
+        """
         if storage_path:
             self.storage_path = Path(storage_path)
         else:
-            self.storage_path = settings.cache_dir / "deployment_history.json"
-        self._ensure_storage()
+            self.storage_path = settings.cache_dir / "deployment_history.jsonl"
+        self.legacy_path = self.storage_path.with_suffix(".json")
+        self.retention = (
+            settings.deployment_history_retention if retention is None else retention
+        )
 
-    def _ensure_storage(self):
-        """Ensure storage file exists"""
+        self._loaded = False
+        self._next_seq = 0
+        self._log_lines = 0  # Lines in the log file, live or not
+        # seq -> record, in insertion order
+        self._records: Dict[int, DeploymentRecord] = {}
+        self._by_solution: Dict[str, Dict[int, None]] = {}
+        self._by_device: Dict[Tuple[str, str], Dict[int, None]] = {}
+        self._by_deployment: Dict[str, Dict[int, None]] = {}
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _ensure_loaded(self):
+        """Replay the log into memory on first use (migrating legacy JSON)"""
+        if self._loaded:
+            return
+        self._loaded = True
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if not self.storage_path.exists() and self.legacy_path.exists():
+            self._migrate_legacy()
+            return
+
         if not self.storage_path.exists():
-            self.storage_path.write_text("[]")
+            return
 
-    def _load_records(self) -> List[Dict[str, Any]]:
-        """Load all records from storage"""
         try:
-            content = self.storage_path.read_text()
-            return json.loads(content)
+            with open(self.storage_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    self._log_lines += 1
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        logger.warning("Skipping corrupt deployment history line")
+                        continue
+                    if entry.get("op") == "remove":
+                        self._drop_deployment(entry.get("deployment_id"))
+                    elif entry.get("op") == "add":
+                        record = self._parse_record(entry.get("record") or {})
+                        if record:
+                            self._index(record)
         except Exception as e:
             logger.error(f"Failed to load deployment history: {e}")
-            return []
 
-    def _save_records(self, records: List[Dict[str, Any]]):
-        """Save records to storage"""
+        self._enforce_retention()
+
+    def _migrate_legacy(self):
+        """One-time import of the old whole-file JSON history"""
         try:
-            # Keep only last 1000 records to prevent unbounded growth
-            records = records[-1000:]
-            content = json.dumps(records, indent=2, default=str)
-            self.storage_path.write_text(content)
+            records = json.loads(self.legacy_path.read_text())
         except Exception as e:
-            logger.error(f"Failed to save deployment history: {e}")
+            logger.error(f"Failed to read legacy deployment history: {e}")
+            return
+
+        for r in records:
+            record = self._parse_record(r)
+            if record:
+                self._index(record)
+        self._enforce_retention(compact=False)
+        self._compact()
+
+        try:
+            self.legacy_path.rename(self.legacy_path.with_suffix(".json.migrated"))
+        except OSError as e:
+            logger.warning(f"Could not rename legacy deployment history: {e}")
+        logger.info(f"Migrated {len(self._records)} deployment records to JSONL log")
+
+    @staticmethod
+    def _parse_record(data: Dict[str, Any]) -> Optional[DeploymentRecord]:
+        """Build a DeploymentRecord from stored data"""
+        data = dict(data)
+        if isinstance(data.get("deployed_at"), str):
+            try:
+                data["deployed_at"] = datetime.fromisoformat(data["deployed_at"])
+            except ValueError:
+                data["deployed_at"] = datetime.utcnow()
+        try:
+            return DeploymentRecord(**data)
+        except Exception as e:
+            logger.warning(f"Skipping invalid deployment record: {e}")
+            return None
+
+    def _append(self, entry: Dict[str, Any]):
+        """Append one entry to the log"""
+        with open(self.storage_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+        self._log_lines += 1
+
+    def _compact(self):
+        """Rewrite the log with only the live records"""
+        tmp_path = self.storage_path.with_suffix(".jsonl.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in self._records.values():
+                entry = {"op": "add", "record": record.model_dump(mode="json")}
+                f.write(json.dumps(entry, default=str) + "\n")
+        tmp_path.replace(self.storage_path)
+        self._log_lines = len(self._records)
+
+    def _maybe_compact(self):
+        """Compact once dead lines outnumber live records"""
+        dead = self._log_lines - len(self._records)
+        if dead > max(len(self._records), 100):
+            self._compact()
+
+    # ------------------------------------------------------------------
+    # Indexes
+    # ------------------------------------------------------------------
+
+    def _index(self, record: DeploymentRecord) -> int:
+        if record.deployed_at.tzinfo is not None:
+            # Keep every timestamp naive UTC so records stay comparable
+            deployed_at = record.deployed_at.astimezone(timezone.utc)
+            record = record.model_copy(
+                update={"deployed_at": deployed_at.replace(tzinfo=None)}
+            )
+        seq = self._next_seq
+        self._next_seq += 1
+        self._records[seq] = record
+        self._by_solution.setdefault(record.solution_id, {})[seq] = None
+        self._by_device.setdefault((record.solution_id, record.device_id), {})[
+            seq
+        ] = None
+        self._by_deployment.setdefault(record.deployment_id, {})[seq] = None
+        return seq
+
+    def _unindex(self, seq: int):
+        record = self._records.pop(seq, None)
+        if record is None:
+            return
+        for index, key in (
+            (self._by_solution, record.solution_id),
+            (self._by_device, (record.solution_id, record.device_id)),
+            (self._by_deployment, record.deployment_id),
+        ):
+            seqs = index.get(key)
+            if seqs is not None:
+                seqs.pop(seq, None)
+                if not seqs:
+                    del index[key]
+
+    def _drop_deployment(self, deployment_id: Optional[str]) -> int:
+        seqs = list(self._by_deployment.get(deployment_id, ()))
+        for seq in seqs:
+            self._unindex(seq)
+        return len(seqs)
+
+    def _enforce_retention(self, compact: bool = True):
+        """Drop the oldest records beyond the retention limit"""
+        if self.retention <= 0 or len(self._records) <= self.retention:
+            return
+        excess = len(self._records) - self.retention
+        for _ in range(excess):
+            self._unindex(next(iter(self._records)))
+        if compact:
+            self._maybe_compact()
+
+    def _select(
+        self, solution_id: Optional[str], device_id: Optional[str]
+    ) -> Iterable[DeploymentRecord]:
+        """Records matching the filters, using the narrowest index"""
+        if solution_id and device_id:
+            seqs = self._by_device.get((solution_id, device_id), {})
+        elif solution_id:
+            seqs = self._by_solution.get(solution_id, {})
+        else:
+            seqs = self._records
+        records = (self._records[seq] for seq in seqs)
+        if device_id and not solution_id:
+            records = (r for r in records if r.device_id == device_id)
+        return records
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
 
     async def record_deployment(self, record: DeploymentRecord):
         """Record a deployment"""
         try:
-            records = self._load_records()
-            record_dict = record.model_dump()
-            # Convert datetime to ISO string
-            if isinstance(record_dict.get("deployed_at"), datetime):
-                record_dict["deployed_at"] = record_dict["deployed_at"].isoformat()
-            records.append(record_dict)
-            self._save_records(records)
+            self._ensure_loaded()
+            self._append({"op": "add", "record": record.model_dump(mode="json")})
+            self._index(record)
+            self._enforce_retention()
             logger.info(
                 f"Recorded deployment: {record.deployment_id} for {record.solution_id}/{record.device_id}"
             )
@@ -68,14 +241,14 @@ class DeploymentHistory:
     async def remove_deployment(self, deployment_id: str) -> bool:
         """Remove a deployment record by deployment_id"""
         try:
-            records = self._load_records()
-            original_len = len(records)
-            records = [r for r in records if r.get("deployment_id") != deployment_id]
-            if len(records) < original_len:
-                self._save_records(records)
-                logger.info(f"Removed deployment record: {deployment_id}")
-                return True
-            return False
+            self._ensure_loaded()
+            if deployment_id not in self._by_deployment:
+                return False
+            self._append({"op": "remove", "deployment_id": deployment_id})
+            self._drop_deployment(deployment_id)
+            self._maybe_compact()
+            logger.info(f"Removed deployment record: {deployment_id}")
+            return True
         except Exception as e:
             logger.error(f"Failed to remove deployment: {e}")
             return False
@@ -86,36 +259,15 @@ class DeploymentHistory:
         device_id: Optional[str] = None,
         limit: int = 10,
     ) -> List[DeploymentRecord]:
-        """Get deployment history, optionally filtered"""
+        """Get deployment history, optionally filtered (newest first)"""
         try:
-            records = self._load_records()
-
-            # Filter by solution_id
-            if solution_id:
-                records = [r for r in records if r.get("solution_id") == solution_id]
-
-            # Filter by device_id
-            if device_id:
-                records = [r for r in records if r.get("device_id") == device_id]
-
-            # Sort by deployed_at descending
-            records.sort(key=lambda r: r.get("deployed_at", ""), reverse=True)
-
-            # Apply limit
-            records = records[:limit]
-
-            # Convert to DeploymentRecord objects
-            result = []
-            for r in records:
-                # Parse datetime string
-                if isinstance(r.get("deployed_at"), str):
-                    try:
-                        r["deployed_at"] = datetime.fromisoformat(r["deployed_at"])
-                    except ValueError:
-                        r["deployed_at"] = datetime.utcnow()
-                result.append(DeploymentRecord(**r))
-
-            return result
+            self._ensure_loaded()
+            newest = heapq.nlargest(
+                limit,
+                self._select(solution_id, device_id),
+                key=lambda r: r.deployed_at,
+            )
+            return [r.model_copy() for r in newest]
 
         except Exception as e:
             logger.error(f"Failed to get deployment history: {e}")
@@ -142,37 +294,24 @@ class DeploymentHistory:
         device_id: str,
     ) -> int:
         """Get the number of times a device has been deployed"""
-        records = self._load_records()
-        count = sum(
-            1
-            for r in records
-            if r.get("solution_id") == solution_id
-            and r.get("device_id") == device_id
-            and r.get("status") == "completed"
+        self._ensure_loaded()
+        return sum(
+            1 for r in self._select(solution_id, device_id) if r.status == "completed"
         )
-        return count
 
     async def get_solution_stats(self, solution_id: str) -> Dict[str, Any]:
         """Get deployment statistics for a solution"""
-        records = self._load_records()
-        solution_records = [r for r in records if r.get("solution_id") == solution_id]
-
-        total = len(solution_records)
-        successful = sum(1 for r in solution_records if r.get("status") == "completed")
-        failed = sum(1 for r in solution_records if r.get("status") == "failed")
-
+        self._ensure_loaded()
+        total = successful = failed = 0
         last_deployment = None
-        if solution_records:
-            solution_records.sort(key=lambda r: r.get("deployed_at", ""), reverse=True)
-            if solution_records[0].get("deployed_at"):
-                deployed_at = solution_records[0]["deployed_at"]
-                if isinstance(deployed_at, str):
-                    try:
-                        last_deployment = datetime.fromisoformat(deployed_at)
-                    except ValueError:
-                        pass
-                else:
-                    last_deployment = deployed_at
+        for r in self._select(solution_id, None):
+            total += 1
+            if r.status == "completed":
+                successful += 1
+            elif r.status == "failed":
+                failed += 1
+            if last_deployment is None or r.deployed_at > last_deployment:
+                last_deployment = r.deployed_at
 
         return {
             "total_deployments": total,
@@ -0,0 +1,134 @@
+"""
+Device scheduling for multi-device deployments
+
+Devices in a deployment form a dependency graph. By default every device
+waits for the one before it, so guides keep their written order. A step can
+declare ``parallel=true`` to start alongside the previous device, or
+``depends_on=a,b`` to wait only for the named devices. Devices whose
+dependencies are met run concurrently, bounded by shared resources: one flash
+per serial port and a few SSH sessions per host.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set
+
+from ..config import settings
+from ..models.deployment import DeviceDeployment
+
+# Connection keys holding the SSH host, in the order deployers read them
+SSH_HOST_FIELDS = ("host", "recamera_ip", "nodered_host")
+
+
+def parse_depends_on(value: Any) -> List[str]:
+    """Normalize a ``depends_on`` declaration (comma string or list) to IDs"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(v).strip() for v in value if str(v).strip()]
+
+
+def plan_dependencies(devices: Sequence[DeviceDeployment]) -> Dict[str, Set[str]]:
+    """Map each device ID to the device IDs it must wait for.
+
+    A ``parallel`` device shares the prerequisites of the device before it,
+    and the next sequential device waits for the whole parallel group.
+    Dependencies on devices outside this deployment (deselected, or skipped
+    for lack of a connection) are treated as already satisfied.
+
+    Raises:
+        ValueError: If the declared dependencies form a cycle
+    """
+    known = {d.device_id for d in devices}
+    graph: Dict[str, Set[str]] = {}
+    group: Set[str] = set()  # Devices of the current parallel run
+    group_deps: Set[str] = set()  # What that run waits for
+
+    for device in devices:
+        device_id = device.device_id
+        if device.depends_on:
+            deps = {d for d in device.depends_on if d in known and d != device_id}
+            group, group_deps = {device_id}, deps
+        elif device.parallel:
+            deps = set(group_deps)
+            group.add(device_id)
+        else:
+            deps = set(group)
+            group, group_deps = {device_id}, deps
+        graph[device_id] = deps
+
+    _check_acyclic(graph)
+    return graph
+
+
+def _check_acyclic(graph: Dict[str, Set[str]]):
+    """Raise ValueError if the dependency graph has a cycle"""
+    remaining = {node: set(deps) for node, deps in graph.items()}
+    while remaining:
+        ready = [node for node, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(
+                f"Circular device dependencies: {', '.join(sorted(remaining))}"
+            )
+        for node in ready:
+            del remaining[node]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def device_resources(deployer: Any, connection: Dict[str, Any]) -> Dict[str, int]:
+    """Shared resources a device holds while its deployer runs.
+
+    Returns:
+        Mapping of resource key to the number of concurrent holders allowed
+    """
+    resources: Dict[str, int] = {}
+    transport = (getattr(deployer, "ui_traits", None) or {}).get("connection")
+
+    if transport == "serial":
+        port = connection.get("port")
+        if port:
+            resources[f"serial:{port}"] = 1
+    elif transport == "ssh":
+        host = next((connection[f] for f in SSH_HOST_FIELDS if connection.get(f)), None)
+        if host:
+            resources[f"ssh:{str(host).lower()}"] = max(
+                1, settings.ssh_sessions_per_host
+            )
+
+    return resources
+
+
+class ResourceLimiter:
+    """Counting semaphores keyed by resource, shared by all deployments"""
+
+    def __init__(self):
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, key: str, limit: int) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(limit)
+            self._semaphores[key] = semaphore
+        return semaphore
+
+    @asynccontextmanager
+    async def hold(
+        self,
+        resources: Dict[str, int],
+        on_wait: Optional[Callable[[str], Awaitable[None]]] = None,
+    ):
+        """Acquire every resource (in a fixed order to avoid deadlocks)"""
+        acquired: List[asyncio.Semaphore] = []
+        try:
+            for key in sorted(resources):
+                semaphore = self._semaphore(key, resources[key])
+                if semaphore.locked() and on_wait:
+                    await on_wait(key)
+                await semaphore.acquire()
+                acquired.append(semaphore)
+            yield
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
@@ -6,9 +6,10 @@ import asyncio
 import glob as glob_module
 import logging
 import sys
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..models.device import DeviceConfig
+from .ssh_pool import get_ssh_pool
 
 logger = logging.getLogger(__name__)
 
@@ -697,38 +698,11 @@ class DeviceDetector:
         try:
             import paramiko
 
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
             try:
-                if key_file:
-                    client.connect(
-                        hostname=host,
-                        port=port,
-                        username=username,
-                        key_filename=key_file,
-                        timeout=10,
-                    )
-                else:
-                    client.connect(
-                        hostname=host,
-                        port=port,
-                        username=username,
-                        password=password,
-                        timeout=10,
-                    )
-
-                # Get device info
-                stdin, stdout, stderr = client.exec_command("uname -a")
-                uname = stdout.read().decode().strip()
-
-                stdin, stdout, stderr = client.exec_command(
-                    "cat /etc/os-release 2>/dev/null || echo 'Unknown'"
+                # The pooled connect can wait for a free slot; keep it off the loop
+                uname, os_info = await asyncio.to_thread(
+                    self._probe_ssh, host, port, username, password, key_file
                 )
-                os_info = stdout.read().decode().strip()
-
-                client.close()
-
                 return {
                     "status": "detected",
                     "connection_info": {
@@ -752,8 +726,6 @@ class DeviceDetector:
                     "status": "error",
                     "details": {"error": f"SSH error: {str(e)}"},
                 }
-            finally:
-                client.close()
 
         except ImportError:
             return {
@@ -767,6 +739,46 @@ class DeviceDetector:
                 "details": {"error": str(e)},
             }
 
+    @staticmethod
+    def _probe_ssh(
+        host: str,
+        port: int,
+        username: str,
+        password: Optional[str],
+        key_file: Optional[str],
+    ) -> Tuple[str, str]:
+        """Connect and read uname and os-release (blocking, run in thread)"""
+        client = get_ssh_pool().client()
+        try:
+            if key_file:
+                client.connect(
+                    hostname=host,
+                    port=port,
+                    username=username,
+                    key_filename=key_file,
+                    timeout=10,
+                )
+            else:
+                client.connect(
+                    hostname=host,
+                    port=port,
+                    username=username,
+                    password=password,
+                    timeout=10,
+                )
+
+            # Get device info
+            stdin, stdout, stderr = client.exec_command("uname -a")
+            uname = stdout.read().decode().strip()
+
+            stdin, stdout, stderr = client.exec_command(
+                "cat /etc/os-release 2>/dev/null || echo 'Unknown'"
+            )
+            os_info = stdout.read().decode().strip()
+            return uname, os_info
+        finally:
+            client.close()
+
 
 # Global instance
 device_detector = DeviceDetector()
@@ -8,9 +8,11 @@ import logging
 import platform
 import socket
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from ..config import settings
 from ..models.docker_device import (
     ConnectDeviceRequest,
     ContainerInfo,
@@ -27,6 +29,42 @@ from ..utils.compose_labels import (
 
 logger = logging.getLogger(__name__)
 
+# Seconds granted beyond a remote command's own timeout before it is aborted
+EXEC_GRACE_SECONDS = 10
+
+# Budget for probing the remote compose command (two probes of 20s)
+COMPOSE_PROBE_TIMEOUT = 45
+
+# Bounded pool for blocking SSH work, so slow hosts can't starve to_thread
+_ssh_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_ssh_executor() -> ThreadPoolExecutor:
+    global _ssh_executor
+    if _ssh_executor is None:
+        _ssh_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.docker_ssh_workers),
+            thread_name_prefix="docker-ssh",
+        )
+    return _ssh_executor
+
+
+def _abort_client(client):
+    """Drop a client whose call was abandoned instead of pooling it"""
+    try:
+        if hasattr(client, "discard"):
+            client.discard()
+        else:
+            client.close()
+    except Exception:
+        pass
+
+
+def _close_abandoned(future):
+    """Done-callback for a connect nobody waits for any more"""
+    if not future.cancelled() and future.exception() is None:
+        _abort_client(future.result())
+
 
 def _get_subprocess_kwargs() -> Dict[str, Any]:
     """Get subprocess kwargs with hidden window on Windows"""
@@ -745,26 +783,23 @@ class DockerDeviceManager:
     # ============================================
 
     def _get_ssh_client(self, connection: ConnectDeviceRequest):
-        """Create and connect an SSH client
+        """Borrow a connected SSH client from the shared pool
 
         Raises:
-            paramiko.AuthenticationException: If authentication fails
-            paramiko.SSHException: If SSH connection fails
-            OSError: If network connection fails
+            RuntimeError: If authentication or the connection fails
         """
         import paramiko
 
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        from .ssh_pool import get_ssh_pool
+
         try:
-            client.connect(
+            return get_ssh_pool().connect(
                 hostname=connection.host,
                 port=connection.port,
                 username=connection.username,
                 password=connection.password,
                 timeout=10,
             )
-            return client
         except paramiko.AuthenticationException:
             raise RuntimeError(
                 f"Authentication failed for {connection.username}@{connection.host}. "
@@ -788,20 +823,71 @@ class DockerDeviceManager:
             raise RuntimeError(f"Command failed (exit {exit_code}): {error or output}")
         return output
 
+    async def _run_remote(self, client, func, *args, timeout: float):
+        """Run a blocking SSH call on the remote-management executor.
+
+        On timeout or cancellation the client is discarded, which closes its
+        transport and unblocks the worker thread still waiting on it.
+        """
+        future = asyncio.wrap_future(_get_ssh_executor().submit(func, *args))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            _abort_client(client)
+            raise RuntimeError(f"Remote operation timed out after {timeout:.0f}s")
+        except asyncio.CancelledError:
+            _abort_client(client)
+            raise
+
+    async def _exec_remote(self, client, command: str, timeout: int = 30) -> str:
+        """Execute a command off the event loop and return stdout"""
+        return await self._run_remote(
+            client,
+            self._exec_command,
+            client,
+            command,
+            timeout,
+            timeout=timeout + EXEC_GRACE_SECONDS,
+        )
+
+    async def _connect_remote(self, connection: ConnectDeviceRequest):
+        """Open (or borrow) an SSH client off the event loop"""
+        future = _get_ssh_executor().submit(self._get_ssh_client, connection)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), settings.docker_ssh_connect_timeout
+            )
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            # The handshake may still finish; hand the client back when it does
+            future.add_done_callback(_close_abandoned)
+            if isinstance(e, asyncio.TimeoutError):
+                raise RuntimeError(
+                    f"Timed out connecting to {connection.host}:{connection.port}"
+                )
+            raise
+
+    @staticmethod
+    def shutdown():
+        """Stop the remote-management threads without waiting for stuck calls"""
+        global _ssh_executor
+        if _ssh_executor is not None:
+            _ssh_executor.shutdown(wait=False, cancel_futures=True)
+            _ssh_executor = None
+
     async def connect(self, connection: ConnectDeviceRequest) -> DeviceInfo:
         """Test SSH connection and verify Docker is installed"""
         try:
-            client = self._get_ssh_client(connection)
+            client = await self._connect_remote(connection)
             try:
                 # Get Docker version
-                docker_version = self._exec_command(client, "docker --version")
+                docker_version = await self._exec_remote(client, "docker --version")
 
                 # Get hostname
-                hostname = self._exec_command(client, "hostname")
+                hostname = await self._exec_remote(client, "hostname")
 
                 # Get OS info
                 try:
-                    os_info = self._exec_command(
+                    os_info = await self._exec_remote(
                         client, "cat /etc/os-release | head -2"
                     )
                 except Exception:
@@ -828,10 +914,10 @@ class DockerDeviceManager:
     ) -> List[ContainerInfo]:
         """List all Docker containers on the device"""
         try:
-            client = self._get_ssh_client(connection)
+            client = await self._connect_remote(connection)
             try:
                 # Get container list in JSON format with labels
-                output = self._exec_command(
+                output = await self._exec_remote(
                     client,
                     'docker ps -a --format \'{"id":"{{.ID}}","name":"{{.Names}}","image":"{{.Image}}","status":"{{.Status}}","ports":"{{.Ports}}","labels":"{{.Labels}}"}\'',
                 )
@@ -920,9 +1006,14 @@ class DockerDeviceManager:
         )
 
         try:
-            client = self._get_ssh_client(connection)
+            client = await self._connect_remote(connection)
             try:
-                compose_base = self._resolve_remote_compose_base(client)
+                compose_base = await self._run_remote(
+                    client,
+                    self._resolve_remote_compose_base,
+                    client,
+                    timeout=COMPOSE_PROBE_TIMEOUT,
+                )
                 # Pull new images
                 compose_dir = (
                     request.compose_path.rsplit("/", 1)[0]
@@ -933,14 +1024,14 @@ class DockerDeviceManager:
                     f"-p {request.project_name}" if request.project_name else ""
                 )
 
-                pull_output = self._exec_command(
+                pull_output = await self._exec_remote(
                     client,
                     f"cd {compose_dir} && {compose_base} {project_flag} pull",
                     timeout=120,
                 )
 
                 # Recreate containers
-                up_output = self._exec_command(
+                up_output = await self._exec_remote(
                     client,
                     f"cd {compose_dir} && {compose_base} {project_flag} up -d",
                     timeout=60,
@@ -972,21 +1063,21 @@ class DockerDeviceManager:
             raise ValueError(f"Invalid action: {action}")
 
         try:
-            client = self._get_ssh_client(connection)
+            client = await self._connect_remote(connection)
             try:
                 if action == "remove":
                     # First stop, then remove
                     try:
-                        self._exec_command(
+                        await self._exec_remote(
                             client, f"docker stop {container_name}", timeout=30
                         )
                     except Exception:
                         pass  # Container might already be stopped
-                    output = self._exec_command(
+                    output = await self._exec_remote(
                         client, f"docker rm {container_name}", timeout=30
                     )
                 else:
-                    output = self._exec_command(
+                    output = await self._exec_remote(
                         client,
                         f"docker {action} {container_name}",
                         timeout=30,
@@ -1019,7 +1110,7 @@ class DockerDeviceManager:
         project_names = set()
 
         try:
-            client = self._get_ssh_client(connection)
+            client = await self._connect_remote(connection)
             try:
                 # Get container info before removing (to get image references and project name)
                 containers = await self.list_containers(connection)
@@ -1035,12 +1126,12 @@ class DockerDeviceManager:
                 for container_name in container_names:
                     try:
                         try:
-                            self._exec_command(
+                            await self._exec_remote(
                                 client, f"docker stop {container_name}", timeout=30
                             )
                         except Exception:
                             pass
-                        self._exec_command(
+                        await self._exec_remote(
                             client, f"docker rm {container_name}", timeout=30
                         )
                         results.append({"container": container_name, "success": True})
@@ -1060,7 +1151,7 @@ class DockerDeviceManager:
                     for image in set(images_to_remove):
                         try:
                             # Check if image is used by other containers
-                            check_output = self._exec_command(
+                            check_output = await self._exec_remote(
                                 client,
                                 f"docker ps -a --filter ancestor={image} --format '{{{{.Names}}}}'",
                                 timeout=10,
@@ -1077,7 +1168,7 @@ class DockerDeviceManager:
                                 )
                                 continue
 
-                            self._exec_command(
+                            await self._exec_remote(
                                 client, f"docker rmi {image}", timeout=60
                             )
                             images_removed.append(image)
@@ -1090,7 +1181,7 @@ class DockerDeviceManager:
                 if remove_volumes:
                     try:
                         # List all volumes and filter by project_name pattern
-                        output = self._exec_command(
+                        output = await self._exec_remote(
                             client, "docker volume ls --format '{{.Name}}'", timeout=10
                         )
                         all_volumes = [v for v in output.strip().split("\n") if v]
@@ -1109,7 +1200,7 @@ class DockerDeviceManager:
 
                         for volume in solution_volumes:
                             try:
-                                self._exec_command(
+                                await self._exec_remote(
                                     client, f"docker volume rm {volume}", timeout=30
                                 )
                                 volumes_removed.append(volume)
@@ -1138,9 +1229,9 @@ class DockerDeviceManager:
     async def prune_images(self, connection: ConnectDeviceRequest) -> Dict[str, Any]:
         """Remove all unused Docker images on remote device"""
         try:
-            client = self._get_ssh_client(connection)
+            client = await self._connect_remote(connection)
             try:
-                output = self._exec_command(
+                output = await self._exec_remote(
                     client, "docker image prune -af", timeout=120
                 )
 
@@ -1234,11 +1325,16 @@ class DockerDeviceManager:
                 compose_filename = Path(docker_config.compose_file).name
                 remote_compose = f"{remote_base}/{compose_filename}"
 
-                client = self._get_ssh_client(connection)
+                client = await self._connect_remote(connection)
                 try:
-                    compose_base = self._resolve_remote_compose_base(client)
+                    compose_base = await self._run_remote(
+                        client,
+                        self._resolve_remote_compose_base,
+                        client,
+                        timeout=COMPOSE_PROBE_TIMEOUT,
+                    )
                     cmd = f"cd {remote_base} && {env_str} {compose_base} -p {project_name} -f {remote_compose} up -d"
-                    output = self._exec_command(client, cmd, timeout=60)
+                    output = await self._exec_remote(client, cmd, timeout=60)
 
                     # Update manifest
                     for field in manifest.get("fields", []):
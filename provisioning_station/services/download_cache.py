@@ -0,0 +1,276 @@
+"""
+Content-addressed store for downloaded assets.
+
+Each downloaded file is stored once under ``blobs/<sha256>``. URLs map to
+blobs in ``index.json``, so two URLs serving identical content share one
+copy. Every URL also gets a view at ``<sha256(url)[:16]>/<filename>``,
+hard-linked to its blob, so deployers see the original file name and
+extension.
+
+The index records each blob's size, its digests (sha256 and md5), and when
+it was last used. A cached asset whose declared checksum matches the index
+is therefore never hashed again. Blobs are evicted least-recently-used
+first to keep the store under a byte budget.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_DIGESTS = ("sha256", "md5")
+
+INDEX_VERSION = 1
+
+
+@dataclass
+class BlobEntry:
+    size: int
+    digests: Dict[str, str] = field(default_factory=dict)
+    last_access: float = 0.0
+
+
+@dataclass
+class UrlEntry:
+    sha256: str
+    view: str  # Path relative to the store root
+
+
+def hash_file(
+    path: Path, algorithms: Iterable[str] = SUPPORTED_DIGESTS
+) -> Dict[str, str]:
+    """Compute several digests of a file in a single pass."""
+    hashes = {algo: hashlib.new(algo) for algo in algorithms}
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            for h in hashes.values():
+                h.update(block)
+    return {algo: h.hexdigest() for algo, h in hashes.items()}
+
+
+class DownloadCache:
+    """Blob store with a URL index and LRU eviction.
+
+    Not thread-safe: call it from the event loop only. The one slow step,
+    hashing, is the caller's job (``hash_file`` in a worker thread); the
+    methods here only move, link and delete files.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = 0):
+        self.root = root
+        self.max_bytes = max_bytes  # 0 = unlimited
+        self._index_file = root / "index.json"
+        self.blobs: Dict[str, BlobEntry] = {}
+        self.urls: Dict[str, UrlEntry] = {}
+        self._dirty = False
+        self._load()
+
+    # ---- index ----
+
+    def _load(self):
+        if not self._index_file.exists():
+            return
+        try:
+            data = json.loads(self._index_file.read_text())
+            self.blobs = {k: BlobEntry(**v) for k, v in data["blobs"].items()}
+            self.urls = {k: UrlEntry(**v) for k, v in data["urls"].items()}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable download cache index: %s", e)
+            self.blobs, self.urls = {}, {}
+
+    def save(self):
+        """Write the index if it changed (atomically)."""
+        if not self._dirty:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": INDEX_VERSION,
+            "blobs": {k: asdict(v) for k, v in self.blobs.items()},
+            "urls": {k: asdict(v) for k, v in self.urls.items()},
+        }
+        tmp = self._index_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data))
+        tmp.replace(self._index_file)
+        self._dirty = False
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.root / "blobs" / sha256
+
+    def has_blob(self, sha256: str) -> bool:
+        return sha256 in self.blobs and self.blob_path(sha256).exists()
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(b.size for b in self.blobs.values())
+
+    # ---- lookup ----
+
+    def lookup(self, url: str) -> Optional[Path]:
+        """Cached view of *url*, or None. Marks its blob as used."""
+        entry = self.urls.get(url)
+        if entry is None:
+            return None
+        blob = self.blobs.get(entry.sha256)
+        view = self.root / entry.view
+        if blob is None or not view.exists() or view.stat().st_size != blob.size:
+            self.forget(url)
+            return None
+        blob.last_access = time.time()
+        self._dirty = True
+        return view
+
+    def _blob_for(self, url: str) -> Optional[BlobEntry]:
+        entry = self.urls.get(url)
+        return self.blobs.get(entry.sha256) if entry else None
+
+    def path_for(self, url: str) -> Optional[Path]:
+        entry = self.urls.get(url)
+        return self.blob_path(entry.sha256) if entry else None
+
+    @staticmethod
+    def _wanted(checksums: Dict[str, str]) -> Dict[str, str]:
+        wanted = {}
+        for algo, expected in checksums.items():
+            if algo.lower() in SUPPORTED_DIGESTS:
+                wanted[algo.lower()] = expected.lower()
+            else:
+                logger.warning("Unsupported checksum algorithm: %s", algo)
+        return wanted
+
+    def missing_digests(self, url: str, checksums: Dict[str, str]) -> List[str]:
+        """Algorithms in *checksums* not yet recorded for *url*'s blob."""
+        blob = self._blob_for(url)
+        if blob is None:
+            return []
+        return [a for a in self._wanted(checksums) if a not in blob.digests]
+
+    def record_digests(self, url: str, digests: Dict[str, str]):
+        blob = self._blob_for(url)
+        if blob is not None:
+            blob.digests.update(digests)
+            self._dirty = True
+
+    def digests_match(self, url: str, checksums: Dict[str, str]) -> bool:
+        """Check declared checksums against the digests in the index.
+
+        Record missing digests first (``missing_digests``); an algorithm
+        without a recorded digest counts as a mismatch.
+        """
+        blob = self._blob_for(url)
+        if blob is None:
+            return False
+        for algo, expected in self._wanted(checksums).items():
+            actual = blob.digests.get(algo)
+            if actual != expected:
+                logger.error(
+                    "Checksum mismatch for %s: expected %s, got %s",
+                    url,
+                    expected,
+                    actual,
+                )
+                return False
+        return True
+
+    # ---- insert ----
+
+    def adopt(self, url: str, path: Path, view: Path, digests: Dict[str, str]) -> str:
+        """Move a downloaded file into the store and link it at *view*.
+
+        *digests* come from ``hash_file(path)``. *path* may be *view* itself
+        (a file already at the view location). If the content is already
+        stored, the new copy is dropped and *url* shares the existing blob.
+        Returns the blob's sha256.
+        """
+        sha256 = digests["sha256"]
+        blob_path = self.blob_path(sha256)
+        blob = self.blobs.get(sha256)
+
+        if self.has_blob(sha256):
+            path.unlink()
+            logger.info("Download of %s matches cached blob %s", url, sha256[:12])
+        else:
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(path, blob_path)
+            blob = BlobEntry(size=blob_path.stat().st_size)
+            self.blobs[sha256] = blob
+        blob.digests.update(digests)
+        self.link(url, sha256, view)
+        return sha256
+
+    def link(self, url: str, sha256: str, view: Path):
+        """Point *url* at a blob already in the store, with its view at
+        *view*."""
+        old = self.urls.get(url)
+        if old and old.sha256 != sha256:
+            self.forget(url)
+        self._link(self.blob_path(sha256), view)
+        self.urls[url] = UrlEntry(sha256, view.relative_to(self.root).as_posix())
+        self.blobs[sha256].last_access = time.time()
+        self._dirty = True
+
+    @staticmethod
+    def _link(blob_path: Path, view: Path):
+        view.parent.mkdir(parents=True, exist_ok=True)
+        if view.exists() or view.is_symlink():
+            view.unlink()
+        try:
+            os.link(blob_path, view)
+        except OSError:
+            # No hard links on this filesystem: fall back to a copy
+            shutil.copyfile(blob_path, view)
+
+    # ---- eviction ----
+
+    def forget(self, url: str):
+        """Drop *url*'s view; its blob goes too if no other URL uses it."""
+        entry = self.urls.pop(url, None)
+        if entry is None:
+            return
+        view = self.root / entry.view
+        view.unlink(missing_ok=True)
+        try:
+            view.parent.rmdir()
+        except OSError:
+            pass
+        if not any(e.sha256 == entry.sha256 for e in self.urls.values()):
+            self.blobs.pop(entry.sha256, None)
+            self.blob_path(entry.sha256).unlink(missing_ok=True)
+        self._dirty = True
+
+    def remove_blob(self, sha256: str):
+        """Delete a blob and the views of every URL that uses it."""
+        for url in [u for u, e in self.urls.items() if e.sha256 == sha256]:
+            self.forget(url)
+        self.blobs.pop(sha256, None)
+        self.blob_path(sha256).unlink(missing_ok=True)
+        self._dirty = True
+
+    def evict(self, keep: Iterable[str] = ()) -> int:
+        """Remove least recently used blobs until under the byte budget.
+
+        Blobs in *keep* (sha256) are never evicted. Returns bytes freed.
+        """
+        if self.max_bytes <= 0:
+            return 0
+        keep_set: Set[str] = set(keep)
+        total = self.total_bytes
+        freed = 0
+        for sha256, blob in sorted(self.blobs.items(), key=lambda i: i[1].last_access):
+            if total <= self.max_bytes:
+                break
+            if sha256 in keep_set:
+                continue
+            logger.info(
+                "Evicting cached download %s (%d bytes)", sha256[:12], blob.size
+            )
+            self.remove_blob(sha256)
+            total -= blob.size
+            freed += blob.size
+        return freed
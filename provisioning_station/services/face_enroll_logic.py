@@ -5,19 +5,67 @@ Domain-specific logic for face enrollment:
 1. Register as frame callback on SerialCameraSession
 2. Collect N seconds of high-confidence embeddings
 3. Average and normalize the collected embeddings
-4. Store via SerialCrudClient
+4. Check the result against the gallery of already enrolled faces
+5. Store via SerialCrudClient
+
+Embedding math uses NumPy float32 arrays (a declared dependency), with a
+plain-Python fallback for environments where NumPy cannot be imported.
+Per-frame work is O(dim): each sample is normalized once and folded into a
+running sum, so enrollment keeps up with the camera's full frame rate on the
+serial reader thread.
 """
 
 import logging
 import math
+import threading
 import time
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Cosine similarity above which two embeddings are taken to be the same person
+DUPLICATE_THRESHOLD = 0.8
+
+# Minimum similarity between neighbouring samples before warning
+CONSISTENCY_THRESHOLD = 0.8
+
+# How often the live enrollment state re-checks the gallery (seconds)
+MATCH_INTERVAL = 0.5
+
+
+def _normalize(embedding):
+    """Return an L2-normalized copy (float32 array, or list without NumPy)."""
+    if NUMPY_AVAILABLE:
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else vec
+    norm = math.sqrt(sum(x * x for x in embedding))
+    if norm == 0:
+        return [float(x) for x in embedding]
+    return [x / norm for x in embedding]
+
+
+def _dot(a, b) -> float:
+    if NUMPY_AVAILABLE:
+        return float(np.dot(a, b))
+    return sum(x * y for x, y in zip(a, b))
+
 
 def _cosine_similarity(a: List[float], b: List[float]) -> float:
     """Compute cosine similarity between two vectors."""
+    if NUMPY_AVAILABLE:
+        a = np.asarray(a, dtype=np.float32)
+        b = np.asarray(b, dtype=np.float32)
+        norm = float(np.linalg.norm(a) * np.linalg.norm(b))
+        return float(np.dot(a, b)) / norm if norm > 0 else 0.0
     dot = sum(x * y for x, y in zip(a, b))
     norm_a = math.sqrt(sum(x * x for x in a))
     norm_b = math.sqrt(sum(x * x for x in b))
@@ -31,6 +79,10 @@ def _average_embeddings(embeddings: List[List[float]]) -> List[float]:
     if not embeddings:
         return []
 
+    if NUMPY_AVAILABLE:
+        avg = np.asarray(embeddings, dtype=np.float32).mean(axis=0)
+        return _normalize(avg).tolist()
+
     dim = len(embeddings[0])
     avg = [0.0] * dim
     for emb in embeddings:
@@ -41,11 +93,117 @@ def _average_embeddings(embeddings: List[List[float]]) -> List[float]:
     avg = [v / n for v in avg]
 
     # L2 normalize
-    norm = math.sqrt(sum(v * v for v in avg))
-    if norm > 0:
-        avg = [v / norm for v in avg]
+    return _normalize(avg)
+
 
-    return avg
+class FaceGallery:
+    """In-memory index of enrolled face embeddings for one face database.
+
+    The device's ``face_list`` reports names (and embeddings, on firmware
+    that includes them); embeddings enrolled from this host are added as
+    they are stored. Vectors are kept L2-normalized, so a lookup is a single
+    matrix-vector product with NumPy.
+
+    Thread-safe: enrollment matches from the serial reader thread while CRUD
+    calls update the gallery from the event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vectors: Dict[str, object] = {}
+        self._names: List[str] = []
+        self._matrix = None  # Rebuilt lazily after changes (NumPy only)
+        self.device_names: List[str] = []
+        self.synced = False
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._vectors
+
+    def load(self, faces: List[dict]):
+        """Sync with a ``face_list`` response.
+
+        Drops embeddings of faces no longer on the device and loads any
+        embeddings the device reports.
+        """
+        names = [f["name"] for f in faces if "name" in f]
+        with self._lock:
+            present = set(names)
+            for name in list(self._vectors):
+                if name not in present:
+                    del self._vectors[name]
+            for face in faces:
+                embedding = face.get("embedding")
+                if face.get("name") and isinstance(embedding, list) and embedding:
+                    self._vectors[face["name"]] = _normalize(embedding)
+            self.device_names = names
+            self.synced = True
+            self._matrix = None
+
+    def add(self, name: str, embedding: List[float]):
+        with self._lock:
+            self._vectors[name] = _normalize(embedding)
+            if name not in self.device_names:
+                self.device_names.append(name)
+            self._matrix = None
+
+    def remove(self, name: str):
+        with self._lock:
+            self._vectors.pop(name, None)
+            if name in self.device_names:
+                self.device_names.remove(name)
+            self._matrix = None
+
+    def rename(self, old_name: str, new_name: str):
+        with self._lock:
+            if old_name in self._vectors:
+                self._vectors[new_name] = self._vectors.pop(old_name)
+            self.device_names = [
+                new_name if n == old_name else n for n in self.device_names
+            ]
+            self._matrix = None
+
+    def embedding(self, name: str) -> Optional[List[float]]:
+        """The stored (normalized) embedding for a name, as a list."""
+        with self._lock:
+            vec = self._vectors.get(name)
+        if vec is None:
+            return None
+        return vec.tolist() if NUMPY_AVAILABLE else list(vec)
+
+    def match(
+        self, embedding, exclude: Optional[str] = None
+    ) -> Optional[Tuple[str, float]]:
+        """Best ``(name, cosine similarity)`` for a normalized embedding.
+
+        ``exclude`` skips one name (re-enrolling the same person).
+        Returns None when the gallery has no other entries.
+        """
+        with self._lock:
+            if not self._vectors:
+                return None
+            if NUMPY_AVAILABLE:
+                if self._matrix is None:
+                    self._names = list(self._vectors)
+                    self._matrix = np.stack([self._vectors[n] for n in self._names])
+                scores = self._matrix @ np.asarray(embedding, dtype=np.float32)
+                if exclude in self._vectors:
+                    scores[self._names.index(exclude)] = -np.inf
+                best = int(np.argmax(scores))
+                if not np.isfinite(scores[best]):
+                    return None
+                return self._names[best], float(scores[best])
+
+            best = None
+            for name, vec in self._vectors.items():
+                if name == exclude:
+                    continue
+                score = _dot(vec, embedding)
+                if best is None or score > best[1]:
+                    best = (name, score)
+            return best
 
 
 class FaceEnrollmentSession:
@@ -66,6 +224,8 @@ class FaceEnrollmentSession:
         duration: float = 5.0,
         min_samples: int = 3,
         min_confidence: float = 0.5,
+        gallery: Optional[FaceGallery] = None,
+        allow_duplicate: bool = False,
     ):
         self.camera_session = camera_session
         self.crud_client = crud_client
@@ -73,11 +233,23 @@ class FaceEnrollmentSession:
         self.duration = duration
         self.min_samples = min_samples
         self.min_confidence = min_confidence
+        self.gallery = gallery
+        self.allow_duplicate = allow_duplicate
 
         self._samples: List[List[float]] = []
         self._start_time: Optional[float] = None
         self._active = False
         self.result: Optional[dict] = None  # {ok, error?}
+        self._reset_stats()
+
+    def _reset_stats(self):
+        # Running statistics over the normalized samples
+        self._sum = None
+        self._recent: List = []  # Last two normalized samples
+        self._min_similarity = 1.0
+        self._duplicate: Optional[dict] = None
+        self._matched_samples = 0
+        self._last_match = 0.0
 
     @property
     def active(self) -> bool:
@@ -88,6 +260,7 @@ class FaceEnrollmentSession:
         self._active = True
         self._start_time = time.time()
         self._samples = []
+        self._reset_stats()
         self.result = None
 
         # Update enrollment state on camera session
@@ -123,25 +296,82 @@ class FaceEnrollmentSession:
 
             embedding = face.get("embedding", [])
             if isinstance(embedding, list) and len(embedding) > 0:
-                self._samples.append(embedding)
+                self._add_sample(embedding)
 
         self._update_state()
 
+    def _add_sample(self, embedding: List[float]):
+        """Record a sample and fold it into the running statistics."""
+        self._samples.append(embedding)
+        vec = _normalize(embedding)
+
+        # Consistency: similarity to the previous two samples
+        for prev in self._recent:
+            self._min_similarity = min(self._min_similarity, _dot(prev, vec))
+        self._recent = self._recent[-1:] + [vec]
+
+        if self._sum is None:
+            self._sum = vec.copy() if NUMPY_AVAILABLE else list(vec)
+        elif NUMPY_AVAILABLE:
+            self._sum += vec
+        else:
+            self._sum = [a + b for a, b in zip(self._sum, vec)]
+
+    def quality(self) -> dict:
+        """Intra-sample quality of the collected embeddings.
+
+        ``consistency`` is the lowest similarity between neighbouring samples;
+        ``spread`` is 1 - |mean of the normalized samples|, which is 0 when all
+        samples agree and grows with their variance.
+        """
+        n = len(self._samples)
+        if n == 0:
+            return {"consistency": None, "spread": None}
+        length = math.sqrt(_dot(self._sum, self._sum))
+        return {
+            "consistency": round(self._min_similarity, 3),
+            "spread": round(max(0.0, 1 - length / n), 4),
+        }
+
+    def _check_duplicate(self, embedding) -> Optional[dict]:
+        """Match an embedding against the gallery, ignoring this name."""
+        if self.gallery is None:
+            return None
+        match = self.gallery.match(_normalize(embedding), exclude=self.name)
+        if match and match[1] >= DUPLICATE_THRESHOLD:
+            return {"name": match[0], "similarity": round(match[1], 3)}
+        return None
+
     def _update_state(self):
         """Update enrollment state on camera session for WebSocket broadcast."""
         if not self._active:
             self.camera_session.enrollment_state = None
             return
 
-        elapsed = time.time() - self._start_time
+        now = time.time()
+        elapsed = now - self._start_time
         remaining = max(0, self.duration - elapsed)
 
+        # Re-check the gallery with the running mean, at most every
+        # MATCH_INTERVAL and only when new samples arrived
+        n = len(self._samples)
+        if (
+            n > self._matched_samples
+            and now - self._last_match >= MATCH_INTERVAL
+            and self.gallery
+        ):
+            self._duplicate = self._check_duplicate(self._sum)
+            self._matched_samples = n
+            self._last_match = now
+
         self.camera_session.enrollment_state = {
             "active": True,
             "name": self.name,
-            "samples": len(self._samples),
+            "samples": n,
             "min_samples": self.min_samples,
             "remaining_seconds": round(remaining, 1),
+            "quality": self.quality(),
+            "duplicate": self._duplicate,
         }
 
     def _finish(self):
@@ -155,6 +385,8 @@ class FaceEnrollmentSession:
             "samples": len(self._samples),
             "min_samples": self.min_samples,
             "remaining_seconds": 0,
+            "quality": self.quality(),
+            "duplicate": self._duplicate,
         }
 
         if len(self._samples) < self.min_samples:
@@ -170,27 +402,43 @@ class FaceEnrollmentSession:
             )
             return
 
-        # Check variance: minimum pairwise similarity
-        if len(self._samples) >= 2:
-            min_sim = 1.0
-            for i in range(len(self._samples)):
-                for j in range(i + 1, min(i + 3, len(self._samples))):
-                    sim = _cosine_similarity(self._samples[i], self._samples[j])
-                    min_sim = min(min_sim, sim)
-
-            if min_sim < 0.8:
-                logger.warning(
-                    "Enrollment warning for '%s': low consistency (min_sim=%.2f)",
-                    self.name,
-                    min_sim,
-                )
+        quality = self.quality()
+        if len(self._samples) >= 2 and self._min_similarity < CONSISTENCY_THRESHOLD:
+            logger.warning(
+                "Enrollment warning for '%s': low consistency (min_sim=%.2f)",
+                self.name,
+                self._min_similarity,
+            )
 
         # Average and normalize
         averaged = _average_embeddings(self._samples)
+
+        duplicate = self._check_duplicate(averaged)
+        self.camera_session.enrollment_state["duplicate"] = duplicate
+        if duplicate and not self.allow_duplicate:
+            self.result = {
+                "ok": False,
+                "error": (
+                    f"Face already enrolled as '{duplicate['name']}' "
+                    f"(similarity {duplicate['similarity']:.2f})"
+                ),
+                "duplicate": duplicate,
+                "quality": quality,
+            }
+            logger.warning(
+                "Enrollment rejected for '%s': matches '%s' (%.2f)",
+                self.name,
+                duplicate["name"],
+                duplicate["similarity"],
+            )
+            return
+
         self.result = {
             "ok": True,
             "embedding": averaged,
             "samples_collected": len(self._samples),
+            "quality": quality,
+            "duplicate": duplicate,
         }
         logger.info(
             "Enrollment completed for '%s': %d samples collected",
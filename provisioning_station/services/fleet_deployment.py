@@ -0,0 +1,295 @@
+"""
+Fleet deployment - one solution/preset rolled out to many targets
+
+Each target is an ordinary deployment started through the DeploymentEngine
+with its own connection set. The fleet bounds how many run at once, applies
+a failure policy, and reports on a single WebSocket channel (the fleet ID):
+per-target events from the engine are forwarded there alongside aggregated
+``fleet_*`` messages.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from ..config import settings
+from ..models.deployment import (
+    Deployment,
+    DeploymentStatus,
+    FleetDeployment,
+    FleetFailurePolicy,
+    FleetTarget,
+)
+from ..models.solution import Solution
+from .deployment_engine import deployment_engine
+
+logger = logging.getLogger(__name__)
+
+# Connection keys used to label a target when no label is given
+LABEL_FIELDS = ("host", "recamera_ip", "nodered_host", "port")
+
+# Finished fleets kept for status queries
+MAX_COMPLETED_FLEETS = 20
+
+
+def deployment_progress(deployment: Optional[Deployment]) -> int:
+    """Overall step progress of a deployment (0-100)"""
+    if not deployment:
+        return 0
+    total = completed = 0
+    for device in deployment.devices:
+        for step in device.steps:
+            total += 1
+            if step.status in ("completed", "skipped"):
+                completed += 1
+            elif step.status == "running":
+                completed += step.progress / 100
+    return int(completed / total * 100) if total else 0
+
+
+def _default_label(index: int, device_connections: Dict[str, Dict[str, Any]]) -> str:
+    for connection in device_connections.values():
+        for field in LABEL_FIELDS:
+            if connection and connection.get(field):
+                return str(connection[field])
+    return f"target-{index + 1}"
+
+
+class FleetManager:
+    """Runs fleet deployments on top of the DeploymentEngine"""
+
+    def __init__(self, engine=None):
+        self.engine = engine or deployment_engine
+        self.fleets: Dict[str, FleetDeployment] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._websocket_manager = None
+
+    def set_websocket_manager(self, manager):
+        """Set WebSocket manager for broadcasting fleet updates"""
+        self._websocket_manager = manager
+
+    async def start_fleet(
+        self,
+        solution: Solution,
+        targets: List[Dict[str, Any]],
+        selected_devices: List[str] = None,
+        options: Dict[str, Any] = None,
+        preset_id: str = None,
+        concurrency: Optional[int] = None,
+        failure_policy: FleetFailurePolicy = FleetFailurePolicy.CONTINUE,
+    ) -> str:
+        """Start deploying the same solution to every target.
+
+        Args:
+            targets: One dict per target with ``device_connections`` and an
+                optional ``label``
+            concurrency: Targets deployed at once (defaults to settings)
+            failure_policy: Continue or stop after the first failed target
+
+        Returns:
+            Fleet ID, also the WebSocket channel for its updates
+        """
+        if not targets:
+            raise ValueError("No fleet targets given")
+
+        fleet = FleetDeployment(
+            id=str(uuid4()),
+            solution_id=solution.id,
+            preset_id=preset_id,
+            status=DeploymentStatus.RUNNING,
+            failure_policy=failure_policy,
+            concurrency=max(1, concurrency or settings.fleet_concurrency),
+            targets=[
+                FleetTarget(
+                    index=i,
+                    label=t.get("label")
+                    or _default_label(i, t.get("device_connections") or {}),
+                )
+                for i, t in enumerate(targets)
+            ],
+        )
+        self.fleets[fleet.id] = fleet
+        logger.info(
+            f"Starting fleet {fleet.id}: solution={solution.id}, "
+            f"targets={len(targets)}, concurrency={fleet.concurrency}"
+        )
+
+        connections = [t.get("device_connections") or {} for t in targets]
+        self._tasks[fleet.id] = asyncio.create_task(
+            self._run_fleet(fleet, solution, connections, selected_devices, options)
+        )
+        return fleet.id
+
+    async def _run_fleet(
+        self,
+        fleet: FleetDeployment,
+        solution: Solution,
+        connections: List[Dict[str, Dict[str, Any]]],
+        selected_devices: Optional[List[str]],
+        options: Optional[Dict[str, Any]],
+    ):
+        """Deploy all targets, at most ``fleet.concurrency`` at a time"""
+        semaphore = asyncio.Semaphore(fleet.concurrency)
+        halted = False
+
+        async def run_target(target: FleetTarget, device_connections):
+            nonlocal halted
+            async with semaphore:
+                if halted or fleet.status == DeploymentStatus.CANCELLED:
+                    target.status = DeploymentStatus.CANCELLED
+                    await self._broadcast_target(fleet, target)
+                    return
+
+                target.status = DeploymentStatus.RUNNING
+                target.started_at = datetime.utcnow()
+                try:
+                    target.deployment_id = await self.engine.start_deployment(
+                        solution=solution,
+                        device_connections=device_connections,
+                        selected_devices=selected_devices,
+                        options=options,
+                        preset_id=fleet.preset_id,
+                        fleet_id=fleet.id,
+                    )
+                except Exception as e:
+                    target.status = DeploymentStatus.FAILED
+                    target.error = str(e)
+                else:
+                    await self._broadcast(
+                        fleet.id,
+                        {
+                            "type": "fleet_target_started",
+                            "index": target.index,
+                            "label": target.label,
+                            "deployment_id": target.deployment_id,
+                        },
+                    )
+                    await self.engine.wait_for_deployment(target.deployment_id)
+                    deployment = self.engine.get_deployment(target.deployment_id)
+                    target.status = (
+                        deployment.status if deployment else DeploymentStatus.FAILED
+                    )
+                    if deployment and target.status != DeploymentStatus.COMPLETED:
+                        target.error = next(
+                            (d.error for d in deployment.devices if d.error), None
+                        )
+
+                target.completed_at = datetime.utcnow()
+                if (
+                    target.status == DeploymentStatus.FAILED
+                    and fleet.failure_policy == FleetFailurePolicy.STOP
+                ):
+                    halted = True
+                await self._broadcast_target(fleet, target)
+
+        try:
+            await asyncio.gather(
+                *(
+                    run_target(target, device_connections)
+                    for target, device_connections in zip(fleet.targets, connections)
+                )
+            )
+
+            if fleet.status != DeploymentStatus.CANCELLED:
+                if all(t.status == DeploymentStatus.COMPLETED for t in fleet.targets):
+                    fleet.status = DeploymentStatus.COMPLETED
+                else:
+                    fleet.status = DeploymentStatus.FAILED
+
+        except Exception as e:
+            logger.error(f"Fleet {fleet.id} failed: {e}")
+            fleet.status = DeploymentStatus.FAILED
+
+        finally:
+            fleet.completed_at = datetime.utcnow()
+            self._tasks.pop(fleet.id, None)
+            self._prune()
+            await self._broadcast(
+                fleet.id,
+                {
+                    "type": "fleet_completed",
+                    "status": fleet.status.value,
+                    "counts": fleet.counts(),
+                },
+            )
+
+    async def cancel_fleet(self, fleet_id: str):
+        """Cancel a fleet: pending targets never start, running ones are cancelled"""
+        fleet = self.fleets.get(fleet_id)
+        if not fleet or fleet.status != DeploymentStatus.RUNNING:
+            return
+        fleet.status = DeploymentStatus.CANCELLED
+        for target in fleet.targets:
+            if target.status == DeploymentStatus.RUNNING and target.deployment_id:
+                await self.engine.cancel_deployment(target.deployment_id)
+
+    async def wait_for_fleet(self, fleet_id: str):
+        """Wait until a fleet has finished"""
+        task = self._tasks.get(fleet_id)
+        if task:
+            await asyncio.shield(task)
+
+    def get_fleet(self, fleet_id: str) -> Optional[FleetDeployment]:
+        """Get fleet by ID"""
+        return self.fleets.get(fleet_id)
+
+    def target_progress(self, target: FleetTarget) -> int:
+        """Progress of one target (finished targets count as 100)"""
+        if target.status in (DeploymentStatus.PENDING, DeploymentStatus.RUNNING):
+            if not target.deployment_id:
+                return 0
+            return deployment_progress(self.engine.get_deployment(target.deployment_id))
+        return 100
+
+    def overall_progress(self, fleet: FleetDeployment) -> int:
+        """Average progress across all targets"""
+        if not fleet.targets:
+            return 0
+        total = sum(self.target_progress(t) for t in fleet.targets)
+        return int(total / len(fleet.targets))
+
+    def _prune(self):
+        """Forget the oldest finished fleets"""
+        finished = [
+            f
+            for f in self.fleets.values()
+            if f.completed_at and f.id not in self._tasks
+        ]
+        finished.sort(key=lambda f: f.completed_at)
+        for fleet in finished[:-MAX_COMPLETED_FLEETS]:
+            del self.fleets[fleet.id]
+
+    async def _broadcast_target(self, fleet: FleetDeployment, target: FleetTarget):
+        """Broadcast a finished target and the fleet's aggregated progress"""
+        await self._broadcast(
+            fleet.id,
+            {
+                "type": "fleet_target_completed",
+                "index": target.index,
+                "label": target.label,
+                "deployment_id": target.deployment_id,
+                "status": target.status.value,
+                "error": target.error,
+            },
+        )
+        await self._broadcast(
+            fleet.id,
+            {
+                "type": "fleet_progress",
+                "counts": fleet.counts(),
+                "overall_progress": self.overall_progress(fleet),
+            },
+        )
+
+    async def _broadcast(self, fleet_id: str, message: dict):
+        """Broadcast update to WebSocket clients of the fleet channel"""
+        if self._websocket_manager:
+            message["fleet_id"] = fleet_id
+            message["timestamp"] = datetime.utcnow().isoformat()
+            await self._websocket_manager.broadcast(fleet_id, message)
+
+
+# Global instance
+fleet_manager = FleetManager()
@@ -0,0 +1,370 @@
+"""
+In-memory low-latency HLS for the stream proxy.
+
+FFmpeg writes fragmented MP4 (CMAF) to a pipe. Fmp4Splitter cuts that byte
+stream into the init segment (ftyp + moov) and one part per moof + mdat
+fragment. HlsWindow groups the parts into segments that start on a keyframe
+and keeps the newest few in RAM. It renders an LL-HLS playlist and serves
+blocking playlist reloads and preload-hinted parts, so no file ever touches
+the disk and players can stay about a second behind the camera.
+"""
+
+import asyncio
+import math
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Iterator, List, Optional, Tuple
+
+# Target durations (seconds); FFmpeg cuts a fragment per keyframe and at
+# least every PART_TARGET, segments close on the first keyframe past
+# SEGMENT_TARGET
+PART_TARGET = 0.2
+SEGMENT_TARGET = 1.0
+
+# Segments kept in memory, and how many of the newest list their parts
+WINDOW_SEGMENTS = 6
+PART_SEGMENTS = 3
+
+# Upper bound for one top-level MP4 box; protects against a corrupt pipe
+MAX_BOX_SIZE = 64 * 1024 * 1024
+
+# trun/tfhd flag bits (ISO/IEC 14496-12)
+_SAMPLE_IS_NON_SYNC = 0x00010000
+
+
+def _boxes(
+    data: bytes, start: int = 0, end: Optional[int] = None
+) -> Iterator[Tuple[bytes, int, int]]:
+    """Yield ``(type, payload_start, box_end)`` for the boxes in a range"""
+    end = len(data) if end is None else end
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, pos)
+        header = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", data, pos + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header or pos + size > end:
+            return
+        yield box_type, pos + header, pos + size
+        pos += size
+
+
+def _find(
+    data: bytes, path: List[bytes], start: int = 0, end: Optional[int] = None
+) -> Optional[Tuple[int, int]]:
+    """Payload range of the first box at ``path`` below the given range"""
+    for box_type, payload, box_end in _boxes(data, start, end):
+        if box_type == path[0]:
+            if len(path) == 1:
+                return payload, box_end
+            found = _find(data, path[1:], payload, box_end)
+            if found:
+                return found
+    return None
+
+
+@dataclass
+class TrackDefaults:
+    """Per-track values from the init segment that fragments may omit"""
+
+    timescale: int = 90000
+    sample_duration: int = 0
+    sample_flags: int = 0
+
+
+def parse_init(init: bytes) -> TrackDefaults:
+    """Read the video track's timescale and trex defaults from ftyp + moov"""
+    defaults = TrackDefaults()
+    mdhd = _find(init, [b"moov", b"trak", b"mdia", b"mdhd"])
+    if mdhd:
+        start = mdhd[0]
+        version = init[start]
+        offset = start + (20 if version == 1 else 12)
+        defaults.timescale = struct.unpack_from(">I", init, offset)[0] or 90000
+    trex = _find(init, [b"moov", b"mvex", b"trex"])
+    if trex:
+        # version/flags, track_ID, sample_description_index, then defaults
+        duration, _size, flags = struct.unpack_from(">III", init, trex[0] + 12)
+        defaults.sample_duration = duration
+        defaults.sample_flags = flags
+    return defaults
+
+
+def parse_fragment(moof: bytes, defaults: TrackDefaults) -> Tuple[float, bool]:
+    """Duration in seconds of a moof's first track, and whether it starts
+    on a keyframe"""
+    traf = _find(moof, [b"moof", b"traf"])
+    if not traf:
+        return 0.0, False
+
+    sample_duration = defaults.sample_duration
+    sample_flags = defaults.sample_flags
+    tfhd = _find(moof, [b"tfhd"], *traf)
+    if tfhd:
+        pos = tfhd[0]
+        flags = int.from_bytes(moof[pos + 1 : pos + 4], "big")
+        pos += 8  # version/flags, track_ID
+        if flags & 0x01:
+            pos += 8  # base_data_offset
+        if flags & 0x02:
+            pos += 4  # sample_description_index
+        if flags & 0x08:
+            sample_duration = struct.unpack_from(">I", moof, pos)[0]
+            pos += 4
+        if flags & 0x10:
+            pos += 4  # default_sample_size
+        if flags & 0x20:
+            sample_flags = struct.unpack_from(">I", moof, pos)[0]
+
+    ticks = 0
+    independent = False
+    first = True
+    for box_type, payload, box_end in _boxes(moof, *traf):
+        if box_type != b"trun":
+            continue
+        flags = int.from_bytes(moof[payload + 1 : payload + 4], "big")
+        count = struct.unpack_from(">I", moof, payload + 4)[0]
+        pos = payload + 8
+        if flags & 0x001:
+            pos += 4  # data_offset
+        first_flags = None
+        if flags & 0x004:
+            first_flags = struct.unpack_from(">I", moof, pos)[0]
+            pos += 4
+        for n in range(count):
+            duration, this_flags = sample_duration, sample_flags
+            if flags & 0x100:
+                duration = struct.unpack_from(">I", moof, pos)[0]
+                pos += 4
+            if flags & 0x200:
+                pos += 4  # sample_size
+            if flags & 0x400:
+                this_flags = struct.unpack_from(">I", moof, pos)[0]
+                pos += 4
+            if flags & 0x800:
+                pos += 4  # composition time offset
+            if n == 0 and first_flags is not None:
+                this_flags = first_flags
+            if first and n == 0:
+                independent = not this_flags & _SAMPLE_IS_NON_SYNC
+            ticks += duration
+        first = False
+    return ticks / defaults.timescale, independent
+
+
+class Fmp4Splitter:
+    """Incremental splitter for a fragmented MP4 byte stream.
+
+    ``feed`` returns ``("init", bytes)`` once for ftyp + moov, then
+    ``("part", moof + mdat)`` per fragment.
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._init = bytearray()
+        self._moof: Optional[bytes] = None
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, bytes]]:
+        buf = self._buf
+        buf += chunk
+        out = []
+        pos = 0
+        while len(buf) - pos >= 8:
+            size, box_type = struct.unpack_from(">I4s", buf, pos)
+            header = 8
+            if size == 1:
+                if len(buf) - pos < 16:
+                    break
+                size = struct.unpack_from(">Q", buf, pos + 8)[0]
+                header = 16
+            if size < header or size > MAX_BOX_SIZE:
+                raise ValueError(f"Corrupt MP4 box '{box_type!r}' of {size} bytes")
+            if len(buf) - pos < size:
+                break
+
+            box = bytes(buf[pos : pos + size])
+            pos += size
+            if box_type in (b"ftyp", b"moov"):
+                self._init += box
+                if box_type == b"moov":
+                    out.append(("init", bytes(self._init)))
+            elif box_type == b"moof":
+                self._moof = box
+            elif box_type == b"mdat" and self._moof is not None:
+                out.append(("part", self._moof + box))
+                self._moof = None
+        if pos:
+            del buf[:pos]
+        return out
+
+
+@dataclass
+class HlsPart:
+    data: bytes
+    duration: float
+    independent: bool
+
+
+@dataclass
+class HlsSegment:
+    msn: int  # Media sequence number
+    parts: List[HlsPart] = field(default_factory=list)
+    complete: bool = False
+
+    @property
+    def duration(self) -> float:
+        return sum(p.duration for p in self.parts)
+
+    @property
+    def data(self) -> bytes:
+        return b"".join(p.data for p in self.parts)
+
+
+class HlsWindow:
+    """Bounded in-memory LL-HLS rendition fed by fMP4 fragments"""
+
+    def __init__(
+        self,
+        segment_target: float = SEGMENT_TARGET,
+        part_target: float = PART_TARGET,
+        max_segments: int = WINDOW_SEGMENTS,
+    ):
+        self.segment_target = segment_target
+        self.part_target = part_target
+        self.max_segments = max_segments
+        self.init: Optional[bytes] = None
+        self.segments: Deque[HlsSegment] = deque()
+        self.closed = False
+        self._defaults = TrackDefaults()
+        self._max_part = 0.0
+        self._event = asyncio.Event()
+        self.updated_at = 0.0
+
+    # ---- feeding (event loop only) ----
+
+    def set_init(self, init: bytes):
+        self.init = init
+        self._defaults = parse_init(init)
+
+    def add_part(self, data: bytes):
+        """Append a moof + mdat fragment, opening a segment on keyframes"""
+        duration, independent = parse_fragment(data, self._defaults)
+        current = self.segments[-1] if self.segments else None
+        if current and independent and current.duration >= self.segment_target:
+            current.complete = True
+            current = None
+        if current is None:
+            if not independent and not self.segments:
+                return  # Players need the first segment to start on a keyframe
+            msn = self.segments[-1].msn + 1 if self.segments else 0
+            current = HlsSegment(msn)
+            self.segments.append(current)
+            while len(self.segments) > self.max_segments:
+                self.segments.popleft()
+
+        current.parts.append(HlsPart(data, duration, independent))
+        self._max_part = max(self._max_part, duration)
+        self.updated_at = time.monotonic()
+        self._notify()
+
+    def close(self):
+        self.closed = True
+        self._notify()
+
+    def _notify(self):
+        event, self._event = self._event, asyncio.Event()
+        event.set()
+
+    # ---- serving ----
+
+    def has(self, msn: int, part: Optional[int] = None) -> bool:
+        """True once the playlist includes segment ``msn`` (complete), or
+        part ``part`` of it"""
+        if not self.segments:
+            return False
+        last = self.segments[-1]
+        if msn < last.msn:
+            return True
+        if msn > last.msn:
+            return False
+        if part is None:
+            return last.complete
+        return len(last.parts) > part
+
+    async def wait_for(self, msn: int, part: Optional[int], timeout: float) -> bool:
+        """Block until ``has(msn, part)``; False on timeout or close"""
+        deadline = time.monotonic() + timeout
+        while not self.has(msn, part):
+            remaining = deadline - time.monotonic()
+            if self.closed or remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def _segment(self, msn: int) -> Optional[HlsSegment]:
+        if not self.segments:
+            return None
+        index = msn - self.segments[0].msn
+        if 0 <= index < len(self.segments):
+            return self.segments[index]
+        return None
+
+    def get_segment(self, msn: int) -> Optional[bytes]:
+        segment = self._segment(msn)
+        return segment.data if segment and segment.complete else None
+
+    def get_part(self, msn: int, index: int) -> Optional[bytes]:
+        segment = self._segment(msn)
+        if segment and index < len(segment.parts):
+            return segment.parts[index].data
+        return None
+
+    @property
+    def blocking_timeout(self) -> float:
+        """How long a blocking request may wait (three target durations)"""
+        return 3 * self.target_duration
+
+    @property
+    def target_duration(self) -> int:
+        longest = max((s.duration for s in self.segments), default=0.0)
+        return max(1, math.ceil(max(longest, self.segment_target)))
+
+    def playlist(self) -> str:
+        part_target = max(self.part_target, self._max_part)
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:9",
+            f"#EXT-X-TARGETDURATION:{self.target_duration}",
+            f"#EXT-X-PART-INF:PART-TARGET={part_target:.3f}",
+            "#EXT-X-SERVER-CONTROL:CAN-BLOCK-RELOAD=YES,"
+            f"PART-HOLD-BACK={3 * part_target:.3f}",
+            f"#EXT-X-MEDIA-SEQUENCE:{self.segments[0].msn if self.segments else 0}",
+            '#EXT-X-MAP:URI="init.mp4"',
+        ]
+        with_parts = len(self.segments) - PART_SEGMENTS
+        for i, segment in enumerate(self.segments):
+            if i >= with_parts:
+                for n, part in enumerate(segment.parts):
+                    attrs = (
+                        f'DURATION={part.duration:.3f},URI="part{segment.msn}.{n}.m4s"'
+                    )
+                    if part.independent:
+                        attrs += ",INDEPENDENT=YES"
+                    lines.append(f"#EXT-X-PART:{attrs}")
+            if segment.complete:
+                lines.append(f"#EXTINF:{segment.duration:.3f},")
+                lines.append(f"seg{segment.msn}.m4s")
+        if self.segments and not self.closed:
+            last = self.segments[-1]
+            lines.append(
+                f'#EXT-X-PRELOAD-HINT:TYPE=PART,URI="part{last.msn}.{len(last.parts)}.m4s"'
+            )
+        return "\n".join(lines) + "\n"
@@ -19,6 +19,7 @@ from typing import Any, Dict, Optional
 from ..config import settings
 from ..models.kiosk import KioskConfigResponse, KioskStatus
 from .deployment_history import deployment_history
+from .ssh_pool import get_ssh_pool
 
 logger = logging.getLogger(__name__)
 
@@ -379,10 +380,7 @@ class KioskManager:
     ) -> bool:
         """Configure Kiosk mode on remote device via SSH"""
         try:
-            import paramiko
-
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            client = get_ssh_pool().client()
 
             # Connect
             await asyncio.to_thread(
@@ -449,10 +447,7 @@ class KioskManager:
     ) -> bool:
         """Remove Kiosk mode from remote device via SSH"""
         try:
-            import paramiko
-
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            client = get_ssh_pool().client()
 
             await asyncio.to_thread(
                 client.connect,
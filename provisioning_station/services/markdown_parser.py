@@ -129,6 +129,8 @@ class DeploymentStep:
     type: str = ""
     required: bool = True
     config_file: Optional[str] = None
+    depends_on: list[str] = field(default_factory=list)  # Step IDs run first
+    parallel: bool = False  # Run alongside the previous step
     section: SectionContent = field(default_factory=SectionContent)
     targets: list[TargetInfo] = field(default_factory=list)
 
@@ -546,6 +548,10 @@ def parse_deployment_step(
         type=step_type,
         required=attrs.get("required", True),
         config_file=attrs.get("config"),
+        depends_on=[
+            d.strip() for d in str(attrs.get("depends_on", "")).split(",") if d.strip()
+        ],
+        parallel=attrs.get("parallel") is True,
         section=section,
     )
 
@@ -1342,6 +1348,8 @@ def parse_guide_multilang(
                 type=base_step.type,
                 required=base_step.required,
                 config_file=base_step.config_file,
+                depends_on=list(base_step.depends_on),
+                parallel=base_step.parallel,
                 section=SectionContent(
                     title=Localized(),
                     subtitle=Localized(),
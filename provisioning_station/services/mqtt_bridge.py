@@ -2,12 +2,17 @@
 MQTT Bridge Service - MQTT to WebSocket bridging
 
 Connects to MQTT brokers and forwards messages to WebSocket clients.
+Each WebSocket reads from its own bounded MessageBuffer, so a chatty topic
+and a slow browser cost a fixed amount of memory instead of growing a queue.
 """
 
 import asyncio
 import json
 import logging
+import threading
+import time
 import uuid
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from typing import Callable, Dict, List, Optional, Set
 
@@ -33,6 +38,122 @@ except ImportError:
     )
 
 
+# MessageBuffer drop policies
+DROP_OLDEST = "drop_oldest"  # Keep the newest messages in arrival order
+LATEST_PER_TOPIC = "latest_per_topic"  # Keep only the newest value per topic
+DROP_POLICIES = (DROP_OLDEST, LATEST_PER_TOPIC)
+
+
+class MessageBuffer:
+    """Bounded buffer between the paho network thread and one WebSocket.
+
+    Called from the paho thread for each message; the event loop is only
+    woken when the buffer goes from empty to non-empty, so a burst costs one
+    callback instead of one coroutine per message. When full, the oldest
+    message is dropped (``drop_oldest``), or with ``latest_per_topic`` a new
+    value replaces the pending one for its topic. ``max_rate`` caps the
+    messages per second handed to the consumer; messages arriving faster are
+    dropped or coalesced by the policy while the consumer waits.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        maxsize: int = 100,
+        policy: str = DROP_OLDEST,
+        max_rate: float = 0,
+    ):
+        if policy not in DROP_POLICIES:
+            raise ValueError(
+                f"Unknown drop policy '{policy}' (expected one of {DROP_POLICIES})"
+            )
+        self._loop = loop
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.max_rate = max_rate
+        self._lock = threading.Lock()
+        self._messages: deque = deque()
+        self._latest: "OrderedDict[str, dict]" = OrderedDict()
+        self._event = asyncio.Event()
+        self._next_at = 0.0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __call__(self, message: dict):
+        self.offer(message)
+
+    def offer(self, message: dict):
+        """Add a message (thread-safe; called from the paho thread)."""
+        with self._lock:
+            was_empty = not (self._messages or self._latest)
+            if self.policy == LATEST_PER_TOPIC:
+                topic = message.get("topic", "")
+                if topic in self._latest:
+                    self.coalesced += 1
+                    self._latest.move_to_end(topic)
+                elif len(self._latest) >= self.maxsize:
+                    self._latest.popitem(last=False)
+                    self.dropped += 1
+                self._latest[topic] = message
+            else:
+                if len(self._messages) >= self.maxsize:
+                    self._messages.popleft()
+                    self.dropped += 1
+                self._messages.append(message)
+        if was_empty:
+            try:
+                self._loop.call_soon_threadsafe(self._event.set)
+            except RuntimeError:
+                pass  # Loop closed; the consumer is gone
+
+    def _pop(self) -> Optional[dict]:
+        with self._lock:
+            if self._messages:
+                return self._messages.popleft()
+            if self._latest:
+                return self._latest.popitem(last=False)[1]
+            self._event.clear()
+            return None
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """Next message, or None if nothing arrives within ``timeout``."""
+        if self.max_rate > 0:
+            wait = self._next_at - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+        deadline = time.monotonic() + timeout
+        while True:
+            message = self._pop()
+            if message is not None:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+        self.delivered += 1
+        if self.max_rate > 0:
+            self._next_at = time.monotonic() + 1 / self.max_rate
+        return message
+
+    def qsize(self) -> int:
+        with self._lock:
+            return len(self._messages) + len(self._latest)
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "max_rate": self.max_rate,
+            "pending": self.qsize(),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
+
 @dataclass
 class MqttSubscription:
     """Information about an MQTT subscription"""
@@ -79,7 +200,9 @@ class MqttBridge:
             broker: MQTT broker hostname or IP
             port: MQTT broker port
             topic: MQTT topic to subscribe to
-            callback: Async callback function(message: dict) to receive messages
+            callback: Receives each message dict. A MessageBuffer (or other
+                sync callable) is called on the paho thread; an async
+                function is scheduled on the event loop per message
             username: Optional MQTT username
             password: Optional MQTT password
             subscription_id: Optional subscription ID (auto-generated if not provided)
@@ -199,8 +322,6 @@ class MqttBridge:
                 except json.JSONDecodeError:
                     data = {"raw": payload}
 
-                import time
-
                 message = {
                     "topic": msg.topic,
                     "payload": data,
@@ -208,7 +329,7 @@ class MqttBridge:
                 }
 
                 # Forward to all callbacks
-                for callback in subscription.callbacks:
+                for callback in list(subscription.callbacks):
                     if asyncio.iscoroutinefunction(callback):
                         asyncio.run_coroutine_threadsafe(callback(message), self._loop)
                     else:
@@ -301,6 +422,9 @@ class MqttBridge:
             "connected": sub.connected,
             "error": sub.error,
             "message_count": sub.message_count,
+            "subscribers": [
+                cb.stats() for cb in sub.callbacks if isinstance(cb, MessageBuffer)
+            ],
         }
 
     def list_subscriptions(self) -> List[dict]:
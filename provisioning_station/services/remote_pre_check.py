@@ -10,6 +10,8 @@ from typing import Any, Callable, Dict, Optional
 
 from pydantic import BaseModel
 
+from .ssh_pool import retire
+
 logger = logging.getLogger(__name__)
 
 
@@ -276,6 +278,9 @@ class RemotePreCheckService:
                     )
                 return False
 
+            # The session predates the docker group; don't pool it
+            retire(ssh_client)
+
             if progress_callback:
                 await progress_callback(
                     "install_docker", 100, "Docker installed successfully"
@@ -319,6 +324,8 @@ class RemotePreCheckService:
                     )
                 return False
 
+            retire(ssh_client)
+
             if progress_callback:
                 await progress_callback(
                     "fix_permission",
@@ -6,23 +6,74 @@ cached path.  Local paths are resolved against a base directory as before.
 All ``path`` / ``file`` fields in device YAML configs can therefore hold
 either a relative local path **or** an ``https://`` URL – the resolver
 handles both transparently.
+
+Downloaded files live in a content-addressed DownloadCache (deduplicated,
+checksums recorded once, LRU-evicted under a byte budget). Downloads share
+one pooled HTTP client (HTTP/2 when ``h2`` is installed)
+and a global concurrency limit. ``prefetch`` fetches a batch of assets
+concurrently; a caller resolving a URL that is already being fetched waits
+for that download instead of starting another. Interrupted downloads keep
+their ``.part`` file and resume with an HTTP Range request. Blobs resolved
+inside ``hold_assets()`` (one per running deployment) are not evicted until
+every deployment holding them has finished.
 """
 
+import asyncio
 import hashlib
 import logging
 import os
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, Tuple, Union
 from urllib.parse import unquote, urlparse
 
+from .download_cache import DownloadCache, hash_file
+
 logger = logging.getLogger(__name__)
 
+# HTTP/2 needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Downloads in flight at once, across all deployments
+MAX_PARALLEL_DOWNLOADS = 4
+
+# Suffixes for an incomplete download and its resume validator (ETag or
+# Last-Modified of the response the partial data came from)
+PARTIAL_SUFFIX = ".part"
+VALIDATOR_SUFFIX = ".part.validator"
+
+# An asset to fetch: URL and optional checksums
+Asset = Tuple[str, Optional[Dict[str, str]]]
+
 
 class ResourceResolver:
     """Download and cache remote resources."""
 
-    def __init__(self, cache_dir: Path):
+    def __init__(self, cache_dir: Path, max_bytes: int = 0, offline: bool = False):
         self.cache_dir = cache_dir / "downloads"
+        self.cache = DownloadCache(self.cache_dir, max_bytes)
+        # Serve only what is cached (e.g. from an imported asset bundle)
+        self.offline = offline
+        # Shared per event loop: clients by trust_env, and the download limit
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._clients: Dict[bool, Any] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # cache path -> running download, so concurrent callers share one,
+        # and how many callers await it (cancelled when the last one leaves)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._waiters: Dict[str, int] = {}
+        # sha256 -> number of hold_assets() scopes using the blob, and the
+        # scope of the current task (inherited by the tasks it starts)
+        self._holds: Dict[str, int] = {}
+        self._scope: ContextVar[Optional[Set[str]]] = ContextVar(
+            f"resolver_holds_{id(self)}", default=None
+        )
 
     # ------------------------------------------------------------------
     # Public helpers
@@ -61,55 +112,224 @@ class ResourceResolver:
             return str(Path(base_path) / reference)
         return reference
 
+    @contextmanager
+    def hold_assets(self) -> Iterator[None]:
+        """Keep blobs resolved in this block (and tasks started from it) out
+        of eviction until it exits. Nested blocks share the outer hold."""
+        if self._scope.get() is not None:
+            yield
+            return
+        held: Set[str] = set()
+        token = self._scope.set(held)
+        try:
+            yield
+        finally:
+            self._scope.reset(token)
+            for sha256 in held:
+                self._holds[sha256] -= 1
+                if not self._holds[sha256]:
+                    del self._holds[sha256]
+
+    def held_blobs(self) -> Set[str]:
+        """Blobs in use by running deployments."""
+        return set(self._holds)
+
+    def _hold(self, url: str):
+        held = self._scope.get()
+        entry = self.cache.urls.get(url)
+        if held is None or entry is None or entry.sha256 in held:
+            return
+        held.add(entry.sha256)
+        self._holds[entry.sha256] = self._holds.get(entry.sha256, 0) + 1
+
     # ------------------------------------------------------------------
     # Download & cache
     # ------------------------------------------------------------------
 
+    async def prefetch(
+        self,
+        assets: Iterable[Asset],
+        progress_callback: Optional[Callable] = None,
+    ) -> Dict[str, Union[str, Exception]]:
+        """Download many URLs concurrently (bounded by MAX_PARALLEL_DOWNLOADS).
+
+        Returns ``{url: local path or the exception}``; failures are not
+        raised, so a later ``resolve`` can retry and report them in context.
+        """
+        unique: Dict[str, Optional[Dict[str, str]]] = {}
+        for url, checksum in assets:
+            if self.is_url(url):
+                unique.setdefault(url, checksum)
+        if not unique:
+            return {}
+
+        results = await asyncio.gather(
+            *(
+                self._download_and_cache(url, checksum, progress_callback)
+                for url, checksum in unique.items()
+            ),
+            return_exceptions=True,
+        )
+        for url, result in zip(unique, results):
+            if isinstance(result, Exception):
+                logger.warning("Prefetch failed for %s: %s", url, result)
+        return dict(zip(unique, results))
+
+    def _cache_path(self, url: str) -> Path:
+        url_hash = hashlib.sha256(url.encode()).hexdigest()[:16]
+        return self.cache_dir / url_hash / self._filename_from_url(url)
+
     async def _download_and_cache(
         self,
         url: str,
         checksum: Optional[Dict[str, str]] = None,
         progress_callback: Optional[Callable] = None,
     ) -> str:
-        """Download *url* into the cache directory (if not already cached)."""
-        url_hash = hashlib.sha256(url.encode()).hexdigest()[:16]
-        filename = self._filename_from_url(url)
-        cache_dir = self.cache_dir / url_hash
-        cache_path = cache_dir / filename
+        """Download *url* into the cache directory (if not already cached).
+
+        Joins a download of the same URL that is already running; the
+        download is cancelled only when every caller waiting on it is.
+        """
+        key = str(self._cache_path(url))
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._fetch(url, checksum, progress_callback))
+            self._inflight[key] = task
+
+            def _done(t: asyncio.Future, key: str = key):
+                if self._inflight.get(key) is t:
+                    del self._inflight[key]
+
+            task.add_done_callback(_done)
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            path = await asyncio.shield(task)
+            self._hold(url)
+            return path
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                task.cancel()  # No-op once done; stops an abandoned download
+
+    async def _fetch(
+        self,
+        url: str,
+        checksum: Optional[Dict[str, str]] = None,
+        progress_callback: Optional[Callable] = None,
+    ) -> str:
+        cache = self.cache
+        cache_path = self._cache_path(url)
+        filename = cache_path.name
 
         # Check cache – if file exists and checksum matches, skip download
-        if cache_path.exists():
-            if checksum and not self._verify_checksum(cache_path, checksum):
+        cached = cache.lookup(url)
+        if cached is None and cache_path.exists():
+            # Downloaded before the index existed: hash it once and adopt it
+            digests = await asyncio.to_thread(hash_file, cache_path)
+            cache.adopt(url, cache_path, cache_path, digests)
+            cached = cache_path
+        if cached is not None:
+            if checksum and not await self._checksum_ok(url, checksum):
                 logger.info("Cached file checksum mismatch, re-downloading: %s", url)
+                cache.forget(url)
             else:
-                logger.info("Using cached file: %s", cache_path)
-                return str(cache_path)
+                logger.info("Using cached file: %s", cached)
+                cache.save()
+                return str(cached)
+
+        if self.offline:
+            raise RuntimeError(
+                f"{url} is not in the download cache and offline mode is on; "
+                "import an asset bundle that contains it"
+            )
 
         # Download
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        logger.info("Downloading %s → %s", url, cache_path)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
 
-        if progress_callback:
-            await self._report(progress_callback, f"Downloading {filename}...")
+        async with self._download_slot():
+            logger.info("Downloading %s → %s", url, cache_path)
+            if progress_callback:
+                await self._report(progress_callback, f"Downloading {filename}...")
 
-        try:
-            await self._stream_download(url, cache_path, progress_callback)
-        except Exception as exc:
-            # Clean up partial download
-            if cache_path.exists():
-                cache_path.unlink()
-            raise RuntimeError(f"Download failed for {url}: {exc}") from exc
+            try:
+                await self._stream_download(url, cache_path, progress_callback)
+            except Exception as exc:
+                # Clean up partial download (a .part file stays for resuming)
+                if cache_path.exists():
+                    cache_path.unlink()
+                raise RuntimeError(f"Download failed for {url}: {exc}") from exc
+
+        digests = await asyncio.to_thread(hash_file, cache_path)
+        sha256 = cache.adopt(url, cache_path, cache_path, digests)
 
         # Verify checksum after download
-        if checksum and not self._verify_checksum(cache_path, checksum):
-            cache_path.unlink()
+        if checksum and not cache.digests_match(url, checksum):
+            cache.forget(url)
+            cache.save()
             raise RuntimeError(f"Checksum verification failed after downloading {url}")
 
+        cache.evict(keep={sha256, *self._holds})
+        cache.save()
+
         if progress_callback:
             await self._report(progress_callback, f"Downloaded {filename}")
 
         return str(cache_path)
 
+    async def _checksum_ok(self, url: str, checksum: Dict[str, str]) -> bool:
+        """Match *checksum* against the cache index, hashing (off the event
+        loop) only digests the index has not recorded yet."""
+        missing = self.cache.missing_digests(url, checksum)
+        if missing:
+            digests = await asyncio.to_thread(
+                hash_file, self.cache.path_for(url), missing
+            )
+            self.cache.record_digests(url, digests)
+        return self.cache.digests_match(url, checksum)
+
+    def _bind_loop(self):
+        """Reset loop-bound state when first used from a new event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._clients = {}
+            self._semaphore = asyncio.Semaphore(MAX_PARALLEL_DOWNLOADS)
+
+    def _download_slot(self) -> asyncio.Semaphore:
+        self._bind_loop()
+        return self._semaphore
+
+    def _client(self, trust_env: bool = True):
+        """Pooled HTTP client shared by all downloads on this event loop."""
+        import httpx
+
+        self._bind_loop()
+        client = self._clients.get(trust_env)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=httpx.Timeout(30.0, read=120.0),
+                trust_env=trust_env,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=MAX_PARALLEL_DOWNLOADS * 2,
+                    max_keepalive_connections=MAX_PARALLEL_DOWNLOADS,
+                ),
+            )
+            self._clients[trust_env] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP clients (on shutdown)."""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+
     # ------------------------------------------------------------------
     # Internals
     # ------------------------------------------------------------------
@@ -127,10 +347,9 @@ class ResourceResolver:
         Tries up to MAX_RETRIES times using the system proxy settings.
         If all attempts fail, makes one final attempt bypassing the proxy
         (common fix for Windows machines with Clash/V2Ray proxies that
-        interfere with CDN downloads).
+        interfere with CDN downloads). Each attempt resumes from the data
+        received so far.
         """
-        import asyncio
-
         last_error: Optional[Exception] = None
 
         for attempt in range(1, self.MAX_RETRIES + 1):
@@ -155,9 +374,6 @@ class ResourceResolver:
                             f"Download interrupted, retrying ({attempt}/{self.MAX_RETRIES})...",
                         )
                     await asyncio.sleep(wait)
-                    # Clean up partial file
-                    if dest.exists():
-                        dest.unlink()
 
         # All proxy-aware attempts failed — try once more bypassing proxy
         logger.info("All proxy attempts failed, trying direct connection for %s", url)
@@ -166,8 +382,6 @@ class ResourceResolver:
                 progress_callback,
                 "Retrying with direct connection (bypassing proxy)...",
             )
-        if dest.exists():
-            dest.unlink()
         try:
             await self._stream_download_once(
                 url, dest, progress_callback, trust_env=False
@@ -188,32 +402,85 @@ class ResourceResolver:
     ) -> None:
         """Single attempt to stream-download *url* to *dest*.
 
+        Data goes to ``dest.part``, renamed to *dest* when complete. If a
+        partial file and its validator exist, only the rest is requested
+        (``Range`` + ``If-Range``); a server that ignores the range or
+        reports a changed file gets a fresh download.
+
         Set *trust_env=False* to ignore system proxy settings.
         """
-        import httpx
+        part = dest.with_name(dest.name + PARTIAL_SUFFIX)
+        validator_file = dest.with_name(dest.name + VALIDATOR_SUFFIX)
+
+        offset = part.stat().st_size if part.exists() else 0
+        validator = validator_file.read_text() if validator_file.exists() else None
+        headers = {}
+        if offset and validator:
+            headers = {"Range": f"bytes={offset}-", "If-Range": validator}
+
+        client = self._client(trust_env)
+        async with client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 416:
+                # Range past the end: the partial file is stale
+                part.unlink(missing_ok=True)
+                validator_file.unlink(missing_ok=True)
+            response.raise_for_status()
+
+            resumed = (
+                bool(headers)
+                and response.status_code == 206
+                and self._range_start(response) == offset
+            )
+            if not resumed:
+                offset = 0
+            else:
+                logger.info("Resuming %s at %d bytes", dest.name, offset)
+
+            validator = self._validator(response)
+            if validator:
+                validator_file.write_text(validator)
+            else:
+                validator_file.unlink(missing_ok=True)
+
+            total = int(response.headers.get("content-length", 0))
+            if total:
+                total += offset
+            downloaded = offset
+
+            with open(part, "ab" if resumed else "wb") as f:
+                async for chunk in response.aiter_bytes(chunk_size=65536):
+                    f.write(chunk)
+                    downloaded += len(chunk)
+
+                    if progress_callback and total > 0:
+                        pct = min(99, downloaded * 100 // total)
+                        await self._report(
+                            progress_callback,
+                            f"Downloading {dest.name} ({downloaded // 1024}KB / {total // 1024}KB)",
+                            pct,
+                        )
+
+        if total and downloaded < total:
+            raise IOError(f"Connection closed at {downloaded} of {total} bytes")
+        part.replace(dest)
+        validator_file.unlink(missing_ok=True)
+
+    @staticmethod
+    def _range_start(response) -> Optional[int]:
+        """First byte position of a 206 response's Content-Range."""
+        value = response.headers.get("content-range", "")
+        try:
+            return int(value.split()[1].split("-")[0])
+        except (IndexError, ValueError):
+            return None
 
-        timeout = httpx.Timeout(30.0, read=120.0)
-        async with httpx.AsyncClient(
-            follow_redirects=True, timeout=timeout, trust_env=trust_env
-        ) as client:
-            async with client.stream("GET", url) as response:
-                response.raise_for_status()
-
-                total = int(response.headers.get("content-length", 0))
-                downloaded = 0
-
-                with open(dest, "wb") as f:
-                    async for chunk in response.aiter_bytes(chunk_size=65536):
-                        f.write(chunk)
-                        downloaded += len(chunk)
-
-                        if progress_callback and total > 0:
-                            pct = min(99, downloaded * 100 // total)
-                            await self._report(
-                                progress_callback,
-                                f"Downloading {dest.name} ({downloaded // 1024}KB / {total // 1024}KB)",
-                                pct,
-                            )
+    @staticmethod
+    def _validator(response) -> Optional[str]:
+        """Strong ETag or Last-Modified, usable in If-Range."""
+        etag = response.headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return response.headers.get("last-modified")
 
     @staticmethod
     def _filename_from_url(url: str) -> str:
@@ -223,29 +490,6 @@ class ResourceResolver:
         name = Path(path).name
         return name if name else "download"
 
-    @staticmethod
-    def _verify_checksum(path: Path, checksums: Dict[str, str]) -> bool:
-        """Verify file against checksums (supports sha256, md5)."""
-        for algo, expected in checksums.items():
-            algo_lower = algo.lower()
-            if algo_lower not in ("sha256", "md5"):
-                logger.warning("Unsupported checksum algorithm: %s", algo)
-                continue
-            h = hashlib.new(algo_lower)
-            with open(path, "rb") as f:
-                for block in iter(lambda: f.read(65536), b""):
-                    h.update(block)
-            actual = h.hexdigest()
-            if actual != expected:
-                logger.error(
-                    "Checksum mismatch for %s: expected %s, got %s",
-                    path,
-                    expected,
-                    actual,
-                )
-                return False
-        return True
-
     @staticmethod
     async def _report(
         callback: Callable,
@@ -270,7 +514,9 @@ class ResourceResolver:
 def _create_resolver() -> ResourceResolver:
     from ..config import settings
 
-    return ResourceResolver(settings.cache_dir)
+    return ResourceResolver(
+        settings.cache_dir, settings.download_cache_max_bytes, settings.offline_mode
+    )
 
 
 # Lazy singleton – import ``resource_resolver`` from this module.
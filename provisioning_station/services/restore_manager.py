@@ -17,6 +17,8 @@ from typing import Any, Callable, Dict, List, Optional
 
 import yaml
 
+from .ssh_pool import get_ssh_pool, retire
+
 logger = logging.getLogger(__name__)
 
 
@@ -236,8 +238,8 @@ class RestoreManager:
                             operation, "info", f"Downloading firmware from {source_url}"
                         )
 
-                        success = await self._download_firmware(source_url, fw_path)
-                        if not success:
+                        fw_path = await self._download_firmware(source_url)
+                        if fw_path is None:
                             raise FileNotFoundError(
                                 f"Failed to download firmware: {fw_file}"
                             )
@@ -535,8 +537,7 @@ class RestoreManager:
             await self._notify_progress(operation)
 
             # Connect via SSH using paramiko
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            ssh = get_ssh_pool().client()
 
             try:
                 await asyncio.to_thread(
@@ -596,6 +597,7 @@ class RestoreManager:
                 await self._notify_progress(operation)
                 self._add_log(operation, "info", "Rebooting device...")
 
+                retire(ssh)
                 await exec_ssh_cmd(ssh, build_sudo_cmd(password, "reboot"), timeout=5)
 
             finally:
@@ -646,28 +648,18 @@ class RestoreManager:
         finally:
             self.unregister_callback(operation.id)
 
-    async def _download_firmware(self, url: str, dest_path: Path) -> bool:
-        """Download firmware file from URL"""
-        try:
-            import httpx
-
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
+    async def _download_firmware(self, url: str) -> Optional[Path]:
+        """Download firmware file from URL into the shared download cache"""
+        from .resource_resolver import resource_resolver
 
-            async with httpx.AsyncClient(
-                follow_redirects=True, timeout=120.0
-            ) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-
-                with open(dest_path, "wb") as f:
-                    f.write(response.content)
-
-            logger.info(f"Downloaded firmware to {dest_path}")
-            return True
+        try:
+            path = Path(await resource_resolver.resolve(url))
+            logger.info(f"Downloaded firmware to {path}")
+            return path
 
         except Exception as e:
             logger.error(f"Failed to download firmware from {url}: {e}")
-            return False
+            return None
 
 
 # Global instance
@@ -5,9 +5,9 @@ Reads SSCMA face recognition data from serial port (Himax),
 parses frames, and broadcasts to connected WebSocket clients.
 """
 
+import asyncio
 import json
 import logging
-import queue
 import threading
 import time
 from typing import Callable, Dict, List, Optional
@@ -15,56 +15,168 @@ from uuid import uuid4
 
 import serial
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Largest SSCMA message accepted (face embeddings plus a base64 JPEG fit
+# well below this); longer runs without a newline are treated as garbage
+MAX_MESSAGE_SIZE = 256 * 1024
+
 
 class SSCMAParser:
     """Parse SSCMA JSON messages from serial buffer.
 
     Protocol: messages framed as \\r{JSON}\\n (firmware sends \\r then JSON then \\n).
     JSON content is a single line with no embedded newlines.
+
+    Bytes accumulate in one bytearray and the newline search resumes where
+    the last read stopped, so each byte is scanned about once however the
+    reads are split. A message start seen before the previous message ended
+    means that message was cut off; parsing resyncs on the newer start.
+    Anything longer than ``max_message_size`` is dropped.
     """
 
-    def __init__(self):
-        self._buffer = b""
+    def __init__(self, max_message_size: int = MAX_MESSAGE_SIZE):
+        self.max_message_size = max_message_size
+        self._buffer = bytearray()
+        self._scan = 0  # Where the newline search resumes
+        # Counters for diagnostics
+        self.messages = 0
+        self.skipped_bytes = 0
+        self.oversized = 0
+        self.decode_errors = 0
 
     def feed(self, data: bytes) -> List[dict]:
         """Feed raw bytes and return parsed JSON messages."""
-        self._buffer += data
+        buf = self._buffer
+        buf += data
         messages = []
+        pos = 0
 
         while True:
             # Find start marker: \r{
-            start = self._buffer.find(b"\r{")
+            start = buf.find(b"\r{", pos)
             if start == -1:
-                # Keep last few bytes in case start marker is split
-                if len(self._buffer) > 4:
-                    self._buffer = self._buffer[-4:]
+                # Keep a trailing \r in case the start marker is split
+                keep = 1 if buf.endswith(b"\r") else 0
+                self.skipped_bytes += len(buf) - keep - pos
+                pos = len(buf) - keep
+                self._scan = 0
                 break
+            self.skipped_bytes += start - pos
 
             # Find end: first \n after start (JSON is single-line)
-            end = self._buffer.find(b"\n", start + 2)
+            end = buf.find(b"\n", max(start + 2, self._scan))
             if end == -1:
+                if len(buf) - start > self.max_message_size:
+                    # Runaway message: drop it and look for the next start
+                    self.oversized += 1
+                    self.skipped_bytes += 1
+                    pos = start + 1
+                    self._scan = 0
+                    continue
                 # Incomplete message, keep from start
-                self._buffer = self._buffer[start:]
+                pos = start
+                self._scan = len(buf)
                 break
+            self._scan = 0
+
+            # A newer start inside means this message lost its newline
+            resync = buf.rfind(b"\r{", start + 2, end)
+            if resync != -1:
+                self.skipped_bytes += resync - start
+                start = resync
+            pos = end + 1
+            if end - start > self.max_message_size:
+                self.oversized += 1
+                self.skipped_bytes += end + 1 - start
+                continue
 
             # Extract JSON: skip leading \r, strip trailing \r if present
-            json_bytes = self._buffer[start + 1 : end]
-            if json_bytes.endswith(b"\r"):
-                json_bytes = json_bytes[:-1]
-            self._buffer = self._buffer[end + 1 :]
-
+            stop = end - 1 if buf[end - 1] == 0x0D else end
+            json_bytes = buf[start + 1 : stop]
             try:
-                msg = json.loads(json_bytes)
-                messages.append(msg)
-            except json.JSONDecodeError:
-                logger.debug("Failed to parse SSCMA JSON: %s", json_bytes[:200])
-
+                messages.append(_json_loads(json_bytes))
+            except ValueError:
+                self.decode_errors += 1
+                logger.debug("Failed to parse SSCMA JSON: %s", bytes(json_bytes[:200]))
+
+        self.messages += len(messages)
+        if pos:
+            del buf[:pos]
+            if self._scan:
+                self._scan -= pos
         return messages
 
     def reset(self):
-        self._buffer = b""
+        self._buffer = bytearray()
+        self._scan = 0
+
+    def stats(self) -> dict:
+        return {
+            "messages": self.messages,
+            "buffered": len(self._buffer),
+            "skipped_bytes": self.skipped_bytes,
+            "oversized": self.oversized,
+            "decode_errors": self.decode_errors,
+        }
+
+
+class ClientQueue:
+    """Frame queue of one WebSocket client, living on its event loop.
+
+    The serial reader thread hands messages over with ``offer``, which
+    schedules the put on the client's loop, so a waiting client wakes as
+    soon as a frame arrives. A client that falls behind loses its oldest
+    frame, counted in ``dropped``.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int = 5):
+        self.loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.delivered = 0
+        self.dropped = 0
+        self.connected_at = time.time()
+
+    def offer(self, message: str):
+        """Queue a message from any thread (drop-oldest when full)"""
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            pass  # Event loop already closed
+
+    def _put(self, message: str):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(message)
+
+    async def get(self, timeout: float) -> Optional[str]:
+        """Next message, or None if nothing arrived within ``timeout``"""
+        try:
+            message = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self.delivered += 1
+        return message
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict:
+        return {
+            "id": id(self),
+            "qsize": self.qsize(),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "connected_seconds": round(time.time() - self.connected_at, 1),
+        }
 
 
 def parse_face_result(msg: dict) -> Optional[dict]:
@@ -145,8 +257,8 @@ def parse_face_result(msg: dict) -> Optional[dict]:
 class SerialCameraSession:
     """Manages a serial camera connection and broadcasts frames via WebSocket.
 
-    Runs a background thread for serial I/O, bridges to async via
-    asyncio.run_coroutine_threadsafe().
+    Runs a background thread for serial I/O and hands frames to each
+    client's event loop via ClientQueue.
     """
 
     def __init__(
@@ -166,8 +278,8 @@ class SerialCameraSession:
         self._running = False
         self._parser = SSCMAParser()
 
-        # WebSocket clients — use threading.Queue for cross-thread safety
-        self._clients: List[queue.Queue] = []
+        # WebSocket clients; the lock guards the list, not the queues
+        self._clients: List[ClientQueue] = []
         self._clients_lock = threading.Lock()
 
         # Frame callbacks (for enrollment logic)
@@ -185,9 +297,9 @@ class SerialCameraSession:
         self._last_broadcast_time = 0.0
         self._broadcast_interval = 0.1  # 100ms = 10 FPS max
 
-    def add_client(self) -> queue.Queue:
-        """Add a WebSocket client queue (thread-safe)."""
-        q: queue.Queue = queue.Queue(maxsize=5)
+    def add_client(self) -> ClientQueue:
+        """Add a WebSocket client queue (call from the client's event loop)."""
+        q = ClientQueue(asyncio.get_running_loop())
         with self._clients_lock:
             self._clients.append(q)
         logger.debug(
@@ -198,7 +310,7 @@ class SerialCameraSession:
         )
         return q
 
-    def remove_client(self, q: queue.Queue):
+    def remove_client(self, q: ClientQueue):
         """Remove a WebSocket client queue."""
         with self._clients_lock:
             if q in self._clients:
@@ -262,32 +374,19 @@ class SerialCameraSession:
         it won't send INIT@STAT? and we shouldn't block the user.
         """
         start = time.time()
-        buf = b""
+        parser = SSCMAParser()
         while time.time() - start < timeout and self._running:
             data = self._serial.read(4096)
             if not data:
                 continue
-            buf += data
-            # Look for ready message in buffer
-            while b"\r{" in buf:
-                idx = buf.find(b"\r{")
-                end = buf.find(b"\n", idx)
-                if end == -1:
-                    break
-                msg_bytes = buf[idx + 1 : end]
-                if msg_bytes.endswith(b"\r"):
-                    msg_bytes = msg_bytes[:-1]
-                buf = buf[end + 1 :]
-                try:
-                    msg = json.loads(msg_bytes)
-                    if (
-                        msg.get("name") == "INIT@STAT?"
-                        and msg.get("data", {}).get("is_ready") == 1
-                    ):
-                        logger.info("Device ready on session %s", self.session_id)
-                        return True
-                except json.JSONDecodeError:
-                    pass
+            # Look for ready message
+            for msg in parser.feed(data):
+                if (
+                    msg.get("name") == "INIT@STAT?"
+                    and msg.get("data", {}).get("is_ready") == 1
+                ):
+                    logger.info("Device ready on session %s", self.session_id)
+                    return True
         return False
 
     def _reader_loop(self):
@@ -349,7 +448,8 @@ class SerialCameraSession:
                         frame["enrollment"] = self.enrollment_state.copy()
 
                     # Call frame callbacks (for enrollment)
-                    for cb in self._frame_callbacks:
+                    # Copy: enrollment removes its callback when it finishes
+                    for cb in list(self._frame_callbacks):
                         try:
                             cb(frame)
                         except Exception as e:
@@ -393,20 +493,19 @@ class SerialCameraSession:
             self._last_fps_time = now
 
     def _broadcast(self, data: dict):
-        """Send frame data to all connected clients via thread-safe queues."""
+        """Send frame data to all connected clients (serialized once)."""
         json_str = json.dumps(data)
         with self._clients_lock:
-            n_clients = len(self._clients)
-            for q in list(self._clients):
-                try:
-                    q.put_nowait(json_str)
-                except queue.Full:
-                    # Drop oldest frame if client is too slow
-                    try:
-                        q.get_nowait()
-                        q.put_nowait(json_str)
-                    except (queue.Empty, queue.Full):
-                        pass
+            clients = list(self._clients)
+        for q in clients:
+            q.offer(json_str)
+
+    def publish(self, event: dict):
+        """Send an out-of-band event (e.g. bulk progress) to all clients.
+
+        Safe to call from any thread.
+        """
+        self._broadcast(event)
 
     def _broadcast_status(self, status: str, message: str = ""):
         """Broadcast a status message."""
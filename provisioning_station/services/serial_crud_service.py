@@ -11,9 +11,12 @@ Protocol:
   face_rename <old> <new>\n -> {"ok":true}
 
 Important:
-  - Must send in 32-byte chunks with 10ms inter-chunk delay (USB FIFO limit)
+  - Input must be paced (USB FIFO limit). Writes start at 32-byte chunks
+    with a 30ms gap; ChunkPacer then adapts both from how fast the device
+    echoes each chunk back
   - Commands are echoed back; skip lines not starting with '{'
   - ESP REPL prompt 'SenseCAP>' may appear; skip it too
+  - Bulk operations reset the REPL once and run all commands under one lock
 """
 
 import asyncio
@@ -24,19 +27,30 @@ import re
 import struct
 import threading
 import time
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 
 import serial
 
+from .face_enroll_logic import FaceGallery
+
 logger = logging.getLogger(__name__)
 
 # Default timeout for serial command responses
 DEFAULT_TIMEOUT = 5.0
 
-# USB FIFO chunk size and inter-chunk delay
+# USB FIFO chunk size and inter-chunk delay (starting point for ChunkPacer)
 CHUNK_SIZE = 32
 CHUNK_DELAY = 0.03  # 30ms - increased for UART safety under load
 
+# Bounds for adaptive pacing
+MIN_CHUNK_SIZE = 16
+MAX_CHUNK_SIZE = 256
+MIN_CHUNK_DELAY = 0.002
+MAX_CHUNK_DELAY = 0.1
+
+# Consecutive fully echoed chunks before pacing speeds up
+PACER_GROW_AFTER = 4
+
 # Regex to strip ANSI escape codes (cursor movement, colors, clear line, etc.)
 _ANSI_RE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]|\x1b\[\?[0-9;]*[A-Za-z]|\x00")
 
@@ -69,6 +83,55 @@ def _decode_name(raw: str) -> str:
     return raw
 
 
+class ChunkPacer:
+    """Adapts chunk size and inter-chunk delay from measured device echo.
+
+    The ESP console echoes every input byte once its REPL has consumed it.
+    A chunk echoed in full means the device kept up: after a few of those
+    the chunk size doubles and the delay follows the measured echo time.
+    A short echo means input is piling up in the FIFO, so both back off.
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE, delay: float = CHUNK_DELAY):
+        self.chunk_size = chunk_size
+        self.delay = delay
+        self._streak = 0
+        self.backoffs = 0
+
+    def record(self, sent: int, echoed: int, elapsed: float):
+        """Record one chunk: bytes sent, bytes echoed back and echo time."""
+        if echoed >= sent:
+            self._streak += 1
+            if self._streak >= PACER_GROW_AFTER:
+                self._streak = 0
+                self.chunk_size = min(MAX_CHUNK_SIZE, self.chunk_size * 2)
+                self.delay = max(MIN_CHUNK_DELAY, min(self.delay, elapsed * 1.5))
+        else:
+            self.backoff()
+
+    def backoff(self):
+        """Halve the chunk size and double the delay (after a lag or error)."""
+        self._streak = 0
+        self.backoffs += 1
+        self.chunk_size = max(MIN_CHUNK_SIZE, self.chunk_size // 2)
+        self.delay = min(MAX_CHUNK_DELAY, self.delay * 2)
+
+    def stats(self) -> dict:
+        return {
+            "chunk_size": self.chunk_size,
+            "delay_ms": round(self.delay * 1000, 1),
+            "backoffs": self.backoffs,
+        }
+
+
+def _face_add_command(name: str, embedding: List[float]) -> str:
+    """Build a face_add command with a base64(float16) embedding."""
+    # Encode as float16 + base64 (128 floats → 256 bytes → 344 chars base64)
+    raw = struct.pack(f"<{len(embedding)}e", *embedding)
+    emb_b64 = base64.b64encode(raw).decode("ascii")
+    return f"face_add {_encode_name(name)} {emb_b64}"
+
+
 class SerialCrudClient:
     """ESP Console command client for face database CRUD.
 
@@ -82,6 +145,9 @@ class SerialCrudClient:
         self._serial: Optional[serial.Serial] = None
         self._lock = threading.Lock()
         self._inference_paused = False
+        self.pacer = ChunkPacer()
+        # Host-side index of enrolled embeddings, kept in step with CRUD calls
+        self.gallery = FaceGallery()
 
     def open(self):
         """Open serial connection."""
@@ -102,19 +168,35 @@ class SerialCrudClient:
         self._serial = None
 
     def _send_chunked(self, data: bytes, drain_echo: bool = False):
-        """Send data in 32-byte chunks with 10ms delay to avoid USB FIFO overflow.
+        """Send data in paced chunks to avoid USB FIFO overflow.
 
-        For long commands (e.g. face_add with 1KB+ payload), set drain_echo=True
-        to read back echo data between chunks.  This prevents the device's output
-        FIFO from filling up and stalling input processing.
+        After each chunk but the last, wait up to the pacer's delay for the
+        device to echo it back; the echo both paces the next write and keeps
+        the device's output FIFO from filling up and stalling input. Long
+        commands (e.g. face_add) used to need drain_echo=True for that; all
+        commands are now echo-paced and the flag is kept for callers.
         """
-        for i in range(0, len(data), CHUNK_SIZE):
-            self._serial.write(data[i : i + CHUNK_SIZE])
+        pacer = self.pacer
+        pos = 0
+        while pos < len(data):
+            chunk = data[pos : pos + pacer.chunk_size]
+            pos += len(chunk)
+            sent_at = time.monotonic()
+            self._serial.write(chunk)
             self._serial.flush()
-            if i + CHUNK_SIZE < len(data):
-                time.sleep(CHUNK_DELAY)
-                if drain_echo and self._serial.in_waiting > 0:
-                    self._serial.read(self._serial.in_waiting)
+            if pos >= len(data):
+                break
+            echoed = 0
+            deadline = sent_at + pacer.delay
+            while echoed < len(chunk):
+                waiting = self._serial.in_waiting
+                if waiting > 0:
+                    echoed += len(self._serial.read(waiting))
+                elif time.monotonic() >= deadline:
+                    break
+                else:
+                    time.sleep(0.001)
+            pacer.record(len(chunk), echoed, time.monotonic() - sent_at)
 
     def _send_command(
         self,
@@ -180,10 +262,17 @@ class SerialCrudClient:
         drain_echo: bool,
     ) -> dict:
         """Single attempt to send command and read JSON response."""
-        # Flush ESP32 REPL state: Ctrl+C aborts any partial input, then
-        # drain all pending output (log spam, prompts, ANSI sequences).
-        # The old \r\n approach caused command corruption when the REPL's
-        # linenoise editor was mid-escape-sequence.
+        self._reset_repl()
+        return self._exchange(cmd_str, timeout, drain_echo)
+
+    def _reset_repl(self):
+        """Bring the ESP32 REPL to an empty prompt.
+
+        Ctrl+C aborts any partial input, then all pending output (log spam,
+        prompts, ANSI sequences) is drained. The old CRLF approach caused
+        command corruption when the REPL's linenoise editor was
+        mid-escape-sequence.
+        """
         self._serial.reset_input_buffer()
         self._serial.write(b"\x03\n")  # Ctrl+C + newline
         self._serial.flush()
@@ -192,6 +281,8 @@ class SerialCrudClient:
         if self._serial.in_waiting > 0:
             self._serial.read(self._serial.in_waiting)
 
+    def _exchange(self, cmd_str: str, timeout: float, drain_echo: bool) -> dict:
+        """Send one command to a REPL at its prompt and read the JSON reply."""
         # Send command in chunks
         data = (cmd_str + "\n").encode("utf-8")
         self._send_chunked(data, drain_echo=drain_echo)
@@ -247,6 +338,49 @@ class SerialCrudClient:
         )
         raise TimeoutError(f"No response within {timeout}s for command: {cmd_name}")
 
+    def _run_batch(
+        self,
+        commands: List[Tuple[str, float]],
+        on_result: Optional[Callable[[int, dict], None]] = None,
+    ) -> List[dict]:
+        """Run many commands as one transaction.
+
+        Holds the port lock throughout and resets the REPL once. A finished
+        command leaves the REPL at its prompt, so the next one only discards
+        leftover output. A command that times out or hits a serial error
+        gets a full reset (or reconnect) and one retry, with slower pacing;
+        if that fails too, its result is ``{ok: False, error}`` and the batch
+        continues.
+        """
+        if not self._serial or not self._serial.is_open:
+            raise ConnectionError("Serial port not open")
+
+        results = []
+        with self._lock:
+            self._reset_repl()
+            for i, (cmd_str, timeout) in enumerate(commands):
+                try:
+                    self._serial.reset_input_buffer()
+                    result = self._exchange(cmd_str, timeout, drain_echo=True)
+                except (TimeoutError, serial.SerialException) as e:
+                    logger.warning(
+                        "[%s] batch command failed: %s — retrying",
+                        cmd_str.split()[0],
+                        e,
+                    )
+                    self.pacer.backoff()
+                    try:
+                        if isinstance(e, serial.SerialException):
+                            self._reconnect()
+                        self._reset_repl()
+                        result = self._exchange(cmd_str, timeout, drain_echo=True)
+                    except Exception as e2:
+                        result = {"ok": False, "error": str(e2)}
+                results.append(result)
+                if on_result:
+                    on_result(i, result)
+        return results
+
     async def list_faces(self) -> dict:
         """List all enrolled faces.
 
@@ -259,6 +393,8 @@ class SerialCrudClient:
         for face in result.get("faces", []):
             if "name" in face:
                 face["name"] = _decode_name(face["name"])
+        if result.get("ok"):
+            self.gallery.load(result.get("faces", []))
         return result
 
     async def add_face(self, name: str, embedding: List[float]) -> dict:
@@ -276,11 +412,7 @@ class SerialCrudClient:
                 "add_face called without inference paused — proceeding anyway (base64 cmd is short)"
             )
 
-        safe_name = _encode_name(name)
-        # Encode as float16 + base64 (128 floats → 256 bytes → 344 chars base64)
-        raw = struct.pack(f"<{len(embedding)}e", *embedding)
-        emb_b64 = base64.b64encode(raw).decode("ascii")
-        cmd = f"face_add {safe_name} {emb_b64}"
+        cmd = _face_add_command(name, embedding)
         logger.info(
             "add_face: name='%s', embedding_dim=%d, cmd_len=%d (base64+fp16)",
             name,
@@ -289,10 +421,13 @@ class SerialCrudClient:
         )
         loop = asyncio.get_event_loop()
         # Use longer timeout and drain echo for payload
-        return await loop.run_in_executor(
+        result = await loop.run_in_executor(
             None,
             lambda: self._send_command(cmd, timeout=10.0, drain_echo=True),
         )
+        if result.get("ok"):
+            self.gallery.add(name, embedding)
+        return result
 
     async def delete_face(self, name: str) -> dict:
         """Delete a face from the database.
@@ -301,9 +436,12 @@ class SerialCrudClient:
         """
         safe_name = _encode_name(name)
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
+        result = await loop.run_in_executor(
             None, self._send_command, f"face_delete {safe_name}"
         )
+        if result.get("ok"):
+            self.gallery.remove(name)
+        return result
 
     async def rename_face(self, old_name: str, new_name: str) -> dict:
         """Rename a face in the database.
@@ -313,9 +451,108 @@ class SerialCrudClient:
         safe_old = _encode_name(old_name)
         safe_new = _encode_name(new_name)
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
+        result = await loop.run_in_executor(
             None, self._send_command, f"face_rename {safe_old} {safe_new}"
         )
+        if result.get("ok"):
+            self.gallery.rename(old_name, new_name)
+        return result
+
+    async def import_faces(
+        self,
+        faces: List[dict],
+        replace: bool = False,
+        on_progress: Optional[Callable[[int, int, str, dict], None]] = None,
+    ) -> dict:
+        """Add many faces in one serial transaction.
+
+        ``faces`` are ``{name, embedding}`` records; records missing either
+        are reported as failed. With ``replace``, names already on the device
+        are deleted first (the face list is read if this client has not seen
+        it yet). Inference is paused for the batch if it is not already.
+        ``on_progress(done, total, name, result)`` is called from the worker
+        thread after each face.
+
+        Returns: {ok, added, failed, results: [{name, ok, error?}]}
+        """
+        records = [f for f in faces if f.get("name") and f.get("embedding")]
+        results: List[dict] = [
+            {
+                "name": f.get("name") or "",
+                "ok": False,
+                "error": "Missing name or embedding",
+            }
+            for f in faces
+            if not (f.get("name") and f.get("embedding"))
+        ]
+        if replace and not self.gallery.synced:
+            await self.list_faces()
+        existing = set(self.gallery.device_names) if replace else set()
+
+        commands: List[Tuple[str, float]] = []
+        owners: List[Optional[int]] = []  # Record index per command
+        pause = not self._inference_paused
+        if pause:
+            commands.append(("inference_pause", DEFAULT_TIMEOUT))
+            owners.append(None)
+        for i, face in enumerate(records):
+            if face["name"] in existing:
+                commands.append(
+                    (f"face_delete {_encode_name(face['name'])}", DEFAULT_TIMEOUT)
+                )
+                owners.append(None)
+            commands.append((_face_add_command(face["name"], face["embedding"]), 10.0))
+            owners.append(i)
+        if pause:
+            commands.append(("inference_resume", DEFAULT_TIMEOUT))
+            owners.append(None)
+
+        def on_result(i: int, result: dict):
+            index = owners[i]
+            if index is None:
+                return
+            name = records[index]["name"]
+            entry = {"name": name, "ok": bool(result.get("ok"))}
+            if not entry["ok"]:
+                entry["error"] = result.get("error", "rejected by device")
+            else:
+                self.gallery.add(name, records[index]["embedding"])
+            results.append(entry)
+            if on_progress:
+                on_progress(len(results), len(faces), name, entry)
+
+        started = time.monotonic()
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._run_batch, commands, on_result)
+        added = sum(1 for r in results if r["ok"])
+        logger.info(
+            "import_faces: %d/%d added in %.1fs (pacing %s)",
+            added,
+            len(faces),
+            time.monotonic() - started,
+            self.pacer.stats(),
+        )
+        return {
+            "ok": added == len(faces),
+            "added": added,
+            "failed": len(faces) - added,
+            "results": results,
+        }
+
+    async def export_faces(self) -> dict:
+        """List the device's faces with any embeddings known to the host.
+
+        The device's face_list reports names only, so embeddings come from
+        the gallery (faces enrolled or imported through this client).
+
+        Returns: {ok, faces: [{name, index, embedding?}], count, max}
+        """
+        result = await self.list_faces()
+        for face in result.get("faces", []):
+            embedding = self.gallery.embedding(face.get("name", ""))
+            if embedding is not None and "embedding" not in face:
+                face["embedding"] = embedding
+        return result
 
     async def pause_inference(self) -> dict:
         """Pause ESP32 SPI inference so Himax UART enrollment can work."""
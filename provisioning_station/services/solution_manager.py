@@ -2,11 +2,17 @@
 Solution loading and management service
 """
 
+import asyncio
+import copy
+import hashlib
+import json
 import logging
 import re
 import shutil
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import aiofiles
 import markdown
@@ -39,6 +45,108 @@ ALLOWED_EXTENSIONS = (
 # Solution ID validation pattern: lowercase letters, numbers, underscore, must start with letter
 SOLUTION_ID_PATTERN = re.compile(r"^[a-z][a-z0-9_]*$")
 
+# Validated solutions from the last load, keyed by solution.yaml hash
+SOLUTION_SNAPSHOT_FILE = "solutions_snapshot.json"
+SOLUTION_SNAPSHOT_VERSION = 1
+
+# libyaml's loader is an order of magnitude faster when PyYAML was built with it
+_YamlSafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@dataclass
+class SolutionLoadResult:
+    """Outcome of loading one solution directory in a worker thread"""
+
+    path: Path
+    solution: Optional[Solution] = None
+    sha256: Optional[str] = None
+    guide_sha256: Optional[str] = None
+    step_count: Optional[int] = None  # Reused from snapshot if guide unchanged
+    from_snapshot: bool = False
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+def _load_solution_file(
+    solution_path: Path, snapshot_entry: Optional[dict] = None
+) -> SolutionLoadResult:
+    """Read, parse and validate solution.yaml (blocking, runs off the loop).
+
+    If ``snapshot_entry`` matches the file hash, the previously validated
+    data is reused instead of parsing YAML again. The same applies to the
+    guide step count, keyed by the guide file hash.
+    """
+    started = time.perf_counter()
+    result = SolutionLoadResult(path=solution_path)
+    try:
+        raw = (solution_path / "solution.yaml").read_bytes()
+        result.sha256 = hashlib.sha256(raw).hexdigest()
+
+        if snapshot_entry and snapshot_entry.get("sha256") == result.sha256:
+            try:
+                result.solution = Solution.model_validate(snapshot_entry["solution"])
+                result.from_snapshot = True
+            except Exception:
+                result.solution = None  # Unusable entry, parse the file instead
+
+        if result.solution is None:
+            data = yaml.load(raw.decode("utf-8"), Loader=_YamlSafeLoader)
+
+            # Set base path for asset resolution
+            data["base_path"] = str(solution_path)
+
+            result.solution = Solution(**data)
+
+        guide_file = result.solution.deployment.guide_file or "guide.md"
+        guide_path = solution_path / guide_file
+        if guide_path.is_file():
+            result.guide_sha256 = hashlib.sha256(guide_path.read_bytes()).hexdigest()
+            if (
+                snapshot_entry
+                and snapshot_entry.get("guide_sha256") == result.guide_sha256
+            ):
+                result.step_count = snapshot_entry.get("step_count")
+    except Exception as e:
+        result.error = str(e)
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _solution_schema_fingerprint() -> str:
+    """Hash of the Solution schema, so model changes discard old snapshots"""
+    schema = json.dumps(Solution.model_json_schema(), sort_keys=True)
+    return hashlib.sha256(schema.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class CompiledGuide:
+    """Parsed guide files for one solution, plus per-language deployment data.
+
+    ``signature`` records (lang, path, mtime_ns, size) of every guide file that
+    went into ``parsed``; a mismatch means the files changed on disk.
+    """
+
+    signature: Tuple[Tuple[str, str, int, int], ...]
+    parsed: ParseResult
+    by_lang: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+@dataclass
+class SolutionIndexEntry:
+    """Listing data for one solution that would otherwise need disk access."""
+
+    id: str
+    category: str
+    solution_type: str
+    enabled: bool
+    device_count: int = 0
+    cover_image: Optional[str] = None  # Asset URL, not the relative path
+    has_description: bool = False
+    has_description_zh: bool = False
+    has_guide: bool = False
+    has_guide_zh: bool = False
+
 
 class SolutionManager:
     """Solution loading and management service"""
@@ -50,6 +158,10 @@ class SolutionManager:
             {}
         )  # solution_id -> device_id -> config
         self._global_device_catalog: Dict[str, dict] = {}  # Global device catalog
+        self._guide_cache: Dict[str, CompiledGuide] = {}  # solution_id -> guide
+        self._solution_index: Dict[str, SolutionIndexEntry] = {}
+        self.snapshot_path = settings.cache_dir / SOLUTION_SNAPSHOT_FILE
+        self.load_stats: Dict[str, Any] = {}  # Timing of the last load_solutions
 
     async def load_global_device_catalog(self) -> None:
         """Load the global device catalog from devices/catalog.yaml"""
@@ -77,9 +189,17 @@ class SolutionManager:
         return self._global_device_catalog
 
     async def load_solutions(self) -> List[Solution]:
-        """Scan and load all solutions from solutions directory"""
+        """Scan and load all solutions from solutions directory.
+
+        solution.yaml files are parsed concurrently in worker threads. Files
+        whose hash matches the on-disk snapshot skip YAML parsing.
+        """
+        started = time.perf_counter()
         self.solutions.clear()
         self._device_configs.clear()
+        self._guide_cache.clear()
+        self._solution_index.clear()
+        self.load_stats = {}
 
         # Load global device catalog first
         await self.load_global_device_catalog()
@@ -88,34 +208,113 @@ class SolutionManager:
             logger.warning(f"Solutions directory does not exist: {self.solutions_dir}")
             return []
 
-        for solution_path in self.solutions_dir.iterdir():
-            if solution_path.is_dir():
-                solution_file = solution_path / "solution.yaml"
-                if solution_file.exists():
-                    solution = await self._load_solution(solution_path)
-                    if solution:
-                        self.solutions[solution.id] = solution
-                        logger.info(f"Loaded solution: {solution.id}")
+        solution_paths = [
+            path
+            for path in self.solutions_dir.iterdir()
+            if path.is_dir() and (path / "solution.yaml").exists()
+        ]
 
-        return list(self.solutions.values())
+        snapshot, fingerprint = await asyncio.gather(
+            asyncio.to_thread(self._read_snapshot),
+            asyncio.to_thread(_solution_schema_fingerprint),
+        )
+        entries = snapshot.get("solutions", {})
+        if snapshot.get("schema") != fingerprint:
+            entries = {}
+
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(_load_solution_file, path, entries.get(str(path)))
+                for path in solution_paths
+            )
+        )
 
-    async def _load_solution(self, solution_path: Path) -> Optional[Solution]:
-        """Load and validate a solution configuration"""
-        try:
-            solution_file = solution_path / "solution.yaml"
-            async with aiofiles.open(solution_file, "r", encoding="utf-8") as f:
-                content = await f.read()
-                data = yaml.safe_load(content)
+        for result in results:
+            if result.error or not result.solution:
+                logger.error(
+                    f"Failed to load solution from {result.path}: {result.error}"
+                )
+                continue
+            solution = result.solution
+            self.solutions[solution.id] = solution
+            logger.info(
+                f"Loaded solution: {solution.id} "
+                f"({result.elapsed * 1000:.1f} ms"
+                f"{', cached' if result.from_snapshot else ''})"
+            )
 
-            # Set base path for asset resolution
-            data["base_path"] = str(solution_path)
+        loaded = [r for r in results if r.solution and not r.error]
+        index_entries = await asyncio.gather(
+            *(self._index_solution(r.solution, r.step_count) for r in loaded)
+        )
+
+        new_entries = {
+            str(r.path): {
+                "sha256": r.sha256,
+                "guide_sha256": r.guide_sha256,
+                "step_count": entry.device_count,
+                "solution": r.solution.model_dump(mode="json"),
+            }
+            for r, entry in zip(loaded, index_entries)
+        }
 
-            solution = Solution(**data)
-            return solution
+        # Only rewrite the snapshot when something was actually parsed
+        cached = sum(1 for r in loaded if r.from_snapshot)
+        unchanged = all(
+            r.from_snapshot and r.step_count is not None for r in loaded
+        ) and len(new_entries) == len(entries)
+        if not unchanged:
+            await asyncio.to_thread(self._write_snapshot, fingerprint, new_entries)
+
+        self.load_stats = {
+            "total_seconds": time.perf_counter() - started,
+            "solutions": len(self.solutions),
+            "from_snapshot": cached,
+            "parse_seconds": {r.solution.id: r.elapsed for r in loaded},
+        }
+        return list(self.solutions.values())
 
+    def _read_snapshot(self) -> Dict[str, Any]:
+        """Read the validated-solution snapshot, or {} if missing/incompatible"""
+        try:
+            data = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable solution snapshot: {e}")
+            return {}
+        if (
+            data.get("version") != SOLUTION_SNAPSHOT_VERSION
+            or data.get("app_version") != settings.app_version
+        ):
+            return {}
+        return data
+
+    def _write_snapshot(self, fingerprint: str, entries: Dict[str, dict]) -> None:
+        """Atomically persist validated solutions for the next warm start"""
+        data = {
+            "version": SOLUTION_SNAPSHOT_VERSION,
+            "app_version": settings.app_version,
+            "schema": fingerprint,
+            "solutions": entries,
+        }
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            tmp_path.replace(self.snapshot_path)
         except Exception as e:
-            logger.error(f"Failed to load solution from {solution_path}: {e}")
+            logger.warning(f"Failed to write solution snapshot: {e}")
+
+    async def _load_solution(self, solution_path: Path) -> Optional[Solution]:
+        """Load and validate a solution configuration"""
+        result = await asyncio.to_thread(_load_solution_file, solution_path)
+        if result.error:
+            logger.error(
+                f"Failed to load solution from {solution_path}: {result.error}"
+            )
             return None
+        return result.solution
 
     def get_solution(self, solution_id: str) -> Optional[Solution]:
         """Get a specific solution by ID"""
@@ -125,6 +324,65 @@ class SolutionManager:
         """Get all loaded solutions"""
         return list(self.solutions.values())
 
+    def get_index_entry(self, solution_id: str) -> Optional[SolutionIndexEntry]:
+        """Get the precomputed listing entry for a solution"""
+        return self._solution_index.get(solution_id)
+
+    def list_index(
+        self,
+        category: Optional[str] = None,
+        solution_type: Optional[str] = None,
+        include_disabled: bool = False,
+    ) -> List[SolutionIndexEntry]:
+        """List index entries matching the given filters, in load order"""
+        entries = (self._solution_index.get(sid) for sid in self.solutions)
+        return [
+            entry
+            for entry in entries
+            if entry
+            and (include_disabled or entry.enabled)
+            and (not category or entry.category == category)
+            and (not solution_type or entry.solution_type == solution_type)
+        ]
+
+    async def _index_solution(
+        self, solution: Solution, step_count: Optional[int] = None
+    ) -> SolutionIndexEntry:
+        """Compute and store the listing entry for a solution.
+
+        Called whenever a solution is loaded or its files are edited, so the
+        listing endpoint never has to stat files or parse guides. A known
+        ``step_count`` (e.g. from the load snapshot) skips parsing guide.md.
+        """
+        if step_count is None:
+            step_count = await self.count_steps_from_guide(solution.id)
+
+        base_path = Path(solution.base_path) if solution.base_path else None
+
+        def file_exists(relative_path: Optional[str]) -> bool:
+            if not base_path or not relative_path:
+                return False
+            return (base_path / relative_path).exists()
+
+        entry = SolutionIndexEntry(
+            id=solution.id,
+            category=solution.intro.category,
+            solution_type=solution.intro.solution_type,
+            enabled=solution.enabled,
+            device_count=step_count,
+            cover_image=(
+                f"/api/solutions/{solution.id}/assets/{solution.intro.cover_image}"
+                if solution.intro.cover_image
+                else None
+            ),
+            has_description=file_exists(solution.intro.description_file),
+            has_description_zh=file_exists(solution.intro.description_file_zh),
+            has_guide=file_exists(solution.deployment.guide_file),
+            has_guide_zh=file_exists(solution.deployment.guide_file_zh),
+        )
+        self._solution_index[solution.id] = entry
+        return entry
+
     async def find_device_async(
         self, solution_id: str, device_id: str, preset_id: str = None
     ):
@@ -520,12 +778,81 @@ class SolutionManager:
                 new_solution = await self._load_solution(Path(solution.base_path))
                 if new_solution:
                     self.solutions[solution_id] = new_solution
-                    # Clear device config cache
-                    if solution_id in self._device_configs:
-                        del self._device_configs[solution_id]
+                    # Clear device config and compiled guide caches
+                    self.invalidate_solution_caches(solution_id)
+                    await self._index_solution(new_solution)
                     return new_solution
         return None
 
+    def invalidate_solution_caches(self, solution_id: str) -> None:
+        """Drop cached device configs and compiled guides for a solution."""
+        self._device_configs.pop(solution_id, None)
+        self._guide_cache.pop(solution_id, None)
+
+    def _forget_solution(self, solution_id: str) -> None:
+        """Remove a solution and everything cached about it from memory."""
+        self.solutions.pop(solution_id, None)
+        self._solution_index.pop(solution_id, None)
+        self.invalidate_solution_caches(solution_id)
+
+    def _solution_id_for_path(self, solution_path: Path) -> Optional[str]:
+        """Find the loaded solution whose base_path is the given directory."""
+        for solution_id, solution in self.solutions.items():
+            if solution.base_path and Path(solution.base_path) == solution_path:
+                return solution_id
+        return None
+
+    async def apply_file_changes(
+        self, solution_path: Path, relative_paths: Set[str]
+    ) -> Optional[str]:
+        """Refresh in-memory state after files under a solution changed on disk.
+
+        Used by the filesystem watcher. solution.yaml changes reload the
+        solution; device YAML changes drop only the matching device configs;
+        any change refreshes the listing index entry.
+
+        Args:
+            solution_path: The solution directory
+            relative_paths: Changed paths relative to ``solution_path``
+
+        Returns:
+            The affected solution ID, or None if nothing is loaded there
+        """
+        solution_id = self._solution_id_for_path(solution_path)
+
+        if not (solution_path / "solution.yaml").exists():
+            if solution_id:
+                self._forget_solution(solution_id)
+                logger.info(f"Solution removed from disk: {solution_id}")
+            return solution_id
+
+        if solution_id is None or "solution.yaml" in relative_paths:
+            solution = await self._load_solution(solution_path)
+            if not solution:
+                return solution_id  # Keep the last good version in memory
+            if solution_id and solution_id != solution.id:
+                self._forget_solution(solution_id)
+            self.solutions[solution.id] = solution
+            self.invalidate_solution_caches(solution.id)
+            await self._index_solution(solution)
+            logger.info(f"Reloaded solution from disk: {solution.id}")
+            return solution.id
+
+        changed = [Path(p) for p in relative_paths]
+        device_ids = {p.stem for p in changed if p.suffix in ALLOWED_CONFIG_EXTENSIONS}
+        cached_configs = self._device_configs.get(solution_id, {})
+        for device_id in device_ids:
+            cached_configs.pop(device_id, None)
+
+        # Deployment data embeds device config fields as well as guide content
+        if device_ids or any(
+            p.suffix == ".md" and p.name.startswith("guide") for p in changed
+        ):
+            self._guide_cache.pop(solution_id, None)
+
+        await self._index_solution(self.solutions[solution_id])
+        return solution_id
+
     # ============================================
     # Guide-based Deployment Methods (Simplified Structure)
     # ============================================
@@ -544,11 +871,6 @@ class SolutionManager:
         if not solution:
             return [f"Solution not found: {solution_id}"]
 
-        # Get preset IDs from YAML (used for intro page)
-        yaml_preset_ids = set()
-        if solution.intro and solution.intro.presets:
-            yaml_preset_ids = {p.id for p in solution.intro.presets}
-
         # Parse guide.md to get preset IDs (used for deploy page)
         guide_file = solution.deployment.guide_file or "guide.md"
         guide_path = Path(solution.base_path) / guide_file
@@ -562,25 +884,9 @@ class SolutionManager:
                 content = await f.read()
 
             parse_result = parse_single_language_guide(content)
-            guide_preset_ids = {p.id for p in parse_result.presets}
-
-            # Check for mismatches
-            missing_in_guide = yaml_preset_ids - guide_preset_ids
-            extra_in_guide = guide_preset_ids - yaml_preset_ids
-
-            if missing_in_guide:
-                errors.append(
-                    f"Presets in YAML but not in guide.md: {sorted(missing_in_guide)}"
-                )
-            if extra_in_guide:
-                errors.append(
-                    f"Presets in guide.md but not in YAML: {sorted(extra_in_guide)}"
-                )
-
-            if errors:
-                logger.warning(
-                    f"Solution {solution_id} preset mismatch:\n" + "\n".join(errors)
-                )
+            errors.extend(
+                self._check_preset_ids(solution, {p.id for p in parse_result.presets})
+            )
 
         except Exception as e:
             logger.error(f"Failed to validate preset IDs for {solution_id}: {e}")
@@ -588,6 +894,34 @@ class SolutionManager:
 
         return errors
 
+    def _check_preset_ids(self, solution: Solution, guide_preset_ids: set) -> List[str]:
+        """Compare guide preset IDs against solution.yaml and log mismatches."""
+        errors = []
+
+        # Get preset IDs from YAML (used for intro page)
+        yaml_preset_ids = set()
+        if solution.intro and solution.intro.presets:
+            yaml_preset_ids = {p.id for p in solution.intro.presets}
+
+        missing_in_guide = yaml_preset_ids - guide_preset_ids
+        extra_in_guide = guide_preset_ids - yaml_preset_ids
+
+        if missing_in_guide:
+            errors.append(
+                f"Presets in YAML but not in guide.md: {sorted(missing_in_guide)}"
+            )
+        if extra_in_guide:
+            errors.append(
+                f"Presets in guide.md but not in YAML: {sorted(extra_in_guide)}"
+            )
+
+        if errors:
+            logger.warning(
+                f"Solution {solution.id} preset mismatch:\n" + "\n".join(errors)
+            )
+
+        return errors
+
     async def count_steps_from_guide(self, solution_id: str) -> int:
         """Count unique step IDs from guide.md.
 
@@ -690,16 +1024,52 @@ class SolutionManager:
         if not solution or not solution.base_path:
             return None
 
-        # Validate preset IDs consistency (logs warnings)
-        await self.validate_preset_ids(solution_id)
-
-        # Discover and read all language guide files
+        # Discover all language guide files
         guide_files = self._discover_guide_files(solution_id)
         if not guide_files:
             logger.warning(f"No guide files found for {solution_id}")
             return None
 
-        # Read all guide file contents
+        # Reuse the compiled guide unless a guide file changed on disk
+        signature = self._guide_signature(guide_files)
+        compiled = self._guide_cache.get(solution_id)
+        if compiled is None or compiled.signature != signature:
+            parsed_result = await self._parse_guide_files(solution, guide_files)
+            if parsed_result is None:
+                return None
+            compiled = CompiledGuide(signature=signature, parsed=parsed_result)
+            self._guide_cache[solution_id] = compiled
+
+        if not compiled.parsed.presets:
+            logger.warning(f"No presets found in guide files for {solution_id}")
+            return None
+
+        result = compiled.by_lang.get(lang)
+        if result is None:
+            result = await self._build_deployment_info(solution, compiled.parsed, lang)
+            compiled.by_lang[lang] = result
+
+        # Callers may mutate the result, so never hand out the cached dict
+        return copy.deepcopy(result)
+
+    @staticmethod
+    def _guide_signature(
+        guide_files: Dict[str, Path],
+    ) -> Tuple[Tuple[str, str, int, int], ...]:
+        """Build a cache key from the mtime and size of each guide file."""
+        signature = []
+        for file_lang, path in sorted(guide_files.items()):
+            try:
+                stat = path.stat()
+                signature.append((file_lang, str(path), stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((file_lang, str(path), -1, -1))
+        return tuple(signature)
+
+    async def _parse_guide_files(
+        self, solution: Solution, guide_files: Dict[str, Path]
+    ) -> Optional[ParseResult]:
+        """Read and parse all language guide files for a solution."""
         lang_contents: Dict[str, str] = {}
         for file_lang, path in guide_files.items():
             try:
@@ -709,15 +1079,22 @@ class SolutionManager:
                 logger.error(f"Failed to read {file_lang} guide: {e}")
 
         if not lang_contents:
-            logger.warning(f"No readable guide files for {solution_id}")
+            logger.warning(f"No readable guide files for {solution.id}")
             return None
 
         # Parse all languages together
         parsed_result, _ = parse_guide_multilang(lang_contents)
 
-        if not parsed_result.presets:
-            logger.warning(f"No presets found in guide files for {solution_id}")
-            return None
+        # Validate preset IDs consistency (logs warnings)
+        self._check_preset_ids(solution, {p.id for p in parsed_result.presets})
+
+        return parsed_result
+
+    async def _build_deployment_info(
+        self, solution: Solution, parsed_result: ParseResult, lang: str
+    ) -> Dict[str, Any]:
+        """Build deployment page data for one language from a parsed guide."""
+        solution_id = solution.id
 
         # Build result using Localized.get(lang) for all fields
         devices = []
@@ -835,6 +1212,10 @@ class SolutionManager:
             "type": step.type,
             "required": step.required,
         }
+        if step.depends_on:
+            device["depends_on"] = list(step.depends_on)
+        if step.parallel:
+            device["parallel"] = True
 
         # Inject ui_traits from deployer registry
         from ..deployers import DEPLOYER_REGISTRY
@@ -1084,6 +1465,7 @@ class SolutionManager:
             solution = await self._load_solution(solution_path)
             if solution:
                 self.solutions[solution_id] = solution
+                await self._index_solution(solution)
                 logger.info(f"Created new solution: {solution_id}")
                 return solution
             else:
@@ -1167,10 +1549,7 @@ class SolutionManager:
             logger.info(f"Permanently deleted solution: {solution_id}")
 
         # Remove from cache
-        if solution_id in self.solutions:
-            del self.solutions[solution_id]
-        if solution_id in self._device_configs:
-            del self._device_configs[solution_id]
+        self._forget_solution(solution_id)
 
         return True
 
@@ -1216,6 +1595,7 @@ class SolutionManager:
             await f.write(file_content)
 
         logger.info(f"Saved asset: {solution_id}/{relative_path}")
+        self.invalidate_solution_caches(solution_id)
 
         # Optionally update solution.yaml field (e.g., cover_image)
         if update_yaml_field:
@@ -1238,6 +1618,8 @@ class SolutionManager:
 
             # Reload solution
             await self.reload_solution(solution_id)
+        else:
+            await self._index_solution(solution)
 
         return relative_path
 
@@ -1299,6 +1681,8 @@ class SolutionManager:
             file_path.unlink()
 
         logger.info(f"Deleted file: {solution_id}/{relative_path}")
+        self.invalidate_solution_caches(solution_id)
+        await self._index_solution(solution)
         return True
 
     async def save_text_file(
@@ -1328,6 +1712,8 @@ class SolutionManager:
             await f.write(content)
 
         logger.info(f"Saved text file: {solution_id}/{relative_path}")
+        self.invalidate_solution_caches(solution_id)
+        await self._index_solution(solution)
         return relative_path
 
     async def get_solution_structure(self, solution_id: str) -> Dict[str, Any]:
@@ -1975,10 +2361,12 @@ class SolutionManager:
             await f.write(content)
 
         logger.info(f"Saved content file: {solution_id}/{filename}")
+        self.invalidate_solution_caches(solution_id)
 
         # If it's a guide file, sync presets to YAML (which also reloads)
         if filename.startswith("guide"):
-            await self.sync_presets_from_guide(solution_id)
+            if not await self.sync_presets_from_guide(solution_id):
+                await self._index_solution(solution)
         else:
             # For description files, just reload to update cache
             await self.reload_solution(solution_id)
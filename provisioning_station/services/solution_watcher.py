@@ -0,0 +1,213 @@
+"""
+Solution file watcher - hot reload of edited solutions
+
+Watches the solutions directory and the global device catalog, and
+invalidates only the caches affected by each change. Uses watchfiles
+(inotify on Linux, FSEvents/ReadDirectoryChangesW elsewhere) when it is
+installed, otherwise falls back to periodic mtime polling.
+"""
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from ..config import settings
+from .solution_manager import SolutionManager, solution_manager
+
+logger = logging.getLogger(__name__)
+
+# Try to import watchfiles (installed with uvicorn[standard])
+try:
+    from watchfiles import awatch
+
+    WATCHFILES_AVAILABLE = True
+except ImportError:
+    WATCHFILES_AVAILABLE = False
+
+# Editor swap/backup files that should never trigger a reload
+IGNORED_SUFFIXES = (".swp", ".swx", ".tmp", "~")
+
+# (mtime_ns, size) per file, used by the polling fallback
+FileState = Dict[Path, Tuple[int, int]]
+
+
+class SolutionWatcher:
+    """
+    Watches solution files and hot-reloads them into a SolutionManager.
+
+    Change events are debounced so a burst of writes (e.g. an editor saving
+    several files, or a git checkout) results in one refresh per solution.
+    """
+
+    def __init__(
+        self,
+        manager: Optional[SolutionManager] = None,
+        debounce: float = 0.5,
+        poll_interval: float = 2.0,
+        force_polling: bool = False,
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            manager: SolutionManager to refresh (defaults to the global one)
+            debounce: Seconds of quiet before a batch of changes is applied
+            poll_interval: Seconds between scans in polling mode
+            force_polling: Use polling even if watchfiles is available
+        """
+        self.manager = manager or solution_manager
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.force_polling = force_polling or not WATCHFILES_AVAILABLE
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event = asyncio.Event()
+
+    @property
+    def solutions_dir(self) -> Path:
+        return Path(self.manager.solutions_dir)
+
+    @property
+    def catalog_path(self) -> Path:
+        return self.solutions_dir.parent / "devices" / "catalog.yaml"
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start watching in a background task"""
+        if self.running:
+            return
+        if not self.solutions_dir.exists():
+            logger.warning(f"Not watching missing directory: {self.solutions_dir}")
+            return
+
+        self._stop_event = asyncio.Event()
+        runner = self._run_polling if self.force_polling else self._run_watchfiles
+        self._task = asyncio.create_task(runner())
+        logger.info(
+            f"Watching {self.solutions_dir} for changes "
+            f"({'polling' if self.force_polling else 'native events'})"
+        )
+
+    async def stop(self) -> None:
+        """Stop watching"""
+        if not self._task:
+            return
+        self._stop_event.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._task = None
+
+    async def _run_watchfiles(self) -> None:
+        """Watch using OS change notifications"""
+        watch_paths = [self.solutions_dir]
+        if self.catalog_path.parent.exists():
+            watch_paths.append(self.catalog_path.parent)
+
+        async for changes in awatch(
+            *watch_paths,
+            debounce=int(self.debounce * 1000),
+            stop_event=self._stop_event,
+        ):
+            await self._apply_changes(Path(path) for _, path in changes)
+
+    async def _run_polling(self) -> None:
+        """Watch by comparing file mtimes/sizes at a fixed interval"""
+        previous = await asyncio.to_thread(self._scan)
+        while not self._stop_event.is_set():
+            await asyncio.sleep(self.poll_interval)
+            current = await asyncio.to_thread(self._scan)
+            changed = self._diff(previous, current)
+            if not changed:
+                continue
+
+            # Keep collecting until the tree stays quiet for the debounce period
+            while True:
+                await asyncio.sleep(self.debounce)
+                latest = await asyncio.to_thread(self._scan)
+                more = self._diff(current, latest)
+                current = latest
+                if not more:
+                    break
+                changed |= more
+
+            previous = current
+            await self._apply_changes(changed)
+
+    def _scan(self) -> FileState:
+        """Snapshot mtime and size of every watched file"""
+        state: FileState = {}
+        for root, dirs, files in os.walk(self.solutions_dir):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in files:
+                path = Path(root) / name
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+        try:
+            stat = self.catalog_path.stat()
+            state[self.catalog_path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+        return state
+
+    @staticmethod
+    def _diff(before: FileState, after: FileState) -> Set[Path]:
+        """Paths added, removed or modified between two scans"""
+        changed = set(before.keys() ^ after.keys())
+        changed.update(p for p in before.keys() & after.keys() if before[p] != after[p])
+        return changed
+
+    async def _apply_changes(self, paths: Iterable[Path]) -> None:
+        """Group changed paths by solution and refresh each one once"""
+        by_solution: Dict[Path, Set[str]] = {}
+        catalog_changed = False
+
+        for path in paths:
+            if path.name.endswith(IGNORED_SUFFIXES):
+                continue
+            if path == self.catalog_path:
+                catalog_changed = True
+                continue
+            try:
+                relative = path.relative_to(self.solutions_dir)
+            except ValueError:
+                continue
+            if not relative.parts or relative.parts[0].startswith("."):
+                continue  # Hidden entries such as .trash
+            solution_path = self.solutions_dir / relative.parts[0]
+            changed = by_solution.setdefault(solution_path, set())
+            if len(relative.parts) > 1:
+                changed.add(Path(*relative.parts[1:]).as_posix())
+
+        if catalog_changed:
+            await self.manager.load_global_device_catalog()
+
+        for solution_path, relative_paths in by_solution.items():
+            try:
+                await self.manager.apply_file_changes(solution_path, relative_paths)
+            except Exception as e:
+                logger.error(f"Failed to refresh {solution_path.name}: {e}")
+
+
+# Global instance
+_solution_watcher: Optional[SolutionWatcher] = None
+
+
+def get_solution_watcher() -> SolutionWatcher:
+    """Get the global solution watcher instance"""
+    global _solution_watcher
+    if _solution_watcher is None:
+        _solution_watcher = SolutionWatcher(
+            debounce=settings.watch_debounce_ms / 1000,
+            force_polling=settings.watch_force_polling,
+        )
+    return _solution_watcher
@@ -0,0 +1,404 @@
+"""
+Shared SSH connection pool
+
+Deployers and managers used to open a fresh paramiko client (TCP connect,
+key exchange, authentication) for every operation and close it right after.
+The pool keeps authenticated clients keyed by (host, port, user, credential
+fingerprint) and lends them out, so repeated operations against one device
+reuse one transport.
+
+Borrowed clients behave like ``paramiko.SSHClient``; calling ``close()``
+returns them to the pool instead of disconnecting. Idle clients are checked
+for liveness before reuse and closed after ``ssh_pool_idle_timeout``. At most
+``ssh_pool_max_per_host`` clients are lent out per host at a time.
+
+The pool is thread-safe: most SSH work runs in ``asyncio.to_thread``.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Idle clients unused for longer than this get a round-trip probe before reuse
+PROBE_AFTER_SECONDS = 5.0
+
+# Seconds to wait for a free per-host slot before giving up
+ACQUIRE_TIMEOUT_SECONDS = 120.0
+
+PoolKey = Tuple[str, int, str, str]
+
+
+def _fingerprint(password: Optional[str], key_filename: Optional[str]) -> str:
+    """Hash credentials so the pool key never holds them in plain text"""
+    digest = hashlib.sha256()
+    digest.update((password or "").encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(str(key_filename or "").encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class _IdleClient:
+    client: Any
+    released_at: float
+
+
+@dataclass
+class PoolStats:
+    """Counters describing pool behaviour since startup"""
+
+    created: int = 0  # New connections opened
+    reused: int = 0  # Borrows served by an idle connection
+    discarded: int = 0  # Idle connections found dead before reuse
+    evicted: int = 0  # Idle connections closed after the idle timeout
+    waits: int = 0  # Borrows that waited for a per-host slot
+    failures: int = 0  # Connection attempts that raised
+
+
+class PooledSSHClient:
+    """An SSH client borrowed from the pool.
+
+    Drop-in for ``paramiko.SSHClient``: ``connect()`` borrows a pooled
+    connection, other attributes are forwarded to it, ``close()`` hands it
+    back and ``discard()`` disconnects it.
+    """
+
+    def __init__(self, pool: "SSHConnectionPool"):
+        self._pool = pool
+        self._key: Optional[PoolKey] = None
+        self._client = None
+        self.reusable = True
+
+    def __getattr__(self, name):
+        if name.startswith("_") or self._client is None:
+            raise AttributeError(name)
+        return getattr(self._client, name)
+
+    @property
+    def client(self):
+        """The underlying paramiko client (None until connected)"""
+        return self._client
+
+    def connect(
+        self,
+        hostname: str,
+        port: int = 22,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        key_filename: Optional[str] = None,
+        timeout: float = 10,
+        **kwargs,
+    ):
+        """Borrow a connection (blocking, run in thread).
+
+        Takes the same arguments as ``paramiko.SSHClient.connect`` and raises
+        the same exceptions when a new connection is needed and fails.
+        """
+        self.close()
+        self._key, self._client = self._pool._checkout(
+            hostname, port, username, password, key_filename, timeout, **kwargs
+        )
+
+    def close(self):
+        """Return the connection to the pool"""
+        self._give_back(reuse=self.reusable)
+
+    def discard(self):
+        """Disconnect instead of returning (e.g. after the host rebooted)"""
+        self._give_back(reuse=False)
+
+    def _give_back(self, reuse: bool):
+        key, client = self._key, self._client
+        self._key = self._client = None
+        if client is not None:
+            self._pool._release(key, client, reuse=reuse)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # A borrower that never closed must not hold the host slot forever
+        if self.__dict__.get("_client") is not None:
+            self.discard()
+
+
+def retire(client):
+    """Disconnect a borrowed client on close instead of pooling it.
+
+    For sessions that no longer reflect the device: the host is rebooting,
+    or the login's group membership changed (e.g. added to ``docker``).
+    Plain paramiko clients are left alone.
+    """
+    if isinstance(client, PooledSSHClient):
+        client.reusable = False
+
+
+class SSHConnectionPool:
+    """Thread-safe pool of authenticated paramiko clients"""
+
+    def __init__(
+        self,
+        max_per_host: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            max_per_host: Clients lent out per host at once
+                (defaults to ``settings.ssh_pool_max_per_host``)
+            idle_timeout: Seconds an idle client is kept, 0 disables pooling
+                (defaults to ``settings.ssh_pool_idle_timeout``)
+        """
+        if max_per_host is None:
+            max_per_host = settings.ssh_pool_max_per_host
+        self.max_per_host = max(1, max_per_host)
+        self.idle_timeout = (
+            idle_timeout if idle_timeout is not None else settings.ssh_pool_idle_timeout
+        )
+        self._cond = threading.Condition()
+        self._idle: Dict[PoolKey, List[_IdleClient]] = {}
+        self._leased: Dict[str, int] = {}
+        self._stats = PoolStats()
+        self._reaper: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Borrowing
+    # ------------------------------------------------------------------
+
+    def client(self) -> PooledSSHClient:
+        """An unconnected client; its ``connect()`` borrows from the pool"""
+        return PooledSSHClient(self)
+
+    def connect(self, hostname: str, **kwargs) -> PooledSSHClient:
+        """Borrow a connected client (blocking, run in thread)"""
+        client = self.client()
+        client.connect(hostname, **kwargs)
+        return client
+
+    def _checkout(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        key_filename: Optional[str],
+        timeout: float,
+        **kwargs,
+    ) -> Tuple[PoolKey, Any]:
+        """Reuse a live idle connection for the key or open a new one"""
+        import paramiko
+
+        host = str(hostname).lower()
+        key: PoolKey = (
+            host,
+            int(port),
+            username or "",
+            _fingerprint(password, key_filename),
+        )
+
+        idle = self._lease(key)
+        if idle is not None:
+            if self._is_alive(idle):
+                with self._cond:
+                    self._stats.reused += 1
+                return key, idle.client
+            with self._cond:
+                self._stats.discarded += 1
+            self._close_quietly(idle.client)
+
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        try:
+            client.connect(
+                hostname=hostname,
+                port=port,
+                username=username,
+                password=password,
+                key_filename=key_filename,
+                timeout=timeout,
+                **kwargs,
+            )
+        except BaseException:
+            with self._cond:
+                self._stats.failures += 1
+            self._close_quietly(client)
+            self._release_slot(host)
+            raise
+
+        with self._cond:
+            self._stats.created += 1
+        logger.debug(f"Opened pooled SSH connection to {username}@{host}:{port}")
+        return key, client
+
+    def _lease(self, key: PoolKey) -> Optional[_IdleClient]:
+        """Take a per-host slot, returning an idle client for the key if any"""
+        import paramiko
+
+        host = key[0]
+        deadline = time.monotonic() + ACQUIRE_TIMEOUT_SECONDS
+        waited = False
+        with self._cond:
+            while self._leased.get(host, 0) >= self.max_per_host:
+                if not waited:
+                    waited = True
+                    self._stats.waits += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise paramiko.SSHException(
+                        f"Timed out waiting for a free SSH connection to {host}"
+                    )
+                self._cond.wait(remaining)
+            self._leased[host] = self._leased.get(host, 0) + 1
+            idle_list = self._idle.get(key)
+            if idle_list:
+                idle = idle_list.pop()  # Most recently used first
+                if not idle_list:
+                    del self._idle[key]
+                return idle
+        return None
+
+    def _is_alive(self, idle: _IdleClient) -> bool:
+        """Liveness check for an idle client"""
+        transport = idle.client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        if time.monotonic() - idle.released_at < PROBE_AFTER_SECONDS:
+            return True
+        # Round trip: opening a channel fails fast on a dead peer
+        try:
+            channel = transport.open_session(timeout=3)
+            channel.close()
+            return True
+        except Exception:
+            return False
+
+    # ------------------------------------------------------------------
+    # Returning
+    # ------------------------------------------------------------------
+
+    def _release(self, key: PoolKey, client, reuse: bool):
+        transport = client.get_transport()
+        keep = (
+            reuse
+            and self.idle_timeout > 0
+            and not self._closed.is_set()
+            and transport is not None
+            and transport.is_active()
+        )
+        to_close = [] if keep else [client]
+        with self._cond:
+            if keep:
+                idle_list = self._idle.setdefault(key, [])
+                idle_list.append(_IdleClient(client, time.monotonic()))
+                # Cap idle clients per key; close the least recently used
+                while len(idle_list) > self.max_per_host:
+                    to_close.append(idle_list.pop(0).client)
+            self._decrement(key[0])
+            self._cond.notify_all()
+        for c in to_close:
+            self._close_quietly(c)
+        if keep:
+            self._ensure_reaper()
+
+    def _release_slot(self, host: str):
+        with self._cond:
+            self._decrement(host)
+            self._cond.notify_all()
+
+    def _decrement(self, host: str):
+        count = self._leased.get(host, 0) - 1
+        if count > 0:
+            self._leased[host] = count
+        else:
+            self._leased.pop(host, None)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def reap_idle(self) -> int:
+        """Close idle clients past the idle timeout, returning how many"""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = []
+        with self._cond:
+            for key in list(self._idle):
+                idle_list = self._idle[key]
+                expired.extend(i.client for i in idle_list if i.released_at < cutoff)
+                idle_list[:] = [i for i in idle_list if i.released_at >= cutoff]
+                if not idle_list:
+                    del self._idle[key]
+            self._stats.evicted += len(expired)
+        for client in expired:
+            self._close_quietly(client)
+        return len(expired)
+
+    def _ensure_reaper(self):
+        """Start the background thread that closes idle clients"""
+        with self._cond:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._reaper = threading.Thread(
+                target=self._reap_loop, name="ssh-pool-reaper", daemon=True
+            )
+            self._reaper.start()
+
+    def _reap_loop(self):
+        interval = max(1.0, min(30.0, self.idle_timeout / 2))
+        while not self._closed.wait(interval):
+            self.reap_idle()
+            with self._cond:
+                if not self._idle:
+                    self._reaper = None
+                    return
+
+    def close_all(self):
+        """Close every idle client; borrowed ones close when returned"""
+        self._closed.set()
+        with self._cond:
+            clients = [i.client for lst in self._idle.values() for i in lst]
+            self._idle.clear()
+        for client in clients:
+            self._close_quietly(client)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool metrics (counts only, no credentials)"""
+        with self._cond:
+            return {
+                "created": self._stats.created,
+                "reused": self._stats.reused,
+                "discarded": self._stats.discarded,
+                "evicted": self._stats.evicted,
+                "waits": self._stats.waits,
+                "failures": self._stats.failures,
+                "leased": sum(self._leased.values()),
+                "idle": sum(len(lst) for lst in self._idle.values()),
+            }
+
+    @staticmethod
+    def _close_quietly(client):
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+# Global instance
+_ssh_pool: Optional[SSHConnectionPool] = None
+
+
+def get_ssh_pool() -> SSHConnectionPool:
+    """Get the global SSH connection pool"""
+    global _ssh_pool
+    if _ssh_pool is None:
+        _ssh_pool = SSHConnectionPool()
+    return _ssh_pool
@@ -2,6 +2,18 @@
 Stream Proxy Service - RTSP to MJPEG/HLS conversion
 
 Uses FFmpeg to convert RTSP streams to MJPEG (low latency) or HLS format for browser playback.
+
+Callers get a stream ID (a handle) per start request, but handles asking for
+the same camera with the same output settings share one FFmpeg process, so
+N viewers cost a single RTSP session to the device. The ingest stops when
+its last handle is stopped or after nobody has watched it for a while.
+
+MJPEG output comes in transcoding profiles (full, thumbnail, passthrough),
+and adaptive viewers move down a ladder of smaller, cheaper ingests while
+their link cannot keep up.
+
+HLS is served as low-latency HLS from memory (see hls_window); the older
+mode writing .ts segments to disk remains available.
 """
 
 import asyncio
@@ -14,7 +26,11 @@ import time
 import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import AsyncGenerator, Dict, Optional
+from typing import AsyncGenerator, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from ..config import settings
+from .hls_window import PART_TARGET, Fmp4Splitter, HlsWindow
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +38,218 @@ logger = logging.getLogger(__name__)
 JPEG_SOI = b"\xff\xd8"
 JPEG_EOI = b"\xff\xd9"
 
+# Seconds a viewer waits for the next frame before re-checking stream status
+FRAME_WAIT_TIMEOUT = 5.0
+
+# Seconds between idle-stream sweeps
+IDLE_CHECK_INTERVAL = 30
+
+# Ports RTSP URLs imply when none is given
+RTSP_DEFAULT_PORTS = {"rtsp": 554, "rtsps": 322}
+
+# Seconds to wait for ffprobe to report a camera's codec
+PROBE_TIMEOUT = 10
+
+# Adaptive MJPEG: output widths a congested viewer steps down through, the
+# JPEG quality step per rung, and how busy its link must be to move
+ADAPTIVE_WIDTHS = (1280, 640, 320)
+ADAPTIVE_QUALITY_STEP = 3
+ADAPT_WINDOW = 5.0
+CONGESTED_BUSY_RATIO = 0.8
+RELAXED_BUSY_RATIO = 0.15
+RELAXED_WINDOWS = 6
+
+
+@dataclass(frozen=True)
+class TranscodeProfile:
+    """FFmpeg output settings for an MJPEG stream"""
+
+    name: str
+    width: Optional[int] = None  # Downscale to at most this width
+    copy: bool = False  # Forward the camera's own JPEGs without re-encoding
+
+
+MJPEG_PROFILES = {
+    "full": TranscodeProfile("full"),
+    "thumbnail": TranscodeProfile("thumbnail", width=320),
+    "passthrough": TranscodeProfile("passthrough", copy=True),
+}
+# "auto" resolves to passthrough for MJPEG cameras and full otherwise
+
+
+def normalize_rtsp_url(url: str) -> str:
+    """Canonical form of an RTSP URL, used to spot viewers of the same camera.
+
+    Scheme and host are case-insensitive and the default port is dropped, so
+    ``RTSP://Cam.local:554/live`` and ``rtsp://cam.local/live`` match.
+    Credentials, path and query are kept as given.
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.hostname:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = parts.hostname.lower()
+    if ":" in host:
+        host = f"[{host}]"  # IPv6 literal
+    if port and port != RTSP_DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    userinfo = parts.netloc.rpartition("@")[0]
+    netloc = f"{userinfo}@{host}" if userinfo else host
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def mjpeg_part(frame) -> bytes:
+    """Wrap a JPEG frame (any bytes-like object) as one multipart part"""
+    return b"".join(
+        (
+            b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: ",
+            str(len(frame)).encode(),
+            b"\r\n\r\n",
+            frame,
+            b"\r\n",
+        )
+    )
+
+
+class MjpegFrameParser:
+    """Incremental JPEG frame splitter for the ffmpeg MJPEG pipe.
+
+    Chunks are appended to one bytearray and each marker search resumes
+    where the previous one stopped, so a large frame arriving in many reads
+    is scanned once instead of once per read. Each complete frame is copied
+    exactly once, straight into its multipart part.
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._start = -1  # Offset of the current frame's SOI
+        self._scan = 0  # Offset where the next marker search resumes
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """Append a chunk and return multipart parts for completed frames"""
+        buf = self._buf
+        buf += chunk
+        parts = []
+        consumed = 0
+
+        while True:
+            if self._start < 0:
+                # A marker may straddle two reads, so back up one byte
+                soi = buf.find(JPEG_SOI, max(self._scan - 1, consumed))
+                if soi < 0:
+                    consumed = max(len(buf) - 1, consumed)
+                    self._scan = len(buf)
+                    break
+                self._start = soi
+                self._scan = soi + 2
+
+            eoi = buf.find(JPEG_EOI, max(self._scan - 1, self._start + 2))
+            if eoi < 0:
+                consumed = self._start
+                self._scan = len(buf)
+                break
+
+            end = eoi + 2
+            with memoryview(buf) as view:
+                parts.append(mjpeg_part(view[self._start : end]))
+            consumed = end
+            self._start = -1
+            self._scan = end
+
+        if consumed:
+            # bytearray drops a prefix without copying the whole buffer
+            del buf[:consumed]
+            self._scan -= consumed
+            if self._start >= 0:
+                self._start -= consumed
+        return parts
+
+
+class FrameSlot:
+    """Latest-frame slot shared by all viewers of a stream.
+
+    Holds the newest frame as a ready-to-send multipart part, built once by
+    the reader and handed to every viewer as is. Each published part bumps
+    ``version`` and wakes every waiter exactly once. Viewers remember the
+    version they sent last, so a slow viewer just picks up the newest frame
+    and skips the ones it missed.
+    """
+
+    def __init__(self):
+        self.part: Optional[bytes] = None
+        self.version = 0
+        self.closed = False
+        self._event = asyncio.Event()
+
+    def publish(self, part: bytes):
+        """Store a new multipart part and wake current waiters (event loop only)"""
+        self.part = part
+        self.version += 1
+        event, self._event = self._event, asyncio.Event()
+        event.set()
+
+    def close(self):
+        """Wake all waiters for good, e.g. when the stream ended"""
+        self.closed = True
+        self._event.set()
+
+    async def wait(self, seen_version: int, timeout: float) -> bool:
+        """Wait for a frame newer than ``seen_version``.
+
+        Returns:
+            False on timeout, True once a newer frame exists or the slot closed
+        """
+        if self.version != seen_version or self.closed:
+            return True
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+class CongestionMeter:
+    """Tracks how much of a viewer's time goes into sending frames.
+
+    Sends wait on the client's TCP window, so a viewer whose link cannot
+    keep up spends nearly all of its time sending.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._started = time.monotonic()
+        self._busy = 0.0
+        self._relaxed = 0
+
+    def record(self, busy: float) -> int:
+        """Add the time one send took.
+
+        Returns:
+            1 to step quality down, -1 to step it back up, 0 to stay
+        """
+        self._busy += busy
+        now = time.monotonic()
+        elapsed = now - self._started
+        if elapsed < self.window:
+            return 0
+
+        ratio = self._busy / elapsed
+        self._started, self._busy = now, 0.0
+        if ratio >= CONGESTED_BUSY_RATIO:
+            self._relaxed = 0
+            return 1
+        self._relaxed = self._relaxed + 1 if ratio <= RELAXED_BUSY_RATIO else 0
+        if self._relaxed >= RELAXED_WINDOWS:
+            self._relaxed = 0
+            return -1
+        return 0
+
 
 @dataclass
 class StreamInfo:
@@ -38,10 +266,20 @@ class StreamInfo:
     error: Optional[str] = None
     status: str = "starting"  # starting | running | stopped | error
     mode: str = "mjpeg"  # mjpeg | hls
+    profile: str = "full"  # MJPEG transcoding profile
+    fps: int = 10
+    quality: int = 5
+    width: Optional[int] = None
+    # Shared ingest: stream IDs handed out for this FFmpeg process
+    key: Optional[Tuple] = None
+    handles: Set[str] = field(default_factory=set)
     # MJPEG specific
-    _frame_buffer: bytes = field(default=b"", repr=False)
-    _latest_frame: Optional[bytes] = field(default=None, repr=False)
-    _frame_event: Optional[asyncio.Event] = field(default=None, repr=False)
+    clients: int = 0  # Connected MJPEG viewers
+    frames_received: int = 0
+    _frames: Optional[FrameSlot] = field(default=None, repr=False)
+    # In-memory HLS
+    _hls: Optional[HlsWindow] = field(default=None, repr=False)
+    _loop: Optional[asyncio.AbstractEventLoop] = field(default=None, repr=False)
     _reader_task: Optional[asyncio.Task] = field(default=None, repr=False)
     _stderr_output: str = field(default="", repr=False)
     _is_sync_process: bool = field(
@@ -64,9 +302,13 @@ class StreamProxy:
             self.output_base_dir = Path(tempfile.gettempdir()) / "stream_proxy"
 
         self.output_base_dir.mkdir(parents=True, exist_ok=True)
+        # Stream ID -> ingest; several IDs may share one StreamInfo
         self.streams: Dict[str, StreamInfo] = {}
+        self._ingests: Dict[Tuple, StreamInfo] = {}
+        self._idle_task: Optional[asyncio.Task] = None
         self._ffmpeg_path = self._find_ffmpeg()
         self._has_v4l2m2m = self._check_v4l2m2m()
+        self._codecs: Dict[str, Optional[str]] = {}  # Normalized URL -> codec
 
     def _find_ffmpeg(self) -> Optional[str]:
         """Find FFmpeg executable, checking common installation paths"""
@@ -144,21 +386,85 @@ class StreamProxy:
         # Check for v4l2 device
         return os.path.exists("/dev/video10") or os.path.exists("/dev/video11")
 
+    async def _probe_codec(self, rtsp_url: str) -> Optional[str]:
+        """Video codec a camera serves (e.g. "h264", "mjpeg"), None if unknown"""
+        url = normalize_rtsp_url(rtsp_url)
+        if url in self._codecs:
+            return self._codecs[url]
+
+        ffprobe = None
+        if self._ffmpeg_path:
+            ffprobe = shutil.which("ffprobe") or shutil.which(
+                "ffprobe", path=str(Path(self._ffmpeg_path).parent)
+            )
+        if not ffprobe:
+            return None
+
+        codec = None
+        try:
+            process = await asyncio.create_subprocess_exec(
+                ffprobe,
+                "-v",
+                "error",
+                "-rtsp_transport",
+                "tcp",
+                "-select_streams",
+                "v:0",
+                "-show_entries",
+                "stream=codec_name",
+                "-of",
+                "csv=p=0",
+                rtsp_url,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            try:
+                stdout, _ = await asyncio.wait_for(
+                    process.communicate(), timeout=PROBE_TIMEOUT
+                )
+                codec = stdout.decode().strip().lower() or None
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        except Exception as e:
+            logger.debug(f"ffprobe failed for {rtsp_url}: {e}")
+
+        if codec:
+            self._codecs[url] = codec
+        return codec
+
+    async def _resolve_profile(self, rtsp_url: str, profile: str) -> TranscodeProfile:
+        if profile == "auto":
+            codec = await self._probe_codec(rtsp_url)
+            return MJPEG_PROFILES["passthrough" if codec == "mjpeg" else "full"]
+        if profile not in MJPEG_PROFILES:
+            raise ValueError(
+                f"Unknown MJPEG profile '{profile}', expected one of: "
+                f"{', '.join([*MJPEG_PROFILES, 'auto'])}"
+            )
+        return MJPEG_PROFILES[profile]
+
     async def start_mjpeg_stream(
         self,
         rtsp_url: str,
         stream_id: Optional[str] = None,
         fps: int = 10,
         quality: int = 5,
+        profile: str = "full",
     ) -> str:
         """
         Start an RTSP to MJPEG stream.
 
+        Joins a running ingest of the same camera with the same output
+        settings instead of starting another FFmpeg.
+
         Args:
             rtsp_url: The RTSP URL to convert
             stream_id: Optional stream ID
             fps: Target frame rate (default: 10)
             quality: JPEG quality (2=best, 31=worst, default: 5)
+            profile: full | thumbnail (320 px wide) | passthrough (camera
+                already serves MJPEG, frames are not re-encoded) | auto
 
         Returns:
             The stream ID
@@ -166,26 +472,54 @@ class StreamProxy:
         if not self._ffmpeg_path:
             raise RuntimeError("FFmpeg is not installed.")
 
+        resolved = await self._resolve_profile(rtsp_url, profile)
+        return await self._open_mjpeg(rtsp_url, stream_id, fps, quality, resolved)
+
+    async def _open_mjpeg(
+        self,
+        rtsp_url: str,
+        stream_id: Optional[str],
+        fps: int,
+        quality: int,
+        profile: TranscodeProfile,
+    ) -> str:
         if stream_id is None:
             stream_id = str(uuid.uuid4())[:8]
 
-        # Stop existing stream with same ID
-        if stream_id in self.streams:
-            await self.stop_stream(stream_id)
+        if profile.copy:
+            fps, quality = 0, 0  # Set by the camera
+        key = (
+            "mjpeg",
+            normalize_rtsp_url(rtsp_url),
+            fps,
+            quality,
+            profile.width,
+            profile.copy,
+        )
+        if await self._join_ingest(stream_id, key):
+            return stream_id
 
         stream_info = StreamInfo(
             stream_id=stream_id,
             rtsp_url=rtsp_url,
             mode="mjpeg",
+            profile=profile.name,
+            fps=fps,
+            quality=quality,
+            width=profile.width,
             started_at=time.time(),
             last_accessed=time.time(),
-            _frame_event=asyncio.Event(),
+            key=key,
+            _frames=FrameSlot(),
+            _loop=asyncio.get_running_loop(),
         )
-        self.streams[stream_id] = stream_info
+        self._add_ingest(stream_id, stream_info)
 
         try:
-            await self._start_mjpeg_ffmpeg(stream_info, fps, quality)
-            logger.info(f"Started MJPEG stream {stream_id} from {rtsp_url}")
+            await self._start_mjpeg_ffmpeg(stream_info, fps, quality, profile)
+            logger.info(
+                f"Started MJPEG stream {stream_id} ({profile.name}) from {rtsp_url}"
+            )
         except Exception as e:
             import traceback
 
@@ -197,14 +531,18 @@ class StreamProxy:
 
         return stream_id
 
-    async def _start_mjpeg_ffmpeg(
-        self, stream_info: StreamInfo, fps: int, quality: int
-    ):
-        """Start FFmpeg for MJPEG output to pipe"""
+    def _mjpeg_command(
+        self,
+        rtsp_url: str,
+        fps: int,
+        quality: int,
+        profile: TranscodeProfile,
+    ) -> List[str]:
+        """FFmpeg command line writing the given profile as JPEGs to stdout"""
         cmd = [self._ffmpeg_path]
 
-        # Hardware acceleration on Raspberry Pi
-        if self._has_v4l2m2m:
+        # Hardware acceleration on Raspberry Pi (nothing to decode when copying)
+        if self._has_v4l2m2m and not profile.copy:
             cmd.extend(["-hwaccel", "v4l2m2m"])
 
         cmd.extend(
@@ -222,21 +560,37 @@ class StreamProxy:
                 "-probesize",
                 "5000000",  # Larger probe size for problematic streams
                 "-i",
-                stream_info.rtsp_url,
+                rtsp_url,
                 "-f",
                 "image2pipe",
-                "-c:v",
-                "mjpeg",
-                "-q:v",
-                str(quality),
-                "-r",
-                str(fps),
+            ]
+        )
+        if profile.copy:
+            cmd.extend(["-c:v", "copy"])
+        else:
+            if profile.width:
+                # Never upscale; -2 keeps the height even for the encoder
+                cmd.extend(["-vf", f"scale='min({profile.width},iw)':-2"])
+            cmd.extend(["-c:v", "mjpeg", "-q:v", str(quality), "-r", str(fps)])
+        cmd.extend(
+            [
                 "-an",  # No audio
                 "-flush_packets",
                 "1",
                 "pipe:1",
             ]
         )
+        return cmd
+
+    async def _start_mjpeg_ffmpeg(
+        self,
+        stream_info: StreamInfo,
+        fps: int,
+        quality: int,
+        profile: TranscodeProfile = MJPEG_PROFILES["full"],
+    ):
+        """Start FFmpeg for MJPEG output to pipe"""
+        cmd = self._mjpeg_command(stream_info.rtsp_url, fps, quality, profile)
 
         logger.debug(f"Starting FFmpeg MJPEG: {' '.join(cmd)}")
 
@@ -354,8 +708,7 @@ class StreamProxy:
 
     async def _read_mjpeg_frames(self, stream_info: StreamInfo):
         """Read JPEG frames from ffmpeg stdout pipe"""
-        buffer = b""
-        frame_start = -1
+        parser = MjpegFrameParser()
 
         try:
             while True:
@@ -363,47 +716,17 @@ class StreamProxy:
                 if not chunk:
                     break
 
-                buffer += chunk
-
-                # Find complete JPEG frames in buffer
-                while True:
-                    # Find SOI marker
-                    if frame_start < 0:
-                        soi_pos = buffer.find(JPEG_SOI)
-                        if soi_pos < 0:
-                            # No SOI found, discard buffer up to last byte
-                            buffer = buffer[-1:] if buffer else b""
-                            break
-                        frame_start = soi_pos
-
-                    # Find EOI marker after frame_start
-                    eoi_pos = buffer.find(JPEG_EOI, frame_start + 2)
-                    if eoi_pos < 0:
-                        # No complete frame yet, trim buffer
-                        if frame_start > 0:
-                            buffer = buffer[frame_start:]
-                            frame_start = 0
-                        break
-
-                    # Extract complete JPEG frame
-                    frame_end = eoi_pos + 2
-                    frame = buffer[frame_start:frame_end]
-
-                    # Update latest frame
-                    stream_info._latest_frame = frame
-                    stream_info._frame_event.set()
-                    stream_info._frame_event.clear()
+                for part in parser.feed(chunk):
+                    # Hand the frame to every viewer
+                    stream_info.frames_received += 1
+                    stream_info._frames.publish(part)
 
                     if stream_info.status == "starting":
                         stream_info.status = "running"
                         logger.info(
-                            f"MJPEG stream {stream_info.stream_id}: first frame received ({len(frame)} bytes)"
+                            f"MJPEG stream {stream_info.stream_id}: first frame received ({len(part)} bytes)"
                         )
 
-                    # Advance buffer past this frame
-                    buffer = buffer[frame_end:]
-                    frame_start = -1
-
         except asyncio.CancelledError:
             pass
         except Exception as e:
@@ -421,11 +744,11 @@ class StreamProxy:
                 )
             elif stream_info.status == "running":
                 stream_info.status = "stopped"
+            stream_info._frames.close()
 
     def _read_mjpeg_frames_sync(self, stream_info: StreamInfo):
         """Synchronous version of _read_mjpeg_frames for Windows subprocess.Popen"""
-        buffer = b""
-        frame_start = -1
+        parser = MjpegFrameParser()
 
         try:
             while not stream_info._stop_event.is_set():
@@ -433,40 +756,16 @@ class StreamProxy:
                 if not chunk:
                     break
 
-                buffer += chunk
-
-                # Find complete JPEG frames in buffer
-                while True:
-                    # Find SOI marker
-                    if frame_start < 0:
-                        soi_pos = buffer.find(JPEG_SOI)
-                        if soi_pos < 0:
-                            buffer = buffer[-1:] if buffer else b""
-                            break
-                        frame_start = soi_pos
-
-                    # Find EOI marker after frame_start
-                    eoi_pos = buffer.find(JPEG_EOI, frame_start + 2)
-                    if eoi_pos < 0:
-                        if frame_start > 0:
-                            buffer = buffer[frame_start:]
-                            frame_start = 0
-                        break
-
-                    # Extract complete JPEG frame
-                    frame_end = eoi_pos + 2
-                    frame = buffer[frame_start:frame_end]
-
-                    # Update latest frame (thread-safe via GIL for simple assignments)
-                    stream_info._latest_frame = frame
-                    # Note: asyncio.Event.set() is not thread-safe, but the frame is available
+                for part in parser.feed(chunk):
+                    # Publish on the event loop; asyncio primitives aren't thread-safe
+                    stream_info.frames_received += 1
+                    stream_info._loop.call_soon_threadsafe(
+                        stream_info._frames.publish, part
+                    )
 
                     if stream_info.status == "starting":
                         stream_info.status = "running"
 
-                    buffer = buffer[frame_end:]
-                    frame_start = -1
-
         except Exception as e:
             logger.error(f"MJPEG reader error for {stream_info.stream_id}: {e}")
             stream_info.error = str(e)
@@ -481,73 +780,192 @@ class StreamProxy:
                 )
             elif stream_info.status == "running":
                 stream_info.status = "stopped"
+            try:
+                stream_info._loop.call_soon_threadsafe(stream_info._frames.close)
+            except RuntimeError:
+                pass  # Event loop already closed
 
-    async def get_mjpeg_frames(self, stream_id: str) -> AsyncGenerator[bytes, None]:
+    async def get_mjpeg_frames(
+        self,
+        stream_id: str,
+        max_fps: Optional[float] = None,
+        adaptive: bool = False,
+    ) -> AsyncGenerator[bytes, None]:
         """
         Async generator yielding MJPEG frames for HTTP streaming.
 
-        Yields frames in multipart/x-mixed-replace format.
+        Yields frames in multipart/x-mixed-replace format. Each viewer is
+        woken once per new frame; with ``max_fps`` it is sent at most that
+        many frames per second, always the newest one.
+
+        With ``adaptive`` a viewer whose link stays saturated is moved to a
+        smaller, lower-quality ingest of the same camera, one rung of
+        ``ADAPTIVE_WIDTHS`` at a time, and back up once it has headroom.
         """
         stream_info = self.streams.get(stream_id)
         if not stream_info or stream_info.mode != "mjpeg":
             return
 
-        stream_info.last_accessed = time.time()
-        last_frame = None
-        frame_count = 0
+        min_interval = 1.0 / max_fps if max_fps and max_fps > 0 else 0.0
+        seen_version = 0
+        next_due = 0.0
 
-        while stream_info.status in ("starting", "running"):
-            # Wait for a new frame or timeout
-            try:
-                await asyncio.wait_for(
-                    self._wait_for_frame(stream_info, last_frame), timeout=5.0
-                )
-            except asyncio.TimeoutError:
-                # Keep waiting during "starting" (ffmpeg connecting) and "running" phases
-                # Only break if status changed to "error" or "stopped"
-                if stream_info.status not in ("starting", "running"):
+        ladder = self._adaptive_ladder(stream_info) if adaptive else []
+        meter = CongestionMeter(ADAPT_WINDOW) if ladder else None
+        source, rung = stream_info, 0  # Ingest feeding this viewer
+        pending: Optional[Tuple[StreamInfo, int]] = None  # Rung warming up
+        handles: Dict[int, str] = {}  # Rung -> our handle on its ingest
+
+        source.clients += 1
+        stream_info.last_accessed = time.time()
+        try:
+            while True:
+                if pending:
+                    target, target_rung = pending
+                    if target._frames.version:
+                        # Switch once the new rung has a frame to show
+                        source.clients -= 1
+                        target.clients += 1
+                        if rung in handles:
+                            await self.stop_stream(handles.pop(rung))
+                        source, rung, seen_version = target, target_rung, 0
+                        pending = None
+                        logger.info(
+                            f"MJPEG viewer of {stream_id} moved to "
+                            f"{source.width or 'full'} px"
+                        )
+                    elif target.status not in ("starting", "running"):
+                        # That rung does not work; stay where we are
+                        if target_rung in handles:
+                            await self.stop_stream(handles.pop(target_rung))
+                        if target_rung > rung:
+                            ladder = ladder[: target_rung - 1]
+                        pending = None
+
+                if source.status not in ("starting", "running"):
                     break
-                continue
-
-            frame = stream_info._latest_frame
-            if frame and frame is not last_frame:
-                last_frame = frame
-                frame_count += 1
-                stream_info.last_accessed = time.time()
-                # Yield as multipart chunk
-                yield (
-                    b"--frame\r\n"
-                    b"Content-Type: image/jpeg\r\n"
-                    b"Content-Length: " + str(len(frame)).encode() + b"\r\n"
-                    b"\r\n" + frame + b"\r\n"
-                )
+                slot = source._frames
+
+                # Keep waiting while ffmpeg connects or between frames; the
+                # status check ends the stream on "error" or "stopped"
+                if not await slot.wait(seen_version, FRAME_WAIT_TIMEOUT):
+                    continue
+                if slot.version == seen_version:
+                    break  # Slot closed without a newer frame
+
+                if min_interval:
+                    delay = next_due - time.monotonic()
+                    if delay > 0:
+                        # Frames published meanwhile are skipped
+                        await asyncio.sleep(delay)
+                    next_due = time.monotonic() + min_interval
+
+                seen_version = slot.version
+                stream_info.last_accessed = source.last_accessed = time.time()
+                sent_at = time.monotonic()
+                # The multipart part is built once and shared by all viewers
+                yield slot.part
+
+                if meter and not pending:
+                    step = meter.record(time.monotonic() - sent_at)
+                    if step and 0 <= rung + step <= len(ladder):
+                        pending = await self._adaptive_rung(
+                            stream_info, rung + step, ladder, handles
+                        )
+        finally:
+            source.clients -= 1
+            for handle in handles.values():
+                await self.stop_stream(handle)
+
+    def _adaptive_ladder(self, stream_info: StreamInfo) -> List[int]:
+        """Widths below the stream's own an adaptive viewer may drop to"""
+        return [
+            w for w in ADAPTIVE_WIDTHS if not stream_info.width or w < stream_info.width
+        ]
 
-    async def _wait_for_frame(self, stream_info: StreamInfo, last_frame):
-        """Wait until a new frame is available"""
-        while stream_info._latest_frame is last_frame and stream_info.status in (
-            "starting",
-            "running",
-        ):
-            await asyncio.sleep(0.01)
+    async def _adaptive_rung(
+        self,
+        stream_info: StreamInfo,
+        rung: int,
+        ladder: List[int],
+        handles: Dict[int, str],
+    ) -> Optional[Tuple[StreamInfo, int]]:
+        """Open (or join) the ingest for a ladder rung; rung 0 is the stream itself"""
+        if rung == 0:
+            if stream_info.status not in ("starting", "running"):
+                return None
+            return stream_info, 0
+
+        width = ladder[rung - 1]
+        handle = f"{stream_info.stream_id}~{width}-{uuid.uuid4().hex[:6]}"
+        quality = min(31, max(stream_info.quality, 2) + ADAPTIVE_QUALITY_STEP * rung)
+        fps = stream_info.fps or 10
+        try:
+            await self._open_mjpeg(
+                stream_info.rtsp_url,
+                handle,
+                fps,
+                quality,
+                TranscodeProfile(f"adaptive-{width}", width=width),
+            )
+        except Exception as e:
+            logger.warning(f"Adaptive rung {width} px for {stream_info.stream_id}: {e}")
+            await self.stop_stream(handle)
+            return None
+        handles[rung] = handle
+        return self.streams[handle], rung
 
-    # ========== HLS mode (kept for backward compatibility) ==========
+    # ========== HLS mode ==========
 
-    async def start_stream(self, rtsp_url: str, stream_id: Optional[str] = None) -> str:
-        """Start converting an RTSP stream to HLS."""
+    async def start_stream(
+        self,
+        rtsp_url: str,
+        stream_id: Optional[str] = None,
+        low_latency: bool = True,
+    ) -> str:
+        """Start converting an RTSP stream to HLS.
+
+        Args:
+            rtsp_url: The RTSP URL to convert
+            stream_id: Optional stream ID
+            low_latency: Serve LL-HLS parts from memory instead of writing
+                .ts segments to disk
+
+        Returns:
+            The stream ID
+        """
         if not self._ffmpeg_path:
             raise RuntimeError("FFmpeg is not installed.")
 
         if stream_id is None:
             stream_id = str(uuid.uuid4())[:8]
 
-        if stream_id in self.streams:
-            existing = self.streams[stream_id]
-            if existing.status == "running":
-                return stream_id
-            else:
-                await self.stop_stream(stream_id)
+        key = ("hls", normalize_rtsp_url(rtsp_url), low_latency)
+        if await self._join_ingest(stream_id, key):
+            return stream_id
+
+        if low_latency:
+            stream_info = StreamInfo(
+                stream_id=stream_id,
+                rtsp_url=rtsp_url,
+                mode="hls",
+                profile="copy",
+                started_at=time.time(),
+                last_accessed=time.time(),
+                key=key,
+                _hls=HlsWindow(),
+            )
+            self._add_ingest(stream_id, stream_info)
+            try:
+                await self._start_ll_hls_ffmpeg(stream_info)
+            except Exception as e:
+                stream_info.status = "error"
+                stream_info.error = str(e)
+                raise
+            return stream_id
 
-        hls_dir = self.output_base_dir / stream_id
+        # Named per ingest: the stream ID may outlive it or be reused
+        hls_dir = self.output_base_dir / f"{stream_id}-{uuid.uuid4().hex[:8]}"
         hls_dir.mkdir(parents=True, exist_ok=True)
 
         stream_info = StreamInfo(
@@ -555,10 +973,12 @@ class StreamProxy:
             rtsp_url=rtsp_url,
             hls_dir=hls_dir,
             mode="hls",
+            profile="copy",
             started_at=time.time(),
             last_accessed=time.time(),
+            key=key,
         )
-        self.streams[stream_id] = stream_info
+        self._add_ingest(stream_id, stream_info)
 
         try:
             await self._start_hls_ffmpeg(stream_info)
@@ -569,9 +989,97 @@ class StreamProxy:
 
         return stream_id
 
+    async def _hls_video_args(self, stream_info: StreamInfo) -> List[str]:
+        """Browsers play H.264 HLS as is; anything else has to be re-encoded"""
+        codec = await self._probe_codec(stream_info.rtsp_url)
+        if codec in (None, "h264"):
+            return ["-c:v", "copy"]
+        stream_info.profile = "transcode"
+        logger.info(f"HLS stream {stream_info.stream_id}: re-encoding {codec}")
+        return ["-c:v", "libx264", "-preset", "veryfast", "-tune", "zerolatency"]
+
+    async def _start_ll_hls_ffmpeg(self, stream_info: StreamInfo, timeout: int = 15):
+        """Start FFmpeg writing fragmented MP4 to a pipe for in-memory LL-HLS"""
+        cmd = [
+            self._ffmpeg_path,
+            "-rtsp_transport",
+            "tcp",
+            "-fflags",
+            "nobuffer",
+            "-flags",
+            "low_delay",
+            "-i",
+            stream_info.rtsp_url,
+            *(await self._hls_video_args(stream_info)),
+            "-an",  # Previews are silent; one track keeps parts simple
+            "-f",
+            "mp4",
+            "-movflags",
+            "+frag_keyframe+empty_moov+default_base_moof",
+            "-frag_duration",
+            str(int(PART_TARGET * 1_000_000)),
+            "pipe:1",
+        ]
+
+        kwargs = {
+            "stdout": asyncio.subprocess.PIPE,
+            "stderr": asyncio.subprocess.PIPE,
+        }
+        if platform.system() == "Windows":
+            import subprocess
+
+            kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+
+        stream_info.process = await asyncio.create_subprocess_exec(*cmd, **kwargs)
+        asyncio.create_task(self._drain_stderr(stream_info))
+        stream_info._reader_task = asyncio.create_task(self._read_fmp4(stream_info))
+
+        if not await stream_info._hls.wait_for(0, 0, timeout):
+            await self._shutdown_ingest(stream_info)
+            raise RuntimeError(
+                stream_info.error
+                or f"Timeout waiting for HLS stream: {stream_info.rtsp_url}"
+            )
+
+    async def _read_fmp4(self, stream_info: StreamInfo):
+        """Feed FFmpeg's fragmented MP4 output into the stream's HLS window"""
+        splitter = Fmp4Splitter()
+        window = stream_info._hls
+        try:
+            while True:
+                chunk = await stream_info.process.stdout.read(65536)
+                if not chunk:
+                    break
+                for kind, data in splitter.feed(chunk):
+                    if kind == "init":
+                        window.set_init(data)
+                    else:
+                        window.add_part(data)
+                        if stream_info.status == "starting" and window.segments:
+                            stream_info.status = "running"
+                            logger.info(
+                                f"HLS stream {stream_info.stream_id}: first part ready"
+                            )
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"HLS reader error for {stream_info.stream_id}: {e}")
+            stream_info.error = str(e)
+            stream_info.status = "error"
+        finally:
+            if stream_info.status == "starting":
+                stream_info.error = (
+                    stream_info._stderr_output or "Stream failed to produce video"
+                )
+                stream_info.status = "error"
+            elif stream_info.status == "running":
+                stream_info.status = "stopped"
+            window.close()
+
     async def _start_hls_ffmpeg(self, stream_info: StreamInfo):
         """Start FFmpeg for HLS output"""
         hls_output = stream_info.hls_dir / "index.m3u8"
+        video_args = await self._hls_video_args(stream_info)
 
         cmd = [
             self._ffmpeg_path,
@@ -583,8 +1091,7 @@ class StreamProxy:
             "low_delay",
             "-i",
             stream_info.rtsp_url,
-            "-c:v",
-            "copy",
+            *video_args,
             "-c:a",
             "aac",
             "-f",
@@ -644,14 +1151,63 @@ class StreamProxy:
         else:
             stream_info.status = "stopped"
 
-    # ========== Common methods ==========
+    # ========== Shared ingests ==========
 
-    async def stop_stream(self, stream_id: str) -> bool:
-        """Stop a running stream"""
-        if stream_id not in self.streams:
+    async def _join_ingest(self, stream_id: str, key: Tuple) -> bool:
+        """Point ``stream_id`` at a live ingest matching ``key``, if any.
+
+        A stream ID already bound to something else is released first.
+
+        Returns:
+            True if the caller can use the stream ID without starting FFmpeg
+        """
+        live = ("starting", "running")
+        current = self.streams.get(stream_id)
+        if current is not None:
+            if current.key == key and current.status in live:
+                return True
+            await self.stop_stream(stream_id)
+
+        ingest = self._ingests.get(key)
+        if ingest is None or ingest.status not in live:
             return False
 
-        stream_info = self.streams[stream_id]
+        self.streams[stream_id] = ingest
+        ingest.handles.add(stream_id)
+        ingest.last_accessed = time.time()
+        logger.info(
+            f"Stream {stream_id} shares ingest {ingest.stream_id} "
+            f"({len(ingest.handles)} handles)"
+        )
+        return True
+
+    def _add_ingest(self, stream_id: str, stream_info: StreamInfo):
+        """Register a new ingest under its first stream ID"""
+        self._ingests[stream_info.key] = stream_info
+        self.streams[stream_id] = stream_info
+        stream_info.handles.add(stream_id)
+
+        timeout = settings.preview_stream_idle_timeout
+        if timeout > 0 and (self._idle_task is None or self._idle_task.done()):
+            self._idle_task = asyncio.create_task(self._reap_idle_streams(timeout))
+
+    async def _reap_idle_streams(self, timeout: int):
+        """Periodically stop unwatched ingests; exits once none are left"""
+        while self.streams:
+            await asyncio.sleep(min(IDLE_CHECK_INTERVAL, timeout))
+            try:
+                await self.cleanup_idle_streams(timeout)
+            except Exception as e:
+                logger.warning(f"Idle stream cleanup failed: {e}")
+
+    async def _shutdown_ingest(self, stream_info: StreamInfo):
+        """Stop an ingest's FFmpeg and drop every stream ID pointing at it"""
+        for handle in stream_info.handles:
+            if self.streams.get(handle) is stream_info:
+                del self.streams[handle]
+        stream_info.handles.clear()
+        if self._ingests.get(stream_info.key) is stream_info:
+            del self._ingests[stream_info.key]
 
         if stream_info._is_sync_process:
             # For sync subprocess (Windows), signal threads to stop
@@ -684,17 +1240,45 @@ class StreamProxy:
                     stream_info.process.kill()
                     await stream_info.process.wait()
 
+        if stream_info._frames:
+            stream_info._frames.close()
+        if stream_info._hls:
+            stream_info._hls.close()
+
         # Clean up HLS files
         if stream_info.hls_dir and stream_info.hls_dir.exists():
             shutil.rmtree(stream_info.hls_dir, ignore_errors=True)
 
-        del self.streams[stream_id]
+    # ========== Common methods ==========
+
+    async def stop_stream(self, stream_id: str) -> bool:
+        """Release a stream ID; FFmpeg stops once its last ID is released"""
+        stream_info = self.streams.pop(stream_id, None)
+        if stream_info is None:
+            return False
+
+        stream_info.handles.discard(stream_id)
+        if stream_info.handles:
+            logger.info(
+                f"Released stream {stream_id}, ingest {stream_info.stream_id} "
+                f"kept for {len(stream_info.handles)} other handles"
+            )
+            return True
+
+        await self._shutdown_ingest(stream_info)
         logger.info(f"Stopped stream {stream_id}")
         return True
 
     def get_stream_info(self, stream_id: str) -> Optional[StreamInfo]:
         return self.streams.get(stream_id)
 
+    def get_hls_window(self, stream_id: str) -> Optional[HlsWindow]:
+        info = self.streams.get(stream_id)
+        if info:
+            info.last_accessed = time.time()
+            return info._hls
+        return None
+
     def get_hls_path(self, stream_id: str) -> Optional[Path]:
         info = self.streams.get(stream_id)
         if info and info.mode == "hls" and info.status == "running":
@@ -712,29 +1296,38 @@ class StreamProxy:
     def list_streams(self) -> Dict[str, dict]:
         return {
             sid: {
-                "stream_id": info.stream_id,
+                "stream_id": sid,
+                "ingest": info.stream_id,
+                "shared_by": len(info.handles),
                 "rtsp_url": info.rtsp_url,
                 "status": info.status,
                 "mode": info.mode,
+                "profile": info.profile,
                 "error": info.error,
+                "clients": info.clients,
+                "frames_received": info.frames_received,
             }
             for sid, info in self.streams.items()
         }
 
     async def cleanup_idle_streams(self, max_idle_seconds: int = 300):
+        """Stop ingests nobody has watched for ``max_idle_seconds``"""
         now = time.time()
-        to_stop = [
-            sid
-            for sid, info in self.streams.items()
-            if now - info.last_accessed > max_idle_seconds
-        ]
-        for stream_id in to_stop:
-            logger.info(f"Cleaning up idle stream: {stream_id}")
-            await self.stop_stream(stream_id)
+        idle = {
+            id(info): info
+            for info in self.streams.values()
+            if info.clients == 0 and now - info.last_accessed > max_idle_seconds
+        }
+        for info in idle.values():
+            logger.info(f"Cleaning up idle stream: {info.stream_id}")
+            await self._shutdown_ingest(info)
 
     async def stop_all(self):
-        for stream_id in list(self.streams.keys()):
-            await self.stop_stream(stream_id)
+        if self._idle_task and not self._idle_task.done():
+            self._idle_task.cancel()
+        ingests = {id(info): info for info in self.streams.values()}
+        for info in ingests.values():
+            await self._shutdown_ingest(info)
 
 
 # Global instance
@@ -13,6 +13,7 @@ from typing import Optional
 
 from ..models.kiosk import UpdateResponse
 from .deployment_history import deployment_history
+from .ssh_pool import get_ssh_pool
 
 logger = logging.getLogger(__name__)
 
@@ -267,8 +268,7 @@ class UpdateManager:
         try:
             import paramiko
 
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            client = get_ssh_pool().client()
 
             await asyncio.to_thread(
                 client.connect,
@@ -423,8 +423,7 @@ class UpdateManager:
         try:
             import paramiko
 
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            client = get_ssh_pool().client()
 
             await asyncio.to_thread(
                 client.connect,
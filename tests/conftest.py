@@ -141,6 +141,41 @@ services:
 """
 
 
+# Runtime state isolation
+@pytest.fixture(autouse=True)
+def deployment_history(tmp_path, monkeypatch):
+    """Point the shared deployment history at a per-test log under tmp_path"""
+    from provisioning_station.services import deployment_history as history_module
+
+    shared = history_module.deployment_history
+    isolated = history_module.DeploymentHistory(
+        storage_path=str(tmp_path / "cache" / "deployment_history.jsonl"),
+        retention=0,
+    )
+    # Swap state rather than the object so modules that imported the
+    # singleton by name see the isolated log too
+    for name, value in vars(isolated).items():
+        monkeypatch.setattr(shared, name, value)
+    return shared
+
+
+@pytest.fixture(autouse=True)
+def solution_snapshot_path(tmp_path, monkeypatch) -> Path:
+    """Keep SolutionManager warm-start snapshots under tmp_path"""
+    from provisioning_station.config import settings
+    from provisioning_station.services.solution_manager import (
+        SOLUTION_SNAPSHOT_FILE,
+        solution_manager,
+    )
+
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(settings, "cache_dir", cache_dir)
+    monkeypatch.setattr(
+        solution_manager, "snapshot_path", cache_dir / SOLUTION_SNAPSHOT_FILE
+    )
+    return cache_dir / SOLUTION_SNAPSHOT_FILE
+
+
 # FastAPI test client fixtures
 @pytest.fixture
 def app():
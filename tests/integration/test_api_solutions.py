@@ -2,6 +2,7 @@
 Integration tests for Solutions API endpoints
 """
 
+import asyncio
 import tempfile
 from pathlib import Path
 from unittest.mock import patch, AsyncMock
@@ -55,6 +56,25 @@ def mock_solution_manager(mock_solution):
     return manager
 
 
+def make_indexed_manager(*solutions):
+    """Create a SolutionManager whose listing index holds the given solutions"""
+    from provisioning_station.services.solution_manager import SolutionManager
+
+    manager = SolutionManager()
+    manager.solutions = {s.id: s for s in solutions}
+    for solution in solutions:
+        asyncio.run(manager._index_solution(solution))
+    return manager
+
+
+def patch_listing(solution_manager, indexed):
+    """Route the listing endpoint's index lookups to another manager"""
+    return (
+        patch.object(solution_manager, 'list_index', side_effect=indexed.list_index),
+        patch.object(solution_manager, 'get_solution', side_effect=indexed.get_solution),
+    )
+
+
 class TestListSolutions:
     """Tests for GET /api/solutions/"""
 
@@ -62,7 +82,8 @@ class TestListSolutions:
         """Test listing solutions when none exist"""
         from provisioning_station.services.solution_manager import solution_manager
 
-        with patch.object(solution_manager, 'get_all_solutions', return_value=[]):
+        patch_index, patch_get = patch_listing(solution_manager, make_indexed_manager())
+        with patch_index, patch_get:
             from provisioning_station.main import app
             with TestClient(app, raise_server_exceptions=False) as client:
                 response = client.get("/api/solutions/")
@@ -74,35 +95,53 @@ class TestListSolutions:
         """Test listing solutions with existing solutions"""
         from provisioning_station.services.solution_manager import solution_manager
 
-        with patch.object(solution_manager, 'get_all_solutions', return_value=[mock_solution]):
-            with patch.object(solution_manager, 'count_devices_in_solution', return_value=2):
-                from provisioning_station.main import app
-                with TestClient(app, raise_server_exceptions=False) as client:
-                    response = client.get("/api/solutions/")
+        indexed = make_indexed_manager(mock_solution)
+        patch_index, patch_get = patch_listing(solution_manager, indexed)
+        with patch_index, patch_get:
+            from provisioning_station.main import app
+            with TestClient(app, raise_server_exceptions=False) as client:
+                response = client.get("/api/solutions/")
 
-                    assert response.status_code == 200
-                    data = response.json()
-                    assert len(data) == 1
-                    assert data[0]["id"] == "test_solution"
-                    assert data[0]["name"] == "Test Solution"
+                assert response.status_code == 200
+                data = response.json()
+                assert len(data) == 1
+                assert data[0]["id"] == "test_solution"
+                assert data[0]["name"] == "Test Solution"
 
     def test_list_solutions_filter_by_category(self, mock_solution):
         """Test filtering solutions by category"""
         from provisioning_station.services.solution_manager import solution_manager
 
-        with patch.object(solution_manager, 'get_all_solutions', return_value=[mock_solution]):
-            with patch.object(solution_manager, 'count_devices_in_solution', return_value=0):
-                from provisioning_station.main import app
-                with TestClient(app, raise_server_exceptions=False) as client:
-                    # Filter by matching category
-                    response = client.get("/api/solutions/?category=testing")
-                    assert response.status_code == 200
-                    assert len(response.json()) == 1
+        indexed = make_indexed_manager(mock_solution)
+        patch_index, patch_get = patch_listing(solution_manager, indexed)
+        with patch_index, patch_get:
+            from provisioning_station.main import app
+            with TestClient(app, raise_server_exceptions=False) as client:
+                # Filter by matching category
+                response = client.get("/api/solutions/?category=testing")
+                assert response.status_code == 200
+                assert len(response.json()) == 1
 
-                    # Filter by non-matching category
-                    response = client.get("/api/solutions/?category=voice_ai")
-                    assert response.status_code == 200
-                    assert len(response.json()) == 0
+                # Filter by non-matching category
+                response = client.get("/api/solutions/?category=voice_ai")
+                assert response.status_code == 200
+                assert len(response.json()) == 0
+
+    def test_list_solutions_hides_disabled(self, mock_solution):
+        """Test disabled solutions only appear with include_disabled"""
+        from provisioning_station.services.solution_manager import solution_manager
+
+        mock_solution.enabled = False
+        indexed = make_indexed_manager(mock_solution)
+        patch_index, patch_get = patch_listing(solution_manager, indexed)
+        with patch_index, patch_get:
+            from provisioning_station.main import app
+            with TestClient(app, raise_server_exceptions=False) as client:
+                response = client.get("/api/solutions/")
+                assert response.json() == []
+
+                response = client.get("/api/solutions/?include_disabled=true")
+                assert len(response.json()) == 1
 
 
 class TestGetSolution:
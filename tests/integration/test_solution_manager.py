@@ -10,6 +10,7 @@ from unittest.mock import patch
 import pytest
 import yaml
 
+from provisioning_station.services.markdown_parser import parse_guide_multilang
 from provisioning_station.services.solution_manager import SolutionManager
 
 
@@ -93,6 +94,82 @@ class TestSolutionManagerLoading:
         assert solutions[0].id == "test_solution"
 
 
+class TestSolutionManagerSnapshot:
+    """Tests for the validated-solution snapshot used on warm starts"""
+
+    @pytest.fixture
+    def make_manager(self, temp_solutions_dir):
+        """Factory for managers sharing one snapshot file"""
+        snapshot_path = temp_solutions_dir.parent / "cache" / "solutions_snapshot.json"
+
+        def _make():
+            manager = SolutionManager()
+            manager.solutions_dir = temp_solutions_dir
+            manager.snapshot_path = snapshot_path
+            return manager
+
+        return _make
+
+    @pytest.mark.asyncio
+    async def test_warm_start_uses_snapshot(self, make_manager):
+        """Unchanged solutions are restored from the snapshot"""
+        cold = make_manager()
+        await cold.load_solutions()
+        assert cold.load_stats["from_snapshot"] == 0
+        assert cold.snapshot_path.exists()
+
+        warm = make_manager()
+        with patch("provisioning_station.services.solution_manager.yaml.load") as mock_load:
+            await warm.load_solutions()
+
+        mock_load.assert_not_called()
+        assert warm.load_stats["from_snapshot"] == 1
+        assert warm.get_solution("test_solution") == cold.get_solution("test_solution")
+        assert "test_solution" in warm.load_stats["parse_seconds"]
+
+    @pytest.mark.asyncio
+    async def test_changed_yaml_is_reparsed(self, make_manager, temp_solutions_dir):
+        """Editing solution.yaml invalidates its snapshot entry"""
+        await make_manager().load_solutions()
+
+        yaml_path = temp_solutions_dir / "test_solution" / "solution.yaml"
+        data = yaml.safe_load(yaml_path.read_text(encoding="utf-8"))
+        data["name"] = "Renamed"
+        yaml_path.write_text(yaml.dump(data, allow_unicode=True), encoding="utf-8")
+
+        manager = make_manager()
+        await manager.load_solutions()
+
+        assert manager.load_stats["from_snapshot"] == 0
+        assert manager.get_solution("test_solution").name == "Renamed"
+
+    @pytest.mark.asyncio
+    async def test_changed_guide_recounts_steps(self, make_manager, temp_solutions_dir):
+        """The cached step count is only reused while guide.md is unchanged"""
+        await make_manager().load_solutions()
+
+        guide_path = temp_solutions_dir / "test_solution" / "deploy" / "guide.md"
+        guide_path.write_text(GUIDE_CACHE_EN, encoding="utf-8")
+
+        manager = make_manager()
+        await manager.load_solutions()
+
+        assert manager.load_stats["from_snapshot"] == 1
+        assert manager.get_index_entry("test_solution").device_count == 1
+
+    @pytest.mark.asyncio
+    async def test_corrupt_snapshot_is_ignored(self, make_manager):
+        """An unreadable snapshot falls back to parsing"""
+        manager = make_manager()
+        manager.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        manager.snapshot_path.write_text("{not json", encoding="utf-8")
+
+        solutions = await manager.load_solutions()
+
+        assert len(solutions) == 1
+        assert manager.load_stats["from_snapshot"] == 0
+
+
 class TestSolutionManagerMarkdown:
     """Tests for markdown loading functionality"""
 
@@ -609,6 +686,162 @@ Congratulations!
         assert preview is None
 
 
+GUIDE_CACHE_EN = """## Preset: Main {#main}
+
+Main preset description.
+
+## Step 1: Deploy {#deploy type=manual required=true}
+
+Deploy content.
+"""
+
+GUIDE_CACHE_ZH = """## 套餐: 主要 {#main}
+
+主要预设描述。
+
+## 步骤 1: 部署 {#deploy type=manual required=true}
+
+部署内容。
+"""
+
+
+class TestSolutionManagerGuideCache:
+    """Tests for the compiled guide cache behind get_deployment_from_guide"""
+
+    @pytest.fixture
+    def manager(self, temp_solutions_dir):
+        """Create SolutionManager with guide files containing a preset"""
+        deploy_dir = temp_solutions_dir / "test_solution" / "deploy"
+        (deploy_dir / "guide.md").write_text(GUIDE_CACHE_EN, encoding="utf-8")
+        (deploy_dir / "guide_zh.md").write_text(GUIDE_CACHE_ZH, encoding="utf-8")
+        manager = SolutionManager()
+        manager.solutions_dir = temp_solutions_dir
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_repeated_calls_parse_once(self, manager):
+        """Both languages are served from one parse until files change"""
+        await manager.load_solutions()
+
+        with patch(
+            "provisioning_station.services.solution_manager.parse_guide_multilang",
+            wraps=parse_guide_multilang,
+        ) as mock_parse:
+            en = await manager.get_deployment_from_guide("test_solution", "en")
+            again = await manager.get_deployment_from_guide("test_solution", "en")
+            zh = await manager.get_deployment_from_guide("test_solution", "zh")
+
+        assert mock_parse.call_count == 1
+        assert en == again
+        assert en["devices"][0]["name"] == "Deploy"
+        assert zh["devices"][0]["name"] == "部署"
+
+    @pytest.mark.asyncio
+    async def test_result_is_not_shared(self, manager):
+        """Mutating a returned dict does not corrupt the cache"""
+        await manager.load_solutions()
+
+        first = await manager.get_deployment_from_guide("test_solution", "en")
+        first["devices"].clear()
+
+        second = await manager.get_deployment_from_guide("test_solution", "en")
+        assert len(second["devices"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_file_change_invalidates(self, manager, temp_solutions_dir):
+        """Editing a guide on disk is picked up on the next call"""
+        await manager.load_solutions()
+        await manager.get_deployment_from_guide("test_solution", "en")
+
+        guide_path = temp_solutions_dir / "test_solution" / "deploy" / "guide.md"
+        guide_path.write_text(
+            GUIDE_CACHE_EN.replace("Step 1: Deploy", "Step 1: Install"),
+            encoding="utf-8",
+        )
+
+        result = await manager.get_deployment_from_guide("test_solution", "en")
+        assert result["devices"][0]["name"] == "Install"
+
+    @pytest.mark.asyncio
+    async def test_reload_invalidates(self, manager):
+        """reload_solution drops the compiled guide"""
+        await manager.load_solutions()
+        await manager.get_deployment_from_guide("test_solution", "en")
+        assert "test_solution" in manager._guide_cache
+
+        await manager.reload_solution("test_solution")
+        assert "test_solution" not in manager._guide_cache
+
+    @pytest.mark.asyncio
+    async def test_save_text_file_invalidates(self, manager):
+        """Editing files through the management API drops the compiled guide"""
+        await manager.load_solutions()
+        await manager.get_deployment_from_guide("test_solution", "en")
+
+        await manager.save_text_file("test_solution", "devices/new.yaml", "id: new\n")
+        assert "test_solution" not in manager._guide_cache
+
+
+class TestSolutionManagerIndex:
+    """Tests for the precomputed solution listing index"""
+
+    @pytest.fixture
+    def manager(self, temp_solutions_dir):
+        """Create SolutionManager with temporary solutions directory"""
+        manager = SolutionManager()
+        manager.solutions_dir = temp_solutions_dir
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_load_builds_index(self, manager):
+        """Loading solutions records file flags and filter fields"""
+        await manager.load_solutions()
+
+        entry = manager.get_index_entry("test_solution")
+        assert entry is not None
+        assert entry.category == "testing"
+        assert entry.has_description is True
+        assert entry.has_guide is True
+        assert entry.device_count == 0
+
+    @pytest.mark.asyncio
+    async def test_list_index_filters(self, manager):
+        """Category and type filters are applied to index entries"""
+        await manager.load_solutions()
+
+        assert len(manager.list_index(category="testing")) == 1
+        assert manager.list_index(category="voice_ai") == []
+        assert manager.list_index(solution_type="technical") == []
+
+    @pytest.mark.asyncio
+    async def test_save_guide_updates_step_count(self, manager):
+        """Writing guide.md through the editing API refreshes the step count"""
+        await manager.load_solutions()
+
+        await manager.save_text_file("test_solution", "deploy/guide.md", GUIDE_CACHE_EN)
+
+        assert manager.get_index_entry("test_solution").device_count == 1
+
+    @pytest.mark.asyncio
+    async def test_delete_file_updates_flags(self, manager):
+        """Deleting a description file clears its flag"""
+        await manager.load_solutions()
+
+        await manager.delete_file("test_solution", "intro/description_zh.md")
+
+        assert manager.get_index_entry("test_solution").has_description_zh is False
+
+    @pytest.mark.asyncio
+    async def test_delete_solution_removes_entry(self, manager):
+        """Deleted solutions disappear from the index"""
+        await manager.load_solutions()
+
+        await manager.delete_solution("test_solution", move_to_trash=False)
+
+        assert manager.get_index_entry("test_solution") is None
+        assert manager.list_index() == []
+
+
 class TestSolutionManagerDeviceCatalog:
     """Tests for device catalog functionality"""
 
@@ -0,0 +1,135 @@
+"""
+Integration tests for the solution file watcher
+"""
+
+import asyncio
+import shutil
+
+import pytest
+import yaml
+
+from provisioning_station.services.solution_manager import SolutionManager
+from provisioning_station.services.solution_watcher import SolutionWatcher
+
+
+@pytest.fixture
+def manager(temp_solutions_dir):
+    """Create SolutionManager with temporary solutions directory"""
+    manager = SolutionManager()
+    manager.solutions_dir = temp_solutions_dir
+    manager.snapshot_path = temp_solutions_dir.parent / "cache" / "snapshot.json"
+    return manager
+
+
+@pytest.fixture
+def watcher(manager):
+    """Create a polling watcher with short intervals"""
+    return SolutionWatcher(
+        manager, debounce=0.05, poll_interval=0.05, force_polling=True
+    )
+
+
+def rename_solution(solutions_dir, name):
+    """Rewrite the test solution's name in solution.yaml"""
+    yaml_path = solutions_dir / "test_solution" / "solution.yaml"
+    data = yaml.safe_load(yaml_path.read_text(encoding="utf-8"))
+    data["name"] = name
+    yaml_path.write_text(yaml.dump(data, allow_unicode=True), encoding="utf-8")
+    return yaml_path
+
+
+class TestApplyChanges:
+    """Tests for mapping changed paths to cache invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_solution_yaml_change_reloads(self, manager, watcher, temp_solutions_dir):
+        """Editing solution.yaml reloads that solution"""
+        await manager.load_solutions()
+        yaml_path = rename_solution(temp_solutions_dir, "Edited")
+
+        await watcher._apply_changes([yaml_path])
+
+        assert manager.get_solution("test_solution").name == "Edited"
+
+    @pytest.mark.asyncio
+    async def test_device_yaml_change_drops_only_that_config(self, manager, watcher, temp_solutions_dir):
+        """Editing a device YAML drops only the matching cached config"""
+        await manager.load_solutions()
+        manager._device_configs["test_solution"] = {"camera": object(), "gateway": object()}
+        manager._solution_index.pop("test_solution")
+
+        await watcher._apply_changes(
+            [temp_solutions_dir / "test_solution" / "devices" / "camera.yaml"]
+        )
+
+        assert set(manager._device_configs["test_solution"]) == {"gateway"}
+        assert manager.get_index_entry("test_solution") is not None
+
+    @pytest.mark.asyncio
+    async def test_removed_solution_is_forgotten(self, manager, watcher, temp_solutions_dir):
+        """Deleting a solution directory removes it from memory"""
+        await manager.load_solutions()
+        solution_path = temp_solutions_dir / "test_solution"
+        shutil.rmtree(solution_path)
+
+        await watcher._apply_changes([solution_path / "solution.yaml"])
+
+        assert manager.get_solution("test_solution") is None
+        assert manager.get_index_entry("test_solution") is None
+
+    @pytest.mark.asyncio
+    async def test_hidden_and_swap_files_ignored(self, manager, watcher, temp_solutions_dir):
+        """Trash entries and editor swap files do not trigger reloads"""
+        await manager.load_solutions()
+        rename_solution(temp_solutions_dir, "Not applied")
+
+        await watcher._apply_changes(
+            [
+                temp_solutions_dir / ".trash" / "old" / "solution.yaml",
+                temp_solutions_dir / "test_solution" / ".solution.yaml.swp",
+            ]
+        )
+
+        assert manager.get_solution("test_solution").name == "Test Solution"
+
+    @pytest.mark.asyncio
+    async def test_catalog_change_reloads_catalog(self, manager, watcher):
+        """Editing devices/catalog.yaml reloads the global catalog"""
+        catalog_path = watcher.catalog_path
+        catalog_path.parent.mkdir(parents=True, exist_ok=True)
+        catalog_path.write_text("camera:\n  name: Camera\n", encoding="utf-8")
+
+        await watcher._apply_changes([catalog_path])
+
+        assert manager.get_global_device("camera") == {"name": "Camera"}
+
+
+class TestPolling:
+    """Tests for the polling fallback"""
+
+    def test_diff_detects_changes(self, tmp_path):
+        """Added, removed and modified files are reported"""
+        a, b, c = tmp_path / "a", tmp_path / "b", tmp_path / "c"
+        before = {a: (1, 10), b: (1, 10)}
+        after = {a: (2, 10), c: (1, 10)}
+
+        assert SolutionWatcher._diff(before, after) == {a, b, c}
+
+    @pytest.mark.asyncio
+    async def test_polling_hot_reloads(self, manager, watcher, temp_solutions_dir):
+        """A running watcher picks up edits without an explicit reload"""
+        await manager.load_solutions()
+        await watcher.start()
+        try:
+            await asyncio.sleep(0.1)
+            rename_solution(temp_solutions_dir, "Hot Reloaded")
+
+            for _ in range(50):
+                await asyncio.sleep(0.05)
+                if manager.get_solution("test_solution").name == "Hot Reloaded":
+                    break
+        finally:
+            await watcher.stop()
+
+        assert manager.get_solution("test_solution").name == "Hot Reloaded"
+        assert not watcher.running
@@ -3,6 +3,9 @@ Simulation framework for testing deployment flows without real hardware.
 
 Provides:
 - SimulationDeployer: Mimics any real deployer type with configurable behavior
+- TimedDeployer: SimulationDeployer that records when each deploy ran
+- make_solution_mock / make_device_config: Solution and device config stand-ins
+- FakeSSHClient: paramiko.SSHClient stand-in with scripted command replies
 - DeviceSimulator: Mock device detection responses
 - Failure scenarios: Pre-built failure injection configs
 """
@@ -184,6 +184,22 @@ class SimulationDeployer(BaseDeployer):
         self.last_connection = None
 
 
+class TimedDeployer(SimulationDeployer):
+    """SimulationDeployer that records when each deploy ran."""
+
+    def __init__(self, mimic_type: str, scenario: dict = None):
+        super().__init__(mimic_type, scenario=scenario)
+        self.intervals = []
+
+    async def deploy(self, config, connection, progress_callback=None):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            return await super().deploy(config, connection, progress_callback)
+        finally:
+            self.intervals.append((config.id, start, loop.time()))
+
+
 def patch_registry(overrides: Dict[str, "SimulationDeployer"]) -> Dict[str, BaseDeployer]:
     """Temporarily replace deployers in the registry with simulators.
 
@@ -0,0 +1,79 @@
+"""
+Minimal solution and device config stand-ins for driving DeploymentEngine.
+
+Usage:
+    from tests.simulation.solution import make_device_config, make_solution_mock
+
+    solution, deployment_info = make_solution_mock(devices=[...])
+    config = make_device_config("device1", "docker_local")
+"""
+
+from unittest.mock import MagicMock
+
+from provisioning_station.deployers import DEPLOYER_REGISTRY
+from provisioning_station.models.device import (
+    DeploymentStep,
+    DetectionConfig,
+    DeviceConfig,
+)
+
+
+def make_device_config(
+    device_id: str = "test_device",
+    device_type: str = "docker_local",
+    steps: list = None,
+) -> DeviceConfig:
+    """Create a minimal DeviceConfig for testing."""
+    if steps is None:
+        # Use the real deployer's steps if available
+        deployer = DEPLOYER_REGISTRY.get(device_type)
+        if deployer and deployer.steps:
+            steps = [
+                DeploymentStep(id=s["id"], name=s["name"])
+                for s in deployer.steps
+            ]
+        else:
+            steps = [DeploymentStep(id="step1", name="Step 1")]
+
+    return DeviceConfig(
+        id=device_id,
+        name=f"Test {device_type}",
+        type=device_type,
+        detection=DetectionConfig(method="local"),
+        steps=steps,
+    )
+
+
+def make_solution_mock(
+    solution_id: str = "test_solution",
+    devices: list = None,
+    presets: list = None,
+):
+    """Create a mock Solution object with deployment info."""
+    solution = MagicMock()
+    solution.id = solution_id
+    solution.name = "Test Solution"
+    solution.base_path = "/tmp/test_solution"
+    solution.intro = MagicMock()
+    solution.intro.stats = MagicMock()
+    solution.intro.stats.deployed_count = 0
+
+    if devices is None:
+        devices = [
+            {
+                "id": "device1",
+                "name": "Test Docker Device",
+                "type": "docker_local",
+                "config_file": "devices/docker.yaml",
+                "required": True,
+            }
+        ]
+
+    deployment_info = {
+        "devices": devices,
+        "presets": presets or [],
+        "overview": "",
+        "post_deployment": None,
+    }
+
+    return solution, deployment_info
@@ -0,0 +1,107 @@
+"""
+SSH test doubles: a paramiko.SSHClient stand-in and its channels.
+
+Usage:
+    from tests.simulation.ssh import FakeSSHClient
+
+    class DockerHost(FakeSSHClient):
+        def reply(self, command):
+            return 0, b"Docker version 24.0.7"
+
+    client = DockerHost()
+    _, stdout, _ = client.exec_command("docker --version")
+    stdout.channel.recv_exit_status()  # 0
+
+Set ``delay`` on a client to make ``recv_exit_status`` block like paramiko
+until the command ends or the client is closed.
+"""
+
+import threading
+from typing import Optional, Tuple
+
+
+class FakeChannel:
+    """Channel of an exec_command: exit status, optionally blocking"""
+
+    def __init__(
+        self,
+        exit_code: int = 0,
+        closed: Optional[threading.Event] = None,
+        delay: float = 0.0,
+    ):
+        self.exit_code = exit_code
+        self.closed = closed
+        self.delay = delay
+
+    def settimeout(self, timeout):
+        pass
+
+    def recv_exit_status(self) -> int:
+        if self.closed is not None and self.delay:
+            self.closed.wait(self.delay)
+        return self.exit_code
+
+    def close(self):
+        pass
+
+
+class FakeStream:
+    """stdout/stderr of an exec_command"""
+
+    def __init__(self, data: bytes = b"", channel: Optional[FakeChannel] = None):
+        self.channel = channel or FakeChannel()
+        self.data = data
+
+    def read(self) -> bytes:
+        return self.data
+
+
+class FakeTransport:
+    def __init__(self):
+        self.active = True
+        self.probe_ok = True
+
+    def is_active(self) -> bool:
+        return self.active
+
+    def open_session(self, timeout=None) -> FakeChannel:
+        if not self.probe_ok:
+            raise EOFError("peer gone")
+        return FakeChannel()
+
+
+class FakeSSHClient:
+    """paramiko.SSHClient stand-in that records commands and answers them
+    through ``reply`` (echoes the command by default)"""
+
+    def __init__(self, delay: float = 0.0):
+        self.transport = FakeTransport()
+        self.connect_kwargs = None
+        self.commands = []
+        self.delay = delay
+        self.closed = False
+        self.closed_event = threading.Event()
+
+    def reply(self, command: str) -> Tuple[int, bytes]:
+        """Exit code and stdout for *command*"""
+        return 0, command.encode()
+
+    def set_missing_host_key_policy(self, policy):
+        pass
+
+    def connect(self, **kwargs):
+        self.connect_kwargs = kwargs
+
+    def get_transport(self):
+        return None if self.closed else self.transport
+
+    def exec_command(self, command: str, timeout=None):
+        self.commands.append(command)
+        exit_code, output = self.reply(command)
+        channel = FakeChannel(exit_code, self.closed_event, self.delay)
+        return None, FakeStream(output, channel), FakeStream()
+
+    def close(self):
+        self.closed = True
+        self.transport.active = False
+        self.closed_event.set()
@@ -2,7 +2,9 @@
 Unit tests for API Key Manager
 """
 
+import asyncio
 import json
+import threading
 
 import pytest
 
@@ -194,3 +196,82 @@ class TestMigration:
 
         m = ApiKeyManager(data_dir=tmp_path)
         assert m.list_keys()[0]["id"] == original_id
+
+
+class TestUsageFlush:
+    def test_validate_does_not_write(self, manager):
+        """validate_key() updates memory only; flush() persists it."""
+        key = manager.create_key("k")
+        keys_file = manager._keys_file
+        before = keys_file.read_text()
+
+        manager.validate_key(key)
+        assert keys_file.read_text() == before
+
+        assert manager.flush() is True
+        assert json.loads(keys_file.read_text())[0]["last_used_at"] is not None
+        assert manager.flush() is False
+
+    def test_index_follows_create_and_delete(self, manager):
+        """Deleted keys stop validating; remaining keys still do."""
+        keys = [manager.create_key(f"k{i}") for i in range(3)]
+        manager.delete_key_by_id(manager.list_keys()[1]["id"])
+
+        assert manager.validate_key(keys[1]) is None
+        assert manager.validate_key(keys[0])["name"] == "k0"
+        assert manager.validate_key(keys[2])["name"] == "k2"
+
+    @pytest.mark.asyncio
+    async def test_periodic_and_shutdown_flush(self, manager):
+        """The flusher writes usage periodically and on stop."""
+        key = manager.create_key("k")
+        manager.start_flusher(interval=0.01)
+        manager.validate_key(key)
+        await asyncio.sleep(0.05)
+        first = json.loads(manager._keys_file.read_text())[0]["last_used_at"]
+        assert first is not None
+
+        await asyncio.sleep(0.001)
+        manager.validate_key(key)
+        await manager.stop_flusher()
+        last = json.loads(manager._keys_file.read_text())[0]["last_used_at"]
+        assert last > first
+
+    @pytest.mark.asyncio
+    async def test_usage_during_async_write_stays_dirty(self, manager):
+        """A validate_key() racing the threaded write is flushed next time."""
+        key = manager.create_key("k")
+        manager.validate_key(key)
+        write = manager._write
+
+        def write_then_use(*args):
+            write(*args)
+            manager.validate_key(key)
+
+        manager._write = write_then_use
+        assert await manager.flush_async() is True
+        assert manager._dirty is True
+
+    @pytest.mark.asyncio
+    async def test_slow_flush_does_not_undo_a_new_key(self, manager):
+        """A flush that finishes after create_key() leaves the new key on disk."""
+        key = manager.create_key("k")
+        manager.validate_key(key)
+        write = manager._write
+        release = threading.Event()
+
+        def slow_write(*args):
+            if threading.current_thread() is not threading.main_thread():
+                release.wait(5)
+            write(*args)
+
+        manager._write = slow_write
+        flushing = asyncio.create_task(manager.flush_async())
+        await asyncio.sleep(0.05)
+        manager.create_key("new")
+        release.set()
+        await flushing
+
+        names = [r["name"] for r in json.loads(manager._keys_file.read_text())]
+        assert names == ["k", "new"]
+        assert not list(manager._data_dir.glob("*.tmp"))
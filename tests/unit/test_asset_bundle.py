@@ -0,0 +1,149 @@
+"""
+Unit tests for offline asset bundle export/import
+"""
+
+import hashlib
+import io
+import json
+import tarfile
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from provisioning_station.services import asset_bundle
+from provisioning_station.services.asset_bundle import (
+    BundleAsset,
+    collect_assets,
+    export_bundle,
+    import_bundle,
+)
+from provisioning_station.services.resource_resolver import ResourceResolver
+from provisioning_station.services.solution_manager import solution_manager
+
+FIRMWARE = "https://cdn.example.com/fw/app.bin"
+MIRROR = "https://mirror.example.com/fw/app.bin"
+MODEL = "https://cdn.example.com/models/person.tflite"
+
+CONTENT = {FIRMWARE: b"firmware" * 100, MIRROR: b"firmware" * 100, MODEL: b"model"}
+
+
+def online_resolver(tmp_path) -> ResourceResolver:
+    resolver = ResourceResolver(tmp_path / "online")
+
+    async def fake_download(url, dest, cb=None):
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(CONTENT[url])
+
+    resolver._stream_download = fake_download
+    return resolver
+
+
+@pytest.fixture
+def solution_assets():
+    assets = {
+        FIRMWARE: BundleAsset(
+            FIRMWARE, {"sha256": hashlib.sha256(CONTENT[FIRMWARE]).hexdigest()}, {"a"}
+        ),
+        MIRROR: BundleAsset(MIRROR, None, {"b"}),
+        MODEL: BundleAsset(MODEL, {"md5": hashlib.md5(b"model").hexdigest()}, {"a"}),
+    }
+    with patch.object(
+        asset_bundle, "collect_assets", AsyncMock(return_value=assets)
+    ), patch.object(solution_manager, "get_solution", return_value=object()):
+        yield assets
+
+
+class TestBundleRoundTrip:
+    """Export on a connected station, import on an offline one"""
+
+    async def test_offline_station_deploys_from_bundle(self, tmp_path, solution_assets):
+        bundle = tmp_path / "bundle.tar"
+        summary = await export_bundle(bundle, ["a", "b"], online_resolver(tmp_path))
+
+        assert summary["assets"] == 3 and summary["blobs"] == 2
+        with tarfile.open(bundle) as tar:
+            index = json.loads(tar.extractfile("bundle.json").read())
+            assert len([n for n in tar.getnames() if n.startswith("blobs/")]) == 2
+        assert {a["url"] for a in index["assets"]} == set(CONTENT)
+
+        offline = ResourceResolver(tmp_path / "site", offline=True)
+        result = await import_bundle(bundle, offline)
+        assert result["extracted"] == 2
+
+        for url, asset in solution_assets.items():
+            path = await offline.resolve(url, checksum=asset.checksum)
+            assert open(path, "rb").read() == CONTENT[url]
+        assert len(offline.cache.blobs) == 2
+
+        # Importing again finds everything in the cache
+        assert (await import_bundle(bundle, offline))["extracted"] == 0
+
+    async def test_offline_mode_refuses_to_download(self, tmp_path):
+        offline = ResourceResolver(tmp_path, offline=True)
+        offline._stream_download = AsyncMock()
+
+        with pytest.raises(RuntimeError, match="offline mode"):
+            await offline.resolve(MODEL)
+        offline._stream_download.assert_not_called()
+
+    async def test_corrupt_blob_is_rejected(self, tmp_path, solution_assets):
+        bundle = tmp_path / "bundle.tar"
+        await export_bundle(bundle, ["a"], online_resolver(tmp_path))
+
+        # Rewrite the bundle with one blob's bytes altered
+        tampered = tmp_path / "tampered.tar"
+        with tarfile.open(bundle) as src, tarfile.open(tampered, "w") as dst:
+            for member in src:
+                data = src.extractfile(member).read()
+                if member.name.startswith("blobs/") and data == b"model":
+                    data = b"MODEL"
+                member.size = len(data)
+                dst.addfile(member, io.BytesIO(data))
+
+        site = ResourceResolver(tmp_path / "site")
+        with pytest.raises(ValueError, match="Corrupt asset bundle"):
+            await import_bundle(tampered, site)
+        assert site.cache.urls == {}
+        assert not (site.cache_dir / "import").exists()
+
+    async def test_unsafe_digest_is_rejected(self, tmp_path):
+        evil = "..\\..\\escaped"
+        bundle = tmp_path / "evil.tar"
+        index = {
+            "version": asset_bundle.BUNDLE_VERSION,
+            "assets": [{"url": MODEL, "sha256": evil}],
+        }
+        with tarfile.open(bundle, "w") as tar:
+            asset_bundle._add_bytes(tar, "bundle.json", json.dumps(index).encode())
+            asset_bundle._add_bytes(tar, f"blobs/{evil}", b"payload")
+
+        site = ResourceResolver(tmp_path / "site")
+        with pytest.raises(ValueError, match="Invalid blob digest"):
+            await import_bundle(bundle, site)
+        assert not (site.cache_dir / "import").exists()
+
+    async def test_not_a_bundle(self, tmp_path):
+        junk = tmp_path / "junk.tar"
+        junk.write_bytes(b"not a tar")
+        with pytest.raises(ValueError, match="Not an asset bundle"):
+            await import_bundle(junk, ResourceResolver(tmp_path))
+
+    async def test_unknown_solution(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown solutions: nope"):
+            await export_bundle(tmp_path / "b.tar", ["nope"], ResourceResolver(tmp_path))
+
+
+class TestAssetDiscovery:
+    """Bundles cover the URLs deployments download"""
+
+    async def test_collects_solution_urls(self, tmp_path):
+        await solution_manager.load_solutions()
+        if not solution_manager.get_solution("smart_space_assistant"):
+            pytest.skip("smart_space_assistant solution not present")
+
+        assets = await collect_assets(["smart_space_assistant"], ResourceResolver(tmp_path))
+
+        assert assets
+        assert all(a.url.startswith("https://") for a in assets.values())
+        assert all(a.solutions == {"smart_space_assistant"} for a in assets.values())
+        assert any(a.url.endswith(".tflite") and a.checksum for a in assets.values())
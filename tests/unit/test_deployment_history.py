@@ -0,0 +1,173 @@
+"""
+Unit tests for the deployment history store
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from provisioning_station.models.version import DeploymentRecord
+from provisioning_station.services.deployment_history import DeploymentHistory
+
+BASE_TIME = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def make_record(
+    n: int,
+    solution_id: str = "sol",
+    device_id: str = "dev",
+    status: str = "completed",
+    deployment_id: str = None,
+) -> DeploymentRecord:
+    return DeploymentRecord(
+        deployment_id=deployment_id or f"dep-{n}",
+        solution_id=solution_id,
+        device_id=device_id,
+        device_type="docker_local",
+        deployed_version=f"1.0.{n}",
+        config_version="1.0",
+        status=status,
+        deployed_at=BASE_TIME + timedelta(minutes=n),
+    )
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return tmp_path / "deployment_history.jsonl"
+
+
+@pytest.fixture
+def history(log_path):
+    return DeploymentHistory(storage_path=str(log_path), retention=0)
+
+
+class TestQueries:
+    """Tests for indexed queries"""
+
+    @pytest.mark.asyncio
+    async def test_history_newest_first_with_filters(self, history):
+        await history.record_deployment(make_record(1, device_id="a"))
+        await history.record_deployment(make_record(2, device_id="b"))
+        await history.record_deployment(make_record(3, solution_id="other"))
+
+        result = await history.get_history(solution_id="sol")
+        assert [r.deployment_id for r in result] == ["dep-2", "dep-1"]
+
+        result = await history.get_history(solution_id="sol", device_id="a")
+        assert [r.deployment_id for r in result] == ["dep-1"]
+
+        result = await history.get_history(device_id="dev")
+        assert [r.deployment_id for r in result] == ["dep-3"]
+
+        result = await history.get_history(limit=2)
+        assert [r.deployment_id for r in result] == ["dep-3", "dep-2"]
+
+    @pytest.mark.asyncio
+    async def test_counts_and_stats(self, history):
+        await history.record_deployment(make_record(1))
+        await history.record_deployment(make_record(2, status="failed"))
+        await history.record_deployment(make_record(3))
+
+        assert await history.get_device_deploy_count("sol", "dev") == 2
+        assert await history.get_last_deployed_version("sol", "dev") == "1.0.3"
+
+        stats = await history.get_solution_stats("sol")
+        assert stats["total_deployments"] == 3
+        assert stats["successful"] == 2
+        assert stats["failed"] == 1
+        assert stats["last_deployment"] == BASE_TIME + timedelta(minutes=3)
+
+    @pytest.mark.asyncio
+    async def test_empty_stats(self, history):
+        stats = await history.get_solution_stats("missing")
+        assert stats["total_deployments"] == 0
+        assert stats["last_deployment"] is None
+
+    @pytest.mark.asyncio
+    async def test_remove_deployment_removes_all_devices(self, history):
+        await history.record_deployment(make_record(1, device_id="a", deployment_id="x"))
+        await history.record_deployment(make_record(2, device_id="b", deployment_id="x"))
+        await history.record_deployment(make_record(3))
+
+        assert await history.remove_deployment("x") is True
+        assert await history.remove_deployment("x") is False
+        assert [r.deployment_id for r in await history.get_history()] == ["dep-3"]
+
+
+class TestPersistence:
+    """Tests for the append-only log"""
+
+    @pytest.mark.asyncio
+    async def test_writes_append_one_line(self, history, log_path):
+        await history.record_deployment(make_record(1))
+        await history.record_deployment(make_record(2))
+
+        lines = log_path.read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[1])["record"]["deployment_id"] == "dep-2"
+
+    @pytest.mark.asyncio
+    async def test_replay_restores_records_and_removals(self, history, log_path):
+        await history.record_deployment(make_record(1))
+        await history.record_deployment(make_record(2))
+        await history.remove_deployment("dep-1")
+
+        reopened = DeploymentHistory(storage_path=str(log_path), retention=0)
+        result = await reopened.get_history()
+        assert [r.deployment_id for r in result] == ["dep-2"]
+        assert result[0].deployed_at == BASE_TIME + timedelta(minutes=2)
+
+    @pytest.mark.asyncio
+    async def test_corrupt_line_is_skipped(self, history, log_path):
+        await history.record_deployment(make_record(1))
+        with open(log_path, "a") as f:
+            f.write("{truncated\n")
+
+        reopened = DeploymentHistory(storage_path=str(log_path), retention=0)
+        assert len(await reopened.get_history()) == 1
+
+    @pytest.mark.asyncio
+    async def test_migrates_legacy_json(self, log_path):
+        legacy = log_path.with_suffix(".json")
+        legacy.write_text(
+            json.dumps(
+                [
+                    {**make_record(n).model_dump(), "deployed_at": (BASE_TIME + timedelta(minutes=n)).isoformat()}
+                    for n in range(3)
+                ]
+            )
+        )
+
+        history = DeploymentHistory(storage_path=str(log_path), retention=0)
+        result = await history.get_history()
+
+        assert [r.deployment_id for r in result] == ["dep-2", "dep-1", "dep-0"]
+        assert log_path.exists()
+        assert not legacy.exists()
+        assert legacy.with_suffix(".json.migrated").exists()
+
+
+class TestRetention:
+    """Tests for configurable retention and compaction"""
+
+    @pytest.mark.asyncio
+    async def test_oldest_records_dropped(self, log_path):
+        history = DeploymentHistory(storage_path=str(log_path), retention=2)
+        for n in range(4):
+            await history.record_deployment(make_record(n))
+
+        result = await history.get_history()
+        assert [r.deployment_id for r in result] == ["dep-3", "dep-2"]
+
+        reopened = DeploymentHistory(storage_path=str(log_path), retention=2)
+        assert len(await reopened.get_history()) == 2
+
+    @pytest.mark.asyncio
+    async def test_log_is_compacted(self, log_path):
+        history = DeploymentHistory(storage_path=str(log_path), retention=5)
+        for n in range(200):
+            await history.record_deployment(make_record(n))
+
+        assert len(log_path.read_text().splitlines()) <= 105
+        assert len(await history.get_history(limit=100)) == 5
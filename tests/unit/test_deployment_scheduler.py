@@ -0,0 +1,122 @@
+"""
+Unit tests for multi-device deployment scheduling
+"""
+
+import asyncio
+
+import pytest
+
+from provisioning_station.deployers import DEPLOYER_REGISTRY
+from provisioning_station.models.deployment import DeviceDeployment
+from provisioning_station.services.deployment_scheduler import (
+    ResourceLimiter,
+    device_resources,
+    parse_depends_on,
+    plan_dependencies,
+)
+
+
+def make_device(device_id: str, **kwargs) -> DeviceDeployment:
+    return DeviceDeployment(device_id=device_id, name=device_id, type="docker_local", **kwargs)
+
+
+class TestPlanDependencies:
+    """Tests for building the device dependency graph"""
+
+    def test_sequential_by_default(self):
+        graph = plan_dependencies([make_device("a"), make_device("b"), make_device("c")])
+        assert graph == {"a": set(), "b": {"a"}, "c": {"b"}}
+
+    def test_parallel_group(self):
+        """Parallel devices share prerequisites; the next device waits for the group"""
+        graph = plan_dependencies(
+            [
+                make_device("setup"),
+                make_device("a"),
+                make_device("b", parallel=True),
+                make_device("c", parallel=True),
+                make_device("after"),
+            ]
+        )
+        assert graph["b"] == {"setup"}
+        assert graph["c"] == {"setup"}
+        assert graph["after"] == {"a", "b", "c"}
+
+    def test_depends_on_replaces_implicit_order(self):
+        graph = plan_dependencies(
+            [make_device("a"), make_device("b"), make_device("c", depends_on=["a"])]
+        )
+        assert graph["c"] == {"a"}
+
+    def test_unknown_dependencies_ignored(self):
+        """Devices outside the deployment count as already satisfied"""
+        graph = plan_dependencies([make_device("a", depends_on=["missing", "a"])])
+        assert graph == {"a": set()}
+
+    def test_cycle_rejected(self):
+        with pytest.raises(ValueError, match="Circular"):
+            plan_dependencies(
+                [make_device("a", depends_on=["b"]), make_device("b", depends_on=["a"])]
+            )
+
+    def test_parse_depends_on(self):
+        assert parse_depends_on("a, b,,c") == ["a", "b", "c"]
+        assert parse_depends_on(["a", " b "]) == ["a", "b"]
+        assert parse_depends_on(None) == []
+
+
+class TestDeviceResources:
+    """Tests for per-device resource keys"""
+
+    def test_serial_port(self):
+        resources = device_resources(DEPLOYER_REGISTRY["esp32_usb"], {"port": "/dev/ttyUSB0"})
+        assert resources == {"serial:/dev/ttyUSB0": 1}
+
+    def test_ssh_host(self):
+        resources = device_resources(DEPLOYER_REGISTRY["ssh_deb"], {"host": "Box.local"})
+        assert list(resources) == ["ssh:box.local"]
+        assert resources["ssh:box.local"] >= 1
+
+    def test_recamera_ip_used_as_host(self):
+        resources = device_resources(DEPLOYER_REGISTRY["recamera_nodered"], {"recamera_ip": "10.0.0.2"})
+        assert list(resources) == ["ssh:10.0.0.2"]
+
+    def test_local_deployer_unrestricted(self):
+        assert device_resources(DEPLOYER_REGISTRY["docker_local"], {}) == {}
+
+
+class TestResourceLimiter:
+    """Tests for shared resource semaphores"""
+
+    @pytest.mark.asyncio
+    async def test_limit_enforced_and_wait_reported(self):
+        limiter = ResourceLimiter()
+        active = 0
+        peak = 0
+        waited = []
+
+        async def on_wait(key):
+            waited.append(key)
+
+        async def worker():
+            nonlocal active, peak
+            async with limiter.hold({"serial:/dev/ttyUSB0": 1}, on_wait):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(worker(), worker(), worker())
+
+        assert peak == 1
+        assert waited == ["serial:/dev/ttyUSB0", "serial:/dev/ttyUSB0"]
+
+    @pytest.mark.asyncio
+    async def test_released_on_error(self):
+        limiter = ResourceLimiter()
+        with pytest.raises(RuntimeError):
+            async with limiter.hold({"ssh:host": 1}):
+                raise RuntimeError("boom")
+
+        async with limiter.hold({"ssh:host": 1}):
+            pass
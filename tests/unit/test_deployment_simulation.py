@@ -21,15 +21,14 @@ import pytest
 
 from provisioning_station.deployers import DEPLOYER_REGISTRY
 from provisioning_station.models.deployment import DeploymentStatus
-from provisioning_station.models.device import (
-    DeploymentStep,
-    DetectionConfig,
-    DeviceConfig,
-    DockerConfig,
-)
+from provisioning_station.models.device import DockerConfig
 from provisioning_station.services.deployment_engine import DeploymentEngine
 
-from tests.simulation.deployer import SimulationDeployer, patch_registry
+from tests.simulation.deployer import (
+    SimulationDeployer,
+    TimedDeployer,
+    patch_registry,
+)
 from tests.simulation.scenarios import (
     DOCKER_HEALTH_CHECK_FAIL,
     DOCKER_PULL_TIMEOUT,
@@ -38,6 +37,7 @@ from tests.simulation.scenarios import (
     SCENARIOS,
     SSH_AUTH_FAILURE,
 )
+from tests.simulation.solution import make_device_config, make_solution_mock
 
 
 # ---------------------------------------------------------------------------
@@ -45,67 +45,6 @@ from tests.simulation.scenarios import (
 # ---------------------------------------------------------------------------
 
 
-def _make_device_config(
-    device_id: str = "test_device",
-    device_type: str = "docker_local",
-    steps: list = None,
-) -> DeviceConfig:
-    """Create a minimal DeviceConfig for testing."""
-    if steps is None:
-        # Use the real deployer's steps if available
-        deployer = DEPLOYER_REGISTRY.get(device_type)
-        if deployer and deployer.steps:
-            steps = [
-                DeploymentStep(id=s["id"], name=s["name"])
-                for s in deployer.steps
-            ]
-        else:
-            steps = [DeploymentStep(id="step1", name="Step 1")]
-
-    return DeviceConfig(
-        id=device_id,
-        name=f"Test {device_type}",
-        type=device_type,
-        detection=DetectionConfig(method="local"),
-        steps=steps,
-    )
-
-
-def _make_solution_mock(
-    solution_id: str = "test_solution",
-    devices: list = None,
-    presets: list = None,
-):
-    """Create a mock Solution object with deployment info."""
-    solution = MagicMock()
-    solution.id = solution_id
-    solution.name = "Test Solution"
-    solution.base_path = "/tmp/test_solution"
-    solution.intro = MagicMock()
-    solution.intro.stats = MagicMock()
-    solution.intro.stats.deployed_count = 0
-
-    if devices is None:
-        devices = [
-            {
-                "id": "device1",
-                "name": "Test Docker Device",
-                "type": "docker_local",
-                "config_file": "devices/docker.yaml",
-                "required": True,
-            }
-        ]
-
-    deployment_info = {
-        "devices": devices,
-        "presets": presets or [],
-        "overview": "",
-        "post_deployment": None,
-    }
-
-    return solution, deployment_info
-
-
 async def _run_simulated_deployment(
     engine: DeploymentEngine,
     solution_id: str = "test_solution",
@@ -122,7 +61,7 @@ async def _run_simulated_deployment(
     originals = patch_registry({device_type: sim})
 
     try:
-        solution, deployment_info = _make_solution_mock(
+        solution, deployment_info = make_solution_mock(
             solution_id=solution_id,
             devices=[
                 {
@@ -135,7 +74,7 @@ async def _run_simulated_deployment(
             ],
         )
 
-        config = _make_device_config(device_id, device_type)
+        config = make_device_config(device_id, device_type)
 
         # Mock solution_manager methods
         with patch(
@@ -198,7 +137,7 @@ class TestSimulationDeployer:
     async def test_successful_deploy(self):
         """Simulated deploy completes successfully with all steps."""
         sim = SimulationDeployer("docker_local", scenario=FAST_SUCCESS)
-        config = _make_device_config("test", "docker_local")
+        config = make_device_config("test", "docker_local")
 
         progress_calls = []
 
@@ -219,7 +158,7 @@ class TestSimulationDeployer:
     async def test_failure_at_step(self):
         """Simulated deploy raises exception at the specified step."""
         sim = SimulationDeployer("docker_local", scenario=DOCKER_PULL_TIMEOUT)
-        config = _make_device_config("test", "docker_local")
+        config = make_device_config("test", "docker_local")
 
         with pytest.raises(Exception, match="Timeout pulling image"):
             await sim.deploy(config, {})
@@ -235,7 +174,7 @@ class TestSimulationDeployer:
         sim = SimulationDeployer(
             "docker_local", scenario={"final_failure": True, "step_delay": 0}
         )
-        config = _make_device_config("test", "docker_local")
+        config = make_device_config("test", "docker_local")
 
         result = await sim.deploy(config, {})
         assert result is False
@@ -247,7 +186,7 @@ class TestSimulationDeployer:
             "recamera_cpp",
             scenario={"connection_validator": lambda c: c.get("host") is not None},
         )
-        config = _make_device_config("test", "recamera_cpp")
+        config = make_device_config("test", "recamera_cpp")
 
         # No host in connection → validator returns False
         with pytest.raises(ConnectionError, match="connection validation failed"):
@@ -263,7 +202,7 @@ class TestSimulationDeployer:
                 "step_delay": 0,
             },
         )
-        config = _make_device_config("test", "recamera_cpp")
+        config = make_device_config("test", "recamera_cpp")
 
         result = await sim.deploy(config, {"host": "192.168.42.1"})
         assert result is True
@@ -279,7 +218,7 @@ class TestSimulationDeployer:
         sim = SimulationDeployer(
             "esp32_usb", scenario={"on_step": on_step, "step_delay": 0}
         )
-        config = _make_device_config("test", "esp32_usb")
+        config = make_device_config("test", "esp32_usb")
 
         await sim.deploy(config, {})
 
@@ -290,7 +229,7 @@ class TestSimulationDeployer:
     async def test_reset_clears_history(self):
         """reset() clears all recorded state."""
         sim = SimulationDeployer("docker_local", scenario=FAST_SUCCESS)
-        config = _make_device_config("test", "docker_local")
+        config = make_device_config("test", "docker_local")
 
         await sim.deploy(config, {})
         assert sim.deploy_count == 1
@@ -503,7 +442,7 @@ class TestDeploymentEngineSimulated:
         originals = patch_registry({"docker_local": sim_docker, "esp32_usb": sim_esp32})
 
         try:
-            solution, deployment_info = _make_solution_mock(
+            solution, deployment_info = make_solution_mock(
                 devices=[
                     {
                         "id": "docker_device",
@@ -522,8 +461,8 @@ class TestDeploymentEngineSimulated:
                 ],
             )
 
-            docker_config = _make_device_config("docker_device", "docker_local")
-            esp32_config = _make_device_config("esp32_device", "esp32_usb")
+            docker_config = make_device_config("docker_device", "docker_local")
+            esp32_config = make_device_config("esp32_device", "esp32_usb")
 
             with patch(
                 "provisioning_station.services.deployment_engine.solution_manager"
@@ -577,7 +516,7 @@ class TestDeploymentEngineSimulated:
         originals = patch_registry({"docker_local": sim_docker, "esp32_usb": sim_esp32})
 
         try:
-            solution, deployment_info = _make_solution_mock(
+            solution, deployment_info = make_solution_mock(
                 devices=[
                     {
                         "id": "docker_device",
@@ -596,8 +535,8 @@ class TestDeploymentEngineSimulated:
                 ],
             )
 
-            docker_config = _make_device_config("docker_device", "docker_local")
-            esp32_config = _make_device_config("esp32_device", "esp32_usb")
+            docker_config = make_device_config("docker_device", "docker_local")
+            esp32_config = make_device_config("esp32_device", "esp32_usb")
 
             with patch(
                 "provisioning_station.services.deployment_engine.solution_manager"
@@ -647,8 +586,8 @@ class TestDeploymentEngineSimulated:
         originals = patch_registry({"docker_local": sim})
 
         try:
-            solution, deployment_info = _make_solution_mock()
-            config = _make_device_config("device1", "docker_local")
+            solution, deployment_info = make_solution_mock()
+            config = make_device_config("device1", "docker_local")
 
             with patch(
                 "provisioning_station.services.deployment_engine.solution_manager"
@@ -689,6 +628,161 @@ class TestDeploymentEngineSimulated:
             DEPLOYER_REGISTRY.update(originals)
 
 
+# ---------------------------------------------------------------------------
+# Tests: Concurrent multi-device scheduling
+# ---------------------------------------------------------------------------
+
+
+def _overlaps(a, b) -> bool:
+    return a[1] < b[2] and b[1] < a[2]
+
+
+async def _run_devices(engine, devices, connections, deployers):
+    """Run a multi-device deployment where each device has its own config."""
+    originals = patch_registry(deployers)
+    try:
+        solution, deployment_info = make_solution_mock(devices=devices)
+        configs = {
+            d["config_file"]: make_device_config(d["id"], d["type"]) for d in devices
+        }
+
+        with patch(
+            "provisioning_station.services.deployment_engine.solution_manager"
+        ) as mock_sm:
+            mock_sm.get_deployment_from_guide = AsyncMock(return_value=deployment_info)
+            mock_sm.load_device_config = AsyncMock(
+                side_effect=lambda sol_id, config_file: configs.get(config_file)
+            )
+            mock_sm.get_solution.return_value = solution
+
+            deployment_id = await engine.start_deployment(
+                solution=solution, device_connections=connections
+            )
+            await asyncio.wait_for(engine._running_tasks[deployment_id], timeout=10.0)
+
+        return engine.get_deployment(deployment_id)
+    finally:
+        DEPLOYER_REGISTRY.update(originals)
+
+
+def _device(device_id: str, device_type: str, **extra) -> dict:
+    return {
+        "id": device_id,
+        "name": device_id,
+        "type": device_type,
+        "config_file": f"devices/{device_id}.yaml",
+        "required": True,
+        **extra,
+    }
+
+
+class TestConcurrentDeployment:
+    """Dependency-aware scheduling of devices within one deployment."""
+
+    @pytest.mark.asyncio
+    async def test_undeclared_devices_run_in_order(self):
+        """Without declarations devices keep the guide's sequential order."""
+        sim = TimedDeployer("docker_local")
+        deployment = await _run_devices(
+            DeploymentEngine(),
+            [_device("a", "docker_local"), _device("b", "docker_local")],
+            {"a": {}, "b": {}},
+            {"docker_local": sim},
+        )
+
+        assert deployment.status == DeploymentStatus.COMPLETED
+        first, second = sim.intervals
+        assert first[0] == "a"
+        assert not _overlaps(first, second)
+
+    @pytest.mark.asyncio
+    async def test_parallel_devices_overlap(self):
+        """A parallel device starts alongside the previous one."""
+        docker = TimedDeployer("docker_local", scenario={"step_delay": 0.02})
+        esp32 = TimedDeployer("esp32_usb", scenario={"step_delay": 0.02})
+        deployment = await _run_devices(
+            DeploymentEngine(),
+            [
+                _device("backend", "docker_local"),
+                _device("firmware", "esp32_usb", parallel=True),
+            ],
+            {"backend": {}, "firmware": {"port": "/dev/ttyACM0"}},
+            {"docker_local": docker, "esp32_usb": esp32},
+        )
+
+        assert deployment.status == DeploymentStatus.COMPLETED
+        assert _overlaps(docker.intervals[0], esp32.intervals[0])
+
+    @pytest.mark.asyncio
+    async def test_depends_on_waits_for_named_devices(self):
+        """A device with depends_on starts only after its dependencies."""
+        sim = TimedDeployer("docker_local")
+        deployment = await _run_devices(
+            DeploymentEngine(),
+            [
+                _device("a", "docker_local"),
+                _device("b", "docker_local", parallel=True),
+                _device("c", "docker_local", depends_on=["a", "b"]),
+            ],
+            {"a": {}, "b": {}, "c": {}},
+            {"docker_local": sim},
+        )
+
+        assert deployment.status == DeploymentStatus.COMPLETED
+        runs = {run[0]: run for run in sim.intervals}
+        assert runs["c"][1] >= max(runs["a"][2], runs["b"][2])
+
+    @pytest.mark.asyncio
+    async def test_same_serial_port_is_serialized(self):
+        """Two flashes on one serial port never run at the same time."""
+        sim = TimedDeployer("esp32_usb")
+        deployment = await _run_devices(
+            DeploymentEngine(),
+            [
+                _device("one", "esp32_usb"),
+                _device("two", "esp32_usb", parallel=True),
+            ],
+            {"one": {"port": "/dev/ttyUSB0"}, "two": {"port": "/dev/ttyUSB0"}},
+            {"esp32_usb": sim},
+        )
+
+        assert deployment.status == DeploymentStatus.COMPLETED
+        assert not _overlaps(*sim.intervals)
+
+    @pytest.mark.asyncio
+    async def test_failed_dependency_blocks_dependents(self):
+        """Dependents of a failed device never start."""
+        docker = TimedDeployer("docker_local", scenario=DOCKER_PULL_TIMEOUT)
+        esp32 = TimedDeployer("esp32_usb")
+        deployment = await _run_devices(
+            DeploymentEngine(),
+            [
+                _device("backend", "docker_local"),
+                _device("firmware", "esp32_usb", depends_on=["backend"]),
+            ],
+            {"backend": {}, "firmware": {"port": "/dev/ttyACM0"}},
+            {"docker_local": docker, "esp32_usb": esp32},
+        )
+
+        assert deployment.status == DeploymentStatus.FAILED
+        assert esp32.deploy_count == 0
+        assert deployment.devices[1].status == DeploymentStatus.PENDING
+
+    @pytest.mark.asyncio
+    async def test_dependency_cycle_rejected(self):
+        """Circular depends_on declarations fail before anything runs."""
+        with pytest.raises(ValueError, match="Circular"):
+            await _run_devices(
+                DeploymentEngine(),
+                [
+                    _device("a", "docker_local", depends_on=["b"]),
+                    _device("b", "docker_local", depends_on=["a"]),
+                ],
+                {"a": {}, "b": {}},
+                {"docker_local": SimulationDeployer("docker_local")},
+            )
+
+
 # ---------------------------------------------------------------------------
 # Tests: All failure scenarios coverage
 # ---------------------------------------------------------------------------
@@ -737,7 +831,7 @@ class TestAllFailureScenarios:
         device_type = self.SCENARIO_TYPE_MAP[scenario_name]
 
         sim = SimulationDeployer(device_type, scenario=scenario)
-        config = _make_device_config("test", device_type)
+        config = make_device_config("test", device_type)
 
         is_success = scenario_name in ("fast_success", "realistic_success")
         is_final_fail = scenario_name == "deploy_returns_false"
@@ -800,7 +894,7 @@ class TestAllDeployerTypesSimulatable:
     async def test_can_simulate_deployer(self, device_type):
         """SimulationDeployer successfully mimics each real deployer type."""
         sim = SimulationDeployer(device_type, scenario=FAST_SUCCESS)
-        config = _make_device_config("test", device_type)
+        config = make_device_config("test", device_type)
 
         result = await sim.deploy(config, {"host": "1.2.3.4", "port": "/dev/ttyACM0"})
         assert result is True
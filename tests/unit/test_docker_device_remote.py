@@ -0,0 +1,111 @@
+"""
+Unit tests for remote Docker management running off the event loop
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from provisioning_station.models.docker_device import ConnectDeviceRequest
+from provisioning_station.services import docker_device_manager as ddm
+from provisioning_station.services.docker_device_manager import DockerDeviceManager
+from tests.simulation.ssh import FakeSSHClient
+
+CONNECTION = ConnectDeviceRequest(host="10.0.0.5", username="pi", password="pw")
+
+
+class FakeClient(FakeSSHClient):
+    """Pooled SSH client double that answers every command"""
+
+    def __init__(self, delay=0.0):
+        super().__init__(delay)
+        self.discarded = False
+
+    def reply(self, command):
+        output = b"Docker version 24.0.7, build afdd53b" if "docker" in command else b"pi"
+        return 0, output
+
+    def discard(self):
+        self.discarded = True
+        self.closed_event.set()
+
+
+@pytest.fixture
+def manager():
+    yield DockerDeviceManager()
+    DockerDeviceManager.shutdown()
+
+
+class TestRemoteOffLoop:
+    """Remote calls must not block the event loop"""
+
+    @pytest.mark.asyncio
+    async def test_connect_keeps_loop_responsive(self, manager):
+        client = FakeClient(delay=0.1)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        with patch.object(manager, "_get_ssh_client", return_value=client):
+            task = asyncio.create_task(ticker())
+            info = await manager.connect(CONNECTION)
+            task.cancel()
+
+        assert info.hostname == "pi"
+        assert info.docker_version == "24.0.7"
+        assert ticks >= 10  # Loop kept running through ~0.3s of blocking I/O
+        assert client.closed_event.is_set()
+
+    @pytest.mark.asyncio
+    async def test_slow_command_times_out_and_discards_client(self, manager):
+        client = FakeClient(delay=30)
+
+        with patch.object(ddm, "EXEC_GRACE_SECONDS", 0):
+            start = time.monotonic()
+            with pytest.raises(RuntimeError, match="timed out"):
+                await manager._exec_remote(client, "docker image prune -af", timeout=0.2)
+
+        assert time.monotonic() - start < 5
+        assert client.discarded
+
+    @pytest.mark.asyncio
+    async def test_cancellation_discards_client(self, manager):
+        client = FakeClient(delay=30)
+
+        task = asyncio.create_task(manager._exec_remote(client, "docker ps", timeout=60))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert client.discarded
+
+    @pytest.mark.asyncio
+    async def test_unreachable_host_times_out(self, manager):
+        release = threading.Event()
+        late_client = FakeClient()
+
+        def slow_connect(connection):
+            release.wait(5)
+            return late_client
+
+        with patch.object(manager, "_get_ssh_client", side_effect=slow_connect), patch.object(
+            ddm.settings, "docker_ssh_connect_timeout", 0.2
+        ):
+            with pytest.raises(RuntimeError, match="Timed out connecting"):
+                await manager.connect(CONNECTION)
+
+        # A handshake finishing after the caller gave up is not leaked
+        release.set()
+        for _ in range(50):
+            if late_client.discarded:
+                break
+            await asyncio.sleep(0.02)
+        assert late_client.discarded
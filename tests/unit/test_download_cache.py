@@ -0,0 +1,194 @@
+"""
+Unit tests for the content-addressed download cache
+"""
+
+import asyncio
+import hashlib
+from unittest.mock import patch
+
+import pytest
+
+from provisioning_station.services import resource_resolver as resolver_module
+from provisioning_station.services.download_cache import DownloadCache, hash_file
+from provisioning_station.services.resource_resolver import ResourceResolver
+
+
+def put(cache: DownloadCache, url: str, content: bytes, name: str = "file.bin") -> str:
+    """Simulate a finished download of *content* from *url*"""
+    view = cache.root / hashlib.sha256(url.encode()).hexdigest()[:16] / name
+    view.parent.mkdir(parents=True, exist_ok=True)
+    view.write_bytes(content)
+    return cache.adopt(url, view, view, hash_file(view))
+
+
+def serve(resolver: ResourceResolver, responses: dict):
+    """Patch downloads to write ``responses[url]`` and record the URLs"""
+    fetched = []
+
+    async def fake_download(url, dest, cb=None):
+        fetched.append(url)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(responses[url])
+
+    return fetched, patch.object(resolver, "_stream_download", fake_download)
+
+
+class TestDownloadCache:
+    """Tests for the blob store and its index"""
+
+    def test_identical_content_is_stored_once(self, tmp_path):
+        cache = DownloadCache(tmp_path)
+        a = put(cache, "https://a.example.com/fw.bin", b"firmware")
+        b = put(cache, "https://mirror.example.com/fw.bin", b"firmware")
+
+        assert a == b and len(cache.blobs) == 1
+        assert cache.total_bytes == len(b"firmware")
+        assert cache.lookup("https://mirror.example.com/fw.bin").read_bytes() == b"firmware"
+
+        # The blob outlives one URL and goes with the last
+        cache.forget("https://a.example.com/fw.bin")
+        assert cache.blob_path(a).exists()
+        cache.forget("https://mirror.example.com/fw.bin")
+        assert not cache.blob_path(a).exists() and cache.blobs == {}
+
+    def test_index_survives_restart(self, tmp_path):
+        cache = DownloadCache(tmp_path)
+        sha = put(cache, "https://a.example.com/model.tflite", b"model", "model.tflite")
+        cache.save()
+
+        reopened = DownloadCache(tmp_path)
+        view = reopened.lookup("https://a.example.com/model.tflite")
+
+        assert view.name == "model.tflite" and view.read_bytes() == b"model"
+        assert reopened.blobs[sha].digests["md5"] == hashlib.md5(b"model").hexdigest()
+        assert reopened.digests_match(
+            "https://a.example.com/model.tflite", {"SHA256": sha.upper()}
+        )
+
+    def test_lru_eviction_under_budget(self, tmp_path):
+        cache = DownloadCache(tmp_path, max_bytes=250)
+        old = put(cache, "https://e.com/old", b"o" * 100)
+        used = put(cache, "https://e.com/used", b"u" * 100)
+        cache.blobs[old].last_access -= 20
+        cache.blobs[used].last_access -= 10
+        cache.lookup("https://e.com/used")  # Touched: now the most recent
+        new = put(cache, "https://e.com/new", b"n" * 100)
+
+        assert cache.evict(keep={new}) == 100
+        assert set(cache.blobs) == {used, new}
+        assert cache.lookup("https://e.com/old") is None
+
+    def test_budget_never_evicts_kept_blob(self, tmp_path):
+        cache = DownloadCache(tmp_path, max_bytes=10)
+        sha = put(cache, "https://e.com/big", b"x" * 100)
+
+        assert cache.evict(keep={sha}) == 0
+        assert sha in cache.blobs
+
+    def test_truncated_view_is_forgotten(self, tmp_path):
+        cache = DownloadCache(tmp_path)
+        put(cache, "https://e.com/a", b"data")
+        cache.lookup("https://e.com/a").unlink()
+
+        assert cache.lookup("https://e.com/a") is None
+        assert cache.urls == {} and cache.blobs == {}
+
+
+class TestResolverCache:
+    """The resolver records checksums once and shares blobs"""
+
+    async def test_repeat_resolve_does_not_rehash(self, tmp_path):
+        resolver = ResourceResolver(tmp_path)
+        url = "https://cdn.example.com/model.bin"
+        content = b"weights" * 1000
+        checksum = {"sha256": hashlib.sha256(content).hexdigest()}
+        fetched, download = serve(resolver, {url: content})
+
+        with download, patch.object(
+            resolver_module, "hash_file", wraps=hash_file
+        ) as hashed:
+            first = await resolver.resolve(url, checksum=checksum)
+            for _ in range(3):
+                assert await resolver.resolve(url, checksum=checksum) == first
+            # A fresh process reads the recorded digests from the index
+            again = ResourceResolver(tmp_path)
+            with patch.object(again, "_stream_download", side_effect=AssertionError):
+                assert await again.resolve(url, checksum=checksum) == first
+
+        assert fetched == [url]
+        assert hashed.call_count == 1
+
+    async def test_mirrors_share_one_blob(self, tmp_path):
+        resolver = ResourceResolver(tmp_path)
+        urls = ["https://a.example.com/fw.bin", "https://b.example.com/fw.bin"]
+        _, download = serve(resolver, dict.fromkeys(urls, b"same firmware"))
+
+        with download:
+            paths = [await resolver.resolve(u) for u in urls]
+
+        assert paths[0] != paths[1]
+        assert len(resolver.cache.blobs) == 1
+
+    async def test_download_evicts_least_recent(self, tmp_path):
+        resolver = ResourceResolver(tmp_path, max_bytes=150)
+        responses = {f"https://e.com/{n}.bin": bytes([n]) * 100 for n in range(3)}
+        _, download = serve(resolver, responses)
+
+        with download:
+            for url in responses:
+                await resolver.resolve(url)
+
+        assert list(resolver.cache.urls) == ["https://e.com/2.bin"]
+        assert resolver.cache.total_bytes == 100
+
+    async def test_held_blobs_survive_other_downloads(self, tmp_path):
+        resolver = ResourceResolver(tmp_path, max_bytes=150)
+        responses = {f"https://e.com/{n}.bin": bytes([n]) * 100 for n in range(3)}
+        urls = list(responses)
+        _, download = serve(resolver, responses)
+
+        first_resolved = asyncio.Event()
+
+        async def other_deployment():
+            await first_resolved.wait()
+            with resolver.hold_assets():
+                await resolver.resolve(urls[1])
+
+        with download:
+            other = asyncio.create_task(other_deployment())
+            with resolver.hold_assets():
+                flashing = await resolver.resolve(urls[0])
+                first_resolved.set()
+                # The other deployment's download must not evict it
+                await other
+                assert open(flashing, "rb").read() == responses[urls[0]]
+            assert resolver.held_blobs() == set()
+            await resolver.resolve(urls[2])
+
+        assert list(resolver.cache.urls) == [urls[2]]
+
+    async def test_legacy_cached_file_is_adopted(self, tmp_path):
+        resolver = ResourceResolver(tmp_path)
+        url = "https://cdn.example.com/app.deb"
+        legacy = resolver._cache_path(url)
+        legacy.parent.mkdir(parents=True)
+        legacy.write_bytes(b"old download")
+
+        with patch.object(resolver, "_stream_download", side_effect=AssertionError):
+            path = await resolver.resolve(
+                url, checksum={"md5": hashlib.md5(b"old download").hexdigest()}
+            )
+
+        assert path == str(legacy)
+        assert url in resolver.cache.urls
+
+    async def test_bad_download_is_not_kept(self, tmp_path):
+        resolver = ResourceResolver(tmp_path)
+        url = "https://cdn.example.com/fw.bin"
+        _, download = serve(resolver, {url: b"corrupt"})
+
+        with download, pytest.raises(RuntimeError, match="Checksum verification"):
+            await resolver.resolve(url, checksum={"sha256": "0" * 64})
+
+        assert resolver.cache.blobs == {}
+        assert not resolver._cache_path(url).exists()
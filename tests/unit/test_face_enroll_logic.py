@@ -0,0 +1,188 @@
+"""
+Unit tests for face enrollment math, the face gallery and enrollment sessions
+"""
+
+import math
+import random
+import time
+
+import pytest
+
+from provisioning_station.services import face_enroll_logic
+from provisioning_station.services.face_enroll_logic import (
+    FaceEnrollmentSession,
+    FaceGallery,
+    _average_embeddings,
+    _cosine_similarity,
+)
+
+DIM = 128
+
+
+@pytest.fixture(autouse=True, params=["numpy", "python"])
+def math_backend(request, monkeypatch):
+    """Run every test on the NumPy path and on the pure-Python fallback"""
+    if request.param == "numpy" and not face_enroll_logic.NUMPY_AVAILABLE:
+        pytest.skip("numpy not installed")
+    if request.param == "python":
+        monkeypatch.setattr(face_enroll_logic, "NUMPY_AVAILABLE", False)
+    return request.param
+
+
+def unit(seed: int) -> list:
+    rng = random.Random(seed)
+    vec = [rng.gauss(0, 1) for _ in range(DIM)]
+    norm = math.sqrt(sum(x * x for x in vec))
+    return [x / norm for x in vec]
+
+
+def jitter(vec: list, amount: float, seed: int) -> list:
+    rng = random.Random(seed)
+    return [x + rng.gauss(0, amount) for x in vec]
+
+
+class FakeCameraSession:
+    def __init__(self):
+        self.callbacks = []
+        self.enrollment_state = None
+
+    def add_frame_callback(self, cb):
+        self.callbacks.append(cb)
+
+    def remove_frame_callback(self, cb):
+        if cb in self.callbacks:
+            self.callbacks.remove(cb)
+
+    def push(self, embedding, confidence=0.9):
+        for cb in list(self.callbacks):
+            cb({"faces": [{"confidence": confidence, "embedding": embedding}]})
+
+
+def enroll(camera, name, samples, gallery=None, **kwargs) -> FaceEnrollmentSession:
+    """Run an enrollment over ``samples`` and finish it"""
+    enrollment = FaceEnrollmentSession(
+        camera, None, name, duration=60, gallery=gallery, **kwargs
+    )
+    enrollment.start()
+    for sample in samples:
+        camera.push(sample)
+    enrollment._start_time -= 60
+    camera.push(samples[0])
+    return enrollment
+
+
+class TestEmbeddingMath:
+    """Tests for the vector helpers"""
+
+    def test_cosine_similarity(self):
+        a = unit(1)
+        assert _cosine_similarity(a, a) == pytest.approx(1.0, abs=1e-5)
+        assert _cosine_similarity(a, [-x for x in a]) == pytest.approx(-1.0, abs=1e-5)
+        assert _cosine_similarity(a, [0.0] * DIM) == 0.0
+
+    def test_average_is_normalized(self):
+        avg = _average_embeddings([[2.0, 0.0], [0.0, 2.0]])
+        assert avg == pytest.approx([math.sqrt(0.5)] * 2, abs=1e-6)
+        assert _average_embeddings([]) == []
+
+
+class TestFaceGallery:
+    """Tests for the in-memory match index"""
+
+    def test_match_add_remove_rename(self):
+        gallery = FaceGallery()
+        assert gallery.match(unit(1)) is None
+
+        gallery.add("Alice", unit(1))
+        gallery.add("Bob", unit(2))
+        name, score = gallery.match(unit(2))
+        assert name == "Bob" and score == pytest.approx(1.0, abs=1e-5)
+        assert gallery.match(unit(2), exclude="Bob")[0] == "Alice"
+
+        gallery.rename("Bob", "Robert")
+        assert gallery.match(unit(2))[0] == "Robert"
+        gallery.remove("Robert")
+        assert gallery.match(unit(2))[0] == "Alice"
+
+    def test_load_syncs_with_device_list(self):
+        gallery = FaceGallery()
+        gallery.add("Alice", unit(1))
+        gallery.add("Gone", unit(2))
+
+        gallery.load(
+            [
+                {"name": "Alice", "index": 0},
+                {"name": "Carol", "index": 1, "embedding": unit(3)},
+            ]
+        )
+
+        assert gallery.synced
+        assert gallery.device_names == ["Alice", "Carol"]
+        assert "Gone" not in gallery and len(gallery) == 2
+
+
+class TestEnrollmentSession:
+    """Tests for quality scoring and duplicate detection"""
+
+    def test_consistent_samples_are_enrolled(self):
+        camera = FakeCameraSession()
+        base = unit(1)
+        enrollment = enroll(camera, "Alice", [jitter(base, 0.01, n) for n in range(10)])
+
+        result = enrollment.result
+        assert result["ok"] and result["samples_collected"] == 10
+        assert _cosine_similarity(result["embedding"], base) > 0.99
+        assert result["quality"]["consistency"] > 0.9
+        assert result["quality"]["spread"] < 0.01
+        assert camera.callbacks == []
+
+    def test_spread_grows_with_variance(self):
+        tight = enroll(FakeCameraSession(), "A", [jitter(unit(1), 0.01, n) for n in range(10)])
+        loose = enroll(FakeCameraSession(), "B", [jitter(unit(1), 0.1, n) for n in range(10)])
+        assert loose.quality()["spread"] > tight.quality()["spread"]
+        assert loose.quality()["consistency"] < tight.quality()["consistency"]
+
+    def test_duplicate_is_rejected(self):
+        gallery = FaceGallery()
+        gallery.add("Alice", unit(1))
+        camera = FakeCameraSession()
+
+        enrollment = enroll(
+            camera, "Mallory", [jitter(unit(1), 0.01, n) for n in range(5)], gallery
+        )
+
+        assert not enrollment.result["ok"]
+        assert enrollment.result["duplicate"]["name"] == "Alice"
+        assert "already enrolled as 'Alice'" in enrollment.result["error"]
+        assert camera.enrollment_state["duplicate"]["name"] == "Alice"
+
+    def test_reenrolling_or_allowed_duplicate_is_stored(self):
+        gallery = FaceGallery()
+        gallery.add("Alice", unit(1))
+        samples = [jitter(unit(1), 0.01, n) for n in range(5)]
+
+        same = enroll(FakeCameraSession(), "Alice", samples, gallery)
+        allowed = enroll(
+            FakeCameraSession(), "Twin", samples, gallery, allow_duplicate=True
+        )
+
+        assert same.result["ok"] and same.result["duplicate"] is None
+        assert allowed.result["ok"] and allowed.result["duplicate"]["name"] == "Alice"
+
+    def test_keeps_up_with_camera_frame_rate(self):
+        gallery = FaceGallery()
+        for n in range(200):
+            gallery.add(f"face{n}", unit(n))
+        camera = FakeCameraSession()
+        enrollment = FaceEnrollmentSession(camera, None, "New", duration=60, gallery=gallery)
+        enrollment.start()
+        frames = [jitter(unit(1000), 0.05, n) for n in range(300)]
+
+        started = time.perf_counter()
+        for frame in frames:
+            camera.push(frame)
+        per_frame = (time.perf_counter() - started) / len(frames)
+
+        assert len(enrollment._samples) == 300
+        # The Himax streams about 30 fps; stay far below the frame interval
+        assert per_frame < 0.002
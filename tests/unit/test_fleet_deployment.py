@@ -0,0 +1,178 @@
+"""
+Fleet deployment tests using simulated devices.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from provisioning_station.deployers import DEPLOYER_REGISTRY
+from provisioning_station.models.deployment import DeploymentStatus, FleetFailurePolicy
+from provisioning_station.services.deployment_engine import DeploymentEngine
+from provisioning_station.services.fleet_deployment import FleetManager
+from tests.simulation.deployer import (
+    SimulationDeployer,
+    TimedDeployer,
+    patch_registry,
+)
+from tests.simulation.solution import make_device_config, make_solution_mock
+
+
+class RecordingManager:
+    """WebSocket manager stand-in that records broadcasts per channel."""
+
+    def __init__(self):
+        self.messages = {}
+
+    async def broadcast(self, channel: str, message: dict):
+        self.messages.setdefault(channel, []).append(dict(message))
+
+
+def _failing_for(hosts):
+    """Scenario validator that rejects the given hosts."""
+    return lambda connection: connection.get("host") not in hosts
+
+
+async def _run_fleet(hosts, scenario=None, deployer=None, **kwargs):
+    """Deploy one docker_local device to each host and wait for the fleet."""
+    engine = DeploymentEngine()
+    ws = RecordingManager()
+    engine.set_websocket_manager(ws)
+    fleets = FleetManager(engine)
+    fleets.set_websocket_manager(ws)
+
+    sim = deployer or SimulationDeployer("docker_local", scenario=scenario or {})
+    originals = patch_registry({"docker_local": sim})
+    try:
+        solution, deployment_info = make_solution_mock()
+        config = make_device_config("device1", "docker_local")
+
+        with patch(
+            "provisioning_station.services.deployment_engine.solution_manager"
+        ) as mock_sm:
+            mock_sm.get_deployment_from_guide = AsyncMock(return_value=deployment_info)
+            mock_sm.load_device_config = AsyncMock(return_value=config)
+            mock_sm.get_solution.return_value = solution
+
+            fleet_id = await fleets.start_fleet(
+                solution=solution,
+                targets=[{"device_connections": {"device1": {"host": h}}} for h in hosts],
+                **kwargs,
+            )
+            await asyncio.wait_for(fleets.wait_for_fleet(fleet_id), timeout=10.0)
+
+        return fleets.get_fleet(fleet_id), ws.messages.get(fleet_id, []), sim
+    finally:
+        DEPLOYER_REGISTRY.update(originals)
+
+
+class TestFleetDeployment:
+    """Fan-out of one solution to many connection sets."""
+
+    @pytest.mark.asyncio
+    async def test_all_targets_deployed(self):
+        hosts = [f"10.0.0.{i}" for i in range(6)]
+        fleet, messages, sim = await _run_fleet(hosts, concurrency=3)
+
+        assert fleet.status == DeploymentStatus.COMPLETED
+        assert sim.deploy_count == 6
+        assert [t.label for t in fleet.targets] == hosts
+        assert all(t.deployment_id for t in fleet.targets)
+        assert fleet.counts()["completed"] == 6
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """No more than `concurrency` targets run at once."""
+        sim = TimedDeployer("docker_local")
+        fleet, _, _ = await _run_fleet([f"h{i}" for i in range(6)], deployer=sim, concurrency=2)
+
+        assert fleet.status == DeploymentStatus.COMPLETED
+        # Sweep start/end events to find the most runs active at once
+        events = sorted(
+            [(start, 1) for _, start, _ in sim.intervals]
+            + [(end, -1) for _, _, end in sim.intervals]
+        )
+        active = peak = 0
+        for _, delta in events:
+            active += delta
+            peak = max(peak, active)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_continue_on_failure(self):
+        fleet, _, sim = await _run_fleet(
+            ["a", "bad", "c"],
+            scenario={"connection_validator": _failing_for({"bad"})},
+            concurrency=1,
+        )
+
+        assert fleet.status == DeploymentStatus.FAILED
+        assert [t.status for t in fleet.targets] == [
+            DeploymentStatus.COMPLETED,
+            DeploymentStatus.FAILED,
+            DeploymentStatus.COMPLETED,
+        ]
+        assert "validation failed" in fleet.targets[1].error
+
+    @pytest.mark.asyncio
+    async def test_stop_on_first_failure(self):
+        fleet, _, sim = await _run_fleet(
+            ["a", "bad", "c", "d"],
+            scenario={"connection_validator": _failing_for({"bad"})},
+            concurrency=1,
+            failure_policy=FleetFailurePolicy.STOP,
+        )
+
+        assert fleet.status == DeploymentStatus.FAILED
+        assert fleet.targets[1].status == DeploymentStatus.FAILED
+        assert [t.status for t in fleet.targets[2:]] == [DeploymentStatus.CANCELLED] * 2
+        assert sim.deploy_count == 2
+
+    @pytest.mark.asyncio
+    async def test_single_channel_aggregates_progress(self):
+        """Target events and fleet summaries share the fleet's channel."""
+        fleet, messages, _ = await _run_fleet(["a", "b"], concurrency=2)
+        types = [m["type"] for m in messages]
+
+        assert types.count("fleet_target_started") == 2
+        assert types.count("fleet_target_completed") == 2
+        assert types[-1] == "fleet_completed"
+        assert "progress" in types  # Forwarded from the engine
+        assert {m["deployment_id"] for m in messages if m["type"] == "progress"} == {
+            t.deployment_id for t in fleet.targets
+        }
+        assert all(m["fleet_id"] == fleet.id for m in messages)
+        assert messages[-2]["overall_progress"] == 100
+
+    @pytest.mark.asyncio
+    async def test_cancel_fleet(self):
+        engine = DeploymentEngine()
+        fleets = FleetManager(engine)
+        sim = SimulationDeployer("docker_local", scenario={"step_delay": 0.2})
+        originals = patch_registry({"docker_local": sim})
+        try:
+            solution, deployment_info = make_solution_mock()
+            config = make_device_config("device1", "docker_local")
+            with patch(
+                "provisioning_station.services.deployment_engine.solution_manager"
+            ) as mock_sm:
+                mock_sm.get_deployment_from_guide = AsyncMock(return_value=deployment_info)
+                mock_sm.load_device_config = AsyncMock(return_value=config)
+                mock_sm.get_solution.return_value = solution
+
+                fleet_id = await fleets.start_fleet(
+                    solution=solution,
+                    targets=[{"device_connections": {"device1": {}}} for _ in range(4)],
+                    concurrency=2,
+                )
+                await asyncio.sleep(0.1)
+                await fleets.cancel_fleet(fleet_id)
+                await asyncio.wait_for(fleets.wait_for_fleet(fleet_id), timeout=5.0)
+
+            fleet = fleets.get_fleet(fleet_id)
+            assert fleet.status == DeploymentStatus.CANCELLED
+            assert all(t.status == DeploymentStatus.CANCELLED for t in fleet.targets)
+            assert sim.deploy_count == 2
+        finally:
+            DEPLOYER_REGISTRY.update(originals)
@@ -0,0 +1,186 @@
+"""
+Unit tests for in-memory low-latency HLS
+"""
+
+import asyncio
+import struct
+
+import pytest
+from fastapi import HTTPException
+
+from provisioning_station.routers.preview import _serve_hls_from_memory
+from provisioning_station.services.hls_window import (
+    Fmp4Splitter,
+    HlsWindow,
+    parse_fragment,
+    parse_init,
+)
+
+TIMESCALE = 1000
+SAMPLE_MS = 40  # 25 fps
+NON_SYNC = 0x00010000
+
+
+def box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def full_box(box_type: bytes, flags: int, payload: bytes) -> bytes:
+    return box(box_type, struct.pack(">I", flags) + payload)
+
+
+def make_init() -> bytes:
+    mdhd = full_box(b"mdhd", 0, struct.pack(">IIII", 0, 0, TIMESCALE, 0) + b"\0" * 4)
+    trak = box(b"trak", box(b"mdia", mdhd))
+    trex = full_box(b"trex", 0, struct.pack(">IIIII", 1, 1, SAMPLE_MS, 0, NON_SYNC))
+    moov = box(b"moov", trak + box(b"mvex", trex))
+    return box(b"ftyp", b"isom\0\0\0\0") + moov
+
+
+def make_part(samples: int = 5, keyframe: bool = False) -> bytes:
+    """moof + mdat with trex default durations and a first-sample flag"""
+    tfhd = full_box(b"tfhd", 0x020000, struct.pack(">I", 1))
+    first_flags = 0 if keyframe else NON_SYNC
+    trun = full_box(
+        b"trun", 0x000204, struct.pack(">II", samples, first_flags) + b"\0\0\0\1" * samples
+    )
+    moof = box(b"moof", box(b"traf", tfhd + trun))
+    return moof + box(b"mdat", b"\0" * samples)
+
+
+def fill(window: HlsWindow, parts: int, gop: int = 5):
+    """Add parts of 200 ms with a keyframe every ``gop`` parts"""
+    for n in range(parts):
+        window.add_part(make_part(keyframe=n % gop == 0))
+
+
+class TestFmp4Parsing:
+    """Tests for box splitting and fragment parsing"""
+
+    def test_splitter_handles_arbitrary_chunking(self):
+        init = make_init()
+        parts = [make_part(keyframe=True), make_part(), make_part(samples=3)]
+        stream = init + b"".join(parts)
+
+        splitter = Fmp4Splitter()
+        out = []
+        for i in range(0, len(stream), 7):
+            out += splitter.feed(stream[i : i + 7])
+
+        assert out == [("init", init)] + [("part", p) for p in parts]
+
+    def test_corrupt_box_is_rejected(self):
+        with pytest.raises(ValueError, match="Corrupt MP4 box"):
+            Fmp4Splitter().feed(struct.pack(">I4s", 4, b"moof"))
+
+    def test_fragment_duration_and_keyframe(self):
+        defaults = parse_init(make_init())
+        assert defaults.timescale == TIMESCALE
+
+        assert parse_fragment(make_part(keyframe=True), defaults) == (0.2, True)
+        assert parse_fragment(make_part(samples=3), defaults) == (0.12, False)
+
+
+class TestHlsWindow:
+    """Tests for segmenting, the playlist and blocking reloads"""
+
+    def test_segments_start_on_keyframes(self):
+        window = HlsWindow()
+        window.set_init(make_init())
+        window.add_part(make_part())  # Before the first keyframe: dropped
+        fill(window, 12)
+
+        segments = list(window.segments)
+        assert [s.msn for s in segments] == [0, 1, 2]
+        assert [len(s.parts) for s in segments] == [5, 5, 2]
+        assert [s.complete for s in segments] == [True, True, False]
+        assert window.get_segment(0) == b"".join(p.data for p in segments[0].parts)
+        assert window.get_segment(2) is None  # Still growing
+
+    def test_window_is_bounded(self):
+        window = HlsWindow(max_segments=3)
+        window.set_init(make_init())
+        fill(window, 50)
+
+        assert len(window.segments) == 3
+        assert window.segments[0].msn == 7
+        assert window.get_part(0, 0) is None
+
+    def test_playlist(self):
+        window = HlsWindow()
+        window.set_init(make_init())
+        fill(window, 22)
+
+        playlist = window.playlist()
+        assert playlist.startswith("#EXTM3U\n")
+        assert "#EXT-X-TARGETDURATION:1\n" in playlist
+        assert "#EXT-X-SERVER-CONTROL:CAN-BLOCK-RELOAD=YES,PART-HOLD-BACK=0.600" in playlist
+        assert '#EXT-X-MAP:URI="init.mp4"' in playlist
+        assert "#EXTINF:1.000,\nseg0.m4s" in playlist
+        # Parts are listed only for the newest segments
+        assert 'URI="part0.0.m4s"' not in playlist
+        assert '#EXT-X-PART:DURATION=0.200,URI="part2.0.m4s",INDEPENDENT=YES' in playlist
+        assert playlist.endswith('#EXT-X-PRELOAD-HINT:TYPE=PART,URI="part4.2.m4s"\n')
+
+    async def test_blocking_reload_waits_for_part(self):
+        window = HlsWindow()
+        window.set_init(make_init())
+        fill(window, 3)
+
+        assert await window.wait_for(0, 2, timeout=0.01)
+        waiter = asyncio.create_task(window.wait_for(0, 3, timeout=1))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        window.add_part(make_part())
+        assert await waiter
+        assert not await window.wait_for(0, 9, timeout=0.01)
+
+
+class TestServeFromMemory:
+    """Tests for the LL-HLS HTTP handler"""
+
+    @pytest.fixture
+    def window(self):
+        window = HlsWindow()
+        window.set_init(make_init())
+        fill(window, 7)
+        return window
+
+    async def test_files(self, window):
+        init = await _serve_hls_from_memory(window, "init.mp4", None, None)
+        part = await _serve_hls_from_memory(window, "part1.1.m4s", None, None)
+        segment = await _serve_hls_from_memory(window, "seg0.m4s", None, None)
+
+        assert init.body == make_init()
+        assert part.body == window.get_part(1, 1)
+        assert segment.body == window.get_segment(0)
+        with pytest.raises(HTTPException) as exc:
+            await _serve_hls_from_memory(window, "seg1.m4s", None, None)
+        assert exc.value.status_code == 404
+
+    async def test_preload_hint_is_held_until_ready(self, window):
+        request = asyncio.create_task(
+            _serve_hls_from_memory(window, "part1.2.m4s", None, None)
+        )
+        await asyncio.sleep(0.01)
+        window.add_part(make_part())
+
+        response = await request
+        assert response.body == window.get_part(1, 2)
+
+    async def test_blocking_playlist_request(self, window):
+        request = asyncio.create_task(
+            _serve_hls_from_memory(window, "index.m3u8", 1, 2)
+        )
+        await asyncio.sleep(0.01)
+        assert not request.done()
+        window.add_part(make_part())
+
+        response = await request
+        assert b'URI="part1.2.m4s"' in response.body
+        assert response.media_type == "application/vnd.apple.mpegurl"
+
+        with pytest.raises(HTTPException) as exc:
+            await _serve_hls_from_memory(window, "index.m3u8", None, 1)
+        assert exc.value.status_code == 400
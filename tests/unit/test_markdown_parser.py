@@ -388,6 +388,29 @@ Deploy with config.
         assert not result.has_errors
         assert result.steps[0].config_file == "devices/docker.yaml"
 
+    def test_scheduling_attributes(self):
+        """Parse depends_on and parallel step attributes."""
+        content = """<!-- @lang:en -->
+
+## Step 1: Backend {#backend type=docker_local config=devices/backend.yaml}
+
+Deploy backend.
+
+## Step 2: Firmware {#firmware type=esp32_usb config=devices/esp32.yaml parallel=true}
+
+Flash firmware.
+
+## Step 3: Flow {#flow type=recamera_nodered config=devices/flow.yaml depends_on=backend,firmware}
+
+Push flow.
+"""
+        result = parse_deployment_guide(content)
+        assert not result.has_errors
+        assert result.steps[0].depends_on == []
+        assert result.steps[0].parallel is False
+        assert result.steps[1].parallel is True
+        assert result.steps[2].depends_on == ["backend", "firmware"]
+
     def test_invalid_type_error(self):
         """Error on invalid step type."""
         content = """<!-- @lang:en -->
@@ -0,0 +1,121 @@
+"""
+Unit tests for bounded MQTT-to-WebSocket message buffers
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from provisioning_station.services.mqtt_bridge import (
+    LATEST_PER_TOPIC,
+    MessageBuffer,
+    MqttBridge,
+    MqttSubscription,
+)
+
+
+def msg(topic: str, n: int) -> dict:
+    return {"topic": topic, "payload": {"n": n}, "timestamp": 0.0}
+
+
+async def drain(buffer: MessageBuffer) -> list:
+    out = []
+    while (message := await buffer.get(timeout=0)) is not None:
+        out.append((message["topic"], message["payload"]["n"]))
+    return out
+
+
+class TestMessageBuffer:
+    """Tests for drop policies, rate limiting and wake-ups"""
+
+    async def test_drop_oldest_bounds_memory(self):
+        buffer = MessageBuffer(asyncio.get_running_loop(), maxsize=3)
+        for n in range(10):
+            buffer.offer(msg("t", n))
+
+        assert buffer.qsize() == 3
+        assert await drain(buffer) == [("t", 7), ("t", 8), ("t", 9)]
+        assert buffer.stats()["dropped"] == 7
+        assert buffer.delivered == 3
+
+    async def test_latest_per_topic_coalesces(self):
+        buffer = MessageBuffer(
+            asyncio.get_running_loop(), maxsize=2, policy=LATEST_PER_TOPIC
+        )
+        for n in range(5):
+            buffer.offer(msg("temp", n))
+            buffer.offer(msg("humidity", n))
+
+        assert await drain(buffer) == [("temp", 4), ("humidity", 4)]
+        assert buffer.coalesced == 8 and buffer.dropped == 0
+
+        buffer.offer(msg("a", 0))
+        buffer.offer(msg("b", 0))
+        buffer.offer(msg("c", 0))  # Over the topic limit: oldest topic goes
+        assert await drain(buffer) == [("b", 0), ("c", 0)]
+        assert buffer.dropped == 1
+
+    def test_unknown_policy_is_rejected(self):
+        loop = asyncio.new_event_loop()
+        with pytest.raises(ValueError, match="Unknown drop policy"):
+            MessageBuffer(loop, policy="keep_everything")
+        loop.close()
+
+    async def test_message_from_thread_wakes_consumer(self):
+        buffer = MessageBuffer(asyncio.get_running_loop())
+
+        def paho():
+            time.sleep(0.05)
+            for n in range(100):
+                buffer(msg("t", n))
+
+        thread = threading.Thread(target=paho)
+        thread.start()
+        first = await buffer.get(timeout=1)
+        await asyncio.to_thread(thread.join)
+
+        assert first["payload"]["n"] == 0
+        rest = await drain(buffer)
+        assert rest[-1] == ("t", 99)
+        assert buffer.delivered + buffer.dropped == 100
+
+    async def test_max_rate_paces_consumer(self):
+        buffer = MessageBuffer(asyncio.get_running_loop(), max_rate=50)
+        for n in range(5):
+            buffer.offer(msg("t", n))
+
+        started = time.monotonic()
+        for _ in range(5):
+            assert await buffer.get(timeout=1) is not None
+        assert time.monotonic() - started >= 4 / 50 * 0.9
+
+    async def test_idle_consumer_times_out(self):
+        buffer = MessageBuffer(asyncio.get_running_loop())
+        assert await buffer.get(timeout=0.01) is None
+
+
+class TestSubscriptionInfo:
+    """Buffer counters are reported per subscriber"""
+
+    async def test_subscribers_in_info(self):
+        bridge = MqttBridge()
+        buffer = MessageBuffer(asyncio.get_running_loop(), maxsize=1)
+        sub = MqttSubscription("s1", "broker", 1883, "sensors/#")
+        sub.callbacks.add(buffer)
+        bridge.subscriptions["s1"] = sub
+        buffer.offer(msg("t", 0))
+        buffer.offer(msg("t", 1))
+
+        info = bridge.get_subscription_info("s1")
+        assert info["subscribers"] == [
+            {
+                "policy": "drop_oldest",
+                "max_rate": 0,
+                "pending": 1,
+                "delivered": 0,
+                "dropped": 1,
+                "coalesced": 0,
+            }
+        ]
@@ -200,40 +200,6 @@ class TestFilenameFromUrl:
         assert ResourceResolver._filename_from_url("https://cdn.example.com/") == "download"
 
 
-# ------------------------------------------------------------------
-# _verify_checksum
-# ------------------------------------------------------------------
-
-
-class TestVerifyChecksum:
-    def test_sha256_match(self, tmp_path):
-        f = tmp_path / "test.bin"
-        content = b"hello world"
-        f.write_bytes(content)
-        sha = hashlib.sha256(content).hexdigest()
-
-        assert ResourceResolver._verify_checksum(f, {"sha256": sha}) is True
-
-    def test_sha256_mismatch(self, tmp_path):
-        f = tmp_path / "test.bin"
-        f.write_bytes(b"hello world")
-
-        assert ResourceResolver._verify_checksum(f, {"sha256": "bad"}) is False
-
-    def test_md5_match(self, tmp_path):
-        f = tmp_path / "test.bin"
-        content = b"hello world"
-        f.write_bytes(content)
-        md5 = hashlib.md5(content).hexdigest()
-
-        assert ResourceResolver._verify_checksum(f, {"md5": md5}) is True
-
-    def test_empty_checksums_passes(self, tmp_path):
-        f = tmp_path / "test.bin"
-        f.write_bytes(b"data")
-        assert ResourceResolver._verify_checksum(f, {}) is True
-
-
 # ------------------------------------------------------------------
 # DeviceConfig.resolve_remote_assets
 # ------------------------------------------------------------------
@@ -727,3 +693,163 @@ class TestResourceResolverErrorPaths:
             url_hash = hashlib.sha256(url.encode()).hexdigest()[:16]
             cache_dir = tmp_cache / "downloads" / url_hash
             assert not (cache_dir / "firmware.bin").exists()
+
+
+# ------------------------------------------------------------------
+# Shared client, resume and prefetch
+# ------------------------------------------------------------------
+
+
+class FlakyServer:
+    """httpx handler serving one blob, cutting the first response short"""
+
+    def __init__(self, body: bytes, fail_after: int = 0, etag: str = '"v1"'):
+        self.body = body
+        self.fail_after = fail_after
+        self.etag = etag
+        self.requests = []
+
+    def __call__(self, request):
+        import httpx
+
+        self.requests.append(dict(request.headers))
+        start = 0
+        status = 200
+        headers = {"etag": self.etag}
+        range_header = request.headers.get("range")
+        if range_header and request.headers.get("if-range") == self.etag:
+            start = int(range_header.split("=")[1].rstrip("-"))
+            status = 206
+            headers["content-range"] = f"bytes {start}-{len(self.body) - 1}/{len(self.body)}"
+        data = self.body[start:]
+        headers["content-length"] = str(len(data))
+
+        fail_after, self.fail_after = self.fail_after, 0
+
+        async def stream():
+            if fail_after:
+                yield data[:fail_after]
+                raise httpx.ReadError("connection reset")
+            yield data
+
+        return httpx.Response(status, headers=headers, content=stream())
+
+
+def use_transport(resolver, handler):
+    import httpx
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    resolver._client = lambda trust_env=True: client
+    return client
+
+
+class TestResumableDownload:
+    @pytest.mark.asyncio
+    async def test_interrupted_download_resumes_with_range(self, resolver, tmp_path):
+        body = bytes(range(256)) * 4096  # 1 MB
+        server = FlakyServer(body, fail_after=300_000)
+        use_transport(resolver, server)
+        dest = tmp_path / "model.cvimodel"
+
+        with pytest.raises(Exception):
+            await resolver._stream_download_once("https://cdn.example.com/m", dest)
+        part = tmp_path / "model.cvimodel.part"
+        received = part.stat().st_size
+        assert 0 < received <= 300_000
+        assert not dest.exists()
+
+        await resolver._stream_download_once("https://cdn.example.com/m", dest)
+
+        assert dest.read_bytes() == body
+        assert server.requests[1]["range"] == f"bytes={received}-"
+        assert not part.exists()
+        assert not (tmp_path / "model.cvimodel.part.validator").exists()
+
+    @pytest.mark.asyncio
+    async def test_changed_file_restarts_from_zero(self, resolver, tmp_path):
+        body = b"new version" * 1000
+        server = FlakyServer(body, etag='"v2"')
+        use_transport(resolver, server)
+        dest = tmp_path / "app.deb"
+        (tmp_path / "app.deb.part").write_bytes(b"old version bytes")
+        (tmp_path / "app.deb.part.validator").write_text('"v1"')
+
+        await resolver._stream_download_once("https://cdn.example.com/app.deb", dest)
+
+        assert server.requests[0]["if-range"] == '"v1"'
+        assert dest.read_bytes() == body
+
+
+class TestPrefetch:
+    @pytest.mark.asyncio
+    async def test_downloads_run_concurrently_and_are_shared(self, resolver):
+        import asyncio
+
+        active = 0
+        peak = 0
+
+        async def slow_download(url, dest, cb=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            dest.write_bytes(url.encode())
+            active -= 1
+
+        urls = [f"https://cdn.example.com/asset{i}.bin" for i in range(6)]
+        with patch.object(resolver, "_stream_download", side_effect=slow_download) as dl:
+            prefetch = asyncio.create_task(
+                resolver.prefetch([(u, None) for u in urls] + [("local/file.bin", None)])
+            )
+            await asyncio.sleep(0.01)
+            # A resolve of an in-flight URL joins it instead of downloading again
+            path = await resolver.resolve(urls[0])
+            results = await prefetch
+
+        assert dl.call_count == 6
+        assert 1 < peak <= 4
+        assert Path(path).read_bytes() == urls[0].encode()
+        assert set(results) == set(urls)
+
+    @pytest.mark.asyncio
+    async def test_failures_are_returned_not_raised(self, resolver):
+        with patch.object(
+            resolver, "_stream_download", new_callable=AsyncMock
+        ) as dl:
+            dl.side_effect = ConnectionError("offline")
+            results = await resolver.prefetch([("https://cdn.example.com/x.bin", None)])
+
+        assert isinstance(results["https://cdn.example.com/x.bin"], RuntimeError)
+
+    def test_device_config_lists_remote_assets(self, resolver):
+        from provisioning_station.models.device import (
+            ActionConfig,
+            ActionsConfig,
+            DeviceConfig,
+            FirmwareConfig,
+            FirmwareSource,
+            FlashConfig,
+        )
+
+        config = DeviceConfig(
+            id="test",
+            name="Test",
+            type="esp32_usb",
+            firmware=FirmwareConfig(
+                source=FirmwareSource(
+                    path="https://cdn.example.com/fw.bin", checksum={"sha256": "ab"}
+                ),
+                flash_config=FlashConfig(),
+            ),
+            actions=ActionsConfig(
+                before=[
+                    ActionConfig(name="a", script="https://cdn.example.com/a.sh"),
+                    ActionConfig(name="b", script="scripts/local.sh"),
+                ]
+            ),
+        )
+
+        assert config.remote_assets(resolver) == [
+            ("https://cdn.example.com/fw.bin", {"sha256": "ab"}),
+            ("https://cdn.example.com/a.sh", None),
+        ]
@@ -0,0 +1,70 @@
+"""
+Unit tests for serial camera WebSocket delivery
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+from provisioning_station.services.serial_camera_service import (
+    ClientQueue,
+    SerialCameraSession,
+)
+
+
+def make_session() -> SerialCameraSession:
+    return SerialCameraSession("s1", "/dev/ttyACM0")
+
+
+class TestClientQueue:
+    """Frames cross from the reader thread to the event loop"""
+
+    async def test_frame_from_thread_wakes_client_immediately(self):
+        session = make_session()
+        client = session.add_client()
+
+        def reader():
+            time.sleep(0.05)
+            session._broadcast({"type": "frame", "n": 1})
+
+        threading.Thread(target=reader).start()
+        message = await client.get(timeout=1)
+
+        # get() returns None if the frame did not arrive within the timeout
+        assert message is not None
+        assert json.loads(message) == {"type": "frame", "n": 1}
+        assert client.delivered == 1
+
+    async def test_idle_client_times_out_for_ping(self):
+        client = ClientQueue(asyncio.get_running_loop())
+        assert await client.get(timeout=0.01) is None
+        assert client.delivered == 0
+
+    async def test_slow_client_drops_oldest(self):
+        session = make_session()
+        slow = session.add_client()
+        fast = session.add_client()
+
+        def reader():
+            for n in range(8):
+                session._broadcast({"n": n})
+
+        await asyncio.to_thread(reader)
+        await asyncio.sleep(0)  # Let the scheduled puts run
+
+        assert slow.dropped == 3
+        received = [json.loads(await slow.get(timeout=1))["n"] for _ in range(5)]
+        assert received == [3, 4, 5, 6, 7]
+        assert fast.stats()["dropped"] == 3 and fast.stats()["qsize"] == 5
+
+    async def test_removed_client_gets_nothing(self):
+        session = make_session()
+        client = session.add_client()
+        session.remove_client(client)
+
+        session._broadcast_status("connected")
+        await asyncio.sleep(0)
+
+        assert session.client_count == 0
+        assert client.qsize() == 0
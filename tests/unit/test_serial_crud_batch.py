@@ -0,0 +1,214 @@
+"""
+Unit tests for batched face-database operations over the serial CRUD channel
+"""
+
+import json
+import time
+
+import pytest
+
+from provisioning_station.services.serial_crud_service import (
+    CHUNK_SIZE,
+    MAX_CHUNK_SIZE,
+    MIN_CHUNK_SIZE,
+    ChunkPacer,
+    SerialCrudClient,
+)
+
+
+class FakeRepl:
+    """Stand-in for the ESP console: echoes input, answers each line"""
+
+    def __init__(self, echo: bool = True, drop: int = 0):
+        self.is_open = True
+        self.echo = echo
+        self.drop = drop  # Ignore this many commands (simulated lost input)
+        self.out = bytearray()
+        self.line = bytearray()
+        self.commands = []
+        self.interrupts = 0
+        self.faces = []
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self.out)
+
+    def write(self, data: bytes):
+        for byte in data:
+            if byte == 3:
+                self.interrupts += 1
+                self.line.clear()
+                continue
+            if self.echo:
+                self.out.append(byte)
+            if byte == ord("\n"):
+                self._run(self.line.decode().strip())
+                self.line.clear()
+            else:
+                self.line.append(byte)
+
+    def _run(self, command: str):
+        if not command:
+            return
+        self.commands.append(command)
+        if self.drop:
+            self.drop -= 1
+            return
+        name, *args = command.split()
+        reply = {"ok": True}
+        if name == "face_add":
+            self.faces.append(args[0])
+        elif name == "face_delete":
+            self.faces.remove(args[0])
+        elif name == "face_list":
+            reply["faces"] = [{"name": n, "index": i} for i, n in enumerate(self.faces)]
+        self.out += b"\r\n" + json.dumps(reply).encode() + b"\r\nSenseCAP> "
+
+    def read(self, size: int = 1) -> bytes:
+        data = bytes(self.out[:size])
+        del self.out[:size]
+        return data
+
+    def readline(self) -> bytes:
+        end = self.out.find(b"\n")
+        if end < 0:
+            return self.read(len(self.out))
+        return self.read(end + 1)
+
+    def reset_input_buffer(self):
+        self.out.clear()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+
+def make_client(repl: FakeRepl) -> SerialCrudClient:
+    client = SerialCrudClient("/dev/fake")
+    client._serial = repl
+    return client
+
+
+def roster(n: int) -> list:
+    return [{"name": f"person{i}", "embedding": [0.01 * i] * 128} for i in range(n)]
+
+
+class TestChunkPacer:
+    """Tests for echo-driven pacing"""
+
+    def test_speeds_up_while_device_keeps_up(self):
+        pacer = ChunkPacer()
+        for _ in range(40):
+            pacer.record(pacer.chunk_size, pacer.chunk_size, 0.004)
+        assert pacer.chunk_size == MAX_CHUNK_SIZE
+        assert pacer.delay == pytest.approx(0.006)
+
+    def test_backs_off_on_short_echo(self):
+        pacer = ChunkPacer()
+        pacer.record(CHUNK_SIZE, 10, 0.03)
+        assert pacer.chunk_size == CHUNK_SIZE // 2
+        assert pacer.delay == pytest.approx(0.06)
+        for _ in range(5):
+            pacer.backoff()
+        assert pacer.chunk_size == MIN_CHUNK_SIZE
+        assert pacer.stats()["backoffs"] == 6
+
+
+class TestBulkImport:
+    """Tests for the one-transaction import"""
+
+    async def test_resets_repl_once_for_the_whole_batch(self):
+        repl = FakeRepl()
+        client = make_client(repl)
+        progress = []
+
+        started = time.monotonic()
+        result = await client.import_faces(
+            roster(20), on_progress=lambda *args: progress.append(args)
+        )
+        elapsed = time.monotonic() - started
+
+        assert result["ok"] and result["added"] == 20
+        assert repl.faces == [f"person{i}" for i in range(20)]
+        assert repl.commands[0] == "inference_pause"
+        assert repl.commands[-1] == "inference_resume"
+        assert repl.interrupts == 1
+        # Per-command reset alone used to cost 100 ms per face
+        assert elapsed < 20 * 0.1
+        assert [p[0] for p in progress] == list(range(1, 21))
+        assert progress[-1][1:3] == (20, "person19")
+        assert client.pacer.chunk_size > CHUNK_SIZE
+        assert "person7" in client.gallery
+
+    async def test_replace_deletes_existing_names_first(self):
+        repl = FakeRepl()
+        repl.faces = ["person0"]
+        client = make_client(repl)
+        client._inference_paused = True
+        await client.list_faces()
+
+        result = await client.import_faces(roster(2), replace=True)
+
+        assert result["added"] == 2
+        assert repl.commands[1].startswith("face_delete person0")
+        assert repl.faces == ["person0", "person1"]
+
+    async def test_replace_reads_face_list_when_not_synced(self):
+        repl = FakeRepl()
+        repl.faces = ["person0"]
+        client = make_client(repl)
+        client._inference_paused = True
+
+        result = await client.import_faces(roster(2), replace=True)
+
+        assert result["added"] == 2
+        assert repl.commands[0] == "face_list"
+        assert repl.commands[1].startswith("face_delete person0")
+        assert repl.faces == ["person0", "person1"]
+
+    async def test_incomplete_records_are_reported_as_failed(self):
+        repl = FakeRepl()
+        client = make_client(repl)
+        client._inference_paused = True
+        faces = roster(2) + [{"name": "nobody"}, {"embedding": [0.1] * 128}]
+
+        result = await client.import_faces(faces)
+
+        assert not result["ok"]
+        assert (result["added"], result["failed"]) == (2, 2)
+        failed = [r for r in result["results"] if not r["ok"]]
+        assert [r["name"] for r in failed] == ["nobody", ""]
+        assert repl.faces == ["person0", "person1"]
+
+    async def test_lost_command_is_retried_after_reset(self):
+        repl = FakeRepl(drop=1)
+        client = make_client(repl)
+        client._inference_paused = True
+
+        client._exchange = _short_timeout(client._exchange)
+        result = await client.import_faces(roster(3))
+
+        assert result["added"] == 3
+        assert repl.interrupts == 2
+        assert client.pacer.backoffs >= 1
+
+    async def test_export_includes_known_embeddings(self):
+        repl = FakeRepl()
+        client = make_client(repl)
+        await client.import_faces(roster(2))
+        repl.faces.append("remote")
+
+        exported = await client.export_faces()
+
+        by_name = {f["name"]: f for f in exported["faces"]}
+        assert len(by_name["person1"]["embedding"]) == 128
+        assert "embedding" not in by_name["remote"]
+
+
+def _short_timeout(exchange):
+    def wrapper(cmd_str, timeout, drain_echo):
+        return exchange(cmd_str, 0.05, drain_echo)
+
+    return wrapper
@@ -0,0 +1,145 @@
+"""
+Unit tests and throughput benchmark for the SSCMA serial parser
+"""
+
+import json
+import os
+import random
+import time
+
+import pytest
+
+from provisioning_station.services.serial_camera_service import SSCMAParser
+
+# Fastest UART the Himax runs at, in bytes per second (8N1)
+MAX_LINE_RATE = 921600 // 10
+
+
+def frame(msg: dict) -> bytes:
+    return b"\r" + json.dumps(msg, separators=(",", ":")).encode() + b"\r\n"
+
+
+def invoke(n: int, faces: int = 2) -> dict:
+    rng = random.Random(n)
+    return {
+        "type": 1,
+        "name": "INVOKE",
+        "code": 0,
+        "data": {
+            "count": n,
+            "resolution": [240, 240],
+            "faces": [
+                {
+                    "box": [rng.randint(0, 200) for _ in range(4)],
+                    "score": rng.randint(50, 99),
+                    "landmarks": [[rng.randint(0, 240)] * 2 for _ in range(5)],
+                    "embedding": [round(rng.uniform(-1, 1), 6) for _ in range(128)],
+                }
+                for _ in range(faces)
+            ],
+            "image": "/9j/" + "A" * 6000,  # Base64 JPEG thumbnail
+        },
+    }
+
+
+def serial_capture(messages: int = 200) -> bytes:
+    """Representative Himax output: face results, logs and line noise"""
+    parts = []
+    for n in range(messages):
+        parts.append(frame(invoke(n)))
+        if n % 10 == 0:
+            parts.append(b"[I] inference 12ms\r\n\x00\xff")
+    return b"".join(parts)
+
+
+def feed_in_reads(parser: SSCMAParser, data: bytes, size: int) -> list:
+    messages = []
+    for i in range(0, len(data), size):
+        messages += parser.feed(data[i : i + size])
+    return messages
+
+
+class TestFraming:
+    """Tests for message framing and recovery"""
+
+    def test_messages_split_across_reads(self):
+        data = frame({"a": 1}) + b"noise" + frame({"b": [1, 2]}) + frame({"c": "x"})
+        parser = SSCMAParser()
+
+        assert feed_in_reads(parser, data, 1) == [{"a": 1}, {"b": [1, 2]}, {"c": "x"}]
+        assert parser.stats()["buffered"] == 0
+        assert parser.skipped_bytes == len(b"noise")
+
+    def test_truncated_message_resyncs_on_next_start(self):
+        data = b'\r{"lost":' + frame({"ok": 1})
+        parser = SSCMAParser()
+
+        assert parser.feed(data) == [{"ok": 1}]
+        assert parser.decode_errors == 0
+
+    def test_buffer_is_bounded_without_newline(self):
+        parser = SSCMAParser(max_message_size=1024)
+        parser.feed(b'\r{"blob":"')
+        for _ in range(10):
+            parser.feed(b"x" * 500)
+
+        assert parser.oversized == 1
+        assert parser.stats()["buffered"] < 1024
+        assert parser.feed(frame({"after": True})) == [{"after": True}]
+
+    def test_garbage_is_not_kept(self):
+        parser = SSCMAParser()
+        for _ in range(100):
+            parser.feed(b"\x00" * 4096)
+        assert parser.stats()["buffered"] == 0
+
+        parser.feed(b"junk\r")  # Possible start of a marker
+        assert parser.feed(b'{"x":1}\n') == [{"x": 1}]
+
+    def test_bad_json_is_counted(self):
+        parser = SSCMAParser()
+        assert parser.feed(b"\r{not json}\n" + frame({"ok": 1})) == [{"ok": 1}]
+        assert parser.decode_errors == 1
+
+
+class TestThroughput:
+    """Micro-benchmark: parsing must stay far ahead of the serial line"""
+
+    @pytest.mark.skipif(
+        not os.environ.get("RUN_BENCHMARKS"),
+        reason="wall-clock benchmark; set RUN_BENCHMARKS=1 to run",
+    )
+    def test_capture_throughput(self):
+        capture = serial_capture()
+        parser = SSCMAParser()
+
+        started = time.perf_counter()
+        messages = feed_in_reads(parser, capture, 4096)
+        elapsed = time.perf_counter() - started
+
+        assert len(messages) == 200
+        assert messages[-1]["data"]["count"] == 199
+        rate = len(capture) / elapsed
+        assert rate > 20 * MAX_LINE_RATE, (
+            f"SSCMA parser: {rate / 1e6:.1f} MB/s over {len(capture)} bytes"
+        )
+
+    def test_large_message_in_small_reads_is_linear(self):
+        # A 2 MB message in 64-byte reads: rescanning or copying the pending
+        # buffer on every read is quadratic, hundreds of times slower than
+        # feeding the same bytes at once; linear parsing stays within ~10x
+        blob = frame({"image": "A" * 2_000_000})
+
+        def parse(read_size):
+            parser = SSCMAParser(max_message_size=4 * 1024 * 1024)
+            started = time.perf_counter()
+            messages = feed_in_reads(parser, blob, read_size)
+            assert len(messages) == 1
+            return time.perf_counter() - started
+
+        one_shot = parse(len(blob))
+        small_reads = parse(64)
+
+        assert small_reads < 100 * one_shot, (
+            f"64-byte reads {small_reads:.3f}s vs one read {one_shot:.3f}s"
+        )
@@ -0,0 +1,197 @@
+"""
+Unit tests for the shared SSH connection pool
+"""
+
+import asyncio
+import importlib
+import threading
+import time
+from unittest.mock import patch
+
+import paramiko
+import pytest
+
+from provisioning_station.services import ssh_pool
+from provisioning_station.services.device_detector import DeviceDetector
+from provisioning_station.services.ssh_pool import SSHConnectionPool, retire
+from tests.simulation.ssh import FakeSSHClient
+
+
+class PooledClient(FakeSSHClient):
+    """Records every instance the pool creates"""
+
+    instances = []
+    fail_with = None
+
+    def __init__(self):
+        super().__init__()
+        PooledClient.instances.append(self)
+
+    def connect(self, **kwargs):
+        if PooledClient.fail_with:
+            raise PooledClient.fail_with
+        super().connect(**kwargs)
+
+
+@pytest.fixture(autouse=True)
+def fake_paramiko():
+    PooledClient.instances = []
+    PooledClient.fail_with = None
+    with patch.object(paramiko, "SSHClient", PooledClient):
+        yield
+
+
+@pytest.fixture
+def pool():
+    pool = SSHConnectionPool(max_per_host=2, idle_timeout=60)
+    yield pool
+    pool.close_all()
+
+
+def _connect(pool, host="10.0.0.5", password="pw", **kwargs):
+    return pool.connect(hostname=host, username="root", password=password, **kwargs)
+
+
+class TestReuse:
+    """Tests for lending and returning connections"""
+
+    def test_returned_client_is_reused(self, pool):
+        first = _connect(pool)
+        _, stdout, _ = first.exec_command("uptime")
+        assert stdout.read() == b"uptime"
+        first.close()
+
+        second = _connect(pool)
+        assert second.client is PooledClient.instances[0]
+        assert len(PooledClient.instances) == 1
+        assert pool.stats()["reused"] == 1
+
+    def test_unconnected_client_is_drop_in(self, pool):
+        client = pool.client()
+        client.close()  # Closing before connect is harmless
+
+        client.connect(hostname="10.0.0.5", port=2222, username="pi", password="x")
+        assert client.client.connect_kwargs["port"] == 2222
+        client.close()
+        stats = pool.stats()
+        assert stats["leased"] == 0
+        assert stats["idle"] == 1
+
+    def test_credentials_and_hosts_are_kept_apart(self, pool):
+        _connect(pool, password="a").close()
+        _connect(pool, password="b").close()
+        _connect(pool, host="10.0.0.6", password="a").close()
+
+        assert len(PooledClient.instances) == 3
+        assert pool.stats()["idle"] == 3
+
+    def test_dead_idle_client_is_replaced(self, pool):
+        first = _connect(pool)
+        first.close()
+        PooledClient.instances[0].transport.active = False
+
+        second = _connect(pool)
+        assert second.client is PooledClient.instances[1]
+        assert pool.stats()["discarded"] == 1
+
+    def test_stale_idle_client_is_probed(self, pool):
+        _connect(pool).close()
+        PooledClient.instances[0].transport.probe_ok = False
+        with patch.object(ssh_pool, "PROBE_AFTER_SECONDS", 0):
+            second = _connect(pool)
+
+        assert second.client is PooledClient.instances[1]
+
+    def test_retired_client_is_not_pooled(self, pool):
+        client = _connect(pool)
+        retire(client)
+        client.close()
+
+        assert PooledClient.instances[0].closed
+        assert pool.stats()["idle"] == 0
+
+    def test_failed_connect_releases_slot(self, pool):
+        PooledClient.fail_with = paramiko.AuthenticationException("denied")
+        for _ in range(3):
+            with pytest.raises(paramiko.AuthenticationException):
+                _connect(pool)
+
+        stats = pool.stats()
+        assert stats["failures"] == 3
+        assert stats["leased"] == 0
+
+
+class TestLimits:
+    """Tests for per-host limits and idle eviction"""
+
+    def test_borrowers_wait_for_a_free_slot(self, pool):
+        held = [_connect(pool), _connect(pool)]
+        borrowed = []
+
+        thread = threading.Thread(target=lambda: borrowed.append(_connect(pool)))
+        thread.start()
+        time.sleep(0.1)
+        assert not borrowed  # Both slots for the host are taken
+
+        freed = held[0].client
+        held[0].close()
+        thread.join(timeout=2)
+        assert borrowed[0].client is freed
+        assert pool.stats()["waits"] == 1
+        assert len(PooledClient.instances) == 2  # Reused, not a third connect
+
+    async def test_connection_test_waits_off_the_event_loop(self, pool):
+        held = [_connect(pool), _connect(pool)]
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.1, held[0].close)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        # The package re-exports the detector instance under the module's name
+        detector_module = importlib.import_module(DeviceDetector.__module__)
+        with patch.object(detector_module, "get_ssh_pool", return_value=pool):
+            result = await DeviceDetector().test_ssh_connection(
+                "10.0.0.5", username="root", password="pw"
+            )
+        ticking.cancel()
+
+        assert result["status"] == "detected"
+        assert result["details"]["uname"] == "uname -a"
+        assert ticks >= 5  # The loop kept running while waiting for the slot
+
+    def test_other_hosts_are_not_blocked(self, pool):
+        held = [_connect(pool), _connect(pool)]
+        assert pool.stats()["leased"] == len(held)
+        other = _connect(pool, host="10.0.0.9")
+        assert other.client is not None
+
+    def test_idle_clients_are_evicted(self):
+        pool = SSHConnectionPool(max_per_host=2, idle_timeout=0.01)
+        _connect(pool).close()
+        time.sleep(0.05)
+
+        assert pool.reap_idle() == 1
+        assert PooledClient.instances[0].closed
+        assert pool.stats()["evicted"] == 1
+        pool.close_all()
+
+    def test_zero_idle_timeout_disables_pooling(self):
+        pool = SSHConnectionPool(idle_timeout=0)
+        _connect(pool).close()
+        _connect(pool).close()
+
+        assert len(PooledClient.instances) == 2
+        assert PooledClient.instances[0].closed
+
+    def test_close_all_closes_idle_clients(self, pool):
+        _connect(pool).close()
+        pool.close_all()
+
+        assert PooledClient.instances[0].closed
+        assert pool.stats()["idle"] == 0
@@ -0,0 +1,193 @@
+"""
+Unit tests for delta file transfer over SSH
+"""
+
+import gzip
+import hashlib
+import io
+import shlex
+import tarfile
+
+import pytest
+
+from provisioning_station.deployers.docker_remote_deployer import DockerRemoteDeployer
+from provisioning_station.deployers.ssh_mixin import SSHMixin, parse_sha256sum
+from tests.simulation.ssh import FakeSSHClient
+
+
+class FakeUploadFile(io.BytesIO):
+    def close(self):
+        pass  # Keep the bytes for the remote to unpack
+
+
+class FakeSession:
+    """An exec channel that unpacks the tar stream into the remote files"""
+
+    def __init__(self, remote):
+        self.remote = remote
+        self.stdin = FakeUploadFile()
+
+    def exec_command(self, command):
+        self.command = command
+
+    def makefile(self, mode):
+        return self.stdin
+
+    def shutdown_write(self):
+        data = self.stdin.getvalue()
+        self.remote.streamed += len(data)
+        if self.command.startswith("gzip -dc"):
+            data = gzip.decompress(data)
+        root = shlex.split(self.command)[-1]
+        with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+            for member in tar:
+                path = ("/" if root == "/" else "") + member.name
+                self.remote.files[path] = tar.extractfile(member).read()
+                if self.remote.corrupt:
+                    self.remote.files[path] += b"!"
+
+    def recv_exit_status(self):
+        return 0
+
+    def close(self):
+        pass
+
+
+class FakeRemote(FakeSSHClient):
+    """SSH client double backed by an in-memory remote file system"""
+
+    def __init__(self, has_sha256sum=True):
+        super().__init__()
+        self.files = {}
+        self.has_sha256sum = has_sha256sum
+        self.sessions = 0
+        self.streamed = 0
+        self.corrupt = False
+
+    def reply(self, command):
+        if not command.startswith("sha256sum"):
+            return 0, b""
+        if not self.has_sha256sum:
+            return 127, b""
+        paths = shlex.split(command.split("2>/dev/null")[0])[2:]
+        lines = [
+            f"{hashlib.sha256(self.files[p]).hexdigest()}  {p}\n"
+            for p in paths
+            if p in self.files
+        ]
+        return int(len(lines) < len(paths)), "".join(lines).encode()
+
+    def get_transport(self):
+        return self
+
+    def open_session(self):
+        self.sessions += 1
+        return FakeSession(self)
+
+
+@pytest.fixture
+def model(tmp_path):
+    path = tmp_path / "model.cvimodel"
+    path.write_bytes(bytes(range(256)) * 4000)
+    return str(path)
+
+
+class TestSyncFiles:
+    """Only missing or changed files cross the link"""
+
+    def test_unchanged_files_are_skipped(self, tmp_path, model):
+        remote = FakeRemote()
+        config = tmp_path / "app.conf"
+        config.write_text("port=80\n")
+        items = [(model, "/userdata/models/model.cvimodel"), (str(config), "/etc/app/")]
+
+        assert SSHMixin()._sync_files(remote, items)
+        assert remote.files["/etc/app/app.conf"] == b"port=80\n"
+        assert remote.sessions == 1  # One tar stream for both files
+
+        remote.commands.clear()
+        assert SSHMixin()._sync_files(remote, items)
+        assert remote.sessions == 1
+        assert len(remote.commands) == 1  # One batched sha256sum, no upload
+
+        config.write_text("port=8080\n")
+        streamed = remote.streamed
+        assert SSHMixin()._sync_files(remote, items)
+        assert remote.files["/etc/app/app.conf"] == b"port=8080\n"
+        assert remote.streamed - streamed < 1024  # Not the model again
+
+    def test_progress_is_reported_per_changed_file(self, tmp_path, model):
+        remote = FakeRemote()
+        remote.files["/tmp/m"] = open(model, "rb").read()
+        items = [(model, "/tmp/m"), (b"a", "/tmp/a"), (b"b", "/tmp/b")]
+        started = []
+
+        assert SSHMixin()._sync_files(
+            remote, items, on_file=lambda *args: started.append(args)
+        )
+        assert started == [(0, 2, "/tmp/a"), (1, 2, "/tmp/b")]
+
+    def test_compression_is_optional(self, model):
+        packed, plain = FakeRemote(), FakeRemote()
+        SSHMixin()._sync_files(packed, [(model, "/tmp/m")])
+        SSHMixin()._sync_files(plain, [(model, "/tmp/m")], compress=False)
+
+        assert packed.files == plain.files
+        assert packed.streamed < plain.streamed / 10
+
+    def test_generated_content_and_relative_paths(self):
+        remote = FakeRemote()
+        assert SSHMixin()._sync_files(remote, [(b"services: {}\n", "app/compose.yml")])
+        assert remote.files == {"app/compose.yml": b"services: {}\n"}
+
+    def test_without_sha256sum_everything_is_sent(self, model):
+        remote = FakeRemote(has_sha256sum=False)
+        remote.files["/tmp/m"] = open(model, "rb").read()
+
+        assert SSHMixin()._sync_files(remote, [(model, "/tmp/m")])
+        assert remote.sessions == 1
+
+    def test_corrupted_upload_fails(self, model):
+        remote = FakeRemote()
+        remote.corrupt = True
+        assert not SSHMixin()._sync_files(remote, [(model, "/tmp/m")])
+
+    def test_hash_batches_stay_short(self, tmp_path):
+        remote = FakeRemote()
+        paths = [f"/srv/app/{'d' * 200}/{n}" for n in range(400)]
+        SSHMixin()._remote_sha256(remote, paths)
+
+        assert len(remote.commands) > 1
+        assert all(len(c) < 40 * 1024 for c in remote.commands)
+
+
+class TestSha256sumOutput:
+    def test_plain_and_escaped_names(self):
+        a, b = "a" * 64, "B" * 64
+        output = f"{a}  /tmp/model file.bin\n\\{b}  /tmp/odd\\nname\\\\x\nsha256sum: /x: No such file\n"
+
+        assert parse_sha256sum(output) == {
+            "/tmp/model file.bin": a,
+            "/tmp/odd\nname\\x": b.lower(),
+        }
+
+
+class TestComposeDirectory:
+    def test_labels_go_into_top_level_compose_files(self, tmp_path):
+        (tmp_path / "config").mkdir()
+        (tmp_path / "config" / "compose.yml").write_text("not: injected\n")
+        (tmp_path / "docker-compose.yml").write_text("services:\n  web:\n    image: nginx\n")
+
+        items = dict(
+            (remote, source)
+            for source, remote in DockerRemoteDeployer._directory_items(
+                str(tmp_path), "/home/pi/app", {"sensecraft.solution_id": "demo"}
+            )
+        )
+
+        assert set(items) == {
+            "/home/pi/app/docker-compose.yml",
+            "/home/pi/app/config/compose.yml",
+        }
+        assert b"sensecraft.solution_id" in items["/home/pi/app/docker-compose.yml"]
+        assert items["/home/pi/app/config/compose.yml"].endswith("compose.yml")
@@ -0,0 +1,384 @@
+"""
+Unit tests for MJPEG fan-out in the stream proxy
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from provisioning_station.services import stream_proxy
+from provisioning_station.services.stream_proxy import (
+    MJPEG_PROFILES,
+    CongestionMeter,
+    FrameSlot,
+    MjpegFrameParser,
+    StreamInfo,
+    StreamProxy,
+    mjpeg_part,
+    normalize_rtsp_url,
+)
+
+
+def make_frame(n: int) -> bytes:
+    return b"\xff\xd8" + str(n).encode() + b"\xff\xd9"
+
+
+@pytest.fixture
+def proxy(tmp_path):
+    return StreamProxy(output_base_dir=str(tmp_path))
+
+
+def add_stream(proxy: StreamProxy, stream_id: str = "cam") -> StreamInfo:
+    info = StreamInfo(
+        stream_id=stream_id,
+        rtsp_url="rtsp://10.0.0.5/live",
+        mode="mjpeg",
+        status="running",
+        started_at=time.time(),
+        last_accessed=time.time(),
+        _frames=FrameSlot(),
+    )
+    proxy.streams[stream_id] = info
+    return info
+
+
+async def publish_frames(info: StreamInfo, count: int, interval: float):
+    for n in range(1, count + 1):
+        await asyncio.sleep(interval)
+        info._frames.publish(mjpeg_part(make_frame(n)))
+    info.status = "stopped"
+    info._frames.close()
+
+
+class TestMjpegFrameParser:
+    """Tests for the incremental JPEG splitter"""
+
+    def test_frames_split_across_reads(self):
+        parser = MjpegFrameParser()
+        stream = b"junk" + make_frame(1) + b"\x00" + make_frame(22) + make_frame(333)
+
+        parts = []
+        for i in range(len(stream)):
+            parts += parser.feed(stream[i : i + 1])  # Markers split between reads
+
+        assert parts == [mjpeg_part(make_frame(n)) for n in (1, 22, 333)]
+        assert parts[0] == (
+            b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: 5\r\n\r\n"
+            + make_frame(1)
+            + b"\r\n"
+        )
+
+    def test_several_frames_in_one_read(self):
+        parser = MjpegFrameParser()
+        data = b"".join(make_frame(n) for n in range(5))
+
+        assert parser.feed(data + b"\xff\xd8partial") == [
+            mjpeg_part(make_frame(n)) for n in range(5)
+        ]
+        assert parser.feed(b"\xff\xd9") == [mjpeg_part(b"\xff\xd8partial\xff\xd9")]
+
+    def test_buffer_stays_bounded(self):
+        parser = MjpegFrameParser()
+        for _ in range(100):
+            parser.feed(b"\x00" * 4096)  # Garbage before the first SOI
+        assert len(parser._buf) <= 1
+
+        frame = b"\xff\xd8" + b"\x11" * 1_000_000 + b"\xff\xd9"
+        parts = []
+        for i in range(0, len(frame), 65536):
+            parts += parser.feed(frame[i : i + 65536])
+        assert parts == [mjpeg_part(frame)]
+        assert len(parser._buf) == 0
+
+
+class TestFrameSlot:
+    """Tests for the versioned frame slot"""
+
+    @pytest.mark.asyncio
+    async def test_each_waiter_wakes_once_per_frame(self):
+        slot = FrameSlot()
+        wakeups = [0] * 10
+
+        async def viewer(i):
+            seen = 0
+            while True:
+                await slot.wait(seen, timeout=1)
+                if slot.version == seen:
+                    return
+                seen = slot.version
+                wakeups[i] += 1
+
+        viewers = [asyncio.create_task(viewer(i)) for i in range(10)]
+        for n in range(5):
+            await asyncio.sleep(0.01)
+            slot.publish(mjpeg_part(make_frame(n)))
+        await asyncio.sleep(0.01)
+        slot.close()
+        await asyncio.gather(*viewers)
+
+        assert wakeups == [5] * 10
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out_without_frames(self):
+        slot = FrameSlot()
+        assert await slot.wait(0, timeout=0.01) is False
+        slot.publish(mjpeg_part(make_frame(1)))
+        assert await slot.wait(0, timeout=0.01) is True
+
+
+class TestMjpegFanOut:
+    """Tests for get_mjpeg_frames"""
+
+    @pytest.mark.asyncio
+    async def test_viewer_receives_frames_as_multipart(self, proxy):
+        info = add_stream(proxy)
+        producer = asyncio.create_task(publish_frames(info, 3, 0.01))
+
+        chunks = [c async for c in proxy.get_mjpeg_frames("cam")]
+        await producer
+
+        assert len(chunks) == 3
+        assert chunks[0].startswith(b"--frame\r\nContent-Type: image/jpeg\r\n")
+        assert chunks[-1] == mjpeg_part(make_frame(3))
+        assert chunks[-1] is info._frames.part  # Shared, not rebuilt per viewer
+        assert info.clients == 0
+
+    @pytest.mark.asyncio
+    async def test_max_fps_paces_viewer_and_sends_newest(self, proxy):
+        info = add_stream(proxy)
+        producer = asyncio.create_task(publish_frames(info, 50, 0.01))
+
+        chunks = [c async for c in proxy.get_mjpeg_frames("cam", max_fps=5)]
+        await producer
+
+        # ~0.5s of frames at 5 fps: a handful, not all 50
+        assert 2 <= len(chunks) <= 5
+
+    @pytest.mark.asyncio
+    async def test_slow_viewer_skips_to_latest(self, proxy):
+        info = add_stream(proxy)
+        stream = proxy.get_mjpeg_frames("cam")
+
+        info._frames.publish(mjpeg_part(make_frame(1)))
+        first = await stream.__anext__()
+        assert make_frame(1) in first
+
+        # Viewer is busy while three frames arrive
+        for n in (2, 3, 4):
+            info._frames.publish(mjpeg_part(make_frame(n)))
+        second = await stream.__anext__()
+        assert make_frame(4) in second
+
+        info.status = "stopped"
+        info._frames.close()
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
+
+    @pytest.mark.asyncio
+    async def test_viewers_are_counted(self, proxy):
+        info = add_stream(proxy)
+        streams = [proxy.get_mjpeg_frames("cam") for _ in range(3)]
+        pending = [asyncio.ensure_future(s.__anext__()) for s in streams]
+        await asyncio.sleep(0.01)
+
+        assert info.clients == 3
+        assert proxy.list_streams()["cam"]["clients"] == 3
+
+        info._frames.publish(mjpeg_part(make_frame(1)))
+        await asyncio.gather(*pending)
+        for s in streams:
+            await s.aclose()
+        assert info.clients == 0
+
+
+@pytest.fixture
+async def ingest_proxy(tmp_path):
+    """Proxy whose FFmpeg launches are recorded instead of run"""
+    proxy = StreamProxy(output_base_dir=str(tmp_path))
+    proxy._ffmpeg_path = "ffmpeg"
+    proxy.launches = []
+
+    async def fake_start(stream_info, *args):
+        proxy.launches.append(stream_info)
+        stream_info.status = "running"
+
+    with patch.object(proxy, "_start_mjpeg_ffmpeg", fake_start), patch.object(
+        proxy, "_start_hls_ffmpeg", fake_start
+    ), patch.object(proxy, "_start_ll_hls_ffmpeg", fake_start):
+        yield proxy
+        await proxy.stop_all()
+
+
+class TestSharedIngest:
+    """One FFmpeg per camera and output settings, however many viewers"""
+
+    def test_normalize_rtsp_url(self):
+        assert normalize_rtsp_url("RTSP://Cam.Local:554/live") == "rtsp://cam.local/live"
+        assert normalize_rtsp_url(" rtsp://admin:pw@10.0.0.5 ") == "rtsp://admin:pw@10.0.0.5/"
+        assert normalize_rtsp_url("rtsp://10.0.0.5:8554/Live") == "rtsp://10.0.0.5:8554/Live"
+
+    async def test_viewers_of_one_camera_share_ffmpeg(self, ingest_proxy):
+        a = await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5/live")
+        b = await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5:554/live")
+        c = await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5/live", fps=5)
+
+        assert a != b
+        assert len(ingest_proxy.launches) == 2  # fps=5 needs its own encode
+        assert ingest_proxy.get_stream_info(a) is ingest_proxy.get_stream_info(b)
+        assert ingest_proxy.get_stream_info(c) is not ingest_proxy.get_stream_info(a)
+        assert ingest_proxy.list_streams()[b]["shared_by"] == 2
+
+    async def test_ffmpeg_stops_with_last_handle(self, ingest_proxy):
+        url = "rtsp://10.0.0.5/live"
+        a = await ingest_proxy.start_stream(url, stream_id="tab-1", low_latency=False)
+        b = await ingest_proxy.start_stream(url, stream_id="tab-2", low_latency=False)
+        info = ingest_proxy.get_stream_info(a)
+
+        assert await ingest_proxy.stop_stream(a)
+        assert info.hls_dir.exists()  # Still serving tab-2
+        assert ingest_proxy.get_stream_info(b) is info
+
+        assert await ingest_proxy.stop_stream(b)
+        assert not info.hls_dir.exists()
+        assert ingest_proxy.streams == {}
+
+        await ingest_proxy.start_stream(url, stream_id="tab-1", low_latency=False)
+        assert len(ingest_proxy.launches) == 2  # Fresh ingest after shutdown
+
+    async def test_reused_id_with_new_url_switches_ingest(self, ingest_proxy):
+        await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5/live", stream_id="p")
+        await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5/live", stream_id="p")
+        assert len(ingest_proxy.launches) == 1
+
+        await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.6/live", stream_id="p")
+        assert len(ingest_proxy.launches) == 2
+        assert ingest_proxy.get_stream_info("p").rtsp_url == "rtsp://10.0.0.6/live"
+        assert len(ingest_proxy._ingests) == 1
+
+    async def test_failed_ingest_is_not_shared(self, ingest_proxy):
+        a = await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5/live")
+        ingest_proxy.get_stream_info(a).status = "error"
+        b = await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5/live")
+
+        assert len(ingest_proxy.launches) == 2
+        assert ingest_proxy.get_stream_info(b).status == "running"
+
+    async def test_idle_ingest_is_stopped(self, ingest_proxy):
+        a = await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5/live")
+        b = await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5/live")
+        watched = await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.7/live")
+        for info in ingest_proxy.streams.values():
+            info.last_accessed -= 600
+        ingest_proxy.get_stream_info(watched).clients = 1
+
+        await ingest_proxy.cleanup_idle_streams(max_idle_seconds=300)
+
+        assert a not in ingest_proxy.streams and b not in ingest_proxy.streams
+        assert watched in ingest_proxy.streams
+
+    async def test_idle_sweep_runs_in_background(self, ingest_proxy):
+        with patch.object(stream_proxy, "IDLE_CHECK_INTERVAL", 0.01), patch.object(
+            stream_proxy.settings, "preview_stream_idle_timeout", 1
+        ):
+            a = await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5/live")
+            ingest_proxy.get_stream_info(a).last_accessed -= 60
+            await asyncio.sleep(0.1)
+
+        assert ingest_proxy.streams == {}
+        assert ingest_proxy._idle_task.done()  # Exits with the last stream
+
+    async def test_low_latency_hls_is_served_from_memory(self, ingest_proxy):
+        a = await ingest_proxy.start_stream("rtsp://10.0.0.5/live", stream_id="tab-1")
+        b = await ingest_proxy.start_stream("rtsp://10.0.0.5/live", stream_id="tab-2")
+        info = ingest_proxy.get_stream_info(a)
+
+        assert info.hls_dir is None
+        assert ingest_proxy.get_hls_window(b) is info._hls
+        assert len(ingest_proxy.launches) == 1
+
+        await ingest_proxy.stop_all()
+        assert info._hls.closed
+
+
+class TestTranscodeProfiles:
+    """Tests for MJPEG profiles and adaptive quality"""
+
+    def test_profile_command_lines(self, proxy):
+        proxy._ffmpeg_path = "ffmpeg"
+        proxy._has_v4l2m2m = True
+        url = "rtsp://10.0.0.5/live"
+
+        full = proxy._mjpeg_command(url, 10, 5, MJPEG_PROFILES["full"])
+        thumb = proxy._mjpeg_command(url, 10, 5, MJPEG_PROFILES["thumbnail"])
+        copy = proxy._mjpeg_command(url, 10, 5, MJPEG_PROFILES["passthrough"])
+
+        assert "-hwaccel" in full and "-vf" not in full
+        assert thumb[thumb.index("-vf") + 1] == "scale='min(320,iw)':-2"
+        assert copy[copy.index("-c:v") + 1] == "copy"
+        assert "-hwaccel" not in copy and "-q:v" not in copy
+
+    async def test_auto_profile_follows_camera_codec(self, ingest_proxy):
+        with patch.object(ingest_proxy, "_probe_codec", return_value="mjpeg"):
+            a = await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5/mj", profile="auto")
+        with patch.object(ingest_proxy, "_probe_codec", return_value="h264"):
+            b = await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.6/h264", profile="auto")
+
+        assert ingest_proxy.get_stream_info(a).profile == "passthrough"
+        assert ingest_proxy.get_stream_info(b).profile == "full"
+        with pytest.raises(ValueError, match="Unknown MJPEG profile"):
+            await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5/mj", profile="4k")
+
+    async def test_profiles_get_separate_ingests(self, ingest_proxy):
+        await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5/live")
+        await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5/live", profile="thumbnail")
+        await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5/live", profile="thumbnail")
+
+        assert [i.profile for i in ingest_proxy.launches] == ["full", "thumbnail"]
+
+    def test_congestion_meter(self):
+        meter = CongestionMeter(window=0.02)
+        time.sleep(0.03)
+        assert meter.record(0.03) == 1  # Busy sending the whole window
+
+        with patch.object(stream_proxy, "RELAXED_WINDOWS", 2):
+            time.sleep(0.03)
+            assert meter.record(0.0) == 0
+            time.sleep(0.03)
+            assert meter.record(0.0) == -1  # Idle link for two windows
+
+    async def test_congested_viewer_steps_down_and_back(self, ingest_proxy):
+        base = await ingest_proxy.start_mjpeg_stream("rtsp://10.0.0.5/live")
+        running = True
+
+        async def producer():
+            # Every ingest publishes its own name so chunks show their source
+            n = 0
+            while running:
+                n += 1
+                for info in {id(i): i for i in ingest_proxy.streams.values()}.values():
+                    info._frames.publish(f"{info.width}:{n}".encode())
+                await asyncio.sleep(0.002)
+
+        task = asyncio.create_task(producer())
+        sources = []
+        with patch.object(stream_proxy, "ADAPT_WINDOW", 0.03), patch.object(
+            stream_proxy, "RELAXED_WINDOWS", 1
+        ):
+            stream = ingest_proxy.get_mjpeg_frames(base, adaptive=True)
+            async for chunk in stream:
+                source = chunk.split(b":")[0].decode()
+                if not sources or sources[-1] != source:
+                    sources.append(source)
+                if len(sources) > 1 and source == "None":
+                    break
+                if "320" not in sources:
+                    await asyncio.sleep(0.01)  # Slow link
+            await stream.aclose()
+        running = False
+        await task
+
+        assert sources[:4] == ["None", "1280", "640", "320"]
+        assert sources[-1] == "None"  # Back to full once the link is idle
+        assert list(ingest_proxy.streams) == [base]  # Rung handles released
@@ -0,0 +1,151 @@
+"""
+Unit tests for off-loop XMODEM flashing in HimaxDeployer
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from provisioning_station.deployers.himax_deployer import HimaxDeployer
+from provisioning_station.deployers.xmodem_worker import (
+    SerialWorker,
+    XmodemProgress,
+    packet_count,
+)
+
+
+class FakeModem:
+    """Blocking XMODEM sender that reports every packet like the library"""
+
+    def __init__(self, packet_size=128, delay=0.002, worker=None):
+        self.packet_size = packet_size
+        self.delay = delay
+        self.worker = worker
+        self.thread_names = []
+
+    def send(self, stream, retry=16, quiet=False, callback=None):
+        self.thread_names.append(threading.current_thread().name)
+        data = stream.read()
+        packets = packet_count(len(data), self.packet_size)
+        for n in range(1, packets + 1):
+            if self.worker:
+                self.worker.check_cancelled()
+            time.sleep(self.delay)  # Blocking serial write
+            if callback:
+                callback(n, n, 0)
+        return True
+
+
+@pytest.fixture
+def firmware(tmp_path):
+    path = tmp_path / "firmware.img"
+    path.write_bytes(b"\xaa" * 128 * 100)  # 100 packets
+    return str(path)
+
+
+class TestSendXmodem:
+    """Tests for the worker-thread transfer and its progress channel"""
+
+    @pytest.mark.asyncio
+    async def test_transfer_runs_off_loop_with_progress(self, firmware):
+        deployer = HimaxDeployer()
+        worker = SerialWorker("/dev/ttyACM0")
+        modem = FakeModem()
+        reports = []
+        ticks = 0
+
+        async def progress(step_id, progress, message):
+            reports.append((step_id, progress, message))
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        try:
+            ok = await deployer._send_xmodem(
+                worker, modem, firmware, 128, progress, 25, 90, "Base firmware"
+            )
+        finally:
+            task.cancel()
+            worker.close()
+
+        assert ok is True
+        assert modem.thread_names[0].startswith("xmodem-ttyACM0")
+        assert ticks >= 5  # Loop kept running during the ~0.2s transfer
+        percents = [p for _, p, _ in reports]
+        assert percents == sorted(percents)
+        assert percents[-1] == 90
+        assert reports[-1][2] == "Base firmware: 100% (100/100 packets)"
+        assert len(reports) <= 21  # Reported in 5% steps, not per packet
+
+    @pytest.mark.asyncio
+    async def test_ports_flash_concurrently(self, firmware):
+        deployer = HimaxDeployer()
+        workers = [SerialWorker(f"/dev/ttyACM{i}") for i in range(3)]
+
+        start = time.monotonic()
+        results = await asyncio.gather(
+            *(
+                deployer._send_xmodem(
+                    w, FakeModem(delay=0.003), firmware, 128, None, 0, 100, "fw"
+                )
+                for w in workers
+            )
+        )
+        elapsed = time.monotonic() - start
+        for w in workers:
+            w.close()
+
+        assert results == [True, True, True]
+        assert elapsed < 0.75  # ~0.3s each; sequential would be ~1s
+
+    @pytest.mark.asyncio
+    async def test_abort_stops_transfer(self, firmware):
+        deployer = HimaxDeployer()
+        worker = SerialWorker("/dev/ttyACM0")
+        modem = FakeModem(delay=0.05, worker=worker)
+
+        task = asyncio.create_task(
+            deployer._send_xmodem(worker, modem, firmware, 128, None, 0, 100, "fw")
+        )
+        await asyncio.sleep(0.1)
+        worker.abort()
+        with pytest.raises(RuntimeError, match="cancelled"):
+            await task
+        worker.close()
+
+
+class TestXmodemProgress:
+    """Tests for the coalescing progress channel"""
+
+    @pytest.mark.asyncio
+    async def test_updates_are_coalesced(self):
+        loop = asyncio.get_running_loop()
+        channel = XmodemProgress(loop)
+        seen = []
+
+        def burst():
+            for n in range(1, 1001):
+                channel.callback(n, n, 0)
+            return "done"
+
+        async def on_update(sent, errors):
+            seen.append(sent)
+
+        transfer = loop.run_in_executor(None, burst)
+        assert await channel.follow(transfer, on_update) == "done"
+
+        assert seen[-1] == 1000
+        assert seen == sorted(seen)
+        assert len(seen) < 1000
+
+    def test_packet_count(self):
+        assert packet_count(0, 128) == 1
+        assert packet_count(128, 128) == 1
+        assert packet_count(129, 128) == 2
+        assert packet_count(4096, 1024) == 4